@@ -0,0 +1,199 @@
+"""Buffered, levelled log files written off the UI thread.
+
+Shared by the remaster and legacy packages, and so kept free of either: each
+caller names its own log file. Each message is tagged with a subsystem ("gesture", "legacy", ...) and a
+level. A message below its subsystem's level costs one dict lookup; one
+that passes is appended to an in-memory queue, and a daemon thread writes
+the queue out every `FLUSH_INTERVAL_S` (sooner once `FLUSH_BATCH` messages
+are waiting). So a gesture logging on every event does no file I/O of its
+own. Files rotate at `MAX_BYTES` to `log.txt.1` ... `log.txt.<BACKUP_COUNT>`.
+
+Levels default to "off". Set them with `set_level()`, or for a whole run
+with the environment variable `QUICK_ACCESS_MANAGER_LOG`: either one level
+for every subsystem (`debug`) or per subsystem (`gesture=debug,legacy=info`,
+with `*` for the rest). `shutdown()` writes whatever is still queued; the
+plugin calls it when Krita closes, and it is registered with atexit too.
+Anything logged after that is written at once, on the caller's thread.
+"""
+
+import atexit
+import collections
+import os
+import threading
+import time
+
+ENV_VAR = "QUICK_ACCESS_MANAGER_LOG"
+MAX_BYTES = 1024 * 1024
+BACKUP_COUNT = 3
+FLUSH_INTERVAL_S = 0.5
+FLUSH_BATCH = 500
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40, "off": 100}
+DEFAULT_LEVEL = "off"
+
+
+def _format(entry):
+    created, level, subsystem, message = entry
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created))
+    millis = int((created % 1) * 1000)
+    return f"{stamp}.{millis:03d} {level.upper():<7} [{subsystem}] {message}\n"
+
+
+class LogWriter:
+    """One log file fed from a queue by a background thread.
+
+    `path` may be a callable, resolved (and its directory created) by the
+    first write rather than by every caller.
+    """
+
+    def __init__(
+        self,
+        path,
+        max_bytes=MAX_BYTES,
+        backup_count=BACKUP_COUNT,
+        flush_interval=FLUSH_INTERVAL_S,
+    ):
+        self._path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self._queue = collections.deque()
+        self._wake = threading.Event()
+        self._write_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._size = None
+
+    @property
+    def path(self):
+        if callable(self._path):
+            self._path = self._path()
+        return self._path
+
+    def enqueue(self, level, subsystem, message):
+        self._queue.append((time.time(), level, subsystem, message))
+        if self._closed:
+            # No thread after shutdown: late teardown messages go straight out.
+            self.flush()
+            return
+        if self._thread is None:
+            self._start()
+        if len(self._queue) >= FLUSH_BATCH:
+            self._wake.set()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is not None or self._closed:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="quick-access-manager-log", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write every queued message now, on the calling thread."""
+        with self._write_lock:
+            lines = []
+            while self._queue:
+                lines.append(_format(self._queue.popleft()))
+            if not lines:
+                return
+            data = "".join(lines).encode("utf-8")
+            try:
+                path = self.path
+                if self._size is None:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    self._size = os.path.getsize(path) if os.path.exists(path) else 0
+                if self._size and self._size + len(data) > self.max_bytes:
+                    self._rotate(path)
+                with open(path, "ab") as handle:
+                    handle.write(data)
+                self._size += len(data)
+            except Exception as e:
+                print(f"Error writing log: {e}")
+
+    def _rotate(self, path):
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                older = f"{path}.{index}"
+                if os.path.exists(older):
+                    os.replace(older, f"{path}.{index + 1}")
+            os.replace(path, f"{path}.1")
+        else:
+            os.remove(path)
+        self._size = 0
+
+    def close(self):
+        """Stop the thread and write what is left; later messages are written
+        directly by `enqueue`."""
+        self._closed = True
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+        self.flush()
+
+
+def _levels_from_environment():
+    levels = {}
+    for part in os.environ.get(ENV_VAR, "").split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        subsystem, _, level = part.rpartition("=")
+        if level in LEVELS:
+            levels[subsystem or "*"] = LEVELS[level]
+    return levels
+
+
+_levels = _levels_from_environment()
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def set_level(subsystem, level):
+    """Set `subsystem`'s minimum level; `*` sets the default for the rest."""
+    _levels[subsystem] = LEVELS[level]
+
+
+def is_enabled(subsystem, level="debug"):
+    threshold = _levels.get(subsystem)
+    if threshold is None:
+        threshold = _levels.get("*", LEVELS[DEFAULT_LEVEL])
+    return LEVELS[level] >= threshold
+
+
+def get_log_writer(path):
+    """The writer for `path` (a file path, or a callable returning one)."""
+    writer = _writers.get(path)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(path)
+            if writer is None:
+                writer = _writers[path] = LogWriter(path)
+    return writer
+
+
+def log(subsystem, message, path, level="debug", force=False):
+    """Queue `message` for `path` if `subsystem` logs at `level` (or `force`)."""
+    if force or is_enabled(subsystem, level):
+        get_log_writer(path).enqueue(level, subsystem, message)
+
+
+def flush():
+    for writer in list(_writers.values()):
+        writer.flush()
+
+
+def shutdown():
+    for writer in list(_writers.values()):
+        writer.close()
+
+
+atexit.register(shutdown)
@@ -5,6 +5,9 @@ Ported from the legacy `color_selector` docker. The companion popup
 behind — only the standalone docker is migrated here.
 """
 
+import math
+import time
+
 from krita import (  # type: ignore
     DockWidget,
     DockWidgetFactory,
@@ -13,8 +16,10 @@ from krita import (  # type: ignore
     ManagedColor,
 )
 
+from .. import startup_profiler
 from ..compat import (
     QColor,
+    QComboBox,
     QFont,
     QHBoxLayout,
     QIntValidator,
@@ -26,7 +31,11 @@ from ..compat import (
     QWidget,
 )
 from ..infrastructure import PaletteRepository
-from .widgets import ChannelBar, FgBgColorWidget, HueBar, SVBox
+from ..quick_adjust.color_state import get_color_state
+from ..quick_adjust.poll_scheduler import get_poll_scheduler
+from ..quick_adjust.write_throttle import ThrottledWriter, frame_interval_ms
+from .document_palette import IMAGE_SOURCE, LAYER_SOURCE, DocumentPaletteExtractor
+from .widgets import ChannelBar, FgBgColorWidget, HueBar, PaletteSwatches, SVBox
 
 DOCKER_ID = "HueSVC"
 
@@ -149,29 +158,65 @@ class ColorSelectorDock(DockWidget):
                         and self._settings["rgb_display_mode"] == "value"
                         else val
                     ),
-                    debounce=True,
                 )
             )
+            bar.dragFinished.connect(self._flushForeground)
 
         outer_layout.addLayout(channels_layout)
 
+        # Document palette: the active layer's (or image's) dominant colors.
+        palette_layout = QHBoxLayout()
+        palette_layout.setSpacing(4)
+        self.palette_swatches = PaletteSwatches()
+        self.palette_swatches.colorClicked.connect(self._onPaletteColorClicked)
+        self.palette_source = QComboBox()
+        self.palette_source.addItem("Layer", LAYER_SOURCE)
+        self.palette_source.addItem("Image", IMAGE_SOURCE)
+        self.palette_button = QPushButton("Extract")
+        self.palette_button.setToolTip("Extract the dominant colors as swatches")
+        self.palette_button.clicked.connect(self._onPaletteButton)
+        palette_layout.addWidget(self.palette_swatches, 1)
+        palette_layout.addWidget(self.palette_source)
+        palette_layout.addWidget(self.palette_button)
+        outer_layout.addLayout(palette_layout)
+
+        self._palette = DocumentPaletteExtractor(self)
+        self._palette.paletteReady.connect(self.palette_swatches.setColors)
+        self._palette.extractionFailed.connect(self._onPaletteFailed)
+        self._palette.busyChanged.connect(
+            lambda busy: self.palette_button.setText("Cancel" if busy else "Extract")
+        )
+
         main_widget.setLayout(outer_layout)
         self.setWidget(main_widget)
 
         self.hue_bar.hueChanged.connect(self._onHueBarChanged)
         self.sv_box.colorChanged.connect(self._onSVChanged)
+        self.hue_bar.dragFinished.connect(self._flushForeground)
+        self.sv_box.dragFinished.connect(self._flushForeground)
 
         self._updateChannelBars()
 
-        self._poll_timer = QTimer(self)
-        self._poll_timer.setInterval(self._settings["poll_interval"])
-        self._poll_timer.timeout.connect(self._pollKritaColor)
-        self._poll_timer.start()
+        # A drag emits a pick per mouse move (hundreds a second on a tablet);
+        # Krita gets at most one foreground write per display frame, the
+        # latest pick, and the last one as soon as the drag is released.
+        self._fg_writer = ThrottledWriter(
+            self._writeForeground, frame_interval_ms(), self
+        )
 
-        self._debounce_timer = QTimer(self)
-        self._debounce_timer.setSingleShot(True)
-        self._debounce_timer.setInterval(150)
-        self._debounce_timer.timeout.connect(self._applyPendingColor)
+        # Krita's colors come from the shared color state (polled at most
+        # every poll_interval ms, shared with the popup and color history);
+        # _holdPoll() ignores it for a while after we wrote a color
+        # ourselves, so a stale read can't undo the user's pick, and
+        # re-reads it once the hold is over.
+        self._poll_hold_until = 0.0
+        self._resync_timer = QTimer(self)
+        self._resync_timer.setSingleShot(True)
+        self._resync_timer.timeout.connect(self._resyncColorState)
+        self._color_state = get_color_state()
+        self._color_state.set_poll_interval(self._settings["poll_interval"])
+        self._color_state.changed.connect(self._onColorState)
+        self._color_state.set_active(self, True)
 
     # ------------------------------------------------------------------
     # Sync helpers
@@ -209,56 +254,86 @@ class ColorSelectorDock(DockWidget):
         self.sv_box.setSatVal(s, v)
         self._updateChannelBars()
         if push:
-            self._setKritaForeground(color)
-            self._poll_timer.start()
+            self._fg_writer.submit((self._r, self._g, self._b))
 
-    def _applyRGB(self, r, g, b, push=True):
+    def _applyRGB(self, r, g, b, push=True, hsv=None):
         self._r, self._g, self._b = r, g, b
-        color = QColor(r, g, b)
-        h = color.hsvHue()
+        if hsv is None:
+            color = QColor(r, g, b)
+            hsv = (color.hsvHue(), color.hsvSaturation(), color.value())
+        h, self._s, self._v = hsv
         self._h = h if h != -1 else self._h
-        self._s = color.hsvSaturation()
-        self._v = color.value()
 
         self.hue_bar.setHue(self._h)
         self.sv_box.setHue(self._h)
         self.sv_box.setSatVal(self._s, self._v)
         self._updateChannelBars()
         if push:
-            self._setKritaForeground(color)
-            self._poll_timer.start()
+            self._fg_writer.submit((self._r, self._g, self._b))
 
-    def _pollKritaColor(self):
-        app = Krita.instance()
-        if not app.activeWindow():
+    def _holdPoll(self):
+        """Skip polls for one poll_interval after writing a color to Krita."""
+        self._poll_hold_until = (
+            time.monotonic() + self._settings["poll_interval"] / 1000.0
+        )
+        get_poll_scheduler().notify_activity()
+
+    def _writeForeground(self, rgb):
+        if not self._setKritaForeground(QColor(*rgb)):
             return
-        view = app.activeWindow().activeView()
-        if not view:
+        self._holdPoll()
+        self._color_state.note_foreground(rgb)
+
+    def _flushForeground(self):
+        self._fg_writer.flush()
+
+    def _colorStateHeld(self):
+        # Krita still has an older pick while one is coalesced.
+        return self._fg_writer.has_pending or time.monotonic() < self._poll_hold_until
+
+    def _onColorState(self, state):
+        if not self.isVisible():
             return
-        canvas = view.canvas()
+        if self._colorStateHeld():
+            # `changed` is not sent again for a state already emitted, so
+            # re-read the shared state once the hold is over.
+            self._scheduleResync()
+            return
+        self._applyColorState(state)
 
-        mc = view.foregroundColor()
-        if mc:
-            qcolor = mc.colorForCanvas(canvas)
-            if qcolor and qcolor.isValid():
-                r, g, b = qcolor.red(), qcolor.green(), qcolor.blue()
-                if (r, g, b) != (self._r, self._g, self._b):
-                    color = QColor(r, g, b)
-                    h = color.hsvHue() if color.hsvHue() != -1 else self._h
-                    s, v = color.hsvSaturation(), color.value()
-                    self._applyHSV(h, s, v, push=False)
+    def _scheduleResync(self):
+        remaining_ms = math.ceil((self._poll_hold_until - time.monotonic()) * 1000)
+        if self._fg_writer.has_pending:
+            remaining_ms = max(remaining_ms, frame_interval_ms())
+        self._resync_timer.start(max(0, remaining_ms))
 
-        mc_bg = view.backgroundColor()
-        if mc_bg:
-            qcolor_bg = mc_bg.colorForCanvas(canvas)
-            if qcolor_bg and qcolor_bg.isValid():
-                r, g, b = qcolor_bg.red(), qcolor_bg.green(), qcolor_bg.blue()
-                if (r, g, b) != (self._bg_r, self._bg_g, self._bg_b):
-                    self._bg_r, self._bg_g, self._bg_b = r, g, b
-                    self.fg_bg_widget.setColors(
-                        QColor(self._r, self._g, self._b),
-                        QColor(self._bg_r, self._bg_g, self._bg_b),
-                    )
+    def _resyncColorState(self):
+        if not self.isVisible():
+            return
+        if self._colorStateHeld():
+            self._scheduleResync()
+            return
+        self._applyColorState(self._color_state.state)
+
+    def _applyColorState(self, state):
+        """Mirror Krita's fg/bg color from the shared color state."""
+        if state.foreground is not None and state.foreground != (
+            self._r,
+            self._g,
+            self._b,
+        ):
+            self._applyRGB(*state.foreground, push=False, hsv=state.foreground_hsv)
+
+        if state.background is not None and state.background != (
+            self._bg_r,
+            self._bg_g,
+            self._bg_b,
+        ):
+            self._bg_r, self._bg_g, self._bg_b = state.background
+            self.fg_bg_widget.setColors(
+                QColor(self._r, self._g, self._b),
+                QColor(self._bg_r, self._bg_g, self._bg_b),
+            )
 
     # ------------------------------------------------------------------
     # Signal handlers
@@ -272,7 +347,7 @@ class ColorSelectorDock(DockWidget):
             h = self._h
         self._applyHSV(h, qcolor.hsvSaturation(), qcolor.value())
 
-    def _onChannelChanged(self, channel, value, debounce=False):
+    def _onChannelChanged(self, channel, value):
         h, s, v = self._h, self._s, self._v
         r, g, b = self._r, self._g, self._b
         use_rgb = False
@@ -297,22 +372,10 @@ class ColorSelectorDock(DockWidget):
             b = value if rgb_mode == "value" else i(value)
             use_rgb = True
 
-        if debounce:
-            self._poll_timer.stop()
-            if use_rgb:
-                self._applyRGB(r, g, b, push=False)
-            else:
-                self._applyHSV(h, s, v, push=False)
-            self._debounce_timer.start()
+        if use_rgb:
+            self._applyRGB(r, g, b)
         else:
-            if use_rgb:
-                self._applyRGB(r, g, b)
-            else:
-                self._applyHSV(h, s, v)
-
-    def _applyPendingColor(self):
-        self._setKritaForeground(QColor(self._r, self._g, self._b))
-        self._poll_timer.start()
+            self._applyHSV(h, s, v)
 
     def _stepChannel(self, ch, delta):
         if ch == "H":
@@ -344,15 +407,30 @@ class ColorSelectorDock(DockWidget):
         val = max(0, min(max_val, val))
         self._onChannelChanged(ch, val)
 
+    def _onPaletteButton(self):
+        if self._palette.busy:
+            self._palette.cancel()
+        else:
+            self._palette.extract(self.palette_source.currentData())
+
+    def _onPaletteFailed(self, message):
+        self.palette_swatches.setColors([])
+        self.palette_swatches.setToolTip(message)
+
+    def _onPaletteColorClicked(self, r, g, b):
+        self._applyRGB(r, g, b)
+        self._fg_writer.flush()
+
     def _setKritaForeground(self, qcolor):
+        """Set Krita's foreground; False if there is no view or document."""
         app = Krita.instance()
         view = app.activeWindow().activeView() if app.activeWindow() else None
         if not view:
-            return
+            return False
 
         doc = app.activeDocument()
         if not doc:
-            return
+            return False
 
         mc = ManagedColor("RGBA", "U8", "")
         components = mc.components()
@@ -362,6 +440,7 @@ class ColorSelectorDock(DockWidget):
         components[3] = 1.0
         mc.setComponents(components)
         view.setForeGroundColor(mc)
+        return True
 
     def _swapColors(self):
         app = Krita.instance()
@@ -370,6 +449,8 @@ class ColorSelectorDock(DockWidget):
         view = app.activeWindow().activeView()
         if not view:
             return
+        # A coalesced pick must reach Krita first or the swap would drop it.
+        self._fg_writer.flush()
         mc_fg = view.foregroundColor()
         mc_bg = view.backgroundColor()
         if not mc_fg or not mc_bg:
@@ -395,21 +476,23 @@ class ColorSelectorDock(DockWidget):
             QColor(self._r, self._g, self._b),
             QColor(self._bg_r, self._bg_g, self._bg_b),
         )
+        # Let the shared color state (and the other color widgets) see the swap.
+        self._color_state.refresh()
 
     def showEvent(self, event):
         super().showEvent(event)
-        # Guarded: Qt can deliver a show event before __init__ has built the timers.
-        if getattr(self, "_poll_timer", None) is not None:
-            self._pollKritaColor()
-            self._poll_timer.start()
+        # Guarded: Qt can deliver a show event before __init__ has registered.
+        if getattr(self, "_color_state", None) is not None:
+            self._poll_hold_until = 0.0
+            self._applyColorState(self._color_state.refresh())
+            self._color_state.set_active(self, True)
 
     def hideEvent(self, event):
         """Stop polling Krita's colour while the docker is collapsed or tabbed away."""
         super().hideEvent(event)
-        if getattr(self, "_poll_timer", None) is not None:
-            self._poll_timer.stop()
-        if getattr(self, "_debounce_timer", None) is not None:
-            self._debounce_timer.stop()
+        if getattr(self, "_color_state", None) is not None:
+            self._color_state.set_active(self, False)
+            self._fg_writer.flush()
 
     def canvasChanged(self, canvas):
         pass
@@ -424,4 +507,7 @@ class ColorSelectorDockFactory(DockWidgetFactoryBase):
         super().__init__(DOCKER_ID, dock_pos)
 
     def createDockWidget(self):
-        return ColorSelectorDock()
+        with startup_profiler.phase("createDockWidget: HueSVC"):
+            dock = ColorSelectorDock()
+        startup_profiler.watch_first_paint(dock, "HueSVC")
+        return dock
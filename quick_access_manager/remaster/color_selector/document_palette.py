@@ -0,0 +1,223 @@
+"""Extracts the dominant colors of the active layer or image for HueSVC.
+
+Krita's pixel API is only safe on the UI thread, so the sampled tiles (see
+`shared.palette_extract.tile_rects`) are read there, a few per event-loop
+turn; decoding and clustering then run on a worker thread. A new request,
+`cancel()`, or switching document or layer while a job runs (noticed by a
+poll-scheduler consumer that is active only during a job) abandons it.
+
+Results are cached per layer (or image) and per content: the sampled bytes'
+checksum stands in for a revision, since Krita exposes none, so asking
+again for an unchanged canvas skips the clustering.
+"""
+
+import threading
+from collections import OrderedDict
+
+from krita import Krita  # type: ignore
+
+from ..compat import QObject, QTimer, pyqtSignal
+from ..quick_adjust.poll_scheduler import get_poll_scheduler
+from ..shared import palette_extract
+
+LAYER_SOURCE = "layer"
+IMAGE_SOURCE = "image"
+
+# Tiles read per event-loop turn; each is one pixelData() call.
+TILES_PER_BATCH = 8
+CACHE_SIZE = 16
+
+
+class _Job:
+    """One extraction: what to read, what was read so far, how to stop it."""
+
+    def __init__(self, generation, source, document, node, target, rects, depth):
+        self.generation = generation
+        self.source = source
+        self.document = document
+        self.target = target
+        self.node_id = _node_id(node)
+        self.rects = rects
+        self.depth = depth
+        self.chunks = []
+        self.cancel_event = threading.Event()
+        self.key = None
+
+
+def _node_id(node):
+    try:
+        return str(node.uniqueId())
+    except Exception:
+        return str(id(node))
+
+
+class DocumentPaletteExtractor(QObject):
+    """Emits `paletteReady([(rgb, share), ...])` for `extract(source)`."""
+
+    paletteReady = pyqtSignal(object)
+    extractionFailed = pyqtSignal(str)
+    busyChanged = pyqtSignal(bool)
+    _workerFinished = pyqtSignal(int, object)
+
+    def __init__(
+        self,
+        parent=None,
+        count=palette_extract.DEFAULT_COLOR_COUNT,
+        pixel_budget=palette_extract.DEFAULT_PIXEL_BUDGET,
+        scheduler=None,
+    ):
+        super().__init__(parent)
+        self._count = count
+        self._pixel_budget = pixel_budget
+        self._cache = OrderedDict()
+        self._generation = 0
+        self._job = None
+        self._read_timer = QTimer(self)
+        self._read_timer.setSingleShot(True)
+        self._read_timer.setInterval(0)
+        self._read_timer.timeout.connect(self._read_batch)
+        self._workerFinished.connect(self._on_worker_finished)
+        self._scheduler = scheduler if scheduler is not None else get_poll_scheduler()
+        self._scheduler.register(self, self._on_poll, groups=())
+
+    @property
+    def busy(self):
+        return self._job is not None
+
+    def extract(self, source=LAYER_SOURCE):
+        """Start extracting from the active layer or the whole image."""
+        self.cancel()
+        app = Krita.instance()
+        document = app.activeDocument()
+        if document is None:
+            self.extractionFailed.emit("No document is open")
+            return
+        node = document.activeNode()
+        try:
+            if source == IMAGE_SOURCE:
+                target = document
+                rect = (0, 0, document.width(), document.height())
+            else:
+                if node is None:
+                    self.extractionFailed.emit("No active layer")
+                    return
+                target = node
+                bounds = node.bounds()
+                rect = (bounds.x(), bounds.y(), bounds.width(), bounds.height())
+            model, depth = target.colorModel(), target.colorDepth()
+        except Exception as e:
+            print(f"Error reading document palette source: {e}")
+            self.extractionFailed.emit("Could not read the canvas")
+            return
+        if model != "RGBA" or depth not in palette_extract.DEPTH_FORMATS:
+            self.extractionFailed.emit("Palette extraction needs an RGB image")
+            return
+        rects = palette_extract.tile_rects(*rect, budget=self._pixel_budget)
+        if not rects:
+            self.extractionFailed.emit("The layer is empty")
+            return
+
+        self._generation += 1
+        self._job = _Job(self._generation, source, document, node, target, rects, depth)
+        self._scheduler.set_active(self, True)
+        self.busyChanged.emit(True)
+        self._read_timer.start()
+
+    def cancel(self):
+        """Abandon the running job, if any; its result is never emitted."""
+        job = self._job
+        if job is None:
+            return
+        job.cancel_event.set()
+        self._job = None
+        self._read_timer.stop()
+        self._scheduler.set_active(self, False)
+        self.busyChanged.emit(False)
+
+    # ------------------------------------------------------------------
+    # UI thread: tile reads
+    # ------------------------------------------------------------------
+    def _read_batch(self):
+        job = self._job
+        if job is None:
+            return
+        try:
+            start = len(job.chunks)
+            for x, y, w, h in job.rects[start : start + TILES_PER_BATCH]:
+                job.chunks.append(bytes(job.target.pixelData(x, y, w, h)))
+        except Exception as e:
+            print(f"Error reading canvas pixels: {e}")
+            self.cancel()
+            self.extractionFailed.emit("Could not read the canvas")
+            return
+        if len(job.chunks) < len(job.rects):
+            self._read_timer.start()
+            return
+
+        job.key = (
+            job.source,
+            job.node_id if job.source == LAYER_SOURCE else _node_id(job.document.rootNode()),
+            job.depth,
+            self._count,
+            palette_extract.fingerprint(job.chunks),
+        )
+        cached = self._cache.get(job.key)
+        if cached is not None:
+            self._cache.move_to_end(job.key)
+            self._finish(cached)
+            return
+        worker = threading.Thread(
+            target=self._run,
+            args=(job.generation, job.chunks, job.depth, job.cancel_event),
+            daemon=True,
+        )
+        worker.start()
+
+    def _on_poll(self, snapshot):
+        job = self._job
+        if job is None:
+            return False
+        document = snapshot.document
+        node = document.activeNode() if document is not None else None
+        if document is None or document != job.document or _node_id(node) != job.node_id:
+            self.cancel()
+            return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Worker thread: decode and cluster
+    # ------------------------------------------------------------------
+    def _run(self, generation, chunks, depth, cancel_event):
+        try:
+            pixels = palette_extract.decode_pixels(chunks, depth)
+            colors = palette_extract.dominant_colors(
+                pixels, self._count, should_cancel=cancel_event.is_set
+            )
+        except Exception as e:
+            print(f"Error extracting document palette: {e}")
+            colors = None
+        if cancel_event.is_set():
+            return
+        try:
+            self._workerFinished.emit(generation, colors)
+        except RuntimeError:
+            pass  # the extractor was deleted while we worked
+
+    def _on_worker_finished(self, generation, colors):
+        job = self._job
+        if job is None or job.generation != generation:
+            return
+        if colors is None:
+            self.cancel()
+            self.extractionFailed.emit("Palette extraction failed")
+            return
+        self._cache[job.key] = colors
+        if len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+        self._finish(colors)
+
+    def _finish(self, colors):
+        self._job = None
+        self._scheduler.set_active(self, False)
+        self.busyChanged.emit(False)
+        self.paletteReady.emit(colors)
@@ -5,6 +5,9 @@ the brush/layer controls panel (BrushLayerControlsWidget/BrushToggleWidget) is
 always shown on the right side rather than being gated by a config toggle.
 """
 
+import math
+import time
+
 from krita import Krita, ManagedColor  # type: ignore
 
 from ..compat import (
@@ -23,8 +26,11 @@ from ..compat import (
     QVBoxLayout,
 )
 from ..infrastructure import PaletteRepository
+from ..quick_adjust.color_state import get_color_state
+from ..quick_adjust.poll_scheduler import get_poll_scheduler
 from ..quick_adjust.popup_controls_widget import BrushLayerControlsWidget
 from ..quick_adjust.widgets import BrushToggleWidget
+from ..quick_adjust.write_throttle import ThrottledWriter, frame_interval_ms
 from .docker import DEFAULT_HUESVC_SETTINGS, ChannelBar, FgBgColorWidget, HueBar, SVBox
 
 
@@ -142,9 +148,9 @@ class HueSvcPopup(QFrame):
                         and self._settings["rgb_display_mode"] == "value"
                         else val
                     ),
-                    debounce=True,
                 )
             )
+            bar.dragFinished.connect(self._flushForeground)
 
         outer_layout.addLayout(channels_layout)
 
@@ -168,15 +174,21 @@ class HueSvcPopup(QFrame):
 
         self.hue_bar.hueChanged.connect(self._onHueBarChanged)
         self.sv_box.colorChanged.connect(self._onSVChanged)
+        self.hue_bar.dragFinished.connect(self._flushForeground)
+        self.sv_box.dragFinished.connect(self._flushForeground)
 
-        self._poll_timer = QTimer(self)
-        self._poll_timer.setInterval(self._settings["poll_interval"])
-        self._poll_timer.timeout.connect(self._pollKritaColor)
+        # One foreground write per display frame while dragging, as in the docker.
+        self._fg_writer = ThrottledWriter(
+            self._writeForeground, frame_interval_ms(), self
+        )
 
-        self._debounce_timer = QTimer(self)
-        self._debounce_timer.setSingleShot(True)
-        self._debounce_timer.setInterval(150)
-        self._debounce_timer.timeout.connect(self._applyPendingColor)
+        self._poll_hold_until = 0.0
+        self._resync_timer = QTimer(self)
+        self._resync_timer.setSingleShot(True)
+        self._resync_timer.timeout.connect(self._resyncColorState)
+        self._color_state = get_color_state()
+        self._color_state.set_poll_interval(self._settings["poll_interval"])
+        self._color_state.changed.connect(self._onColorState)
 
         self._updateChannelBars()
         self.register_close_shortcuts()
@@ -210,15 +222,16 @@ class HueSvcPopup(QFrame):
         self.show()
         self.raise_()
         self.activateWindow()
-        self._pollKritaColor()
-        self._poll_timer.start()
+        self._poll_hold_until = 0.0
+        self._applyColorState(self._color_state.refresh())
+        self._color_state.set_active(self, True)
         self.controls_widget.start_monitoring()
         self.toggle_widget.refresh_from_current_brush()
 
     def hideEvent(self, event):
         super().hideEvent(event)
-        self._poll_timer.stop()
-        self._debounce_timer.stop()
+        self._color_state.set_active(self, False)
+        self._fg_writer.flush()
         self.controls_widget.stop_monitoring()
 
     def leaveEvent(self, event):
@@ -267,56 +280,86 @@ class HueSvcPopup(QFrame):
         self.sv_box.setSatVal(s, v)
         self._updateChannelBars()
         if push:
-            self._setKritaForeground(color)
-            self._poll_timer.start()
+            self._fg_writer.submit((self._r, self._g, self._b))
 
-    def _applyRGB(self, r, g, b, push=True):
+    def _applyRGB(self, r, g, b, push=True, hsv=None):
         self._r, self._g, self._b = r, g, b
-        color = QColor(r, g, b)
-        h = color.hsvHue()
+        if hsv is None:
+            color = QColor(r, g, b)
+            hsv = (color.hsvHue(), color.hsvSaturation(), color.value())
+        h, self._s, self._v = hsv
         self._h = h if h != -1 else self._h
-        self._s = color.hsvSaturation()
-        self._v = color.value()
 
         self.hue_bar.setHue(self._h)
         self.sv_box.setHue(self._h)
         self.sv_box.setSatVal(self._s, self._v)
         self._updateChannelBars()
         if push:
-            self._setKritaForeground(color)
-            self._poll_timer.start()
+            self._fg_writer.submit((self._r, self._g, self._b))
 
-    def _pollKritaColor(self):
-        app = Krita.instance()
-        if not app.activeWindow():
+    def _holdPoll(self):
+        """Skip polls for one poll_interval after writing a color to Krita."""
+        self._poll_hold_until = (
+            time.monotonic() + self._settings["poll_interval"] / 1000.0
+        )
+        get_poll_scheduler().notify_activity()
+
+    def _writeForeground(self, rgb):
+        if not self._setKritaForeground(QColor(*rgb)):
             return
-        view = app.activeWindow().activeView()
-        if not view:
+        self._holdPoll()
+        self._color_state.note_foreground(rgb)
+
+    def _flushForeground(self):
+        self._fg_writer.flush()
+
+    def _colorStateHeld(self):
+        # Krita still has an older pick while one is coalesced.
+        return self._fg_writer.has_pending or time.monotonic() < self._poll_hold_until
+
+    def _onColorState(self, state):
+        if not self.isVisible():
             return
-        canvas = view.canvas()
+        if self._colorStateHeld():
+            # `changed` is not sent again for a state already emitted, so
+            # re-read the shared state once the hold is over.
+            self._scheduleResync()
+            return
+        self._applyColorState(state)
 
-        mc = view.foregroundColor()
-        if mc:
-            qcolor = mc.colorForCanvas(canvas)
-            if qcolor and qcolor.isValid():
-                r, g, b = qcolor.red(), qcolor.green(), qcolor.blue()
-                if (r, g, b) != (self._r, self._g, self._b):
-                    color = QColor(r, g, b)
-                    h = color.hsvHue() if color.hsvHue() != -1 else self._h
-                    s, v = color.hsvSaturation(), color.value()
-                    self._applyHSV(h, s, v, push=False)
+    def _scheduleResync(self):
+        remaining_ms = math.ceil((self._poll_hold_until - time.monotonic()) * 1000)
+        if self._fg_writer.has_pending:
+            remaining_ms = max(remaining_ms, frame_interval_ms())
+        self._resync_timer.start(max(0, remaining_ms))
 
-        mc_bg = view.backgroundColor()
-        if mc_bg:
-            qcolor_bg = mc_bg.colorForCanvas(canvas)
-            if qcolor_bg and qcolor_bg.isValid():
-                r, g, b = qcolor_bg.red(), qcolor_bg.green(), qcolor_bg.blue()
-                if (r, g, b) != (self._bg_r, self._bg_g, self._bg_b):
-                    self._bg_r, self._bg_g, self._bg_b = r, g, b
-                    self.fg_bg_widget.setColors(
-                        QColor(self._r, self._g, self._b),
-                        QColor(self._bg_r, self._bg_g, self._bg_b),
-                    )
+    def _resyncColorState(self):
+        if not self.isVisible():
+            return
+        if self._colorStateHeld():
+            self._scheduleResync()
+            return
+        self._applyColorState(self._color_state.state)
+
+    def _applyColorState(self, state):
+        """Mirror Krita's fg/bg color from the shared color state."""
+        if state.foreground is not None and state.foreground != (
+            self._r,
+            self._g,
+            self._b,
+        ):
+            self._applyRGB(*state.foreground, push=False, hsv=state.foreground_hsv)
+
+        if state.background is not None and state.background != (
+            self._bg_r,
+            self._bg_g,
+            self._bg_b,
+        ):
+            self._bg_r, self._bg_g, self._bg_b = state.background
+            self.fg_bg_widget.setColors(
+                QColor(self._r, self._g, self._b),
+                QColor(self._bg_r, self._bg_g, self._bg_b),
+            )
 
     # ------------------------------------------------------------------
     # Signal handlers
@@ -328,7 +371,7 @@ class HueSvcPopup(QFrame):
         h = qcolor.hsvHue() if qcolor.hsvHue() != -1 else self._h
         self._applyHSV(h, qcolor.hsvSaturation(), qcolor.value())
 
-    def _onChannelChanged(self, channel, value, debounce=False):
+    def _onChannelChanged(self, channel, value):
         h, s, v = self._h, self._s, self._v
         r, g, b = self._r, self._g, self._b
         use_rgb = False
@@ -353,22 +396,10 @@ class HueSvcPopup(QFrame):
             b = value if rgb_mode == "value" else i(value)
             use_rgb = True
 
-        if debounce:
-            self._poll_timer.stop()
-            if use_rgb:
-                self._applyRGB(r, g, b, push=False)
-            else:
-                self._applyHSV(h, s, v, push=False)
-            self._debounce_timer.start()
+        if use_rgb:
+            self._applyRGB(r, g, b)
         else:
-            if use_rgb:
-                self._applyRGB(r, g, b)
-            else:
-                self._applyHSV(h, s, v)
-
-    def _applyPendingColor(self):
-        self._setKritaForeground(QColor(self._r, self._g, self._b))
-        self._poll_timer.start()
+            self._applyHSV(h, s, v)
 
     def _stepChannel(self, ch, delta):
         if ch == "H":
@@ -406,6 +437,8 @@ class HueSvcPopup(QFrame):
         view = app.activeWindow().activeView()
         if not view:
             return
+        # A coalesced pick must reach Krita first or the swap would drop it.
+        self._fg_writer.flush()
         mc_fg = view.foregroundColor()
         mc_bg = view.backgroundColor()
         if not mc_fg or not mc_bg:
@@ -431,15 +464,18 @@ class HueSvcPopup(QFrame):
             QColor(self._r, self._g, self._b),
             QColor(self._bg_r, self._bg_g, self._bg_b),
         )
+        # Let the shared color state (and the other color widgets) see the swap.
+        self._color_state.refresh()
 
     def _setKritaForeground(self, qcolor):
+        """Set Krita's foreground; False if there is no view or document."""
         app = Krita.instance()
         view = app.activeWindow().activeView() if app.activeWindow() else None
         if not view:
-            return
+            return False
         doc = app.activeDocument()
         if not doc:
-            return
+            return False
         mc = ManagedColor("RGBA", "U8", "")
         components = mc.components()
         components[0] = qcolor.blueF()
@@ -448,3 +484,4 @@ class HueSvcPopup(QFrame):
         components[3] = 1.0
         mc.setComponents(components)
         view.setForeGroundColor(mc)
+        return True
@@ -4,6 +4,7 @@ that embed them."""
 from .channel_bar import ChannelBar
 from .fg_bg_color_widget import FgBgColorWidget
 from .hue_bar import HueBar
+from .palette_swatches import PaletteSwatches
 from .sv_box import SVBox
 
-__all__ = ["HueBar", "SVBox", "ChannelBar", "FgBgColorWidget"]
+__all__ = ["HueBar", "SVBox", "ChannelBar", "FgBgColorWidget", "PaletteSwatches"]
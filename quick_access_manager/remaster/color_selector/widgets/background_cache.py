@@ -0,0 +1,47 @@
+"""Cached gradient backgrounds for the HueSVC picker widgets.
+
+The SV box, hue bar and channel bars paint a gradient that depends only on
+their size and a few color inputs, under a marker that moves with every
+drag step. `BackgroundCache` keeps the gradient as a QPixmap keyed by
+(size, device pixel ratio, inputs), so a marker move repaints the marker
+over the cached image instead of rebuilding the gradient.
+
+The gradients themselves come from `shared.color_math`, which computes the
+whole image in one call at device-pixel size; this module only wraps the
+RGB888 data in a QImage and converts it to a pixmap.
+"""
+
+from ...compat import QImage, QPixmap
+from ...shared import color_math
+
+
+class BackgroundCache:
+    """One cached background pixmap, rebuilt when its key changes."""
+
+    def __init__(self, render):
+        # render(width_px, height_px, *inputs) returns color_math image data.
+        self._render = render
+        self._key = None
+        self._pixmap = None
+        self.builds = 0
+
+    def pixmap(self, widget, *inputs):
+        w, h = widget.width(), widget.height()
+        ratio = widget.devicePixelRatioF()
+        key = (w, h, ratio) + inputs
+        if key != self._key:
+            width_px = max(1, round(w * ratio))
+            height_px = max(1, round(h * ratio))
+            data = color_math.to_rgb888(self._render(width_px, height_px, *inputs))
+            image = QImage(data, width_px, height_px, 3 * width_px, QImage.Format_RGB888)
+            # fromImage copies, so `data` may be released afterwards.
+            pixmap = QPixmap.fromImage(image.convertToFormat(QImage.Format_RGB32))
+            pixmap.setDevicePixelRatio(ratio)
+            self._pixmap = pixmap
+            self._key = key
+            self.builds += 1
+        return self._pixmap
+
+    def invalidate(self):
+        self._key = None
+        self._pixmap = None
@@ -1,10 +1,23 @@
-from ...compat import QColor, QLinearGradient, QPainter, Qt, QWidget, pyqtSignal
+from ...compat import QPainter, QRect, Qt, QWidget, pyqtSignal
+from ...shared import color_math
+from .background_cache import BackgroundCache
+
+
+def _q(x):
+    return round(x * 255 / 100)
+
+
+def _render_channel_background(w, h, channel, a, b):
+    """Gradient for `channel`; `a`, `b` are the two other channels it depends
+    on (see `color_math.channel_strip`)."""
+    return color_math.rows_of(color_math.channel_strip(channel, w, a, b), h)
 
 
 class ChannelBar(QWidget):
     """Horizontal gradient bar for a single color channel (H/S/V/R/G/B)."""
 
     valueChanged = pyqtSignal(int)
+    dragFinished = pyqtSignal()
 
     def __init__(self, channel, parent=None):
         super().__init__(parent)
@@ -17,13 +30,31 @@ class ChannelBar(QWidget):
         self._b = 0
         self._value = 0
         self._pressed = False
+        self._background = BackgroundCache(_render_channel_background)
         self.setFixedHeight(16)
         self.setMinimumWidth(80)
 
     def _max_value(self):
         return 359 if self._channel == "H" else 100
 
+    def _gradientInputs(self):
+        """The two channels this bar's gradient depends on."""
+        ch = self._channel
+        if ch == "H":
+            return _q(self._s), _q(self._v)
+        if ch == "S":
+            return self._h, _q(self._v)
+        if ch == "V":
+            return self._h, _q(self._s)
+        if ch == "R":
+            return _q(self._g), _q(self._b)
+        if ch == "G":
+            return _q(self._r), _q(self._b)
+        return _q(self._r), _q(self._g)
+
     def setColor(self, h, s, v, r, g, b):
+        inputs = self._gradientInputs()
+        old_value = self._value
         self._h, self._s, self._v = h, s, v
         self._r, self._g, self._b = r, g, b
         ch = self._channel
@@ -39,44 +70,35 @@ class ChannelBar(QWidget):
             self._value = g
         elif ch == "B":
             self._value = b
-        self.update()
+        # Only bars whose gradient inputs changed repaint in full; the one
+        # being dragged (or unaffected) just moves its marker.
+        if self._gradientInputs() != inputs:
+            self.update()
+        elif self._value != old_value:
+            self._moveMarker(old_value)
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        w, h = self.width(), self.height()
+    def _markerX(self, value=None):
+        max_val = self._max_value()
+        if value is None:
+            value = self._value
+        return int((value / max_val) * (self.width() - 1)) if max_val > 0 else 0
 
-        def q(x):
-            return round(x * 255 / 100)
+    def _markerRect(self, value=None):
+        return QRect(self._markerX(value) - 3, 0, 7, self.height())
 
-        s255, v255 = q(self._s), q(self._v)
-        r255, g255, b255 = q(self._r), q(self._g), q(self._b)
+    def _moveMarker(self, old_value):
+        self.update(self._markerRect(old_value).united(self._markerRect()))
 
-        grad = QLinearGradient(0, 0, w, 0)
-        ch = self._channel
-        if ch == "H":
-            for i in range(7):
-                grad.setColorAt(
-                    i / 6, QColor.fromHsv(int(i * 360 / 6) % 360, s255, v255)
-                )
-        elif ch == "S":
-            grad.setColorAt(0, QColor.fromHsv(self._h, 0, v255))
-            grad.setColorAt(1, QColor.fromHsv(self._h, 255, v255))
-        elif ch == "V":
-            grad.setColorAt(0, QColor.fromHsv(self._h, s255, 0))
-            grad.setColorAt(1, QColor.fromHsv(self._h, s255, 255))
-        elif ch == "R":
-            grad.setColorAt(0, QColor(0, g255, b255))
-            grad.setColorAt(1, QColor(255, g255, b255))
-        elif ch == "G":
-            grad.setColorAt(0, QColor(r255, 0, b255))
-            grad.setColorAt(1, QColor(r255, 255, b255))
-        elif ch == "B":
-            grad.setColorAt(0, QColor(r255, g255, 0))
-            grad.setColorAt(1, QColor(r255, g255, 255))
-        painter.fillRect(0, 0, w, h, grad)
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        h = self.height()
+        painter.drawPixmap(
+            0,
+            0,
+            self._background.pixmap(self, self._channel, *self._gradientInputs()),
+        )
 
-        max_val = self._max_value()
-        marker_x = int((self._value / max_val) * (w - 1)) if max_val > 0 else 0
+        marker_x = self._markerX()
         painter.setPen(Qt.white)
         painter.drawRect(marker_x - 2, 0, 4, h - 1)
         painter.setPen(Qt.black)
@@ -87,8 +109,9 @@ class ChannelBar(QWidget):
         w = self.width()
         x = max(0, min(pos.x(), w - 1))
         max_val = self._max_value()
+        old_value = self._value
         self._value = int((x / (w - 1)) * max_val) if w > 1 else 0
-        self.update()
+        self._moveMarker(old_value)
         self.valueChanged.emit(self._value)
 
     def mousePressEvent(self, event):
@@ -101,4 +124,6 @@ class ChannelBar(QWidget):
             self._pick(event.pos())
 
     def mouseReleaseEvent(self, event):
-        self._pressed = False
+        if self._pressed:
+            self._pressed = False
+            self.dragFinished.emit()
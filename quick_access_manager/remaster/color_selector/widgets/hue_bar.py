@@ -1,10 +1,17 @@
-from ...compat import QColor, QLinearGradient, QPainter, Qt, QWidget, pyqtSignal
+from ...compat import QPainter, QRect, Qt, QWidget, pyqtSignal
+from ...shared import color_math
+from .background_cache import BackgroundCache
+
+
+def _render_hue_background(w, h):
+    return color_math.columns_of(color_math.hue_strip(h), w)
 
 
 class HueBar(QWidget):
     """Vertical hue bar - full spectrum top to bottom."""
 
     hueChanged = pyqtSignal(int)
+    dragFinished = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -12,24 +19,34 @@ class HueBar(QWidget):
         self.setMinimumHeight(100)
         self._hue = 0
         self._pressed = False
+        self._background = BackgroundCache(_render_hue_background)
 
     def hue(self):
         return self._hue
 
     def setHue(self, h):
-        self._hue = max(0, min(359, h))
-        self.update()
+        hue = max(0, min(359, h))
+        if hue == self._hue:
+            return
+        self._moveMarker(hue)
+
+    def _markerY(self):
+        return int((self._hue / 360.0) * self.height())
+
+    def _markerRect(self):
+        return QRect(0, self._markerY() - 3, self.width(), 7)
+
+    def _moveMarker(self, hue):
+        old = self._markerRect()
+        self._hue = hue
+        self.update(old.united(self._markerRect()))
 
     def paintEvent(self, event):
         painter = QPainter(self)
-        w, h = self.width(), self.height()
-
-        grad = QLinearGradient(0, 0, 0, h)
-        for i in range(7):
-            grad.setColorAt(i / 6, QColor.fromHsv(int(i * 360 / 6) % 360, 255, 255))
-        painter.fillRect(0, 0, w, h, grad)
+        w = self.width()
+        painter.drawPixmap(0, 0, self._background.pixmap(self))
 
-        marker_y = int((self._hue / 360.0) * h)
+        marker_y = self._markerY()
         painter.setPen(Qt.white)
         painter.drawRect(0, marker_y - 2, w - 1, 4)
         painter.setPen(Qt.black)
@@ -39,8 +56,7 @@ class HueBar(QWidget):
     def _pick(self, pos):
         h = self.height()
         y = max(0, min(pos.y(), h - 1))
-        self._hue = int((y / h) * 360) % 360
-        self.update()
+        self._moveMarker(int((y / h) * 360) % 360)
         self.hueChanged.emit(self._hue)
 
     def mousePressEvent(self, event):
@@ -53,4 +69,6 @@ class HueBar(QWidget):
             self._pick(event.pos())
 
     def mouseReleaseEvent(self, event):
-        self._pressed = False
+        if self._pressed:
+            self._pressed = False
+            self.dragFinished.emit()
@@ -0,0 +1,68 @@
+from ...compat import QColor, QPainter, Qt, QWidget, pyqtSignal
+
+
+class PaletteSwatches(QWidget):
+    """A row of color swatches, widest for the most common color. Click to pick."""
+
+    colorClicked = pyqtSignal(int, int, int)
+
+    _HEIGHT = 18
+    # Narrowest a swatch gets, however rare its color.
+    _MIN_SWATCH = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._colors = []
+        self.setFixedHeight(self._HEIGHT)
+        self.setCursor(Qt.PointingHandCursor)
+
+    def colors(self):
+        return list(self._colors)
+
+    def setColors(self, colors):
+        """Show `[(rgb, share), ...]`; shares set the relative swatch widths."""
+        colors = [(tuple(rgb), share) for rgb, share in colors]
+        if colors == self._colors:
+            return
+        self._colors = colors
+        self.setToolTip(
+            "\n".join(f"RGB{rgb}  {share:.0%}" for rgb, share in colors)
+            if colors
+            else ""
+        )
+        self.update()
+
+    def _spans(self):
+        """(x, width, rgb) per swatch, filling the widget's width."""
+        if not self._colors:
+            return []
+        width = self.width()
+        floor = min(self._MIN_SWATCH, width // len(self._colors))
+        spare = width - floor * len(self._colors)
+        total = sum(share for _, share in self._colors) or 1.0
+        spans, x = [], 0
+        for i, (rgb, share) in enumerate(self._colors):
+            if i == len(self._colors) - 1:
+                w = width - x
+            else:
+                w = floor + int(spare * share / total)
+            spans.append((x, w, rgb))
+            x += w
+        return spans
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        for x, w, rgb in self._spans():
+            painter.fillRect(x, 0, w, self.height(), QColor(*rgb))
+        painter.setPen(Qt.black)
+        painter.drawRect(0, 0, self.width() - 1, self.height() - 1)
+        painter.end()
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            return
+        x = event.pos().x()
+        for left, w, rgb in self._spans():
+            if left <= x < left + w:
+                self.colorClicked.emit(*rgb)
+                return
@@ -1,10 +1,20 @@
-from ...compat import QColor, QLinearGradient, QPainter, QPoint, Qt, QWidget, pyqtSignal
+from ...compat import QColor, QPainter, QPoint, QRect, Qt, QWidget, pyqtSignal
+from ...shared import color_math
+from .background_cache import BackgroundCache
+
+# Outer marker ring radius, plus a pixel of antialiasing.
+MARKER_EXTENT = 8
+
+
+def _render_sv_background(w, h, hue):
+    return color_math.sv_plane(hue, w, h)
 
 
 class SVBox(QWidget):
     """Saturation (x-axis) / Value (y-axis) picker box."""
 
     colorChanged = pyqtSignal(QColor)
+    dragFinished = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -13,6 +23,7 @@ class SVBox(QWidget):
         self._sat = 255
         self._val = 255
         self._pressed = False
+        self._background = BackgroundCache(_render_sv_background)
 
     def setHue(self, h):
         if h == self._hue:
@@ -21,26 +32,37 @@ class SVBox(QWidget):
         self.update()
 
     def setSatVal(self, s, v):
+        if (s, v) == (self._sat, self._val):
+            return
+        self._moveMarker(s, v)
+
+    def _markerCenter(self):
+        w, h = self.width(), self.height()
+        cx = int((self._sat / 255.0) * (w - 1))
+        cy = int(((255 - self._val) / 255.0) * (h - 1))
+        return cx, cy
+
+    def _markerRect(self):
+        cx, cy = self._markerCenter()
+        return QRect(
+            cx - MARKER_EXTENT,
+            cy - MARKER_EXTENT,
+            2 * MARKER_EXTENT + 1,
+            2 * MARKER_EXTENT + 1,
+        )
+
+    def _moveMarker(self, s, v):
+        # Repaint only where the marker was and where it is now.
+        old = self._markerRect()
         self._sat = s
         self._val = v
-        self.update()
+        self.update(old.united(self._markerRect()))
 
     def paintEvent(self, event):
         painter = QPainter(self)
-        w, h = self.width(), self.height()
-
-        grad_s = QLinearGradient(0, 0, w, 0)
-        grad_s.setColorAt(0, Qt.white)
-        grad_s.setColorAt(1, QColor.fromHsv(self._hue, 255, 255))
-        painter.fillRect(0, 0, w, h, grad_s)
+        painter.drawPixmap(0, 0, self._background.pixmap(self, self._hue))
 
-        grad_v = QLinearGradient(0, 0, 0, h)
-        grad_v.setColorAt(0, QColor(0, 0, 0, 0))
-        grad_v.setColorAt(1, QColor(0, 0, 0, 255))
-        painter.fillRect(0, 0, w, h, grad_v)
-
-        cx = int((self._sat / 255.0) * (w - 1))
-        cy = int(((255 - self._val) / 255.0) * (h - 1))
+        cx, cy = self._markerCenter()
         for color, radius in [(Qt.black, 6), (Qt.white, 5)]:
             painter.setPen(color)
             painter.setBrush(Qt.NoBrush)
@@ -52,9 +74,9 @@ class SVBox(QWidget):
         w, h = self.width(), self.height()
         x = max(0, min(pos.x(), w - 1))
         y = max(0, min(pos.y(), h - 1))
-        self._sat = int((x / (w - 1)) * 255) if w > 1 else 255
-        self._val = 255 - (int((y / (h - 1)) * 255) if h > 1 else 0)
-        self.update()
+        sat = int((x / (w - 1)) * 255) if w > 1 else 255
+        val = 255 - (int((y / (h - 1)) * 255) if h > 1 else 0)
+        self._moveMarker(sat, val)
         self.colorChanged.emit(QColor.fromHsv(self._hue, self._sat, self._val))
 
     def mousePressEvent(self, event):
@@ -67,4 +89,6 @@ class SVBox(QWidget):
             self._pick(event.pos())
 
     def mouseReleaseEvent(self, event):
-        self._pressed = False
+        if self._pressed:
+            self._pressed = False
+            self.dragFinished.emit()
@@ -8,14 +8,18 @@ Qt.AlignmentFlag.AlignLeft), so the rest of the codebase can remain unchanged.
 
 try:
     from PyQt5.QtCore import (
+        QAbstractListModel,
         QEvent,
+        QEventLoop,
         QMimeData,
+        QModelIndex,
         QObject,
         QPoint,
         QPointF,
         QRect,
         QRectF,
         QSize,
+        QSortFilterProxyModel,
         Qt,
         QTimer,
         pyqtSignal,
@@ -28,14 +32,17 @@ try:
         QFont,
         QFontMetrics,
         QIcon,
+        QImage,
         QIntValidator,
         QKeyEvent,
         QKeySequence,
         QLinearGradient,
+        QMouseEvent,
         QPainter,
         QPalette,
         QPen,
         QPixmap,
+        QPixmapCache,
     )
     from PyQt5.QtWidgets import (
         QAbstractItemView,
@@ -58,6 +65,7 @@ try:
         QKeySequenceEdit,
         QLabel,
         QLineEdit,
+        QListView,
         QListWidget,
         QListWidgetItem,
         QMdiArea,
@@ -83,14 +91,18 @@ try:
 
 except ImportError:
     from PyQt6.QtCore import (  # noqa: F401
+        QAbstractListModel,
         QEvent,
+        QEventLoop,
         QMimeData,
+        QModelIndex,
         QObject,
         QPoint,
         QPointF,
         QRect,
         QRectF,
         QSize,
+        QSortFilterProxyModel,
         Qt,
         QTimer,
         pyqtSignal,
@@ -104,6 +116,7 @@ except ImportError:
         QFont,
         QFontMetrics,
         QIcon,
+        QImage,
         QIntValidator,
         QKeyEvent,
         QKeySequence,
@@ -113,6 +126,7 @@ except ImportError:
         QPalette,
         QPen,
         QPixmap,
+        QPixmapCache,
         QShortcut,
     )
     from PyQt6.QtWidgets import (  # noqa: F401
@@ -135,6 +149,7 @@ except ImportError:
         QKeySequenceEdit,
         QLabel,
         QLineEdit,
+        QListView,
         QListWidget,
         QListWidgetItem,
         QMdiArea,
@@ -266,6 +281,10 @@ except ImportError:
     Qt.DisplayRole = Qt.ItemDataRole.DisplayRole
     Qt.UserRole = Qt.ItemDataRole.UserRole
     Qt.DecorationRole = Qt.ItemDataRole.DecorationRole
+    Qt.ToolTipRole = Qt.ItemDataRole.ToolTipRole
+
+    # Case sensitivity
+    Qt.CaseInsensitive = Qt.CaseSensitivity.CaseInsensitive
 
     # Sort order
     Qt.AscendingOrder = Qt.SortOrder.AscendingOrder
@@ -371,6 +390,7 @@ except ImportError:
     QAbstractItemView.ExtendedSelection = (
         QAbstractItemView.SelectionMode.ExtendedSelection
     )
+    QAbstractItemView.NoEditTriggers = QAbstractItemView.EditTrigger.NoEditTriggers
 
     # QListWidget inherits these from QListView; the nested enum classes carry
     # over through the MRO so no separate QListView import is needed here.
@@ -378,6 +398,9 @@ except ImportError:
     QListWidget.ListMode = QListWidget.ViewMode.ListMode
     QListWidget.Adjust = QListWidget.ResizeMode.Adjust
     QListWidget.Static = QListWidget.Movement.Static
+    QListView.IconMode = QListView.ViewMode.IconMode
+    QListView.Adjust = QListView.ResizeMode.Adjust
+    QListView.Static = QListView.Movement.Static
 
     QDialog.Accepted = QDialog.DialogCode.Accepted
     QDialog.Rejected = QDialog.DialogCode.Rejected
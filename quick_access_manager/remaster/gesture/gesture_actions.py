@@ -9,6 +9,7 @@ These functions handle executing different types of gestures:
 from krita import Krita  # type: ignore
 
 from ..infrastructure import ActionManager
+from ..shared import metrics
 
 
 def select_brush_preset_and_close(preset):
@@ -85,6 +86,7 @@ def toggle_docker_by_name(docker_name):
     return toggle_docker_by_keywords([docker_name], f"Docker: {docker_name}")
 
 
+@metrics.timed(metrics.histogram("gesture.dispatch"))
 def execute_gesture(gesture_config):
     """Execute a gesture based on its configuration.
 
@@ -94,7 +94,9 @@ class GestureDetector(QObject):
                 if gesture_map:
                     self.gesture_configs[gesture_key] = gesture_map
             except Exception as e:
-                write_log(f"Error loading gesture config {json_file}: {e}")
+                write_log(
+                    f"Error loading gesture config {json_file}: {e}", level="error"
+                )
 
         write_log(f"Total gesture configs loaded: {len(self.gesture_configs)}")
 
@@ -108,7 +110,7 @@ class GestureDetector(QObject):
                     self.threshold = settings.get("minimum_pixels_to_move", 20)
                     self.show_preview = settings.get("show_preview", True)
         except Exception as e:
-            write_log(f"Error loading settings: {e}")
+            write_log(f"Error loading settings: {e}", level="error")
 
     # ------------------------------------------------------------------
     # Event filter installation and handling
@@ -130,7 +132,7 @@ class GestureDetector(QObject):
                 app_notifier.windowCreated.connect(self._on_window_created)
                 self.window_created_connected = True
         except Exception as e:
-            write_log(f"Error installing event filter: {e}")
+            write_log(f"Error installing event filter: {e}", level="error")
 
     def _on_window_created(self):
         try:
@@ -149,7 +151,7 @@ class GestureDetector(QObject):
                     QApplication.instance().installEventFilter(self)
                     self.event_filter_installed = True
         except Exception as e:
-            write_log(f"Error in windowCreated callback: {e}")
+            write_log(f"Error in windowCreated callback: {e}", level="error")
 
     def uninstall_event_filter(self):
         if self.event_filter_installed:
@@ -161,7 +163,7 @@ class GestureDetector(QObject):
                     self.preview_widget.deleteLater()
                     self.preview_widget = None
             except Exception as e:
-                write_log(f"Error uninstalling event filter: {e}")
+                write_log(f"Error uninstalling event filter: {e}", level="error")
 
     def pause_event_filter(self):
         if self.event_filter_installed:
@@ -169,7 +171,7 @@ class GestureDetector(QObject):
                 QApplication.instance().removeEventFilter(self)
                 self.event_filter_installed = False
             except Exception as e:
-                write_log(f"Error pausing event filter: {e}")
+                write_log(f"Error pausing event filter: {e}", level="error")
 
     def resume_event_filter(self):
         if not self.event_filter_installed:
@@ -179,7 +181,7 @@ class GestureDetector(QObject):
                     QApplication.instance().installEventFilter(self)
                     self.event_filter_installed = True
             except Exception as e:
-                write_log(f"Error resuming event filter: {e}")
+                write_log(f"Error resuming event filter: {e}", level="error")
 
     # ------------------------------------------------------------------
     # Gesture detection and execution
@@ -233,7 +235,7 @@ class GestureDetector(QObject):
                     self.update_gesture(event.globalPos())
 
         except Exception as e:
-            write_log(f"Error in eventFilter: {e}")
+            write_log(f"Error in eventFilter: {e}", level="error")
         finally:
             self.event_filter_call_count -= 1
 
@@ -394,7 +396,7 @@ def is_gesture_enabled():
             with open(settings_path, "r", encoding="utf-8") as f:
                 return json.load(f).get("enabled", True)
     except Exception as e:
-        write_log(f"Error reading gesture settings: {e}")
+        write_log(f"Error reading gesture settings: {e}", level="error")
     return True
 
 
@@ -407,14 +409,14 @@ def set_gesture_enabled(enabled):
             with open(settings_path, "r", encoding="utf-8") as f:
                 settings = json.load(f)
     except Exception as e:
-        write_log(f"Error reading gesture settings: {e}")
+        write_log(f"Error reading gesture settings: {e}", level="error")
 
     settings["enabled"] = bool(enabled)
     try:
         with open(settings_path, "w", encoding="utf-8") as f:
             json.dump(settings, f, indent=4)
     except Exception as e:
-        write_log(f"Error saving gesture settings: {e}")
+        write_log(f"Error saving gesture settings: {e}", level="error")
 
     manager = get_gesture_manager()
     if enabled:
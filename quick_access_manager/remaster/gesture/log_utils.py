@@ -1,14 +1,12 @@
-"""Minimal opt-in file logger for the gesture system (no-op unless enable_debug=True)."""
+"""Gesture-system logging through the buffered log writer.
 
-import os
+Off unless the "gesture" subsystem's level allows it (see
+quick_access_manager/log_writer.py) or a caller passes enable_debug=True.
+"""
 
-from ..infrastructure import get_remaster_config_dir
+from ... import log_writer
+from ..infrastructure import get_log_path
 
 
-def write_log(log_msg, enable_debug=False):
-    if not enable_debug:
-        return
-    log_file = os.path.join(get_remaster_config_dir(), "logs", "log.txt")
-    os.makedirs(os.path.dirname(log_file), exist_ok=True)
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(log_msg + "\n")
+def write_log(log_msg, enable_debug=False, level="debug"):
+    log_writer.log("gesture", log_msg, get_log_path, level=level, force=enable_debug)
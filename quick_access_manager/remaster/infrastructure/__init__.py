@@ -15,11 +15,13 @@ except ModuleNotFoundError as exc:
     DockerManager = None
 
 from .alias_repository import AliasRepository
+from .history_repository import HistoryRepository
 from .palette_repository import DEFAULT_COLUMNS, PaletteRepository
 from .paths import (
     get_default_icons_dir,
     get_gesture_data_dir,
     get_gesture_images_dir,
+    get_log_path,
     get_palette_config_path,
     get_palette_settings_path,
     get_quick_adjust_icons_dir,
@@ -32,10 +34,12 @@ __all__ = [
     "ActionManager",
     "AliasRepository",
     "DockerManager",
+    "HistoryRepository",
     "PaletteRepository",
     "get_default_icons_dir",
     "get_gesture_data_dir",
     "get_gesture_images_dir",
+    "get_log_path",
     "get_palette_config_path",
     "get_palette_settings_path",
     "get_quick_adjust_icons_dir",
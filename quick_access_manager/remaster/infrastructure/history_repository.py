@@ -0,0 +1,46 @@
+"""Repository for the Quick Adjust history strips (recent colors, brushes)."""
+
+import os
+
+from .json_cache import read_json, write_json
+from .paths import get_remaster_config_dir
+
+HISTORY_FILE = "quick_adjust_history.json"
+
+
+def get_history_path():
+    return os.path.join(get_remaster_config_dir(), HISTORY_FILE)
+
+
+class HistoryRepository:
+    """Loads/saves each history as a plain list under its own key."""
+
+    def __init__(self, path: str | None = None):
+        # Resolved lazily, like AliasRepository; tests pass an explicit path.
+        self._path = path
+
+    def _resolve_path(self):
+        return self._path or get_history_path()
+
+    def _load_all(self):
+        path = self._resolve_path()
+        if os.path.exists(path):
+            try:
+                data = read_json(path, default={}) or {}
+                if isinstance(data, dict):
+                    return data
+            except Exception:
+                pass
+        return {}
+
+    def load(self, key):
+        entries = self._load_all().get(key, [])
+        return entries if isinstance(entries, list) else []
+
+    def save(self, key, entries):
+        data = self._load_all()
+        data[key] = list(entries)
+        try:
+            write_json(self._resolve_path(), data)
+        except Exception as e:
+            print(f"Error saving {key} history: {e}")
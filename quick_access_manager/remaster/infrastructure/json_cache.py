@@ -10,8 +10,13 @@ import copy
 import json
 import os
 
+from ..shared import metrics
+
 # {path: (mtime_ns, size, parsed_data)}
 _cache = {}
+_hits = metrics.counter("json_cache.hits")
+_misses = metrics.counter("json_cache.misses")
+_writes = metrics.counter("json_cache.writes")
 
 
 def _stamp(path):
@@ -35,7 +40,9 @@ def read_json(path, default=None):
 
     cached = _cache.get(path)
     if cached is not None and cached[0] == stamp:
+        _hits.inc()
         return copy.deepcopy(cached[1])
+    _misses.inc()
 
     try:
         with open(path, "r", encoding="utf-8") as handle:
@@ -50,6 +57,7 @@ def read_json(path, default=None):
 
 def write_json(path, data, indent=2):
     """Write `data` to `path` and refresh the cache entry from what was written."""
+    _writes.inc()
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, "w", encoding="utf-8") as handle:
         json.dump(data, handle, indent=indent, ensure_ascii=False)
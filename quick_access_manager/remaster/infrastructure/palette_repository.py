@@ -54,6 +54,18 @@ class PaletteRepository:
         write_json(self.path, grid_data)
         self._save_settings(document.settings)
 
+    def load_settings(self) -> dict:
+        """Just the saved settings, without parsing or creating the grid data."""
+        settings = self._load_settings()
+        if settings or not os.path.exists(self.path):
+            return settings
+        # Not yet migrated out of the old combined file (load() does that).
+        try:
+            legacy = read_json(self.path, default={}).get("settings")
+        except Exception:
+            return {}
+        return legacy if isinstance(legacy, dict) else {}
+
     def _load_settings(self) -> dict:
         try:
             return read_json(self.settings_path, default={}) or {}
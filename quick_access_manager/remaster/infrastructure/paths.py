@@ -27,6 +27,11 @@ def get_remaster_config_dir():
     return config_dir
 
 
+def get_log_path():
+    """The remaster's log file; its folder is created by the first write."""
+    return os.path.join(get_remaster_config_dir(), "logs", "log.txt")
+
+
 def get_gesture_data_dir():
     gesture_dir = os.path.join(get_remaster_config_dir(), "gesture")
     os.makedirs(gesture_dir, exist_ok=True)
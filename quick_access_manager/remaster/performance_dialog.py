@@ -0,0 +1,121 @@
+"""Live view of the in-process metrics (see shared/metrics.py).
+
+Not in any menu: it opens from the "Quick Access Manager Performance"
+action, which can be given a shortcut or found through Krita's action
+search. The table refreshes while the dialog is visible; Export writes the
+same numbers as JSON for comparing runs.
+"""
+
+from .compat import (
+    QAbstractItemView,
+    QDialog,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QTimer,
+    QVBoxLayout,
+)
+from .shared.metrics import get_metrics
+
+REFRESH_INTERVAL_MS = 500
+COLUMNS = ("Metric", "Count / value", "Mean ms", "p50 ms", "p95 ms", "Max ms")
+
+
+def _format_ms(value):
+    return f"{value:.3f}"
+
+
+def metric_row(name, data):
+    """The table cells for one entry of MetricsRegistry.snapshot()."""
+    if data["type"] == "histogram":
+        return (
+            name,
+            str(data["count"]),
+            _format_ms(data["mean"]),
+            _format_ms(data["p50"]),
+            _format_ms(data["p95"]),
+            _format_ms(data["max"]),
+        )
+    value = data["value"]
+    return (name, "" if value is None else str(value), "", "", "", "")
+
+
+class PerformanceDialog(QDialog):
+    def __init__(self, parent=None, registry=None):
+        super().__init__(parent)
+        self.setWindowTitle("Quick Access Manager Performance")
+        self.resize(640, 420)
+        self._registry = registry or get_metrics()
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(COLUMNS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset_metrics)
+        export_button = QPushButton("Export JSON...")
+        export_button.clicked.connect(self.export_json)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.close)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(reset_button)
+        buttons.addWidget(export_button)
+        buttons.addStretch()
+        buttons.addWidget(close_button)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.table)
+        layout.addLayout(buttons)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_INTERVAL_MS)
+        self._timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def refresh(self):
+        snapshot = self._registry.snapshot()
+        self.table.setRowCount(len(snapshot))
+        for row, (name, data) in enumerate(snapshot.items()):
+            for column, text in enumerate(metric_row(name, data)):
+                cell = self.table.item(row, column)
+                if cell is None:
+                    self.table.setItem(row, column, QTableWidgetItem(text))
+                elif cell.text() != text:
+                    cell.setText(text)
+
+    def reset_metrics(self):
+        self._registry.reset()
+        self.refresh()
+
+    def export_json(self, path=None):
+        if not path:
+            path, _filter = QFileDialog.getSaveFileName(
+                self, "Export Metrics", "quick_access_manager_metrics.json", "JSON (*.json)"
+            )
+        if not path:
+            return None
+        try:
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(self._registry.to_json())
+        except Exception as e:
+            print(f"Error exporting metrics: {e}")
+            return None
+        return path
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
@@ -1,9 +1,19 @@
-"""Krita registration entry point for the remastered Quick Access Palette."""
+"""Krita registration entry point for the remastered Quick Access Palette.
+
+Krita imports this module while it starts up, so each subsystem (HueSVC,
+Quick Adjust, the popups) is imported only when it is used: a disabled
+docker is never imported and a popup module loads with its first shortcut
+press. The gesture system starts with the first main window, and setup
+reads its flags with `peek_settings()` instead of loading the palette.
+See startup_profiler for timing these phases inside Krita.
+"""
+
+# First, so an opt-in startup profile times the imports below as well.
+from . import startup_profiler
 
 from krita import Extension, Krita  # type: ignore
 
-from .color_selector.docker import ColorSelectorDockFactory
-from .color_selector.popup import HueSvcPopup
+from .. import log_writer
 from .compat import QApplication
 from .gesture import (
     ToggleGestureExtension,
@@ -11,11 +21,7 @@ from .gesture import (
     is_gesture_enabled,
     shutdown_gesture_system,
 )
-from .infrastructure import DockerManager
-from .quick_access_palette.controller import PaletteController
-from .quick_access_palette.docker import QuickAccessPaletteDockerFactory
-from .quick_access_palette.popup import QuickAccessPalettePopup
-from .quick_adjust.docker import QuickAdjustDockerFactory
+from .quick_access_palette.controller import peek_settings
 
 _popup_window = None
 _huesvc_popup_window = None
@@ -28,6 +34,8 @@ def close_visible_palette_popups():
     candidates = []
     if _popup_window is not None:
         candidates.append(_popup_window)
+    from .quick_access_palette.popup import QuickAccessPalettePopup
+
     app = QApplication.instance()
     if app is not None:
         for widget in app.topLevelWidgets():
@@ -61,6 +69,8 @@ def close_visible_huesvc_popups():
     candidates = []
     if _huesvc_popup_window is not None:
         candidates.append(_huesvc_popup_window)
+    from .color_selector.popup import HueSvcPopup
+
     app = QApplication.instance()
     if app is not None:
         for widget in app.topLevelWidgets():
@@ -97,24 +107,50 @@ class QuickAccessPaletteExtension(Extension):
         self.popup_action = None
         self.huesvc_popup_window = None
         self.huesvc_popup_action = None
+        self.performance_dialog = None
 
     def setup(self):
+        with startup_profiler.phase("setup"):
+            self._setup()
+
+    def _setup(self):
+        Krita.instance().notifier().applicationClosing.connect(log_writer.shutdown)
+
+        from .quick_access_palette.docker import QuickAccessPaletteDockerFactory
+
         self.palette_factory = QuickAccessPaletteDockerFactory()
         Krita.instance().addDockWidgetFactory(self.palette_factory)
 
-        controller = PaletteController()
+        settings = peek_settings()["default"]
+
+        if settings.get("huesvc_enabled", True):
+            from .color_selector.docker import ColorSelectorDockFactory
 
-        if controller.is_huesvc_enabled():
             self.color_selector_factory = ColorSelectorDockFactory()
             Krita.instance().addDockWidgetFactory(self.color_selector_factory)
 
-        if controller.is_quick_adjust_enabled():
+        if settings.get("quick_adjust_enabled", True):
+            from .quick_adjust.docker import QuickAdjustDockerFactory
+
             self.quick_adjust_factory = QuickAdjustDockerFactory()
             Krita.instance().addDockWidgetFactory(self.quick_adjust_factory)
 
+        # The gesture filter needs a main window to attach to anyway.
+        if Krita.instance().activeWindow() is not None:
+            self.start_gestures()
+        else:
+            Krita.instance().notifier().windowCreated.connect(self.start_gestures)
+
+    def start_gestures(self):
+        notifier = Krita.instance().notifier()
+        try:
+            notifier.windowCreated.disconnect(self.start_gestures)
+        except (TypeError, RuntimeError):
+            pass
         if is_gesture_enabled():
             try:
-                initialize_gesture_system()
+                with startup_profiler.phase("gesture initialization"):
+                    initialize_gesture_system()
             except Exception as exc:
                 print(f"Quick Access Palette: error initializing gesture system: {exc}")
 
@@ -125,6 +161,11 @@ class QuickAccessPaletteExtension(Extension):
             print(f"Quick Access Palette: error shutting down gesture system: {exc}")
 
     def createActions(self, window):
+        with startup_profiler.phase("createActions"):
+            self._create_actions(window)
+        startup_profiler.schedule_finish()
+
+    def _create_actions(self, window):
         action = window.createAction(
             "quick_access_palette_popup", "Quick Access Palette Popup"
         )
@@ -147,12 +188,19 @@ class QuickAccessPaletteExtension(Extension):
         )
         move_quick_adjust_action.triggered.connect(self.move_quick_adjust_docker_to_cursor)
 
+        performance_action = window.createAction(
+            "quick_access_manager_performance", "Quick Access Manager Performance"
+        )
+        performance_action.triggered.connect(self.show_performance_dialog)
+
     def show_palette_popup(self):
         global _popup_window
         if close_visible_palette_popups():
             self.popup_window = None
             return
 
+        from .quick_access_palette.popup import QuickAccessPalettePopup
+
         close_shortcuts = self.popup_action.shortcuts() if self.popup_action else []
         popup = QuickAccessPalettePopup(close_shortcuts=close_shortcuts)
         _popup_window = popup
@@ -174,6 +222,8 @@ class QuickAccessPaletteExtension(Extension):
             self.huesvc_popup_window = None
             return
 
+        from .color_selector.popup import HueSvcPopup
+
         close_shortcuts = (
             self.huesvc_popup_action.shortcuts() if self.huesvc_popup_action else []
         )
@@ -192,12 +242,26 @@ class QuickAccessPaletteExtension(Extension):
         popup.show_at_cursor()
 
     def move_palette_docker_to_cursor(self):
+        from .infrastructure import DockerManager
+
         DockerManager.toggle_docker_position_at_cursor("quick_access_palette_docker")
 
     def move_quick_adjust_docker_to_cursor(self):
+        from .infrastructure import DockerManager
+
         DockerManager.toggle_docker_position_at_cursor("brush_adjust_docker")
 
+    def show_performance_dialog(self):
+        from .performance_dialog import PerformanceDialog
+
+        if self.performance_dialog is None:
+            self.performance_dialog = PerformanceDialog()
+        self.performance_dialog.show()
+        self.performance_dialog.raise_()
+        self.performance_dialog.activateWindow()
+
 
 app = Krita.instance()
 app.addExtension(QuickAccessPaletteExtension(app))
 app.addExtension(ToggleGestureExtension(app))
+startup_profiler.mark("plugin module imported")
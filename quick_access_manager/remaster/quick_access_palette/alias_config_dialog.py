@@ -15,11 +15,10 @@ from ..compat import (
     QHeaderView,
     QIcon,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
-    QPixmap,
+    QListView,
     QPushButton,
     QSize,
+    QSortFilterProxyModel,
     Qt,
     QTableWidget,
     QTableWidgetItem,
@@ -34,6 +33,7 @@ from ..infrastructure import (
     DockerManager,
     get_default_icons_dir,
 )
+from .brush_thumbnails import BrushListModel
 from .presentation import display_action_text
 
 COLUMN_LABELS = [
@@ -187,58 +187,48 @@ class AliasConfigDialog(QDialog):
         top_row.addWidget(self.brush_filter_edit, 1)
         layout.addLayout(top_row)
 
-        self.brush_list = QListWidget()
-        self.brush_list.setViewMode(QListWidget.IconMode)
-        self.brush_list.setResizeMode(QListWidget.Adjust)
-        self.brush_list.setMovement(QListWidget.Static)
+        # A model/view list rather than one QListWidgetItem per preset: rows
+        # cost nothing until shown, and thumbnails are made only for rows
+        # that scroll into view (see BrushListModel).
+        self.brush_model = BrushListModel(self.brush_entries(), 56, self)
+        self.brush_proxy = QSortFilterProxyModel(self)
+        self.brush_proxy.setSourceModel(self.brush_model)
+        self.brush_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+
+        self.brush_list = QListView()
+        self.brush_list.setViewMode(QListView.IconMode)
+        self.brush_list.setResizeMode(QListView.Adjust)
+        self.brush_list.setMovement(QListView.Static)
         # Click selects one; Ctrl+click adds/removes from the selection.
         self.brush_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.brush_list.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.brush_list.setIconSize(QSize(56, 56))
         self.brush_list.setGridSize(QSize(76, 90))
         self.brush_list.setWordWrap(True)
         self.brush_list.setUniformItemSizes(True)
         self.brush_list.setSpacing(2)
+        self.brush_list.setModel(self.brush_proxy)
+        self.brush_list.verticalScrollBar().valueChanged.connect(
+            self.brush_model.clear_pending
+        )
         layout.addWidget(self.brush_list)
 
-        for brush_name, preset in self.brush_entries():
-            item = QListWidgetItem(brush_name)
-            item.setToolTip(brush_name)
-            item.setData(Qt.UserRole, brush_name)
-            icon = self._brush_icon(preset)
-            if icon is not None:
-                item.setIcon(icon)
-            self.brush_list.addItem(item)
-
         return container
 
-    def _brush_icon(self, preset):
-        try:
-            image = preset.image()
-            if image:
-                pixmap = QPixmap.fromImage(image)
-                if not pixmap.isNull():
-                    return QIcon(pixmap)
-        except Exception:
-            pass
-        return None
-
     def _apply_brush_filter(self, text):
-        needle = text.lower()
-        for row in range(self.brush_list.count()):
-            item = self.brush_list.item(row)
-            name = item.data(Qt.UserRole) or ""
-            item.setHidden(bool(needle and needle not in name.lower()))
+        self.brush_model.clear_pending()
+        self.brush_proxy.setFilterFixedString(text)
 
     def _add_selected_brushes(self):
         if self.controller is None:
             return
         # Row order (alphabetical, matching the grid's own layout) rather than
         # click order - deterministic and matches what the user sees on screen.
-        names = [
-            self.brush_list.item(row).data(Qt.UserRole)
-            for row in range(self.brush_list.count())
-            if self.brush_list.item(row).isSelected()
-        ]
+        rows = sorted(
+            self.brush_proxy.mapToSource(index).row()
+            for index in self.brush_list.selectionModel().selectedIndexes()
+        )
+        names = [self.brush_model.name_at(row) for row in rows]
         if not names:
             return
         for name in names:
@@ -0,0 +1,113 @@
+"""Brush preset thumbnails made on demand, and the list model the Resources
+dialog's Brushes tab shows them through.
+
+Thumbnails are scaled once and kept in Qt's process-wide `QPixmapCache`
+(keyed by preset name and size), so reopening the dialog reuses them and the
+cache's own size limit bounds the memory they take.
+"""
+
+from ..compat import (
+    QAbstractListModel,
+    QModelIndex,
+    QPixmap,
+    QPixmapCache,
+    Qt,
+    QTimer,
+)
+
+CACHE_KEY = "quick_access_manager/brush_thumbnail/{size}/{name}"
+
+# Thumbnails made per timer tick; small enough that a tick never stalls
+# scrolling or typing in the filter.
+THUMBNAIL_BATCH = 24
+
+
+def cached_brush_thumbnail(name, size):
+    """`name`'s thumbnail from the shared cache, or None if not made yet."""
+    pixmap = QPixmapCache.find(CACHE_KEY.format(size=size, name=name))
+    if pixmap is None or pixmap.isNull():
+        return None
+    return pixmap
+
+
+def brush_thumbnail(name, preset, size):
+    """`preset`'s image scaled to fit `size` x `size`, through the shared cache.
+
+    Returns None if the preset has no usable image.
+    """
+    pixmap = cached_brush_thumbnail(name, size)
+    if pixmap is not None:
+        return pixmap
+    try:
+        image = preset.image() if preset is not None else None
+        if not image or image.isNull():
+            return None
+        pixmap = QPixmap.fromImage(image)
+    except Exception:
+        return None
+    if pixmap.isNull():
+        return None
+    pixmap = pixmap.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    QPixmapCache.insert(CACHE_KEY.format(size=size, name=name), pixmap)
+    return pixmap
+
+
+class BrushListModel(QAbstractListModel):
+    """(name, preset) pairs as list rows whose thumbnails load lazily.
+
+    A row's thumbnail is only asked for when the view paints that row. Rows
+    without one yet are queued, and the queue is worked off
+    `THUMBNAIL_BATCH` rows at a time on zero-delay timers, so opening the
+    dialog costs nothing per preset and only rows that have been on screen
+    are ever loaded. Call `clear_pending()` when the view scrolls; the rows
+    still visible are queued again as they repaint.
+    """
+
+    def __init__(self, entries, icon_size=56, parent=None):
+        super().__init__(parent)
+        self._entries = list(entries)
+        self._icon_size = icon_size
+        self._pending = {}  # row -> None; a dict keeps request order
+        self._no_image = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._load_batch)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        name = self._entries[row][0]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole, Qt.UserRole):
+            return name
+        if role == Qt.DecorationRole:
+            pixmap = cached_brush_thumbnail(name, self._icon_size)
+            if pixmap is None and row not in self._no_image:
+                self._pending[row] = None
+                if not self._timer.isActive():
+                    self._timer.start()
+            return pixmap
+        return None
+
+    def name_at(self, row):
+        return self._entries[row][0]
+
+    def clear_pending(self):
+        self._pending.clear()
+
+    def _load_batch(self):
+        rows = list(self._pending)[:THUMBNAIL_BATCH]
+        for row in rows:
+            del self._pending[row]
+            name, preset = self._entries[row]
+            if brush_thumbnail(name, preset, self._icon_size) is None:
+                self._no_image.add(row)
+                continue
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+        if self._pending:
+            self._timer.start()
@@ -2,7 +2,8 @@
 responsibility:
 
 - settings_mixin: DEFAULT_SETTINGS + docker/popup/HueSVC/Quick Adjust
-  settings storage.
+  settings storage, and peek_settings() for reading them without a
+  controller.
 - tab_mixin: tab lookup/selection/add/rename/remove.
 - placement_mixin: sequential placement cursor (Resources dialog) and
   Action item col_span normalization.
@@ -16,6 +17,6 @@ Everything is re-exported here so callers keep importing
 """
 
 from .base import PaletteController
-from .settings_mixin import DEFAULT_SETTINGS
+from .settings_mixin import DEFAULT_SETTINGS, peek_settings
 
-__all__ = ["PaletteController", "DEFAULT_SETTINGS"]
+__all__ = ["PaletteController", "DEFAULT_SETTINGS", "peek_settings"]
@@ -6,6 +6,8 @@ JSON (a fresh install, or one saved before a new setting existed) still
 gets a value.
 """
 
+from ...infrastructure import PaletteRepository
+
 DEFAULT_SETTINGS = {
     "default": {
         "docker_icon_size": 42,
@@ -67,22 +69,32 @@ DEFAULT_SETTINGS = {
 }
 
 
+def merge_settings(saved):
+    """`saved` settings merged section by section on top of DEFAULT_SETTINGS."""
+    merged = {section: dict(values) for section, values in DEFAULT_SETTINGS.items()}
+    for section, values in saved.items():
+        if isinstance(values, dict):
+            merged.setdefault(section, {}).update(values)
+    return merged
+
+
+def peek_settings(repository=None):
+    """Merged settings read without loading the palette document.
+
+    For startup, which only needs a few flags; the full PaletteController
+    parses and normalizes every tab and item.
+    """
+    repository = repository or PaletteRepository()
+    return merge_settings(repository.load_settings())
+
+
 class SettingsMixin:
     """Docker/popup/HueSVC/Quick Adjust settings, all backed by
     `document.settings` and merged with DEFAULT_SETTINGS. Requires
     `self.document` and `self.save()` from the composed controller."""
 
     def settings(self):
-        merged = {
-            "default": dict(DEFAULT_SETTINGS["default"]),
-            "popup": dict(DEFAULT_SETTINGS["popup"]),
-            "huesvc": dict(DEFAULT_SETTINGS["huesvc"]),
-            "quick_adjust": dict(DEFAULT_SETTINGS["quick_adjust"]),
-        }
-        for section, values in self.document.settings.items():
-            if isinstance(values, dict):
-                merged.setdefault(section, {}).update(values)
-        return merged
+        return merge_settings(self.document.settings)
 
     def docker_icon_size(self):
         return self._bounded_icon_size(
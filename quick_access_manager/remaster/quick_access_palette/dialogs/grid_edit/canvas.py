@@ -24,6 +24,8 @@ class GridEditCanvas(QWidget):
         self.origin = None
         self.grid_rows = 0
         self.grid_columns = 0
+        # Clicking the grid focuses it, so the dialog's arrow-key nudge applies.
+        self.setFocusPolicy(Qt.ClickFocus)
 
     def paintEvent(self, event):
         """Draw the cell guides.
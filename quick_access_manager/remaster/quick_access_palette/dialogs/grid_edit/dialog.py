@@ -11,16 +11,18 @@ from ....compat import (
     QFrame,
     QHBoxLayout,
     QIcon,
+    QImage,
+    QKeySequence,
     QMenu,
     QPixmap,
     QPushButton,
     QRect,
     QScrollArea,
+    QShortcut,
     QSize,
     Qt,
     QTabWidget,
     QVBoxLayout,
-    QWidget,
 )
 from ....infrastructure import AliasRepository, get_default_icons_dir, get_system_icons_dir
 from ....shared import (
@@ -36,6 +38,9 @@ from ....shared import (
     SCRIPT_ITEM,
     SEPARATOR_ITEM,
     SEPARATOR_ORIENTATION_VERTICAL,
+    CellIndex,
+    EditJournal,
+    FreeGridLayoutEngine,
     PaletteItem,
 )
 from .canvas import GridEditCanvas
@@ -64,12 +69,14 @@ class GridEditDialog(QDialog):
                 self.normalized_item(PaletteItem.from_dict(item.to_dict()))
                 for item in (grid.items if grid else [])
             ]
+            columns = int(grid.columns) if grid else 8
             self.tab_state[tab.id] = {
-                "columns": int(grid.columns) if grid else 8,
+                "columns": columns,
                 "items": items,
                 "selected_ids": set(),
-                "history": [],
+                "journal": EditJournal(),
                 "item_widgets": {},
+                "cell_index": CellIndex(columns),
                 "drop_highlight": None,
                 "canvas": None,
             }
@@ -79,8 +86,9 @@ class GridEditDialog(QDialog):
         self.columns = 8
         self.items = []
         self.selected_ids = set()
-        self.history = []
+        self.journal = None
         self.item_widgets = {}
+        self.cell_index = None
         self.drop_highlight = None
         self.grid_host = None
 
@@ -129,11 +137,25 @@ class GridEditDialog(QDialog):
             self.undo_btn.setIconSize(QSize(18, 18))
         else:
             self.undo_btn.setText("Undo")
-        self.undo_btn.setToolTip("Undo last move/resize")
+        self.undo_btn.setToolTip("Undo last edit (Ctrl+Z)")
         self.undo_btn.setEnabled(False)
         self.undo_btn.setFixedHeight(24)
         self.undo_btn.clicked.connect(self.undo)
         control_layout.addWidget(self.undo_btn)
+        self.redo_btn = QPushButton()
+        if os.path.exists(undo_icon_path):
+            mirrored = QImage(undo_icon_path).mirrored(True, False)
+            self.redo_btn.setIcon(QIcon(QPixmap.fromImage(mirrored)))
+            self.redo_btn.setIconSize(QSize(18, 18))
+        else:
+            self.redo_btn.setText("Redo")
+        self.redo_btn.setToolTip("Redo (Ctrl+Shift+Z)")
+        self.redo_btn.setEnabled(False)
+        self.redo_btn.setFixedHeight(24)
+        self.redo_btn.clicked.connect(self.redo)
+        control_layout.addWidget(self.redo_btn)
+        QShortcut(QKeySequence("Ctrl+Z"), self).activated.connect(self.undo)
+        QShortcut(QKeySequence("Ctrl+Shift+Z"), self).activated.connect(self.redo)
         control_layout.addStretch(1)
         layout.addLayout(control_layout)
 
@@ -142,6 +164,7 @@ class GridEditDialog(QDialog):
             scroll = QScrollArea()
             scroll.setWidgetResizable(True)
             canvas = GridEditCanvas(self)
+            self.add_nudge_shortcuts(canvas)
             scroll.setWidget(canvas)
             self.tab_state[tab_id]["canvas"] = canvas
             self.tab_widget.addTab(scroll, self.tab_names[tab_id])
@@ -159,14 +182,32 @@ class GridEditDialog(QDialog):
 
         self.setLayout(layout)
 
+    def add_nudge_shortcuts(self, canvas):
+        """Arrow keys nudge the selection one cell while `canvas` has focus.
+
+        Scoped to the canvas so the tab bar, scroll area and input fields keep
+        their own arrow keys.
+        """
+        for key, row_delta, col_delta in (
+            ("Left", 0, -1),
+            ("Right", 0, 1),
+            ("Up", -1, 0),
+            ("Down", 1, 0),
+        ):
+            shortcut = QShortcut(QKeySequence(key), canvas)
+            shortcut.setContext(Qt.WidgetWithChildrenShortcut)
+            shortcut.activated.connect(
+                lambda r=row_delta, c=col_delta: self.move_selected(r, c)
+            )
     def _save_current_tab_state(self):
         if self.current_tab_id is None:
             return
         state = self.tab_state[self.current_tab_id]
         state["items"] = self.items
         state["selected_ids"] = self.selected_ids
-        state["history"] = self.history
+        state["journal"] = self.journal
         state["item_widgets"] = self.item_widgets
+        state["cell_index"] = self.cell_index
         state["drop_highlight"] = self.drop_highlight
 
     def _load_tab_state(self, tab_id):
@@ -175,11 +216,12 @@ class GridEditDialog(QDialog):
         self.columns = state["columns"]
         self.items = state["items"]
         self.selected_ids = state["selected_ids"]
-        self.history = state["history"]
+        self.journal = state["journal"]
         self.item_widgets = state["item_widgets"]
+        self.cell_index = state["cell_index"]
         self.drop_highlight = state["drop_highlight"]
         self.grid_host = state["canvas"]
-        self.undo_btn.setEnabled(bool(self.history))
+        self.update_history_buttons()
         self.update_selection_styles()
 
     def _on_tab_changed(self, index):
@@ -203,12 +245,27 @@ class GridEditDialog(QDialog):
             self._load_tab_state(previous_tab_id)
 
     def rebuild_grid(self):
-        for child in self.grid_host.findChildren(QWidget):
-            child.deleteLater()
-        self.item_widgets = {}
-        self.drop_highlight = None
-        self.grid_host.rubber_band = None
+        """Bring the current tab's widgets in line with self.items.
+
+        Widgets persist per tab for the life of the dialog; only those whose
+        item was added, removed or replaced since the last call are touched,
+        so nudging a selection just moves the selected widgets.
+        """
+        current = {item.id: item for item in self.items}
+        stale = {
+            item_id
+            for item_id, widget in self.item_widgets.items()
+            if current.get(item_id) is not widget.item
+        }
+        stale.update(current.keys() - self.item_widgets.keys())
+        self.hide_drop_highlight()
+        if self.grid_host.rubber_band is not None:
+            self.grid_host.rubber_band.hide()
         self.grid_host.origin = None
+        self.update_item_widgets(stale)
+        self.update_selection_styles()
+
+    def update_grid_extent(self):
         spacing = self.spacing
         max_bottom = max([item.bottom for item in self.items], default=0)
         rows = max(self.visible_rows, max_bottom + 2)
@@ -218,17 +275,55 @@ class GridEditDialog(QDialog):
         self.grid_host.grid_rows = rows
         self.grid_host.grid_columns = self.columns
         self.grid_host.update()
-        for item in sorted(
-            self.items, key=lambda entry: (entry.row, entry.col, entry.id)
-        ):
-            widget = self.create_item_widget(item)
-            self.item_widgets[item.id] = widget
-            widget.setParent(self.grid_host)
-            x, y, item_width, item_height = self.item_geometry(item, spacing)
-            widget.setGeometry(x, y, item_width, item_height)
-            widget.raise_()
-            widget.show()
-        self.update_selection_styles()
+
+    def _add_item_widget(self, item):
+        widget = self.create_item_widget(item)
+        self.item_widgets[item.id] = widget
+        widget.setParent(self.grid_host)
+        widget.setGeometry(*self.item_geometry(item, self.spacing))
+        widget.raise_()
+        widget.show()
+        return widget
+
+    def update_item_widgets(self, item_ids):
+        """Bring just `item_ids`' widgets and cell index entries in line with
+        self.items.
+
+        A widget whose item only moved is repositioned; one whose item was
+        removed is deleted, and one added or otherwise changed is rebuilt.
+        """
+        by_id = {item.id: item for item in self.items}
+        for item_id in item_ids:
+            item = by_id.get(item_id)
+            if item is None:
+                self.cell_index.remove(item_id)
+            else:
+                self.cell_index.add(item)
+            widget = self.item_widgets.get(item_id)
+            if widget is not None and item is not None and self._same_look(
+                widget.item, item
+            ):
+                widget.item = item
+                widget.setGeometry(*self.item_geometry(item, self.spacing))
+                continue
+            if widget is not None:
+                del self.item_widgets[item_id]
+                widget.hide()
+                widget.deleteLater()
+            if item is not None:
+                self._style_widget(
+                    self._add_item_widget(item), item.id in self.selected_ids
+                )
+        self.update_grid_extent()
+
+    @staticmethod
+    def _same_look(old, new):
+        return (
+            old.type == new.type
+            and old.row_span == new.row_span
+            and old.col_span == new.col_span
+            and old.payload == new.payload
+        )
 
     def item_geometry(self, item, spacing):
         x = 4 + item.col * (self.cell_size + spacing)
@@ -380,18 +475,29 @@ class GridEditDialog(QDialog):
             self.update_selection_styles()
 
     def select_items_in_rect(self, rect, additive=False):
-        """Select every item whose cell footprint intersects the marquee rect."""
+        """Select every item whose cell footprint intersects the marquee rect.
+
+        Only the items indexed under the cells the rect touches are tested.
+        """
         hit_ids = set()
-        for item in self.items:
+        rows = self.cells_spanned(rect.top(), rect.bottom())
+        cols = self.cells_spanned(rect.left(), rect.right())
+        for item_id in self.cell_index.items_in(rows, cols):
+            item = self.cell_index.get(item_id)
             x, y, width, height = self.item_geometry(item, self.spacing)
             if rect.intersects(QRect(x, y, width, height)):
-                hit_ids.add(item.id)
+                hit_ids.add(item_id)
         if additive:
             self.selected_ids |= hit_ids
         else:
             self.selected_ids = hit_ids
         self.update_selection_styles()
 
+    def cells_spanned(self, low, high):
+        """Rows (or columns) whose cell, or the gap after it, a pixel span touches."""
+        pitch = self.cell_size + self.spacing
+        return range((low - 4) // pitch, (high - 4) // pitch + 1)
+
     def toggle_selection(self, item_id):
         if QApplication.keyboardModifiers() == Qt.ControlModifier:
             if item_id in self.selected_ids:
@@ -403,11 +509,15 @@ class GridEditDialog(QDialog):
         self.update_selection_styles()
 
     def update_selection_styles(self):
-        for item in self.items:
-            widget = self.item_widgets.get(item.id)
-            if not widget:
-                continue
-            widget.setStyleSheet(self.item_style(item, item.id in self.selected_ids))
+        """Restyle the widgets whose selected state changed since last styled."""
+        for item_id, widget in self.item_widgets.items():
+            selected = item_id in self.selected_ids
+            if widget.styled_selected is not selected:
+                self._style_widget(widget, selected)
+
+    def _style_widget(self, widget, selected):
+        widget.setStyleSheet(self.item_style(widget.item, selected))
+        widget.styled_selected = selected
 
     def item_style(self, item, selected):
         colors = {
@@ -519,7 +629,6 @@ class GridEditDialog(QDialog):
         selected = self.selected_items()
         if not selected or target_tab_id == self.current_tab_id:
             return
-        self._push_history()
         clones = [item.copy_with(id=self._new_item_id(item.type)) for item in selected]
         self._append_items_to_tab(target_tab_id, clones)
 
@@ -527,10 +636,9 @@ class GridEditDialog(QDialog):
         selected = self.selected_items()
         if not selected or target_tab_id == self.current_tab_id:
             return
-        self._push_history()
         moved_ids = {item.id for item in selected}
         clones = [item.copy_with(id=self._new_item_id(item.type)) for item in selected]
-        self.items = [item for item in self.items if item.id not in moved_ids]
+        self._commit_items([item for item in self.items if item.id not in moved_ids])
         self.selected_ids -= moved_ids
         self.rebuild_grid()
         self._append_items_to_tab(target_tab_id, clones)
@@ -539,9 +647,8 @@ class GridEditDialog(QDialog):
         selected = self.selected_items()
         if not selected:
             return
-        self._push_history()
         removed_ids = {item.id for item in selected}
-        self.items = [item for item in self.items if item.id not in removed_ids]
+        self._commit_items([item for item in self.items if item.id not in removed_ids])
         self.selected_ids -= removed_ids
         self.rebuild_grid()
 
@@ -562,112 +669,55 @@ class GridEditDialog(QDialog):
             )
             placed.append(it.copy_with(row=base_row + (it.row - min_row), col=new_col))
         target_state["items"] = target_items + placed
+        target_state["journal"].record(target_items, target_state["items"])
         target_state["selected_ids"] = {it.id for it in placed}
         self._rebuild_tab(target_tab_id)
 
-    MAX_HISTORY = 20
+    def _commit_items(self, items):
+        """Replace the current tab's items, journaling what changed."""
+        self.journal.record(self.items, items)
+        self.items = items
+        self.update_history_buttons()
 
-    def _push_history(self):
-        snapshot = [item.copy_with() for item in self.items]
-        self.history.append(snapshot)
-        if len(self.history) > self.MAX_HISTORY:
-            self.history.pop(0)
-        self.undo_btn.setEnabled(True)
+    def update_history_buttons(self):
+        self.undo_btn.setEnabled(self.journal is not None and self.journal.can_undo)
+        self.redo_btn.setEnabled(self.journal is not None and self.journal.can_redo)
 
     def undo(self):
-        if not self.history:
+        if not self.journal.can_undo:
+            return
+        self.items, touched = self.journal.undo(self.items)
+        self._after_history_step(touched)
+
+    def redo(self):
+        if not self.journal.can_redo:
             return
-        self.items = self.history.pop()
+        self.items, touched = self.journal.redo(self.items)
+        self._after_history_step(touched)
+
+    def _after_history_step(self, touched):
         self.selected_ids &= {item.id for item in self.items}
-        self.undo_btn.setEnabled(bool(self.history))
-        self.rebuild_grid()
+        self.update_history_buttons()
+        self.hide_drop_highlight()
+        self.update_item_widgets(touched)
 
     def move_selected(self, row_delta, col_delta):
         if not self.selected_ids:
             return
-        selected = self.selected_items()
-        min_row = min(item.row for item in selected)
-        min_col = min(item.col for item in selected)
-        row_delta = max(row_delta, -min_row)
-        col_delta = max(col_delta, -min_col)
-        if row_delta == 0 and col_delta == 0:
-            return
-        self._push_history()
-        moved_selected = []
-        for item in selected:
-            moved_selected.append(
-                item.copy_with(row=item.row + row_delta, col=item.col + col_delta)
-            )
-        self.items = self.place_group_with_push(moved_selected)
-        self.rebuild_grid()
-
-    def place_group_with_push(self, active_items):
-        active_ids = {item.id for item in active_items}
-        placed = sorted(active_items, key=lambda item: (item.row, item.col, item.id))
-        for item in self.sorted_items(
-            [item for item in self.items if item.id not in active_ids]
-        ):
-            candidate = item.copy_with(row=max(0, item.row), col=max(0, item.col))
-            if candidate.col_span > self.columns:
-                placed.append(candidate)
-                continue
-            if self.needs_reposition(candidate, placed):
-                candidate = self.first_free_position(candidate, placed)
-            placed.append(candidate)
-        return placed
-
-    def first_free_position(self, item, placed):
-        # An item wider than the grid can never satisfy the column check below,
-        # so leave it where it is instead of scanning forever.
-        if item.col_span > self.columns:
-            return item.copy_with(row=max(0, item.row), col=0)
-        cursor = self.linear_index(item.row, item.col)
-        while True:
-            row = cursor // self.columns
-            col = cursor % self.columns
-            if col + item.col_span <= self.columns:
-                candidate = item.copy_with(row=row, col=col)
-                if not self.needs_reposition(candidate, placed):
-                    return candidate
-            cursor += 1
-
-    def needs_reposition(self, item, placed):
-        if item.col + item.col_span > self.columns:
-            return True
-        return any(self.items_overlap(item, other) for other in placed)
-
-    def items_overlap(self, item, other):
-        return not (
-            item.right <= other.col
-            or other.right <= item.col
-            or item.bottom <= other.row
-            or other.bottom <= item.row
-        )
-
-    def sorted_items(self, items):
-        return sorted(
-            items, key=lambda item: (self.linear_index(item.row, item.col), item.id)
+        result = FreeGridLayoutEngine(self.columns).move_items(
+            self.items, self.selected_ids, row_delta, col_delta
         )
-
-    def linear_index(self, row, col):
-        return max(0, int(row)) * self.columns + max(0, int(col))
+        self._commit_items(result.items)
+        self.rebuild_grid()
 
     def resize_selected(self, row_delta, col_delta):
         selected = self.selected_items()
         if not selected or any(not self.is_resizable(item) for item in selected):
             return
-        self._push_history()
-        resized = []
-        for item in selected:
-            resized.append(
-                item.copy_with(
-                    row_span=max(1, item.row_span + row_delta),
-                    # Never let an item grow past the grid width - a wider item
-                    # can never be placed and would stall the layout pass.
-                    col_span=max(1, min(self.columns, item.col_span + col_delta)),
-                )
-            )
-        self.items = self.place_group_with_push(resized)
+        result = FreeGridLayoutEngine(self.columns).resize_items(
+            self.items, self.selected_ids, row_delta, col_delta
+        )
+        self._commit_items(result.items)
         self.rebuild_grid()
 
     def accept_save(self):
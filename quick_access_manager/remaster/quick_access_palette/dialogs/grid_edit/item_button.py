@@ -22,6 +22,7 @@ class GridEditItemButton(QPushButton):
         self.dialog = dialog
         self.drag_start_global_pos = None
         self.drag_mode = None  # "move" or "resize"
+        self.styled_selected = None  # selected state of the current style sheet
         self.setCursor(Qt.SizeAllCursor)
         if self._resizable:
             self.setMouseTracking(True)
@@ -22,6 +22,8 @@ class GridItemDragFilter(QObject):
         super().__init__(docker)
         self.docker = docker
         self.item_id = None
+        self.item = None
+        self.columns = None
         self.start_pos = None
         self.highlight = None
 
@@ -51,9 +53,15 @@ class GridItemDragFilter(QObject):
         if not (event.modifiers() & Qt.ControlModifier):
             return False
         item_id = watched.property("palette_item_id")
-        if not item_id or self.docker.find_active_item(item_id) is None:
+        item = self.docker.find_active_item(item_id) if item_id else None
+        grid = self.docker.controller.active_grid()
+        if item is None or grid is None:
             return False
+        # Looked up once per drag rather than on every mouse move, which
+        # rescanned the grid's items each time.
         self.item_id = item_id
+        self.item = item
+        self.columns = grid.columns
         self.start_pos = self._global_pos(event)
         return True
 
@@ -89,21 +97,20 @@ class GridItemDragFilter(QObject):
     def _cancel_drag(self):
         self._hide_highlight()
         self.item_id = None
+        self.item = None
+        self.columns = None
         self.start_pos = None
 
     def _target_position(self, watched, event):
         """The clamped (item, row, col) this drag currently points at."""
-        item = self.docker.find_active_item(self.item_id)
+        item = self.item
         if item is None or self.start_pos is None:
             return None
-        grid = self.docker.controller.active_grid()
-        if grid is None:
-            return None
         step = self.docker.item_cell_size() + GRID_CELL_SPACING
         delta = self._global_pos(event) - self.start_pos
         row = max(0, item.row + int(round(delta.y() / float(step))))
         col = item.col + int(round(delta.x() / float(step)))
-        col = max(0, min(col, max(0, grid.columns - item.col_span)))
+        col = max(0, min(col, max(0, self.columns - item.col_span)))
         return item, row, col
 
     def _hide_highlight(self):
@@ -1,5 +1,6 @@
 from krita import DockWidgetFactory, DockWidgetFactoryBase  # type: ignore
 
+from ... import startup_profiler
 from .widget import QuickAccessPaletteDockerWidget
 
 
@@ -12,4 +13,7 @@ class QuickAccessPaletteDockerFactory(DockWidgetFactoryBase):
         super().__init__("quick_access_palette_docker", dock_pos)
 
     def createDockWidget(self):
-        return QuickAccessPaletteDockerWidget()
+        with startup_profiler.phase("createDockWidget: Quick Access Palette"):
+            dock = QuickAccessPaletteDockerWidget()
+        startup_profiler.watch_first_paint(dock, "Quick Access Palette")
+        return dock
@@ -19,6 +19,7 @@ from ...compat import (
     QWidget,
 )
 from ...infrastructure import AliasRepository, get_system_icons_dir
+from ...shared import metrics
 from .drag_filter import GRID_CELL_SPACING
 
 
@@ -122,6 +123,7 @@ class UIBuilderMixin:
     def apply_tab_bar_style(self):
         self.tab_widget.setStyleSheet(self.tab_bar_stylesheet())
 
+    @metrics.timed(metrics.histogram("palette_docker.reload_tabs"))
     def reload_tabs(self):
         self.apply_tab_bar_style()
         self.issue_map = self.controller.validate_active_grid().issues_by_item()
@@ -5,7 +5,6 @@ Main brush adjustment widget with UI and coordination logic.
 from ..compat import (
     QDockWidget,
     QHBoxLayout,
-    QTimer,
     QVBoxLayout,
     QWidget,
 )
@@ -18,6 +17,7 @@ from .alt_erase_listener import (
 from .brush_monitor import BrushMonitorMixin
 from .controls_builder import build_docker_controls_layout
 from .layer_monitor import LayerMonitorMixin
+from .poll_scheduler import get_poll_scheduler
 from .settings import (
     get_alt_erase_key,
     get_blender_mode_list,
@@ -89,9 +89,9 @@ class BrushAdjustmentWidget(QWidget, BrushMonitorMixin, LayerMonitorMixin):
 
         self.init_ui()
 
-        self.update_timer = QTimer(self)
-        self.update_timer.timeout.connect(self.update_docker_size)
-        self.update_timer.start(2000)
+        scheduler = get_poll_scheduler()
+        scheduler.register(self, self._poll_docker_size, min_interval_ms=2000)
+        scheduler.set_active(self, True)
 
     def init_ui(self):
         """Build the complete UI"""
@@ -151,41 +151,26 @@ class BrushAdjustmentWidget(QWidget, BrushMonitorMixin, LayerMonitorMixin):
         self.update_from_current_brush()
 
     def set_monitoring_active(self, active):
-        """Start/stop the polling timers.
+        """Start/stop this docker's share of the shared poll loop.
 
         Driven by the docker's show/hide so a collapsed or tabbed-away docker
-        stops polling Krita five times a second. Qt sends hide events to the
-        QDockWidget, not to this child widget, so the docker calls this for us.
+        stops polling Krita; once no polled widget is shown the scheduler's
+        timer stops entirely. Qt sends hide events to the QDockWidget, not to
+        this child widget, so the docker calls this for us.
         """
-        timers = (
-            getattr(self, "brush_check_timer", None),
-            getattr(self, "layer_check_timer", None),
-            getattr(self, "update_timer", None),
-        )
-        intervals = (200, 200, 2000)
-        for timer, interval in zip(timers, intervals):
-            if timer is None:
-                continue
-            if active:
-                if not timer.isActive():
-                    timer.start(interval)
-            else:
-                timer.stop()
-
+        scheduler = get_poll_scheduler()
+        scheduler.set_active(self, active)
         control_buttons = getattr(self, "control_buttons_layout", None)
-        status_timer = getattr(control_buttons, "status_update_timer", None)
-        if status_timer is not None:
-            if active:
-                if not status_timer.isActive():
-                    status_timer.start(1000)
-            else:
-                status_timer.stop()
-
-        # The history widgets filter every mouse press in the application;
-        # take them out of the chain while the docker is not visible.
-        for history in (self.color_history_widget, self.brush_history_widget):
-            if history is not None:
-                history.set_filter_active(active)
+        if control_buttons is not None:
+            scheduler.set_active(control_buttons, active)
+
+        # The color history follows the shared color state; the brush history
+        # filters every mouse press in the application. Neither should run
+        # while the docker is not visible.
+        if self.color_history_widget is not None:
+            self.color_history_widget.set_monitoring_active(active)
+        if self.brush_history_widget is not None:
+            self.brush_history_widget.set_filter_active(active)
 
         if active:
             self.force_update()
@@ -204,6 +189,10 @@ class BrushAdjustmentWidget(QWidget, BrushMonitorMixin, LayerMonitorMixin):
         if self.brush_history_widget is not None:
             self.brush_history_widget.force_brush_update()
 
+    def _poll_docker_size(self, _context):
+        self.update_docker_size()
+        return False
+
     def update_docker_size(self):
         # Relayouting the whole parent chain twice a second is expensive and
         # makes the docker flicker, so bail out unless the content actually
@@ -237,6 +226,7 @@ class BrushAdjustmentWidget(QWidget, BrushMonitorMixin, LayerMonitorMixin):
     def closeEvent(self, event):
         """Stop every timer, event filter, and notifier connection we own."""
         self.set_monitoring_active(False)
+        get_poll_scheduler().unregister(self)
         if self.control_buttons_layout is not None:
             self.control_buttons_layout.cleanup()
             if self.control_buttons_layout.float_tool_options is not None:
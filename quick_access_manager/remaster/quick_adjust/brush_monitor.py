@@ -5,20 +5,10 @@ Brush state monitoring and control functionality.
 from krita import Krita  # type: ignore
 
 from ..compat import QTimer
+from .krita_state import BRUSH, BRUSH_FIELDS, KritaStateSnapshot
+from .poll_scheduler import get_poll_scheduler
 from .utils_adjust import brush_size_to_slider, slider_to_brush_size
-
-
-def _value_changed(current, previous, tolerance=0.01):
-    """Compare two polled brush values.
-
-    Sliders write back rounded integers while Krita reports floats, so an exact
-    comparison reports a change every poll and fights the user's drag.
-    """
-    if current is None or previous is None:
-        return current is not previous
-    if isinstance(current, (int, float)) and isinstance(previous, (int, float)):
-        return abs(current - previous) > tolerance
-    return current != previous
+from .write_throttle import BRUSH_WRITE_INTERVAL_MS, ThrottledWriter
 
 
 class BrushMonitorMixin:
@@ -33,228 +23,166 @@ class BrushMonitorMixin:
         self.current_blend_mode = None
         self.updating_from_brush = False
 
-        self.opacity_debounce_timer = QTimer()
-        self.opacity_debounce_timer.setSingleShot(True)
-        self.opacity_debounce_timer.timeout.connect(self.apply_opacity_change)
-
-        self.size_debounce_timer = QTimer()
-        self.size_debounce_timer.setSingleShot(True)
-        self.size_debounce_timer.timeout.connect(self.apply_size_change)
-
-        self.flow_debounce_timer = QTimer()
-        self.flow_debounce_timer.setSingleShot(True)
-        self.flow_debounce_timer.timeout.connect(self.apply_flow_change)
-
-        self.pending_opacity_value = None
-        self.pending_size_value = None
-        self.pending_flow_value = None
-
-        self.brush_check_timer = QTimer()
-        self.brush_check_timer.timeout.connect(self.check_brush_change)
-        self.brush_check_timer.start(200)
-
-    def check_brush_change(self):
-        app = Krita.instance()
-        if app.activeWindow() and app.activeWindow().activeView():
-            view = app.activeWindow().activeView()
-            try:
-                current_preset = view.currentBrushPreset()
-                if current_preset:
-                    brush_name = current_preset.name()
-
-                    current_size = None
-                    current_opacity = None
-                    current_flow = None
-                    current_rotation = None
-                    current_blend_mode = None
-
-                    try:
-                        current_size = view.brushSize()
-                    except Exception:
-                        pass
-                    try:
-                        current_opacity = view.paintingOpacity()
-                    except Exception:
-                        pass
-                    try:
-                        current_flow = view.paintingFlow()
-                    except Exception:
-                        pass
-                    try:
-                        current_rotation = view.brushRotation()
-                    except Exception:
-                        pass
-                    try:
-                        current_blend_mode = view.currentBlendingMode()
-                    except Exception:
-                        pass
-
-                    brush_changed = brush_name != self.current_brush_name
-                    size_changed = _value_changed(current_size, self.current_brush_size)
-                    opacity_changed = _value_changed(
-                        current_opacity, self.current_brush_opacity, 0.005
-                    )
-                    flow_changed = _value_changed(
-                        current_flow, self.current_brush_flow, 0.005
-                    )
-                    rotation_changed = _value_changed(
-                        current_rotation, self.current_brush_rotation
-                    )
-                    blend_changed = current_blend_mode != self.current_blend_mode
-
-                    if (
-                        brush_changed
-                        or size_changed
-                        or opacity_changed
-                        or flow_changed
-                        or rotation_changed
-                        or blend_changed
-                    ):
-                        self.current_brush_name = brush_name
-                        self.current_brush_size = current_size
-                        self.current_brush_opacity = current_opacity
-                        self.current_brush_flow = current_flow
-                        self.current_brush_rotation = current_rotation
-                        self.current_blend_mode = current_blend_mode
-                        self.update_from_current_brush()
-            except Exception:
-                pass
-
-    def update_from_current_brush(self):
+        # Drags write through live, rate-limited per property (write_throttle).
+        self.size_writer = ThrottledWriter(
+            self.apply_size_change, BRUSH_WRITE_INTERVAL_MS, self
+        )
+        self.opacity_writer = ThrottledWriter(
+            self.apply_opacity_change, BRUSH_WRITE_INTERVAL_MS, self
+        )
+        self.flow_writer = ThrottledWriter(
+            self.apply_flow_change, BRUSH_WRITE_INTERVAL_MS, self
+        )
+        self.rotation_writer = ThrottledWriter(
+            self.apply_rotation_change, BRUSH_WRITE_INTERVAL_MS, self
+        )
+
+        # Polled by the shared scheduler; the owning widget activates it from
+        # its show/hide handling via get_poll_scheduler().set_active(self, ...).
+        get_poll_scheduler().register(self, self.check_brush_change, groups=(BRUSH,))
+
+    def _known_brush_state(self):
+        """The brush values the controls currently show, as a snapshot."""
+        return KritaStateSnapshot(
+            groups=frozenset((BRUSH,)),
+            brush_name=self.current_brush_name,
+            brush_size=self.current_brush_size,
+            brush_opacity=self.current_brush_opacity,
+            brush_flow=self.current_brush_flow,
+            brush_rotation=self.current_brush_rotation,
+            blend_mode=self.current_blend_mode,
+        )
+
+    def check_brush_change(self, snapshot=None):
+        """Re-sync the controls if the brush changed; returns True if it did."""
+        if snapshot is None:
+            snapshot = KritaStateSnapshot.capture((BRUSH,))
+        if snapshot.view is None or not snapshot.brush_name:
+            return False
+        changes = snapshot.changed_fields(self._known_brush_state(), BRUSH_FIELDS)
+        if not changes:
+            return False
+        if "brush_name" in changes:
+            # A value still queued for the old preset must not land on the new one.
+            for writer in (
+                self.size_writer,
+                self.opacity_writer,
+                self.flow_writer,
+                self.rotation_writer,
+            ):
+                writer.cancel()
+        self.current_brush_name = snapshot.brush_name
+        self.update_from_current_brush(snapshot)
+        return True
+
+    def update_from_current_brush(self, snapshot=None):
         if self.updating_from_brush:
             return
 
-        self.updating_from_brush = True
-
-        app = Krita.instance()
-        if app.activeWindow() and app.activeWindow().activeView():
-            view = app.activeWindow().activeView()
-
-            if self.size_slider is not None:
-                try:
-                    size = view.brushSize()
-                    self.size_slider.setValue(brush_size_to_slider(int(size)))
-                    self.size_value_label.setText(str(int(size)))
-                    self.current_brush_size = size
-                except Exception:
-                    self.size_slider.setValue(brush_size_to_slider(10))
-                    self.size_value_label.setText("10")
-                    self.current_brush_size = 10
-
-            if self.opacity_slider is not None:
-                try:
-                    opacity = view.paintingOpacity()
-                    opacity_percent = int(opacity * 100)
-                    self.opacity_slider.setValue(opacity_percent)
-                    self.opacity_value_label.setText(f"{opacity_percent}%")
-                    self.current_brush_opacity = opacity
-                except Exception:
-                    self.opacity_slider.setValue(100)
-                    self.opacity_value_label.setText("100%")
-                    self.current_brush_opacity = 1.0
-
-            if self.flow_slider is not None:
-                try:
-                    flow = view.paintingFlow()
-                    flow_percent = int(flow * 100)
-                    self.flow_slider.setValue(flow_percent)
-                    self.flow_value_label.setText(f"{flow_percent}%")
-                    self.current_brush_flow = flow
-                except Exception:
-                    self.flow_slider.setValue(100)
-                    self.flow_value_label.setText("100%")
-                    self.current_brush_flow = 1.0
+        if snapshot is None:
+            snapshot = KritaStateSnapshot.capture((BRUSH,))
+        if snapshot.view is None:
+            return
 
-            if self.rotation_widget is not None:
-                try:
-                    rotation = view.brushRotation()
-                    self.rotation_widget.setValue(int(rotation))
-                    self.rotation_value_label.setText(f"{int(rotation)}°")
-                    self.current_brush_rotation = rotation
-                except Exception:
-                    self.rotation_widget.setValue(0)
-                    self.rotation_value_label.setText("0°")
-                    self.current_brush_rotation = 0
+        self.updating_from_brush = True
 
+        size = snapshot.brush_size
+        self.current_brush_size = size if size is not None else 10
+        if self.size_slider is not None:
+            shown = int(self.current_brush_size)
+            self.size_slider.setValue(brush_size_to_slider(shown))
+            self.size_value_label.setText(str(shown))
+
+        opacity = snapshot.brush_opacity
+        self.current_brush_opacity = opacity if opacity is not None else 1.0
+        if self.opacity_slider is not None:
+            opacity_percent = int(self.current_brush_opacity * 100)
+            self.opacity_slider.setValue(opacity_percent)
+            self.opacity_value_label.setText(f"{opacity_percent}%")
+
+        flow = snapshot.brush_flow
+        self.current_brush_flow = flow if flow is not None else 1.0
+        if self.flow_slider is not None:
+            flow_percent = int(self.current_brush_flow * 100)
+            self.flow_slider.setValue(flow_percent)
+            self.flow_value_label.setText(f"{flow_percent}%")
+
+        rotation = snapshot.brush_rotation
+        self.current_brush_rotation = rotation if rotation is not None else 0
+        if self.rotation_widget is not None:
+            self.rotation_widget.setValue(int(self.current_brush_rotation))
+            self.rotation_value_label.setText(f"{int(self.current_brush_rotation)}°")
+
+        blend_mode = snapshot.blend_mode
+        if blend_mode is None:
             if self.blend_combo is not None:
-                try:
-                    blend_mode = view.currentBlendingMode()
-                    if blend_mode:
-                        index = self.blend_combo.findData(blend_mode)
-                        if index >= 0:
-                            self.blend_combo.setCurrentIndex(index)
-                        else:
-                            self.blend_combo.addItem(
-                                blend_mode.replace("_", " ").title(), blend_mode
-                            )
-                            self.blend_combo.setCurrentIndex(
-                                self.blend_combo.count() - 1
-                            )
-                        self.current_blend_mode = blend_mode
-                except Exception:
-                    self.blend_combo.setCurrentIndex(0)
-                    self.current_blend_mode = "normal"
+                self.blend_combo.setCurrentIndex(0)
+            self.current_blend_mode = "normal"
+        elif blend_mode:
+            if self.blend_combo is not None:
+                index = self.blend_combo.findData(blend_mode)
+                if index >= 0:
+                    self.blend_combo.setCurrentIndex(index)
+                else:
+                    self.blend_combo.addItem(
+                        blend_mode.replace("_", " ").title(), blend_mode
+                    )
+                    self.blend_combo.setCurrentIndex(self.blend_combo.count() - 1)
+            self.current_blend_mode = blend_mode
 
         self.updating_from_brush = False
 
-    def on_opacity_changed_debounced(self, value):
+    def on_opacity_changed(self, value):
         if self.updating_from_brush or self.opacity_slider is None:
             return
         self.opacity_value_label.setText(f"{value}%")
-        self.pending_opacity_value = value
-        self.opacity_debounce_timer.start(300)
+        self.opacity_writer.submit(value)
+        get_poll_scheduler().notify_activity()
 
-    def on_size_slider_changed_debounced(self, slider_value):
+    def on_size_slider_changed(self, slider_value):
         if self.updating_from_brush or self.size_slider is None:
             return
         brush_size = slider_to_brush_size(slider_value)
         self.size_value_label.setText(str(brush_size))
-        self.pending_size_value = brush_size
-        self.size_debounce_timer.start(300)
+        self.size_writer.submit(brush_size)
+        get_poll_scheduler().notify_activity()
 
-    def apply_size_change(self):
-        if self.pending_size_value is None:
-            return
-        value = self.pending_size_value
-        self.current_brush_size = value
+    def _active_view(self):
         app = Krita.instance()
-        if app.activeWindow() and app.activeWindow().activeView():
-            view = app.activeWindow().activeView()
+        window = app.activeWindow()
+        return window.activeView() if window else None
+
+    def apply_size_change(self, value):
+        self.current_brush_size = value
+        view = self._active_view()
+        if view:
             try:
                 view.setBrushSize(float(value))
             except Exception as e:
                 print(f"Error setting brush size: {e}")
 
-    def apply_opacity_change(self):
-        if self.pending_opacity_value is None:
-            return
-        value = self.pending_opacity_value
+    def apply_opacity_change(self, value):
         opacity_float = value / 100.0
         self.current_brush_opacity = opacity_float
-        app = Krita.instance()
-        if app.activeWindow() and app.activeWindow().activeView():
-            view = app.activeWindow().activeView()
+        view = self._active_view()
+        if view:
             try:
                 view.setPaintingOpacity(opacity_float)
             except Exception as e:
                 print(f"Error setting brush opacity: {e}")
 
-    def on_flow_changed_debounced(self, value):
+    def on_flow_changed(self, value):
         if self.updating_from_brush or self.flow_slider is None:
             return
         self.flow_value_label.setText(f"{value}%")
-        self.pending_flow_value = value
-        self.flow_debounce_timer.start(300)
+        self.flow_writer.submit(value)
+        get_poll_scheduler().notify_activity()
 
-    def apply_flow_change(self):
-        if self.pending_flow_value is None:
-            return
-        value = self.pending_flow_value
+    def apply_flow_change(self, value):
         flow_float = value / 100.0
         self.current_brush_flow = flow_float
-        app = Krita.instance()
-        if app.activeWindow() and app.activeWindow().activeView():
-            view = app.activeWindow().activeView()
+        view = self._active_view()
+        if view:
             try:
                 view.setPaintingFlow(flow_float)
             except Exception as e:
@@ -264,10 +192,13 @@ class BrushMonitorMixin:
         if self.updating_from_brush or self.rotation_widget is None:
             return
         self.rotation_value_label.setText(f"{value}°")
+        self.rotation_writer.submit(value)
+        get_poll_scheduler().notify_activity()
+
+    def apply_rotation_change(self, value):
         self.current_brush_rotation = value
-        app = Krita.instance()
-        if app.activeWindow() and app.activeWindow().activeView():
-            view = app.activeWindow().activeView()
+        view = self._active_view()
+        if view:
             try:
                 view.setBrushRotation(float(value))
             except Exception as e:
@@ -0,0 +1,158 @@
+"""Krita's foreground/background color, read once for every widget that shows it.
+
+The HueSVC docker, the HueSVC popup and the color history each used to read
+`view.foregroundColor()`/`backgroundColor()` and convert them for display on
+their own. `ColorStateService` is the one reader: it is a single consumer of
+the shared poll scheduler (so Krita's color signals and the fallback poll
+both reach it), keeps the last colors as a `ColorState`, and emits `changed`
+only when the displayed fg or bg actually differs. Widgets that write a color
+themselves report it with `note_foreground()` so the others follow at once.
+
+A subscriber calls `set_active(owner, True)` while it is shown; the service
+polls only while at least one subscriber is active.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Optional, Tuple
+
+from ..compat import QColor, QObject, pyqtSignal
+from .krita_state import COLORS, KritaStateSnapshot
+from .poll_scheduler import get_poll_scheduler
+
+# Matches HueSVC's default `poll_interval`; set_poll_interval() overrides it.
+DEFAULT_POLL_INTERVAL_MS = 250
+
+
+@dataclass(frozen=True)
+class ColorState:
+    """fg/bg as display RGB (0-255) plus the ManagedColors they came from.
+
+    `foreground_hsv` is `foreground` as Qt's integer HSV (`QColor.getHsv()`,
+    hue -1 for grays), converted once here instead of by every subscriber so
+    their pickers land on exactly the values a QColor would give them.
+    The ManagedColors take no part in equality.
+    """
+
+    foreground: Optional[Tuple[int, int, int]] = None
+    background: Optional[Tuple[int, int, int]] = None
+    foreground_hsv: Optional[Tuple[int, int, int]] = None
+    foreground_color: Any = field(default=None, compare=False, repr=False)
+    background_color: Any = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        return cls.create(
+            snapshot.foreground,
+            snapshot.background,
+            snapshot.foreground_color,
+            snapshot.background_color,
+        )
+
+    @classmethod
+    def create(cls, foreground, background, foreground_color=None, background_color=None):
+        return cls(
+            foreground=foreground,
+            background=background,
+            foreground_hsv=_qt_hsv(foreground) if foreground is not None else None,
+            foreground_color=foreground_color,
+            background_color=background_color,
+        )
+
+
+def _qt_hsv(rgb):
+    hue, saturation, value, _alpha = QColor(*rgb).getHsv()
+    return hue, saturation, value
+
+
+class ColorStateService(QObject):
+    """Caches Krita's fg/bg colors and emits `changed(ColorState)` on change."""
+
+    changed = pyqtSignal(object)
+
+    def __init__(self, scheduler=None):
+        super().__init__()
+        self._scheduler = scheduler if scheduler is not None else get_poll_scheduler()
+        self._state = ColorState()
+        self._active = set()
+        self._poll_interval_ms = DEFAULT_POLL_INTERVAL_MS
+        self._register()
+
+    @property
+    def state(self):
+        """The last known colors; may lag Krita while no subscriber is active."""
+        return self._state
+
+    def _register(self):
+        self._scheduler.register(
+            self,
+            self._on_poll,
+            min_interval_ms=self._poll_interval_ms,
+            groups=(COLORS,),
+        )
+
+    def set_poll_interval(self, interval_ms):
+        """Poll at most every `interval_ms` (Krita's color signals still tick at once)."""
+        if interval_ms == self._poll_interval_ms:
+            return
+        self._poll_interval_ms = interval_ms
+        active = self._scheduler.is_active(self)
+        self._scheduler.unregister(self)
+        self._register()
+        self._scheduler.set_active(self, active)
+
+    # ------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------
+    def set_active(self, owner, active):
+        """Mark `owner` shown/hidden; the service polls while any is shown."""
+        key = id(owner)
+        if active:
+            if key not in self._active:
+                self._active.add(key)
+                destroyed = getattr(owner, "destroyed", None)
+                if destroyed is not None:
+                    active_keys = self._active
+                    destroyed.connect(lambda *_args, key=key: active_keys.discard(key))
+        else:
+            self._active.discard(key)
+        self._scheduler.set_active(self, bool(self._active))
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def refresh(self):
+        """Read Krita's colors now (e.g. when a subscriber is shown)."""
+        self._update(ColorState.from_snapshot(KritaStateSnapshot.capture((COLORS,))))
+        return self._state
+
+    def note_foreground(self, rgb, managed_color=None):
+        """Record a foreground a widget just wrote to Krita, without reading it back."""
+        state = self._state
+        self._update(
+            ColorState.create(
+                tuple(rgb), state.background, managed_color, state.background_color
+            )
+        )
+
+    def _on_poll(self, snapshot):
+        return self._update(ColorState.from_snapshot(snapshot))
+
+    def _update(self, state):
+        if state == self._state:
+            # Same colors; keep the fresher ManagedColors without notifying.
+            if state.foreground_color is not None:
+                self._state = state
+            return False
+        self._state = state
+        self.changed.emit(state)
+        return True
+
+
+_color_state = None
+
+
+def get_color_state():
+    global _color_state
+    if _color_state is None:
+        _color_state = ColorStateService()
+    return _color_state
@@ -55,7 +55,7 @@ def create_brush_layer_controls(
         widget.size_slider.setMinimum(0)
         widget.size_slider.setMaximum(100)
         widget.size_slider.setValue(brush_size_to_slider(10))
-        widget.size_slider.valueChanged.connect(widget.on_size_slider_changed_debounced)
+        widget.size_slider.valueChanged.connect(widget.on_size_slider_changed)
 
         number_size = size_config.get("number_size", get_number_size())
         widget.size_value_label = QLabel("10")
@@ -79,7 +79,7 @@ def create_brush_layer_controls(
         widget.opacity_slider.setMinimum(0)
         widget.opacity_slider.setMaximum(100)
         widget.opacity_slider.setValue(100)
-        widget.opacity_slider.valueChanged.connect(widget.on_opacity_changed_debounced)
+        widget.opacity_slider.valueChanged.connect(widget.on_opacity_changed)
 
         number_size = opacity_config.get("number_size", get_number_size())
         widget.opacity_value_label = QLabel("100%")
@@ -103,7 +103,7 @@ def create_brush_layer_controls(
         widget.flow_slider.setMinimum(0)
         widget.flow_slider.setMaximum(100)
         widget.flow_slider.setValue(100)
-        widget.flow_slider.valueChanged.connect(widget.on_flow_changed_debounced)
+        widget.flow_slider.valueChanged.connect(widget.on_flow_changed)
 
         number_size = flow_config.get("number_size", get_number_size())
         widget.flow_value_label = QLabel("100%")
@@ -154,7 +154,7 @@ def create_brush_layer_controls(
         widget.layer_opacity_slider.setMaximum(100)
         widget.layer_opacity_slider.setValue(100)
         widget.layer_opacity_slider.valueChanged.connect(
-            widget.on_layer_opacity_changed_debounced
+            widget.on_layer_opacity_changed
         )
 
         number_size = layer_opacity_config.get("number_size", get_number_size())
@@ -4,6 +4,7 @@ Docker factory and wrapper classes for the remastered Quick Adjust Docker.
 
 from krita import DockWidgetFactory, DockWidgetFactoryBase  # type: ignore
 
+from .. import startup_profiler
 from ..compat import QDockWidget
 from .adjustment_widget import BrushAdjustmentWidget
 
@@ -21,7 +22,10 @@ class QuickAdjustDockerFactory(DockWidgetFactoryBase):
         super().__init__(DOCKER_ID, dock_pos)
 
     def createDockWidget(self):
-        return QuickAdjustDockerWidget()
+        with startup_profiler.phase("createDockWidget: Quick Adjust"):
+            dock = QuickAdjustDockerWidget()
+        startup_profiler.watch_first_paint(dock, "Quick Adjust")
+        return dock
 
 
 class QuickAdjustDockerWidget(QDockWidget):
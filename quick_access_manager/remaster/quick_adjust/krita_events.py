@@ -0,0 +1,136 @@
+"""Krita signals that tell the poll scheduler a snapshot group just changed.
+
+Krita's scripting API has no "brush changed" or "layer changed" signal, but
+most ways of changing them go through something that does signal: a new or
+closed view/image, switching the active view, or one of the QActions below
+(keyboard shortcuts, toolbar buttons, the pop-up palette). `KritaEventBridge`
+listens to those and emits `stateChanged(groups)`, which the scheduler turns
+into an immediate tick for the affected consumers. Everything without a
+signal (picking a preset in the Brush Presets docker, clicking a layer in the
+Layers docker) is still caught by the scheduler's slower fallback poll.
+"""
+
+from krita import Krita  # type: ignore
+
+from ..compat import QObject, pyqtSignal
+from .krita_state import ALL_GROUPS, BRUSH, COLORS, LAYER, SELECTION, STATUS
+
+# Action ids whose effect shows up in a snapshot group. Ids this Krita
+# version does not have are skipped.
+BRUSH_ACTIONS = (
+    "increase_brush_size",
+    "decrease_brush_size",
+    "increase_opacity",
+    "decrease_opacity",
+    "reload_preset_action",
+    "previous_preset",
+    "previous_favorite_preset",
+    "next_favorite_preset",
+)
+LAYER_ACTIONS = (
+    "activateNextLayer",
+    "activatePreviousLayer",
+    "switchToPreviouslyActiveNode",
+    "add_new_paint_layer",
+    "duplicatelayer",
+    "remove_layer",
+    "merge_layer",
+    "flatten_layer",
+)
+COLOR_ACTIONS = (
+    "toggle_fg_bg",
+    "reset_fg_bg",
+    "make_brush_color_lighter",
+    "make_brush_color_darker",
+    "make_brush_color_saturated",
+    "make_brush_color_desaturated",
+    "shift_brush_color_clockwise",
+    "shift_brush_color_counter_clockwise",
+)
+STATUS_ACTIONS = ("erase_action", "preserve_alpha")
+SELECTION_ACTIONS = ("select_all", "deselect")
+
+ACTION_GROUPS = {
+    action_id: frozenset(groups)
+    for action_ids, groups in (
+        (BRUSH_ACTIONS, (BRUSH,)),
+        (LAYER_ACTIONS, (LAYER, STATUS)),
+        (COLOR_ACTIONS, (COLORS,)),
+        # Toggling the eraser can swap the preset's size and blending mode.
+        (STATUS_ACTIONS, (STATUS, BRUSH)),
+        (SELECTION_ACTIONS, (SELECTION,)),
+    )
+    for action_id in action_ids
+}
+
+
+class KritaEventBridge(QObject):
+    """Connects Krita's notifier, window and action signals to `stateChanged`.
+
+    `attach()` is idempotent and cheap to call again: Krita creates its
+    actions with the first main window, so anything missing is retried when
+    a window appears.
+    """
+
+    stateChanged = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._notifier_connected = False
+        self._windows = {}  # QMainWindow -> the Window wrapper connected through
+        self._actions = set()
+
+    @property
+    def attached(self):
+        return self._notifier_connected
+
+    def attach(self):
+        try:
+            app = Krita.instance()
+            if not self._notifier_connected:
+                notifier = app.notifier()
+                notifier.windowCreated.connect(self._on_window_created)
+                notifier.viewCreated.connect(self._on_everything_changed)
+                notifier.viewClosed.connect(self._on_everything_changed)
+                notifier.imageCreated.connect(self._on_everything_changed)
+                notifier.imageClosed.connect(self._on_everything_changed)
+                self._notifier_connected = True
+            for window in app.windows():
+                self._attach_window(window)
+            self._attach_actions(app)
+        except Exception as e:
+            print(f"Quick Adjust could not connect Krita signals: {e}")
+
+    def _attach_window(self, window):
+        # Krita hands out a new Window wrapper on every call, so windows are
+        # told apart by their QMainWindow. The signal lives on the wrapper and
+        # goes away with it: the one connected through is kept alive here.
+        qwindow = window.qwindow()
+        if qwindow is None or qwindow in self._windows:
+            return
+        signal = getattr(window, "activeViewChanged", None)
+        if signal is None:
+            return
+        signal.connect(self._on_everything_changed)
+        self._windows[qwindow] = window
+
+    def _attach_actions(self, app):
+        for action_id in ACTION_GROUPS:
+            if action_id in self._actions:
+                continue
+            action = app.action(action_id)
+            if action is None:
+                continue
+            action.triggered.connect(self._on_action_triggered)
+            self._actions.add(action_id)
+
+    def _on_action_triggered(self, *_args):
+        sender = self.sender()
+        groups = ACTION_GROUPS.get(sender.objectName()) if sender else None
+        self.stateChanged.emit(groups or ALL_GROUPS)
+
+    def _on_window_created(self):
+        self.attach()
+
+    def _on_everything_changed(self, *_args):
+        self.stateChanged.emit(ALL_GROUPS)
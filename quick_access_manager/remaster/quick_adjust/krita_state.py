@@ -0,0 +1,211 @@
+"""Immutable snapshot of the Krita state the Quick Adjust and HueSVC widgets mirror.
+
+The poll scheduler captures one `KritaStateSnapshot` per tick and hands it to
+every consumer, so the brush preset, brush/layer values, fg/bg colors and the
+status actions are each read from Krita once per tick instead of once per
+consumer (and again when that consumer re-syncs its controls).
+
+Fields are grouped (`BRUSH_FIELDS`, `LAYER_FIELDS`, `COLOR_FIELDS`,
+`STATUS_FIELDS`, `SELECTION_FIELDS`); a capture only reads the groups asked
+for, and `changed_fields()` only compares groups both snapshots captured.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, FrozenSet, Iterable, Optional, Tuple
+
+from krita import Krita  # type: ignore
+
+from ..shared import metrics
+
+BRUSH = "brush"
+LAYER = "layer"
+COLORS = "colors"
+STATUS = "status"
+SELECTION = "selection"
+ALL_GROUPS = frozenset((BRUSH, LAYER, COLORS, STATUS, SELECTION))
+
+BRUSH_FIELDS = (
+    "brush_name",
+    "brush_size",
+    "brush_opacity",
+    "brush_flow",
+    "brush_rotation",
+    "blend_mode",
+)
+LAYER_FIELDS = ("layer_id", "layer_opacity", "layer_blend_mode")
+COLOR_FIELDS = ("foreground", "background")
+STATUS_FIELDS = ("preserve_alpha", "erase_mode")
+SELECTION_FIELDS = ("has_selection",)
+
+FIELD_GROUPS = {
+    BRUSH: BRUSH_FIELDS,
+    LAYER: LAYER_FIELDS,
+    COLORS: COLOR_FIELDS,
+    STATUS: STATUS_FIELDS,
+    SELECTION: SELECTION_FIELDS,
+}
+
+# Sliders write back rounded values while Krita reports floats, so numeric
+# brush fields compare with a tolerance instead of exactly.
+FIELD_TOLERANCES = {
+    "brush_size": 0.01,
+    "brush_rotation": 0.01,
+    "brush_opacity": 0.005,
+    "brush_flow": 0.005,
+}
+
+
+def value_changed(current, previous, tolerance=0.01):
+    """Compare two polled values, numerically within `tolerance`."""
+    if current is None or previous is None:
+        return current is not previous
+    if isinstance(current, (int, float)) and isinstance(previous, (int, float)):
+        return abs(current - previous) > tolerance
+    return current != previous
+
+
+def _read(getter):
+    try:
+        return getter()
+    except Exception:
+        return None
+
+
+def _rgb(managed_color, canvas):
+    if not managed_color:
+        return None
+    qcolor = managed_color.colorForCanvas(canvas)
+    if qcolor is None or not qcolor.isValid():
+        return None
+    return (qcolor.red(), qcolor.green(), qcolor.blue())
+
+
+def _action_checked(app, action_id):
+    action = app.action(action_id)
+    return action.isChecked() if action else False
+
+
+@dataclass(frozen=True)
+class KritaStateSnapshot:
+    """Krita state read once per poll tick.
+
+    `app`/`window`/`view`/`document` are the objects the values were read
+    from, kept so consumers can write back without resolving them again;
+    they take no part in equality or change detection.
+    """
+
+    groups: FrozenSet[str] = frozenset()
+
+    brush_name: Optional[str] = None
+    brush_size: Optional[float] = None
+    brush_opacity: Optional[float] = None
+    brush_flow: Optional[float] = None
+    brush_rotation: Optional[float] = None
+    blend_mode: Optional[str] = None
+
+    # The active node's uniqueId(), so switching between two layers that look
+    # alike still counts as a change.
+    layer_id: Any = None
+    layer_opacity: Optional[int] = None
+    layer_blend_mode: Optional[str] = None
+
+    foreground: Optional[Tuple[int, int, int]] = None
+    background: Optional[Tuple[int, int, int]] = None
+
+    has_selection: bool = False
+    preserve_alpha: bool = False
+    erase_mode: bool = False
+
+    app: Any = field(default=None, compare=False, repr=False)
+    window: Any = field(default=None, compare=False, repr=False)
+    view: Any = field(default=None, compare=False, repr=False)
+    document: Any = field(default=None, compare=False, repr=False)
+    # The ManagedColors `foreground`/`background` were converted from.
+    foreground_color: Any = field(default=None, compare=False, repr=False)
+    background_color: Any = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    @metrics.timed(metrics.histogram("krita.snapshot_capture"))
+    def capture(cls, groups: Iterable[str] = ALL_GROUPS) -> "KritaStateSnapshot":
+        groups = frozenset(groups)
+        app = Krita.instance()
+        window = app.activeWindow()
+        view = window.activeView() if window else None
+        document = app.activeDocument()
+        values = {}
+
+        if BRUSH in groups and view is not None:
+            preset = _read(view.currentBrushPreset)
+            values["brush_name"] = preset.name() if preset else None
+            values["brush_size"] = _read(view.brushSize)
+            values["brush_opacity"] = _read(view.paintingOpacity)
+            values["brush_flow"] = _read(view.paintingFlow)
+            values["brush_rotation"] = _read(view.brushRotation)
+            values["blend_mode"] = _read(view.currentBlendingMode)
+
+        if LAYER in groups and document is not None:
+            node = _read(document.activeNode)
+            if node:
+                values["layer_id"] = _read(node.uniqueId)
+                values["layer_opacity"] = _read(node.opacity)
+                values["layer_blend_mode"] = _read(node.blendingMode)
+
+        if COLORS in groups and view is not None:
+            try:
+                canvas = view.canvas()
+                values["foreground_color"] = view.foregroundColor()
+                values["background_color"] = view.backgroundColor()
+                values["foreground"] = _rgb(values["foreground_color"], canvas)
+                values["background"] = _rgb(values["background_color"], canvas)
+            except Exception:
+                pass
+
+        if SELECTION in groups:
+            try:
+                values["has_selection"] = (
+                    document is not None and document.selection() is not None
+                )
+            except Exception:
+                pass
+
+        if STATUS in groups:
+            try:
+                values["preserve_alpha"] = _action_checked(app, "preserve_alpha")
+                values["erase_mode"] = _action_checked(app, "erase_action")
+            except Exception:
+                pass
+
+        return cls(
+            groups=groups,
+            app=app,
+            window=window,
+            view=view,
+            document=document,
+            **values,
+        )
+
+    def changed_fields(
+        self, previous: Optional["KritaStateSnapshot"], among: Iterable[str] = None
+    ) -> FrozenSet[str]:
+        """Names of the fields that differ from `previous`.
+
+        Only groups captured by both snapshots are compared; with no previous
+        snapshot every captured field counts as changed. `among` narrows the
+        comparison to the given field names.
+        """
+        groups = self.groups if previous is None else self.groups & previous.groups
+        names = [name for group in groups for name in FIELD_GROUPS[group]]
+        if among is not None:
+            wanted = set(among)
+            names = [name for name in names if name in wanted]
+        if previous is None:
+            return frozenset(names)
+        return frozenset(
+            name
+            for name in names
+            if value_changed(
+                getattr(self, name),
+                getattr(previous, name),
+                FIELD_TOLERANCES.get(name, 0),
+            )
+        )
@@ -4,116 +4,100 @@ Layer state monitoring and control functionality.
 
 from krita import Krita  # type: ignore
 
-from ..compat import QTimer
+from .krita_state import LAYER, LAYER_FIELDS, KritaStateSnapshot
+from .poll_scheduler import get_poll_scheduler
+from .write_throttle import LAYER_WRITE_INTERVAL_MS, ThrottledWriter
 
 
 class LayerMonitorMixin:
     """Mixin providing layer monitoring and control methods for BrushAdjustmentWidget."""
 
     def setup_layer_monitoring(self):
+        self.current_layer_id = None
         self.current_layer_opacity = None
         self.current_layer_blend_mode = None
         self.updating_from_layer = False
 
-        self.layer_opacity_debounce_timer = QTimer()
-        self.layer_opacity_debounce_timer.setSingleShot(True)
-        self.layer_opacity_debounce_timer.timeout.connect(
-            self.apply_layer_opacity_change
+        self.layer_opacity_writer = ThrottledWriter(
+            self.apply_layer_opacity_change, LAYER_WRITE_INTERVAL_MS, self
         )
 
-        self.pending_layer_opacity_value = None
-
-        self.layer_check_timer = QTimer()
-        self.layer_check_timer.timeout.connect(self.check_layer_change)
-        self.layer_check_timer.start(200)
-
-    def check_layer_change(self):
-        app = Krita.instance()
-
-        current_layer_opacity = None
-        current_layer_blend_mode = None
-
-        try:
-            if app.activeDocument() and app.activeDocument().activeNode():
-                current_layer_opacity = app.activeDocument().activeNode().opacity()
-        except Exception:
-            pass
-
-        try:
-            if app.activeDocument() and app.activeDocument().activeNode():
-                current_layer_blend_mode = (
-                    app.activeDocument().activeNode().blendingMode()
-                )
-        except Exception:
-            pass
-
-        layer_opacity_changed = current_layer_opacity != self.current_layer_opacity
-        layer_blend_changed = current_layer_blend_mode != self.current_layer_blend_mode
-
-        if layer_opacity_changed or layer_blend_changed:
-            self.current_layer_opacity = current_layer_opacity
-            self.current_layer_blend_mode = current_layer_blend_mode
-            self.update_from_current_layer()
-
-    def update_from_current_layer(self):
+        get_poll_scheduler().register(self, self.check_layer_change, groups=(LAYER,))
+
+    def check_layer_change(self, snapshot=None):
+        """Re-sync the layer controls if the layer changed; returns True if it did."""
+        if snapshot is None:
+            snapshot = KritaStateSnapshot.capture((LAYER,))
+        known = KritaStateSnapshot(
+            groups=frozenset((LAYER,)),
+            layer_id=self.current_layer_id,
+            layer_opacity=self.current_layer_opacity,
+            layer_blend_mode=self.current_layer_blend_mode,
+        )
+        changes = snapshot.changed_fields(known, LAYER_FIELDS)
+        if not changes:
+            return False
+        if "layer_id" in changes:
+            # An opacity still queued for the old layer must not land on the new one.
+            self.layer_opacity_writer.cancel()
+        self.current_layer_id = snapshot.layer_id
+        self.current_layer_opacity = snapshot.layer_opacity
+        self.current_layer_blend_mode = snapshot.layer_blend_mode
+        self.update_from_current_layer(snapshot)
+        return True
+
+    def update_from_current_layer(self, snapshot=None):
         if self.updating_from_layer:
             return
 
-        app = Krita.instance()
+        if snapshot is None:
+            snapshot = KritaStateSnapshot.capture((LAYER,))
+        if snapshot.layer_opacity is None and snapshot.layer_blend_mode is None:
+            # No document or no active node: leave the controls as they are.
+            return
+
         self.updating_from_layer = True
 
         if self.layer_opacity_slider is not None:
-            try:
-                active_node = (
-                    app.activeDocument().activeNode() if app.activeDocument() else None
-                )
-                if active_node:
-                    layer_opacity = active_node.opacity()
-                    layer_opacity_percent = int(layer_opacity * 100 / 255)
-                    self.layer_opacity_slider.setValue(layer_opacity_percent)
-                    self.layer_opacity_value_label.setText(f"{layer_opacity_percent}%")
-                    self.current_layer_opacity = layer_opacity
-            except Exception:
+            layer_opacity = snapshot.layer_opacity
+            if layer_opacity is None:
                 self.layer_opacity_slider.setValue(100)
                 self.layer_opacity_value_label.setText("100%")
                 self.current_layer_opacity = 255
+            else:
+                layer_opacity_percent = int(layer_opacity * 100 / 255)
+                self.layer_opacity_slider.setValue(layer_opacity_percent)
+                self.layer_opacity_value_label.setText(f"{layer_opacity_percent}%")
+                self.current_layer_opacity = layer_opacity
 
         if self.layer_blend_combo is not None:
-            try:
-                active_node = (
-                    app.activeDocument().activeNode() if app.activeDocument() else None
-                )
-                if active_node:
-                    layer_blend_mode = active_node.blendingMode()
-                    if layer_blend_mode:
-                        index = self.layer_blend_combo.findData(layer_blend_mode)
-                        if index >= 0:
-                            self.layer_blend_combo.setCurrentIndex(index)
-                        else:
-                            self.layer_blend_combo.addItem(
-                                layer_blend_mode.replace("_", " ").title(),
-                                layer_blend_mode,
-                            )
-                            self.layer_blend_combo.setCurrentIndex(
-                                self.layer_blend_combo.count() - 1
-                            )
-                        self.current_layer_blend_mode = layer_blend_mode
-            except Exception:
+            layer_blend_mode = snapshot.layer_blend_mode
+            if layer_blend_mode is None:
                 self.layer_blend_combo.setCurrentIndex(0)
                 self.current_layer_blend_mode = "normal"
+            elif layer_blend_mode:
+                index = self.layer_blend_combo.findData(layer_blend_mode)
+                if index >= 0:
+                    self.layer_blend_combo.setCurrentIndex(index)
+                else:
+                    self.layer_blend_combo.addItem(
+                        layer_blend_mode.replace("_", " ").title(),
+                        layer_blend_mode,
+                    )
+                    self.layer_blend_combo.setCurrentIndex(
+                        self.layer_blend_combo.count() - 1
+                    )
+                self.current_layer_blend_mode = layer_blend_mode
         self.updating_from_layer = False
 
-    def on_layer_opacity_changed_debounced(self, value):
+    def on_layer_opacity_changed(self, value):
         if self.updating_from_layer or self.layer_opacity_slider is None:
             return
         self.layer_opacity_value_label.setText(f"{value}%")
-        self.pending_layer_opacity_value = value
-        self.layer_opacity_debounce_timer.start(300)
+        self.layer_opacity_writer.submit(value)
+        get_poll_scheduler().notify_activity()
 
-    def apply_layer_opacity_change(self):
-        if self.pending_layer_opacity_value is None:
-            return
-        value = self.pending_layer_opacity_value
+    def apply_layer_opacity_change(self, value):
         opacity_int = int(value * 255 / 100)
         self.current_layer_opacity = opacity_int
 
@@ -0,0 +1,265 @@
+"""One shared, adaptive poll loop for everything that mirrors Krita state.
+
+The brush monitor, layer monitor, docker resize check, status icons and the
+HueSVC color pickers used to run a QTimer each and query Krita on every one
+of them. The scheduler runs a single timer instead: each tick captures one
+`KritaStateSnapshot` (only the field groups the due consumers asked for) and
+hands it to every consumer whose owner is currently shown.
+
+Changes Krita signals (view/image switches, brush/layer/color actions; see
+krita_events) trigger a tick for the affected consumers `EVENT_DELAY_MS`
+later, so the timer is only the fallback for changes that have no signal.
+
+The interval adapts. While the user is interacting (the snapshot changed
+since the last tick, a consumer reported a change, or a widget called
+`notify_activity()`) it ticks every `FAST_INTERVAL_MS`; once nothing has
+changed it doubles up to `MAX_INTERVAL_MS`, starting from
+`EVENT_BACKED_BASE_INTERVAL_MS` once Krita's signals are connected. With no
+active owner the timer stops completely.
+"""
+
+import time
+
+from ..compat import QObject, QTimer
+from ..shared import metrics
+from .krita_events import KritaEventBridge
+from .krita_state import ALL_GROUPS, KritaStateSnapshot
+
+FAST_INTERVAL_MS = 100
+BASE_INTERVAL_MS = 200
+# Idle backoff floor when signals cover the common changes.
+EVENT_BACKED_BASE_INTERVAL_MS = 500
+MAX_INTERVAL_MS = 2000
+# Krita applies an action in its own triggered handler; run the follow-up
+# tick a moment later so it sees the result, and so bursts coalesce.
+EVENT_DELAY_MS = 10
+# How long a notify_activity() call keeps the loop at the fast interval.
+ACTIVITY_WINDOW_MS = 1000
+
+_interval_gauge = metrics.gauge("poll.interval_ms")
+
+
+def _now_ms():
+    return time.monotonic() * 1000.0
+
+
+class _Consumer:
+    __slots__ = ("callback", "min_interval_ms", "groups", "last_run_ms")
+
+    def __init__(self, callback, min_interval_ms, groups):
+        self.callback = callback
+        self.min_interval_ms = min_interval_ms
+        self.groups = frozenset(groups)
+        self.last_run_ms = None
+
+    def wanted(self, now, event_groups=None):
+        """Due by its min interval, or (for an event tick) reads `event_groups`."""
+        if event_groups is not None:
+            return bool(self.groups & event_groups)
+        return not (
+            self.min_interval_ms
+            and self.last_run_ms is not None
+            and now - self.last_run_ms < self.min_interval_ms
+        )
+
+
+class _Owner:
+    __slots__ = ("owner", "consumers", "active")
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.consumers = []
+        self.active = False
+
+
+class PollScheduler(QObject):
+    """Single adaptive timer fanning one snapshot out to registered consumers.
+
+    Consumers are grouped by owner (usually the widget that shows the data),
+    so one show/hide toggles all of that widget's polling. A consumer is
+    `callback(snapshot) -> bool`; returning True means it saw a change, which
+    keeps the loop fast.
+    """
+
+    def __init__(self, use_events=True):
+        super().__init__()
+        self._owners = {}
+        self._interval_ms = BASE_INTERVAL_MS
+        self._last_activity_ms = None
+        self._last_snapshot = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.tick)
+
+        self._pending_groups = frozenset()
+        self._event_timer = QTimer(self)
+        self._event_timer.setSingleShot(True)
+        self._event_timer.timeout.connect(self._run_event_tick)
+        self._events = None
+        if use_events:
+            self._events = KritaEventBridge(self)
+            self._events.stateChanged.connect(self.request_tick)
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+    def register(self, owner, callback, min_interval_ms=0, groups=ALL_GROUPS):
+        """Add `callback` under `owner`. Inactive until set_active(owner, True).
+
+        `min_interval_ms` lets slow housekeeping (the docker resize check)
+        share the loop without running on every fast tick. `groups` names the
+        snapshot field groups the callback reads (see krita_state); pass an
+        empty tuple for a callback that needs none.
+        """
+        key = id(owner)
+        entry = self._owners.get(key)
+        if entry is None:
+            entry = _Owner(owner)
+            self._owners[key] = entry
+            destroyed = getattr(owner, "destroyed", None)
+            if destroyed is not None:
+                # Close over the dict, not self: the owner may outlive us.
+                owners = self._owners
+                destroyed.connect(lambda *_args, key=key: owners.pop(key, None))
+        entry.consumers.append(_Consumer(callback, min_interval_ms, groups))
+
+    def unregister(self, owner):
+        self._owners.pop(id(owner), None)
+        if not self._has_active_owner():
+            self._stop()
+
+    def set_active(self, owner, active):
+        """Start/stop polling for `owner`, typically from its show/hide events."""
+        entry = self._owners.get(id(owner))
+        if entry is None or entry.active == bool(active):
+            return
+        entry.active = bool(active)
+        if entry.active:
+            if self._events is not None:
+                self._events.attach()
+            for consumer in entry.consumers:
+                consumer.last_run_ms = None
+            self.notify_activity()
+        elif not self._has_active_owner():
+            self._stop()
+
+    def is_active(self, owner):
+        entry = self._owners.get(id(owner))
+        return bool(entry and entry.active)
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def interval(self):
+        return self._interval_ms
+
+    def notify_activity(self):
+        """Drop to the fast interval; call from user input on a polled widget."""
+        self._last_activity_ms = _now_ms()
+        self._interval_ms = FAST_INTERVAL_MS
+        if not self._has_active_owner():
+            return
+        remaining = self._timer.remainingTime() if self._timer.isActive() else -1
+        if remaining < 0 or remaining > FAST_INTERVAL_MS:
+            self._timer.start(FAST_INTERVAL_MS)
+
+    def poll_now(self):
+        """Run a tick immediately (e.g. right after a docker becomes visible)."""
+        self.tick()
+
+    def request_tick(self, groups=ALL_GROUPS):
+        """Tick soon for consumers reading `groups`, e.g. after a Krita signal."""
+        if not self._has_active_owner():
+            return
+        self._pending_groups = self._pending_groups | frozenset(groups)
+        if not self._event_timer.isActive():
+            self._event_timer.start(EVENT_DELAY_MS)
+
+    def _run_event_tick(self):
+        groups, self._pending_groups = self._pending_groups, frozenset()
+        if groups:
+            self.tick(groups)
+
+    @metrics.timed(metrics.histogram("poll.tick"))
+    def tick(self, event_groups=None):
+        """Run the due consumers, or with `event_groups` the ones reading them."""
+        active = [entry for entry in self._owners.values() if entry.active]
+        if not active:
+            self._stop()
+            return
+
+        now = _now_ms()
+        due = [
+            (
+                entry,
+                [
+                    consumer
+                    for consumer in entry.consumers
+                    if consumer.wanted(now, event_groups)
+                ],
+            )
+            for entry in active
+        ]
+        groups = frozenset().union(
+            *(consumer.groups for _entry, consumers in due for consumer in consumers)
+        )
+        snapshot = KritaStateSnapshot.capture(groups)
+        # The first snapshot is only a baseline; activation already sped up.
+        changed = self._last_snapshot is not None and bool(
+            snapshot.changed_fields(self._last_snapshot)
+        )
+        self._last_snapshot = snapshot
+        dead = []
+        for entry, consumers in due:
+            for consumer in consumers:
+                consumer.last_run_ms = now
+                try:
+                    if consumer.callback(snapshot):
+                        changed = True
+                except RuntimeError:
+                    # The owning widget's C++ side is gone; drop it.
+                    dead.append(id(entry.owner))
+                    break
+                except Exception as e:
+                    print(f"Quick Adjust poll consumer failed: {e}")
+        for key in dead:
+            self._owners.pop(key, None)
+
+        self._adapt(changed, now)
+        if self._has_active_owner():
+            self._timer.start(self._interval_ms)
+
+    def _adapt(self, changed, now):
+        recently_active = (
+            self._last_activity_ms is not None
+            and now - self._last_activity_ms < ACTIVITY_WINDOW_MS
+        )
+        if changed:
+            self._last_activity_ms = now
+            self._interval_ms = FAST_INTERVAL_MS
+        elif recently_active:
+            self._interval_ms = FAST_INTERVAL_MS
+        else:
+            base = BASE_INTERVAL_MS
+            if self._events is not None and self._events.attached:
+                base = EVENT_BACKED_BASE_INTERVAL_MS
+            self._interval_ms = min(MAX_INTERVAL_MS, max(base, self._interval_ms * 2))
+        _interval_gauge.set(self._interval_ms)
+
+    def _stop(self):
+        self._timer.stop()
+        self._event_timer.stop()
+        self._pending_groups = frozenset()
+
+    def _has_active_owner(self):
+        return any(entry.active for entry in self._owners.values())
+
+
+_poll_scheduler = None
+
+
+def get_poll_scheduler():
+    global _poll_scheduler
+    if _poll_scheduler is None:
+        _poll_scheduler = PollScheduler()
+    return _poll_scheduler
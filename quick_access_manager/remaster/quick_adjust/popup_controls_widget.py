@@ -8,6 +8,7 @@ from ..compat import QWidget
 from .controls_builder import build_popup_controls_layout
 from .brush_monitor import BrushMonitorMixin
 from .layer_monitor import LayerMonitorMixin
+from .poll_scheduler import get_poll_scheduler
 from .settings import get_blender_mode_list, get_brush_section, get_layer_section
 
 
@@ -48,17 +49,14 @@ class BrushLayerControlsWidget(QWidget, BrushMonitorMixin, LayerMonitorMixin):
 
     def start_monitoring(self):
         """Resume polling brush/layer state. Call when the popup becomes visible."""
-        self.brush_check_timer.start(200)
-        self.layer_check_timer.start(200)
+        get_poll_scheduler().set_active(self, True)
         self.update_from_current_brush()
         self.update_from_current_layer()
 
     def stop_monitoring(self):
         """Pause polling brush/layer state. Call when the popup is hidden."""
-        self.brush_check_timer.stop()
-        self.layer_check_timer.stop()
+        get_poll_scheduler().set_active(self, False)
 
     def closeEvent(self, event):
-        self.brush_check_timer.stop()
-        self.layer_check_timer.stop()
+        get_poll_scheduler().unregister(self)
         super().closeEvent(event)
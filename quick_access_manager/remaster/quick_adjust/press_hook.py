@@ -0,0 +1,101 @@
+"""One deferred, coalesced check after mouse presses anywhere in Krita.
+
+The brush and color histories record the preset and color the user actually
+works with, and the only hint they get is a mouse press: on the canvas (a
+stroke), a preset chooser, a shortcut's button. Checking Krita inside the application-wide
+event filter would run Python and Krita API calls before Krita sees the
+press, delaying the start of every stroke. `PressHook` installs a single
+filter that only starts a zero-interval timer; the subscribed checks run
+once, after the press has been delivered, however many presses arrived in
+between and however many widgets subscribe.
+"""
+
+from ..compat import QApplication, QEvent, QObject, Qt, QTimer
+
+
+class PressHook(QObject):
+    """Runs each active owner's callback once after unmodified mouse presses."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._callbacks = {}
+        self._active = set()
+        self._installed = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._run)
+
+    def register(self, owner, callback):
+        """Add `callback` under `owner`. Inactive until set_active(owner, True)."""
+        key = id(owner)
+        if key not in self._callbacks:
+            destroyed = getattr(owner, "destroyed", None)
+            if destroyed is not None:
+                destroyed.connect(lambda *_args, key=key: self._forget(key))
+        self._callbacks[key] = callback
+
+    def set_active(self, owner, active):
+        """Start/stop running `owner`'s callback, typically from show/hide."""
+        key = id(owner)
+        if active and key in self._callbacks:
+            self._active.add(key)
+        else:
+            self._active.discard(key)
+        self._install(bool(self._active))
+
+    def is_pending(self):
+        return self._timer.isActive()
+
+    def _forget(self, key):
+        self._callbacks.pop(key, None)
+        self._active.discard(key)
+        self._install(bool(self._active))
+
+    def _install(self, install):
+        if install == self._installed:
+            return
+        app = QApplication.instance()
+        if app is None:
+            return
+        try:
+            if install:
+                app.installEventFilter(self)
+            else:
+                app.removeEventFilter(self)
+                self._timer.stop()
+            self._installed = install
+        except RuntimeError:
+            # At exit the hook itself can be deleted before its owners.
+            pass
+        except Exception as e:
+            print(f"Error updating event filter: {e}")
+
+    def eventFilter(self, obj, event):
+        if (
+            event.type() == QEvent.MouseButtonPress
+            and not self._timer.isActive()
+            and event.modifiers() == Qt.NoModifier
+        ):
+            self._timer.start()
+        return False
+
+    def _run(self):
+        for key in list(self._active):
+            callback = self._callbacks.get(key)
+            if callback is None:
+                continue
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in mouse-press check: {e}")
+
+
+_press_hook = None
+
+
+def get_press_hook():
+    global _press_hook
+    if _press_hook is None:
+        _press_hook = PressHook()
+    return _press_hook
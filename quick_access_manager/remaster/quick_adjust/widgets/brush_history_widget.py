@@ -1,35 +1,51 @@
+from collections import OrderedDict
+
 from krita import Krita  # type: ignore
 
 from ...compat import (
-    QApplication,
     QBrush,
     QColor,
-    QEvent,
     QHBoxLayout,
     QIcon,
     QPainter,
     QPixmap,
     QPushButton,
     QSize,
-    Qt,
+    QTimer,
     QVBoxLayout,
     QWidget,
 )
+from ...infrastructure import HistoryRepository
+from ..press_hook import get_press_hook
 
 BRUSH_HISTORY_BACKGROUND_COLOR = "#b0b0b0"
+HISTORY_KEY = "brushes"
+# Disk writes are batched: switching brushes quickly saves once.
+SAVE_DELAY_MS = 2000
 
 
 class BrushHistoryWidget(QWidget):
     """Widget to display brush history in 2 rows"""
 
-    def __init__(self, parent=None, brush_history_number=20, icon_size=30):
+    def __init__(
+        self, parent=None, brush_history_number=20, icon_size=30, repository=None
+    ):
         super().__init__(parent)
         self.TOTAL_BRUSHES = brush_history_number
         self.BRUSHES_PER_ROW = brush_history_number // 2
         self.ICON_SIZE = icon_size
-        self.brush_history = []
+        self._repository = repository or HistoryRepository()
+        # Preset name -> (preset, thumbnail icon), most recent first. The
+        # thumbnail is made once, when the preset enters the history.
+        self.brush_history = OrderedDict()
         self.brush_buttons = []
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.save_history)
         self.init_ui()
+        self.load_history()
+        get_press_hook().register(self, self.check_brush_change)
         self.install_event_filter()
         self.force_brush_update()
 
@@ -74,32 +90,17 @@ class BrushHistoryWidget(QWidget):
         self.set_filter_active(True)
 
     def set_filter_active(self, active):
-        """Add/remove the application-wide mouse filter.
+        """Start/stop checking the brush after mouse presses anywhere in Krita.
 
-        This filter sees every click in Krita, so it is only installed while the
-        docker is actually visible. closeEvent is not reliable for a docker
-        child widget, which is why removal cannot depend on it alone.
+        The check is deferred and shared through the press hook, so a press
+        that starts a stroke is never held up by it. It only runs while the
+        docker is actually visible; closeEvent is not reliable for a docker
+        child widget, which is why stopping cannot depend on it alone.
         """
-        if active == getattr(self, "_filter_installed", False):
-            return
-        try:
-            app = QApplication.instance()
-            if app is None:
-                return
-            if active:
-                app.installEventFilter(self)
-            else:
-                app.removeEventFilter(self)
-            self._filter_installed = active
-        except Exception as e:
-            print(f"Error updating event filter: {e}")
-
-    def eventFilter(self, obj, event):
-        if event.type() != QEvent.MouseButtonPress:
-            return super().eventFilter(obj, event)
-        if event.modifiers() == Qt.NoModifier:
-            self.check_brush_change()
-        return super().eventFilter(obj, event)
+        get_press_hook().set_active(self, active)
+        if not active and self._save_timer.isActive():
+            self._save_timer.stop()
+            self.save_history()
 
     def generate_brush_thumbnail(self, brush_preset, size=None):
         if size is None:
@@ -145,7 +146,7 @@ class BrushHistoryWidget(QWidget):
                 current_preset = view.currentBrushPreset()
                 if current_preset:
                     brush_name = current_preset.name()
-                    if not self.brush_history or self.brush_history[0][0] != brush_name:
+                    if next(iter(self.brush_history), None) != brush_name:
                         self.add_brush_to_history(brush_name, current_preset)
             except Exception:
                 import traceback
@@ -153,40 +154,42 @@ class BrushHistoryWidget(QWidget):
                 traceback.print_exc()
 
     def add_brush_to_history(self, brush_name, brush_preset):
-        for i, (name, preset) in enumerate(self.brush_history):
-            if name == brush_name:
-                self.brush_history.pop(i)
-                break
-
-        self.brush_history.insert(0, (brush_name, brush_preset))
-
+        entry = self.brush_history.get(brush_name)
+        if entry is not None:
+            moved = list(self.brush_history).index(brush_name) + 1
+            self.brush_history[brush_name] = (brush_preset, entry[1])
+        else:
+            icon = self.generate_brush_thumbnail(brush_preset)
+            self.brush_history[brush_name] = (brush_preset, icon)
+            moved = None
+        self.brush_history.move_to_end(brush_name, last=False)
         if len(self.brush_history) > self.TOTAL_BRUSHES:
-            self.brush_history = self.brush_history[: self.TOTAL_BRUSHES]
+            self.brush_history.popitem(last=True)
+        self.update_brush_buttons(moved)
+        self._save_timer.start()
 
-        self.update_brush_buttons()
+    def update_brush_buttons(self, count=None):
+        """Show the history on the first `count` buttons (all by default).
 
-    def update_brush_buttons(self):
-        for i, btn in enumerate(self.brush_buttons):
-            if i < len(self.brush_history):
-                brush_name, brush_preset = self.brush_history[i]
-                icon = self.generate_brush_thumbnail(brush_preset)
+        Icons come from the history entries, so a shift reuses the existing
+        thumbnails; a brush moved to the front from slot n touches n + 1
+        buttons, a new brush all of them.
+        """
+        if count is None:
+            count = len(self.brush_buttons)
+        entries = list(self.brush_history.items())
+        for i, btn in enumerate(self.brush_buttons[:count]):
+            if i < len(entries):
+                brush_name, (_preset, icon) = entries[i]
                 btn.setIcon(icon)
-                btn.setText("")
-                btn.setStyleSheet(
-                    f"border: 1px solid #888; border-radius: 4px; background-color: {BRUSH_HISTORY_BACKGROUND_COLOR};"
-                )
                 btn.setToolTip(f"Brush: {brush_name}")
             else:
                 btn.setIcon(QIcon())
-                btn.setText("")
-                btn.setStyleSheet(
-                    f"border: 1px solid #888; border-radius: 4px; background-color: {BRUSH_HISTORY_BACKGROUND_COLOR};"
-                )
                 btn.setToolTip("")
 
     def on_brush_clicked(self, index):
         if index < len(self.brush_history):
-            brush_name, brush_preset = self.brush_history[index]
+            brush_name, (brush_preset, _icon) = list(self.brush_history.items())[index]
             app = Krita.instance()
             if app.activeWindow() and app.activeWindow().activeView():
                 view = app.activeWindow().activeView()
@@ -196,6 +199,25 @@ class BrushHistoryWidget(QWidget):
                 except Exception as e:
                     print(f"Error setting brush preset: {e}")
 
+    def load_history(self):
+        """Fill the strip from the last session, skipping presets now gone."""
+        names = self._repository.load(HISTORY_KEY)[: self.TOTAL_BRUSHES]
+        if not names:
+            return
+        try:
+            presets = Krita.instance().resources("preset")
+        except Exception as e:
+            print(f"Error loading brush history: {e}")
+            return
+        for name in names:
+            preset = presets.get(name) if isinstance(name, str) else None
+            if preset is not None and name not in self.brush_history:
+                self.brush_history[name] = (preset, self.generate_brush_thumbnail(preset))
+        self.update_brush_buttons()
+
+    def save_history(self):
+        self._repository.save(HISTORY_KEY, list(self.brush_history))
+
     def force_brush_update(self):
         self.check_brush_change()
 
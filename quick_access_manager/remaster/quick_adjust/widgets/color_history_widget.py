@@ -1,30 +1,53 @@
 from krita import Krita, ManagedColor  # type: ignore
 
 from ...compat import (
-    QApplication,
     QColor,
-    QEvent,
     QHBoxLayout,
     QPushButton,
-    Qt,
+    QTimer,
     QVBoxLayout,
     QWidget,
 )
+from ...infrastructure import HistoryRepository
+from ...shared.color_history import ColorHistory
+from ..color_state import get_color_state
+from ..poll_scheduler import get_poll_scheduler
+from ..press_hook import get_press_hook
 
 COLOR_HISTORY_BACKGROUND_COLOR = "#b0b0b0"
+HISTORY_KEY = "colors"
+# Disk writes are batched: one save this long after the last change.
+SAVE_DELAY_MS = 2000
 
 
 class ColorHistoryWidget(QWidget):
     """Widget to display color history in a grid"""
 
-    def __init__(self, parent=None, color_history_number=20, icon_size=30):
+    def __init__(
+        self, parent=None, color_history_number=20, icon_size=30, repository=None
+    ):
         super().__init__(parent)
         self.COLOR_HISTORY_NUMBER = color_history_number
         self.ICON_SIZE = icon_size
-        self.color_history = []
+        self._repository = repository or HistoryRepository()
+        self._history = ColorHistory(
+            color_history_number,
+            colors=[tuple(c) for c in self._repository.load(HISTORY_KEY) if len(c) == 3],
+        )
         self.color_buttons = []
+        # What each button currently shows, so unchanged cells are skipped.
+        self._shown = [None] * color_history_number
+        self._monitoring = False
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.save_history)
+
         self.init_ui()
-        self.install_event_filter()
+        self.update_color_buttons()
+        get_press_hook().register(self, self.check_color_change)
+        self.set_monitoring_active(True)
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -63,79 +86,51 @@ class ColorHistoryWidget(QWidget):
         layout.addStretch()
         self.setLayout(layout)
 
-    def install_event_filter(self):
-        self.set_filter_active(True)
+    def set_monitoring_active(self, active):
+        """Record the foreground after mouse presses while the docker is visible.
 
-    def set_filter_active(self, active):
-        """Add/remove the application-wide mouse filter.
-
-        This filter sees every click in Krita, so it is only installed while the
-        docker is actually visible. closeEvent is not reliable for a docker
-        child widget, which is why removal cannot depend on it alone.
+        A color counts once it is painted with, so the check runs from the
+        shared press hook - deferred until after the press is delivered -
+        rather than on every foreground change. Hiding also writes out any
+        pending history change, since closeEvent is not reliable for a docker
+        child widget.
         """
-        if active == getattr(self, "_filter_installed", False):
+        if active == self._monitoring:
             return
-        try:
-            app = QApplication.instance()
-            if app is None:
-                return
-            if active:
-                app.installEventFilter(self)
-            else:
-                app.removeEventFilter(self)
-            self._filter_installed = active
-        except Exception as e:
-            print(f"Error updating event filter: {e}")
-
-    def eventFilter(self, obj, event):
-        if event.type() != QEvent.MouseButtonPress:
-            return super().eventFilter(obj, event)
-        if event.modifiers() == Qt.NoModifier:
-            self.check_color_change()
-        return super().eventFilter(obj, event)
+        self._monitoring = active
+        get_color_state().set_active(self, active)
+        get_press_hook().set_active(self, active)
+        if not active and self._save_timer.isActive():
+            self._save_timer.stop()
+            self.save_history()
 
     def check_color_change(self):
-        app = Krita.instance()
-        if app.activeWindow() and app.activeWindow().activeView():
-            view = app.activeWindow().activeView()
-            try:
-                fg_color = view.foregroundColor()
-                if fg_color:
-                    components = fg_color.components()
-                    if len(components) >= 3:
-                        color_rgb = (
-                            int(components[2] * 255),
-                            int(components[1] * 255),
-                            int(components[0] * 255),
-                        )
-                        if not self.color_history or self.color_history[0] != color_rgb:
-                            self.add_color_to_history(color_rgb)
-            except Exception:
-                try:
-                    fg_color = view.foregroundColor()
-                    if fg_color:
-                        color_rgb = (
-                            int(fg_color.blue() * 255),
-                            int(fg_color.green() * 255),
-                            int(fg_color.red() * 255),
-                        )
-                        if not self.color_history or self.color_history[0] != color_rgb:
-                            self.add_color_to_history(color_rgb)
-                except Exception as e2:
-                    print(f"Error getting foreground color: {e2}")
+        # Read Krita's foreground now: a pick in Krita's own selector or the
+        # eyedropper sends no signal, so the cached state can be a whole idle
+        # poll old. This runs after the press has been delivered, and the one
+        # read updates every other subscriber too.
+        get_poll_scheduler().notify_activity()
+        color_rgb = get_color_state().refresh().foreground
+        if color_rgb is not None:
+            self.add_color_to_history(color_rgb)
 
     def add_color_to_history(self, color_rgb):
-        if color_rgb in self.color_history:
-            self.color_history.remove(color_rgb)
-        self.color_history.insert(0, color_rgb)
-        if len(self.color_history) > self.COLOR_HISTORY_NUMBER:
-            self.color_history = self.color_history[: self.COLOR_HISTORY_NUMBER]
-        self.update_color_buttons()
-
-    def update_color_buttons(self):
-        for i, btn in enumerate(self.color_buttons):
-            if i < len(self.color_history):
-                r, g, b = self.color_history[i]
+        changed = self._history.add(color_rgb)
+        if changed:
+            self.update_color_buttons(changed)
+            self._save_timer.start()
+
+    def update_color_buttons(self, indices=None):
+        if indices is None:
+            indices = range(len(self.color_buttons))
+        for i in indices:
+            color = self._history[i] if i < len(self._history) else None
+            if color == self._shown[i]:
+                continue
+            self._shown[i] = color
+            btn = self.color_buttons[i]
+            if color is not None:
+                r, g, b = color
                 btn.setStyleSheet(
                     f"border: 1px solid #888; border-radius: 4px; background-color: rgb({r}, {g}, {b});"
                 )
@@ -146,9 +141,12 @@ class ColorHistoryWidget(QWidget):
                 )
                 btn.setToolTip("")
 
+    def save_history(self):
+        self._repository.save(HISTORY_KEY, [list(c) for c in self._history.colors()])
+
     def on_color_clicked(self, index):
-        if index < len(self.color_history):
-            r, g, b = self.color_history[index]
+        if index < len(self._history):
+            r, g, b = self._history[index]
             app = Krita.instance()
             if app.activeWindow() and app.activeWindow().activeView():
                 view = app.activeWindow().activeView()
@@ -156,18 +154,21 @@ class ColorHistoryWidget(QWidget):
                     color = ManagedColor("RGBA", "U8", "")
                     color.setComponents([b / 255.0, g / 255.0, r / 255.0, 1.0])
                     view.setForeGroundColor(color)
+                    get_color_state().note_foreground((r, g, b))
                 except Exception:
                     try:
                         color = ManagedColor("RGBA", "U8", "")
                         qcolor = QColor(r, g, b)
                         color.fromQColor(qcolor)
                         view.setForeGroundColor(color)
+                        get_color_state().note_foreground((r, g, b))
                     except Exception as e2:
                         print(f"Fallback also failed: {e2}")
 
     def force_color_update(self):
+        get_color_state().refresh()
         self.check_color_change()
 
     def closeEvent(self, event):
-        self.set_filter_active(False)
+        self.set_monitoring_active(False)
         super().closeEvent(event)
@@ -21,6 +21,8 @@ from ...gesture import (
 from ...infrastructure import get_quick_adjust_icons_dir
 from ..floating_widgets.rotation import FloatRotation
 from ..floating_widgets.tool_options import FloatToolOptions
+from ..krita_state import SELECTION, STATUS, KritaStateSnapshot
+from ..poll_scheduler import get_poll_scheduler
 from ..settings import (
     is_rotation_widget_start_visible,
     is_tool_options_enabled,
@@ -29,6 +31,57 @@ from ..settings import (
     set_tool_options_start_visible,
 )
 
+STATUS_ICON_SIZE = 16
+STATUS_ICONS = (
+    "tool_options_on.png",
+    "tool_options_off.png",
+    "rotate-on.png",
+    "rotate-off.png",
+    "preserve_alpha_on.png",
+    "preserve_alpha_off.png",
+    "erase_mode_on.png",
+    "erase_mode_off.png",
+    "selection_on.png",
+    "selection_off.png",
+    "gesture_on.png",
+    "gesture_off.png",
+)
+# Checkable Krita actions the indicators mirror through their toggled signal.
+PRESERVE_ALPHA_ACTION = "preserve_alpha"
+ERASE_MODE_ACTION = "erase_action"
+# Not checkable; its handler flips the gesture filter.
+GESTURE_TOGGLE_ACTION = "toggle_gesture_recognition"
+
+# (icon dir, file name) -> pixmap/icon, shared by every ControlButtonWidget.
+_status_pixmaps = {}
+_status_icons = {}
+
+
+def status_pixmap(icon_dir, name):
+    """The icon file `name`, read once and scaled to STATUS_ICON_SIZE."""
+    key = (icon_dir, name)
+    pixmap = _status_pixmaps.get(key)
+    if pixmap is None:
+        pixmap = QPixmap(os.path.join(icon_dir, name))
+        if not pixmap.isNull():
+            pixmap = pixmap.scaled(
+                STATUS_ICON_SIZE,
+                STATUS_ICON_SIZE,
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation,
+            )
+        _status_pixmaps[key] = pixmap
+    return pixmap
+
+
+def status_icon(icon_dir, name):
+    key = (icon_dir, name)
+    icon = _status_icons.get(key)
+    if icon is None:
+        icon = QIcon(status_pixmap(icon_dir, name))
+        _status_icons[key] = icon
+    return icon
+
 
 class ControlButtonWidget(QWidget):
     """Status/toggle button column: Tool Options floating widget, floating
@@ -46,13 +99,21 @@ class ControlButtonWidget(QWidget):
         self.is_erase_mode = False
         self.float_tool_options = None
         self.float_rotation = None
+        self._status_actions = {}
+        for name in STATUS_ICONS:
+            status_icon(self.icon_dir, name)
 
         self.init_ui()
+        self.connect_status_actions()
         self.update_status()
 
-        self.status_update_timer = QTimer()
-        self.status_update_timer.timeout.connect(self.update_status)
-        self.status_update_timer.start(1000)
+        # Preserve alpha, erase mode and gesture follow their actions; the
+        # poll is the fallback for selection, which has no signal.
+        scheduler = get_poll_scheduler()
+        scheduler.register(
+            self, self._poll_status, min_interval_ms=1000, groups=(SELECTION,)
+        )
+        scheduler.set_active(self, True)
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -63,13 +124,12 @@ class ControlButtonWidget(QWidget):
         application = Krita.instance()
         self._app_notifier = application.notifier()
         self._app_notifier.windowCreated.connect(self.enableToolOptionsExtension)
+        self._app_notifier.windowCreated.connect(self.connect_status_actions)
 
         self.tool_options_toggle_btn = QPushButton()
         self.tool_options_toggle_btn.setFixedSize(16, 16)
         self.tool_options_toggle_btn.setToolTip("Toggle Tool Options")
-        self.tool_options_toggle_btn.setIcon(
-            QIcon(os.path.join(self.icon_dir, "tool_options_on.png"))
-        )
+        self.tool_options_toggle_btn.setIcon(self._icon("tool_options_on.png"))
         self.tool_options_toggle_btn.setCheckable(True)
         self.tool_options_toggle_btn.setChecked(False)
         self.tool_options_toggle_btn.clicked.connect(
@@ -79,9 +139,7 @@ class ControlButtonWidget(QWidget):
         self.rotation_toggle_btn = QPushButton()
         self.rotation_toggle_btn.setFixedSize(16, 16)
         self.rotation_toggle_btn.setToolTip("Toggle Floating Rotation Widget")
-        self.rotation_toggle_btn.setIcon(
-            QIcon(os.path.join(self.icon_dir, "rotate-off.png"))
-        )
+        self.rotation_toggle_btn.setIcon(self._icon("rotate-off.png"))
         self.rotation_toggle_btn.setCheckable(True)
         self.rotation_toggle_btn.setChecked(False)
         self.rotation_toggle_btn.clicked.connect(self.toggle_rotation_visibility)
@@ -90,7 +148,7 @@ class ControlButtonWidget(QWidget):
         self.preserve_alpha_label.setFixedSize(16, 16)
         self.preserve_alpha_label.setScaledContents(True)
         self.preserve_alpha_label.setPixmap(
-            QPixmap(os.path.join(self.icon_dir, "preserve_alpha_off.png"))
+            self._pixmap("preserve_alpha_off.png")
         )
         self.preserve_alpha_label.setToolTip("Preserve Alpha: Off")
         self.preserve_alpha_label.setCursor(Qt.PointingHandCursor)
@@ -100,7 +158,7 @@ class ControlButtonWidget(QWidget):
         self.erase_mode_label.setFixedSize(16, 16)
         self.erase_mode_label.setScaledContents(True)
         self.erase_mode_label.setPixmap(
-            QPixmap(os.path.join(self.icon_dir, "erase_mode_off.png"))
+            self._pixmap("erase_mode_off.png")
         )
         self.erase_mode_label.setToolTip("Erase Mode: Off")
         self.erase_mode_label.setCursor(Qt.PointingHandCursor)
@@ -110,7 +168,7 @@ class ControlButtonWidget(QWidget):
         self.selection_info_label.setFixedSize(16, 16)
         self.selection_info_label.setScaledContents(True)
         self.selection_info_label.setPixmap(
-            QPixmap(os.path.join(self.icon_dir, "selection_off.png"))
+            self._pixmap("selection_off.png")
         )
         self.selection_info_label.setToolTip("Selection: Off")
 
@@ -118,7 +176,7 @@ class ControlButtonWidget(QWidget):
         self.gesture_status_label.setFixedSize(16, 16)
         self.gesture_status_label.setScaledContents(True)
         self.gesture_status_label.setPixmap(
-            QPixmap(os.path.join(self.icon_dir, "gesture_on.png"))
+            self._pixmap("gesture_on.png")
         )
         self.gesture_status_label.setToolTip("Gesture: On")
         self.gesture_status_label.setCursor(Qt.PointingHandCursor)
@@ -146,93 +204,138 @@ class ControlButtonWidget(QWidget):
         separator.setStyleSheet("QFrame { color: #3a3a3a; margin: 2px 8px; }")
         return separator
 
-    def update_status(self):
-        preserve_alpha = self.get_preserve_alpha_status()
-        if preserve_alpha != self.is_preserve_alpha:
-            self.is_preserve_alpha = preserve_alpha
-            icon = (
-                "preserve_alpha_on.png" if preserve_alpha else "preserve_alpha_off.png"
-            )
-            tooltip = "Preserve Alpha: On" if preserve_alpha else "Preserve Alpha: Off"
-            self.preserve_alpha_label.setToolTip(tooltip)
-            self.preserve_alpha_label.setPixmap(
-                QPixmap(os.path.join(self.icon_dir, icon))
-            )
+    def _icon(self, name):
+        return status_icon(self.icon_dir, name)
 
-        erase_mode = self.get_erase_mode_status()
-        if erase_mode != self.is_erase_mode:
-            self.is_erase_mode = erase_mode
-            icon = "erase_mode_on.png" if erase_mode else "erase_mode_off.png"
-            tooltip = "Erase Mode: On" if erase_mode else "Erase Mode: Off"
-            self.erase_mode_label.setToolTip(tooltip)
-            self.erase_mode_label.setPixmap(QPixmap(os.path.join(self.icon_dir, icon)))
-
-        selection_info = self.get_selection_status()
-        if selection_info != self.is_selected:
-            self.is_selected = selection_info
-            icon = "selection_on.png" if selection_info else "selection_off.png"
-            tooltip = "Selection: On" if selection_info else "Selection: Off"
-            self.selection_info_label.setToolTip(tooltip)
-            self.selection_info_label.setPixmap(
-                QPixmap(os.path.join(self.icon_dir, icon))
-            )
+    def _pixmap(self, name):
+        return status_pixmap(self.icon_dir, name)
 
-        gesture_paused = is_gesture_filter_paused()
-        if gesture_paused != self.is_gesture_paused:
-            self.is_gesture_paused = gesture_paused
-            icon = "gesture_off.png" if gesture_paused else "gesture_on.png"
-            tooltip = "Gesture: Off" if gesture_paused else "Gesture: On"
-            self.gesture_status_label.setToolTip(tooltip)
-            self.gesture_status_label.setPixmap(
-                QPixmap(os.path.join(self.icon_dir, icon))
-            )
+    def connect_status_actions(self):
+        """Follow preserve alpha, erase mode and gesture toggles as they happen.
 
-    def get_selection_status(self):
-        doc = Krita.instance().activeDocument()
-        if doc is None:
+        Krita creates its actions with the first main window, so anything
+        missing here is retried from windowCreated.
+        """
+        app = Krita.instance()
+        slots = {
+            PRESERVE_ALPHA_ACTION: ("toggled", self._show_preserve_alpha),
+            ERASE_MODE_ACTION: ("toggled", self._show_erase_mode),
+            GESTURE_TOGGLE_ACTION: ("triggered", self._on_gesture_toggled),
+        }
+        for action_id, (signal_name, slot) in slots.items():
+            if action_id in self._status_actions:
+                continue
+            action = app.action(action_id)
+            if action is None:
+                continue
+            getattr(action, signal_name).connect(slot)
+            self._status_actions[action_id] = (action, signal_name, slot)
+            if signal_name == "toggled":
+                slot(action.isChecked())
+
+    def _disconnect_status_actions(self):
+        for action, signal_name, slot in self._status_actions.values():
+            try:
+                getattr(action, signal_name).disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass
+        self._status_actions = {}
+
+    def _poll_status(self, snapshot):
+        changed = self._show_selection(snapshot.has_selection)
+        # The gesture config dialog pauses the filter without any signal.
+        return self._show_gesture_paused(is_gesture_filter_paused()) or changed
+
+    def update_status(self, snapshot=None):
+        """Refresh every status icon; returns True if any of them changed."""
+        if snapshot is None:
+            snapshot = KritaStateSnapshot.capture((STATUS, SELECTION))
+        changed = self._show_preserve_alpha(snapshot.preserve_alpha)
+        changed = self._show_erase_mode(snapshot.erase_mode) or changed
+        changed = self._show_selection(snapshot.has_selection) or changed
+        return self._show_gesture_paused(is_gesture_filter_paused()) or changed
+
+    def _show_preserve_alpha(self, preserve_alpha):
+        if preserve_alpha == self.is_preserve_alpha:
             return False
-        return doc.selection() is not None
+        self.is_preserve_alpha = preserve_alpha
+        icon = "preserve_alpha_on.png" if preserve_alpha else "preserve_alpha_off.png"
+        tooltip = "Preserve Alpha: On" if preserve_alpha else "Preserve Alpha: Off"
+        self.preserve_alpha_label.setToolTip(tooltip)
+        self.preserve_alpha_label.setPixmap(self._pixmap(icon))
+        return True
+
+    def _show_erase_mode(self, erase_mode):
+        if erase_mode == self.is_erase_mode:
+            return False
+        self.is_erase_mode = erase_mode
+        icon = "erase_mode_on.png" if erase_mode else "erase_mode_off.png"
+        tooltip = "Erase Mode: On" if erase_mode else "Erase Mode: Off"
+        self.erase_mode_label.setToolTip(tooltip)
+        self.erase_mode_label.setPixmap(self._pixmap(icon))
+        return True
+
+    def _show_selection(self, selection_info):
+        if selection_info == self.is_selected:
+            return False
+        self.is_selected = selection_info
+        icon = "selection_on.png" if selection_info else "selection_off.png"
+        tooltip = "Selection: On" if selection_info else "Selection: Off"
+        self.selection_info_label.setToolTip(tooltip)
+        self.selection_info_label.setPixmap(self._pixmap(icon))
+        return True
+
+    def _show_gesture_paused(self, gesture_paused):
+        if gesture_paused == self.is_gesture_paused:
+            return False
+        self.is_gesture_paused = gesture_paused
+        icon = "gesture_off.png" if gesture_paused else "gesture_on.png"
+        tooltip = "Gesture: Off" if gesture_paused else "Gesture: On"
+        self.gesture_status_label.setToolTip(tooltip)
+        self.gesture_status_label.setPixmap(self._pixmap(icon))
+        return True
+
+    def _on_gesture_toggled(self, *_args):
+        # The shortcut's own handler may run after this one; read the result
+        # once it has.
+        QTimer.singleShot(0, self._refresh_gesture_status)
 
-    def get_preserve_alpha_status(self):
-        action = Krita.instance().action("preserve_alpha")
-        return action.isChecked() if action else False
+    def _refresh_gesture_status(self):
+        self._show_gesture_paused(is_gesture_filter_paused())
 
     def toggle_preserve_alpha(self, _event):
-        action = Krita.instance().action("preserve_alpha")
+        # The icon follows from the action's toggled signal.
+        action = Krita.instance().action(PRESERVE_ALPHA_ACTION)
         if action:
             action.setChecked(not action.isChecked())
-        self.update_status()
-
-    def get_erase_mode_status(self):
-        action = Krita.instance().action("erase_action")
-        return action.isChecked() if action else False
 
     def toggle_erase_mode(self, _event):
-        action = Krita.instance().action("erase_action")
+        action = Krita.instance().action(ERASE_MODE_ACTION)
         if action:
             action.setChecked(not action.isChecked())
-        self.update_status()
 
     def toggle_gesture_status(self, _event):
         if is_gesture_filter_paused():
             resume_gesture_event_filter()
         else:
             pause_gesture_event_filter()
-        self.update_status()
+        self._refresh_gesture_status()
 
     def cleanup(self):
-        """Detach from Krita's notifier and stop the status poll.
+        """Detach from Krita's notifier and actions and stop the status poll.
 
         Without the disconnect, opening a new window after this widget is gone
         calls back into a deleted object (or builds a second floating pad).
         """
-        self.status_update_timer.stop()
+        get_poll_scheduler().unregister(self)
+        self._disconnect_status_actions()
         notifier = getattr(self, "_app_notifier", None)
         if notifier is not None:
-            try:
-                notifier.windowCreated.disconnect(self.enableToolOptionsExtension)
-            except (TypeError, RuntimeError):
-                pass
+            for slot in (self.enableToolOptionsExtension, self.connect_status_actions):
+                try:
+                    notifier.windowCreated.disconnect(slot)
+                except (TypeError, RuntimeError):
+                    pass
             self._app_notifier = None
 
     def closeEvent(self, event):
@@ -260,13 +363,13 @@ class ControlButtonWidget(QWidget):
                     self.float_tool_options.pad.setUserVisible(True)
                     self.tool_options_toggle_btn.setChecked(True)
                     self.tool_options_toggle_btn.setIcon(
-                        QIcon(os.path.join(self.icon_dir, "tool_options_on.png"))
+                        self._icon("tool_options_on.png")
                     )
                 else:
                     self.float_tool_options.pad.setUserVisible(False)
                     self.tool_options_toggle_btn.setChecked(False)
                     self.tool_options_toggle_btn.setIcon(
-                        QIcon(os.path.join(self.icon_dir, "tool_options_off.png"))
+                        self._icon("tool_options_off.png")
                     )
             else:
                 self.tool_options_toggle_btn.hide()
@@ -280,14 +383,10 @@ class ControlButtonWidget(QWidget):
             is_checked = self.tool_options_toggle_btn.isChecked()
             if is_checked:
                 self.float_tool_options.pad.setUserVisible(True)
-                self.tool_options_toggle_btn.setIcon(
-                    QIcon(os.path.join(self.icon_dir, "tool_options_on.png"))
-                )
+                self.tool_options_toggle_btn.setIcon(self._icon("tool_options_on.png"))
             else:
                 self.float_tool_options.pad.setUserVisible(False)
-                self.tool_options_toggle_btn.setIcon(
-                    QIcon(os.path.join(self.icon_dir, "tool_options_off.png"))
-                )
+                self.tool_options_toggle_btn.setIcon(self._icon("tool_options_off.png"))
             set_tool_options_start_visible(is_checked)
 
     def enableRotationExtension(self):
@@ -321,17 +420,13 @@ class ControlButtonWidget(QWidget):
             rotation_widget.show()
             rotation_label.show()
             self.rotation_toggle_btn.setChecked(True)
-            self.rotation_toggle_btn.setIcon(
-                QIcon(os.path.join(self.icon_dir, "rotate-on.png"))
-            )
+            self.rotation_toggle_btn.setIcon(self._icon("rotate-on.png"))
         else:
             self.float_rotation.pad.setUserVisible(False)
             rotation_widget.hide()
             rotation_label.hide()
             self.rotation_toggle_btn.setChecked(False)
-            self.rotation_toggle_btn.setIcon(
-                QIcon(os.path.join(self.icon_dir, "rotate-off.png"))
-            )
+            self.rotation_toggle_btn.setIcon(self._icon("rotate-off.png"))
 
     def toggle_rotation_visibility(self):
         """Toggle the visibility of the floating rotation widget"""
@@ -343,14 +438,10 @@ class ControlButtonWidget(QWidget):
             self.float_rotation.pad.setUserVisible(True)
             self.float_rotation.rotation_widget.show()
             self.float_rotation.rotation_label.show()
-            self.rotation_toggle_btn.setIcon(
-                QIcon(os.path.join(self.icon_dir, "rotate-on.png"))
-            )
+            self.rotation_toggle_btn.setIcon(self._icon("rotate-on.png"))
         else:
             self.float_rotation.pad.setUserVisible(False)
             self.float_rotation.rotation_widget.hide()
             self.float_rotation.rotation_label.hide()
-            self.rotation_toggle_btn.setIcon(
-                QIcon(os.path.join(self.icon_dir, "rotate-off.png"))
-            )
+            self.rotation_toggle_btn.setIcon(self._icon("rotate-off.png"))
         set_rotation_widget_start_visible(is_checked)
@@ -0,0 +1,85 @@
+"""Throttle-and-coalesce for writing slider values back to Krita.
+
+A slider drag emits a value per pixel. Writing each one costs a Krita API call
+(and for layer opacity a projection refresh); debouncing them instead applies
+nothing until the drag stops. `ThrottledWriter` does neither: the first value
+is applied at once (leading edge), values arriving within `interval_ms` of a
+write are coalesced so only the latest is kept, and that one is applied when
+the interval ends (trailing edge). A drag therefore updates Krita live, at
+most `1000 / interval_ms` times a second, and always ends on its final value.
+"""
+
+import math
+
+from ..compat import QApplication, QObject, QTimer
+from ..shared import metrics
+
+# Brush size/opacity/flow/rotation are cheap to set: ~30 writes a second.
+BRUSH_WRITE_INTERVAL_MS = 33
+# Layer opacity refreshes the projection on every write: ~10 a second.
+LAYER_WRITE_INTERVAL_MS = 100
+# HueSVC color picks: one write per display frame, 60 Hz if unknown.
+DEFAULT_FRAME_INTERVAL_MS = 17
+
+_write_time = metrics.histogram("krita.throttled_write")
+
+
+def frame_interval_ms():
+    """One refresh period of the primary screen, rounded up to whole ms."""
+    app = QApplication.instance()
+    screen = app.primaryScreen() if app is not None else None
+    rate = screen.refreshRate() if screen is not None else 0
+    if rate <= 1:
+        return DEFAULT_FRAME_INTERVAL_MS
+    return max(1, math.ceil(1000.0 / rate))
+
+
+_NO_VALUE = object()
+
+
+class ThrottledWriter(QObject):
+    """Applies `apply(value)` at most once per `interval_ms`, latest value wins."""
+
+    def __init__(self, apply, interval_ms, parent=None):
+        super().__init__(parent)
+        self._apply = apply
+        self._pending = _NO_VALUE
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._on_interval_end)
+
+    @property
+    def has_pending(self):
+        return self._pending is not _NO_VALUE
+
+    def submit(self, value):
+        """Apply `value` now if idle, otherwise when the current interval ends."""
+        if self._timer.isActive():
+            self._pending = value
+            return
+        self._write(value)
+
+    def flush(self):
+        """Apply a coalesced value immediately instead of at the interval end."""
+        if self.has_pending:
+            self._timer.stop()
+            value, self._pending = self._pending, _NO_VALUE
+            self._write(value)
+
+    def cancel(self):
+        """Drop a coalesced value, e.g. when the controls re-sync from Krita."""
+        self._pending = _NO_VALUE
+
+    def _write(self, value):
+        self._timer.start()
+        try:
+            with _write_time.time():
+                self._apply(value)
+        except Exception as e:
+            print(f"Error applying throttled value: {e}")
+
+    def _on_interval_end(self):
+        if self.has_pending:
+            value, self._pending = self._pending, _NO_VALUE
+            self._write(value)
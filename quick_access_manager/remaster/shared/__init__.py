@@ -1,5 +1,7 @@
 """Shared model and layout logic for the remastered palette."""
 
+from .cell_index import CellIndex
+from .edit_journal import EditJournal
 from .layout_engine import FreeGridLayoutEngine, LayoutResult, PlacementIssue
 from .models import (
     ACTION_ITEM,
@@ -41,6 +43,8 @@ __all__ = [
     "SEPARATOR_ITEM",
     "SEPARATOR_ORIENTATION_HORIZONTAL",
     "SEPARATOR_ORIENTATION_VERTICAL",
+    "CellIndex",
+    "EditJournal",
     "FreeGridLayoutEngine",
     "LayoutResult",
     "PaletteDocument",
@@ -0,0 +1,78 @@
+"""Cell-to-item lookup for hit tests on a free-layout grid.
+
+Maps every cell an item covers to the ids of all the items on it, so an item
+lying fully under another is still found. Items outside the cells
+`FreeGridLayoutEngine.occupied_cells` indexes - a negative position or one
+reaching past the last column - are kept in a short side list and checked
+directly, so they can still be hit. A lookup over a block of cells costs the
+block's area, not the number of items, and the index is kept up to date item
+by item as edits land instead of being rebuilt.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import PaletteItem
+
+
+class CellIndex:
+    def __init__(self, columns: int, items: Iterable[PaletteItem] = ()):
+        self.columns = max(1, int(columns))
+        self._cells: Dict[Tuple[int, int], List[str]] = {}
+        self._items: Dict[str, PaletteItem] = {}
+        self._loose: Dict[str, PaletteItem] = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item_id):
+        return item_id in self._items
+
+    def get(self, item_id: str) -> Optional[PaletteItem]:
+        return self._items.get(item_id)
+
+    def add(self, item: PaletteItem):
+        """Index `item`, replacing any earlier entry with the same id."""
+        self.remove(item.id)
+        self._items[item.id] = item
+        if item.row < 0 or item.col < 0 or item.right > self.columns:
+            self._loose[item.id] = item
+            return
+        for cell in item.cells():
+            self._cells.setdefault(cell, []).append(item.id)
+
+    def remove(self, item_id: str):
+        item = self._items.pop(item_id, None)
+        if item is None:
+            return
+        if self._loose.pop(item_id, None) is not None:
+            return
+        for cell in item.cells():
+            ids = self._cells.get(cell)
+            if ids is None or item_id not in ids:
+                continue
+            ids.remove(item_id)
+            if not ids:
+                del self._cells[cell]
+
+    def items_in(self, rows: range, cols: range) -> Set[str]:
+        """Ids of the items covering any cell in the `rows` x `cols` block."""
+        found = set()
+        if not rows or not cols:
+            return found
+        cells = self._cells
+        for row in range(max(0, rows.start), rows.stop):
+            for col in range(max(0, cols.start), min(cols.stop, self.columns)):
+                ids = cells.get((row, col))
+                if ids:
+                    found.update(ids)
+        for item in self._loose.values():
+            if (
+                item.row < rows.stop
+                and rows.start < item.bottom
+                and item.col < cols.stop
+                and cols.start < item.right
+            ):
+                found.add(item.id)
+        return found
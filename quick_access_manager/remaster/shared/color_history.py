@@ -0,0 +1,95 @@
+"""Fixed-size recent-colors history with perceptual dedupe, without Qt or Krita.
+
+Entries live in a ring buffer: RGB in an `array('B')`, and each color's
+OKLab coordinates, computed once when it is added, in an `array('d')`.
+Index 0 is the newest color. A new color within `threshold` (ΔEok) of an
+entry does not add a near-duplicate; that entry moves to the front and
+takes the new value instead. `add()` reports which indices changed, so a
+view only redraws those.
+"""
+
+from array import array
+
+from . import color_math
+
+# OKLab distance below which two colors count as the same (about one
+# just-noticeable difference).
+DEFAULT_DELTA_E = 0.02
+
+
+class ColorHistory:
+    def __init__(self, capacity, threshold=DEFAULT_DELTA_E, colors=()):
+        self._capacity = max(1, int(capacity))
+        self._threshold = threshold
+        self._rgb = array("B", bytes(3 * self._capacity))
+        self._lab = array("d", [0.0]) * (3 * self._capacity)
+        self._head = 0  # slot of index 0
+        self._size = 0
+        # Oldest first, so the first color given ends up at index 0.
+        for rgb in reversed(list(colors)[: self._capacity]):
+            self.add(rgb)
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        slot = 3 * self._slot(index)
+        return tuple(self._rgb[slot : slot + 3])
+
+    def colors(self):
+        """Newest-first list of (r, g, b)."""
+        return [self[i] for i in range(self._size)]
+
+    def _slot(self, index):
+        return (self._head + index) % self._capacity
+
+    def find(self, rgb):
+        """Index of the newest entry within the threshold of `rgb`, else -1."""
+        return self._find(color_math.rgb_to_oklab(*rgb))
+
+    def _find(self, lab):
+        limit = self._threshold * self._threshold
+        L, a, b = lab
+        for index in range(self._size):
+            slot = 3 * self._slot(index)
+            dL = self._lab[slot] - L
+            da = self._lab[slot + 1] - a
+            db = self._lab[slot + 2] - b
+            if dL * dL + da * da + db * db < limit:
+                return index
+        return -1
+
+    def add(self, rgb):
+        """Put `rgb` at index 0; returns the range of indices that changed."""
+        rgb = tuple(int(c) for c in rgb)
+        lab = color_math.rgb_to_oklab(*rgb)
+        index = self._find(lab)
+        if index == 0:
+            return range(0)
+        if index > 0:
+            # Move the match to the front: shift the newer entries back one.
+            for i in range(index, 0, -1):
+                self._copy(self._slot(i - 1), self._slot(i))
+            changed = range(index + 1)
+        else:
+            self._head = (self._head - 1) % self._capacity
+            self._size = min(self._size + 1, self._capacity)
+            changed = range(self._size)
+        self._write(self._head, rgb, lab)
+        return changed
+
+    def _copy(self, source, target):
+        s, t = 3 * source, 3 * target
+        self._rgb[t : t + 3] = self._rgb[s : s + 3]
+        self._lab[t : t + 3] = self._lab[s : s + 3]
+
+    def _write(self, slot, rgb, lab):
+        s = 3 * slot
+        self._rgb[s : s + 3] = array("B", rgb)
+        self._lab[s : s + 3] = array("d", lab)
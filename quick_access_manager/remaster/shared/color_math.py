@@ -0,0 +1,337 @@
+"""Color conversions and gradient images for HueSVC, without Qt or Krita.
+
+Scalar conversions use the units the color selector already works in: hue
+in degrees (0-359, -1 for achromatic like `QColor.hsvHue()`), saturation,
+value, lightness and RGB channels in 0-255. OKLab is the float (L, a, b)
+triple from Björn Ottosson's definition, over sRGB.
+
+The image builders (`hue_strip`, `channel_strip`, `sv_plane`, `rows_of`,
+`columns_of`) return row-major RGB888 data: a `(height, width, 3)` uint8
+NumPy array when NumPy is importable, otherwise a `bytes` object with the
+same layout. `to_rgb888()` turns either into bytes for a QImage. The
+pure-Python path builds one row and repeats or rescales it with
+`bytes.translate`, so it stays fast enough for widget-sized images.
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # Krita builds without NumPy
+    np = None
+
+HAS_NUMPY = np is not None
+
+
+# ----------------------------------------------------------------------
+# Scalar conversions
+# ----------------------------------------------------------------------
+def _clamp_byte(x):
+    return 0 if x < 0 else 255 if x > 255 else int(round(x))
+
+
+def _pure_hue(h):
+    """Float RGB of hue `h` at full saturation and value."""
+    h = (h % 360) / 60.0
+    x = 255.0 * (1 - abs(h % 2 - 1))
+    return (
+        (255.0, x, 0.0),
+        (x, 255.0, 0.0),
+        (0.0, 255.0, x),
+        (0.0, x, 255.0),
+        (x, 0.0, 255.0),
+        (255.0, 0.0, x),
+    )[int(h) % 6]
+
+
+def _shade(pure, s, v):
+    """HSV->RGB from the hue's pure color, which is linear in both s and v.
+
+    Works on floats and on broadcastable NumPy arrays alike.
+    """
+    return v / 255.0 * (255.0 - s / 255.0 * (255.0 - pure))
+
+
+def hsv_to_rgb(h, s, v):
+    """(h degrees, s 0-255, v 0-255) -> (r, g, b) 0-255. h < 0 means gray."""
+    if h < 0 or s == 0:
+        gray = _clamp_byte(v)
+        return gray, gray, gray
+    r, g, b = (_clamp_byte(_shade(c, s, v)) for c in _pure_hue(h))
+    return r, g, b
+
+
+def rgb_to_hsv(r, g, b):
+    """(r, g, b) 0-255 -> (h degrees or -1 for gray, s 0-255, v 0-255)."""
+    high = max(r, g, b)
+    low = min(r, g, b)
+    delta = high - low
+    v = high
+    if high == 0 or delta == 0:
+        return -1, 0, v
+    s = _clamp_byte(delta * 255.0 / high)
+    if high == r:
+        h = 60.0 * (((g - b) / delta) % 6)
+    elif high == g:
+        h = 60.0 * ((b - r) / delta + 2)
+    else:
+        h = 60.0 * ((r - g) / delta + 4)
+    return int(round(h)) % 360, s, v
+
+
+def hsl_to_rgb(h, s, l):
+    """(h degrees, s 0-255, l 0-255) -> (r, g, b) 0-255. h < 0 means gray."""
+    if h < 0 or s == 0:
+        gray = _clamp_byte(l)
+        return gray, gray, gray
+    lf = l / 255.0
+    c = (1 - abs(2 * lf - 1)) * (s / 255.0)
+    v = lf + c / 2
+    sv = 0 if v == 0 else 2 * (1 - lf / v)
+    return hsv_to_rgb(h, sv * 255, v * 255)
+
+
+def rgb_to_hsl(r, g, b):
+    """(r, g, b) 0-255 -> (h degrees or -1 for gray, s 0-255, l 0-255)."""
+    high = max(r, g, b) / 255.0
+    low = min(r, g, b) / 255.0
+    l = (high + low) / 2
+    h, _s, _v = rgb_to_hsv(r, g, b)
+    if high == low:
+        return -1, 0, _clamp_byte(l * 255)
+    s = (high - low) / (1 - abs(2 * l - 1))
+    return h, _clamp_byte(s * 255), _clamp_byte(l * 255)
+
+
+def _srgb_to_linear(c):
+    c /= 255.0
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(c):
+    c = 12.92 * c if c <= 0.0031308 else 1.055 * (max(c, 0.0) ** (1 / 2.4)) - 0.055
+    return _clamp_byte(c * 255)
+
+
+def rgb_to_oklab(r, g, b):
+    """sRGB (r, g, b) 0-255 -> OKLab (L, a, b) floats."""
+    r, g, b = _srgb_to_linear(r), _srgb_to_linear(g), _srgb_to_linear(b)
+    lc = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    mc = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    sc = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+    return (
+        0.2104542553 * lc + 0.7936177850 * mc - 0.0040720468 * sc,
+        1.9779984951 * lc - 2.4285922050 * mc + 0.4505937099 * sc,
+        0.0259040371 * lc + 0.7827717662 * mc - 0.8086757660 * sc,
+    )
+
+
+def oklab_to_rgb(L, a, b):
+    """OKLab (L, a, b) -> sRGB (r, g, b) 0-255, clipped to the gamut."""
+    lc = (L + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    mc = (L - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    sc = (L - 0.0894841775 * a - 1.2914855480 * b) ** 3
+    return (
+        _linear_to_srgb(4.0767416621 * lc - 3.3077115913 * mc + 0.2309699292 * sc),
+        _linear_to_srgb(-1.2684380046 * lc + 2.6097574011 * mc - 0.3413193965 * sc),
+        _linear_to_srgb(-0.0041960863 * lc - 0.7034186147 * mc + 1.7076147010 * sc),
+    )
+
+
+def delta_e_ok(lab1, lab2):
+    """Euclidean distance between two OKLab colors (ΔEok)."""
+    return math.dist(lab1, lab2)
+
+
+# ----------------------------------------------------------------------
+# Array conversions (NumPy)
+# ----------------------------------------------------------------------
+def _hsv_to_rgb_float(h, s, v):
+    h = np.mod(np.asarray(h, dtype=np.float64), 360.0) / 60.0
+    s = np.asarray(s, dtype=np.float64)
+    v = np.asarray(v, dtype=np.float64)
+    h, s, v = np.broadcast_arrays(h, s, v)
+    c = v * s / 255.0
+    x = c * (1 - np.abs(np.mod(h, 2) - 1))
+    zero = np.zeros_like(c)
+    sector = np.floor(h).astype(np.int64) % 6
+    r = np.choose(sector, [c, x, zero, zero, x, c])
+    g = np.choose(sector, [x, c, c, x, zero, zero])
+    b = np.choose(sector, [zero, zero, x, c, c, x])
+    m = v - c
+    return np.stack([r + m, g + m, b + m], axis=-1)
+
+
+def _to_uint8(rgb):
+    return np.clip(np.rint(rgb), 0, 255).astype(np.uint8)
+
+
+def hsv_to_rgb_array(h, s, v):
+    """Vectorized hsv_to_rgb over broadcastable arrays -> uint8 (..., 3).
+
+    Requires NumPy; the strip builders below fall back to scalar code.
+    """
+    return _to_uint8(_hsv_to_rgb_float(h, s, v))
+
+
+def rgb_to_oklab_array(rgb):
+    """Vectorized rgb_to_oklab: uint8/float (..., 3) sRGB -> float (..., 3)."""
+    c = np.asarray(rgb, dtype=np.float64) / 255.0
+    c = np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    lms = c @ np.array(
+        [
+            [0.4122214708, 0.2119034982, 0.0883024619],
+            [0.5363325363, 0.6806995451, 0.2817188376],
+            [0.0514459929, 0.1073969566, 0.6299787005],
+        ]
+    )
+    lms = np.cbrt(lms)
+    return lms @ np.array(
+        [
+            [0.2104542553, 1.9779984951, 0.0259040371],
+            [0.7936177850, -2.4285922050, 0.7827717662],
+            [-0.0040720468, 0.4505937099, -0.8086757660],
+        ]
+    )
+
+
+# ----------------------------------------------------------------------
+# Gradient images
+# ----------------------------------------------------------------------
+def _positions(length, top):
+    """`length` evenly spaced values from 0 to `top` inclusive."""
+    if length <= 1:
+        return [0.0] * max(length, 0)
+    return [top * i / (length - 1) for i in range(length)]
+
+
+_STRIP_CACHE = {}
+
+
+def _cached_strip(key, build):
+    """Memoize size-only arrays; widgets only come in a few sizes."""
+    strip = _STRIP_CACHE.get(key)
+    if strip is None:
+        if len(_STRIP_CACHE) >= 32:
+            _STRIP_CACHE.clear()
+        strip = _STRIP_CACHE[key] = build()
+    return strip
+
+
+def _ramp(length):
+    """NumPy twin of `_positions(length, 255.0)`."""
+    return _cached_strip(("ramp", length), lambda: np.linspace(0.0, 255.0, length))
+
+
+def _pure_hue_strip(length):
+    """Float RGB of the full-saturation, full-value spectrum over `length`."""
+    return _cached_strip(
+        ("hue", length),
+        lambda: _hsv_to_rgb_float(np.arange(length) * (360.0 / max(length, 1)), 255, 255),
+    )
+
+
+def hue_strip(length, s=255, v=255):
+    """Full hue spectrum (0 to 360 degrees) over `length` pixels -> (length, 3)."""
+    if HAS_NUMPY:
+        return _to_uint8(_shade(_pure_hue_strip(length), s, v))
+    hues = [360.0 * i / length for i in range(length)]
+    return bytes(c for hue in hues for c in hsv_to_rgb(hue, s, v))
+
+
+def channel_strip(channel, length, a, b):
+    """Gradient for one H/S/V/R/G/B channel over `length` pixels -> (length, 3).
+
+    `a` and `b` are the two other channels of the same model, which fix the
+    rest of the color: H: (s, v) / S: (h, v) / V: (h, s) / R: (g, b) /
+    G: (r, b) / B: (r, g), with hue in degrees and everything else 0-255.
+    """
+    if channel == "H":
+        return hue_strip(length, a, b)
+    if HAS_NUMPY:
+        ramp = _ramp(length)
+        if channel in ("S", "V"):
+            pure = np.array(_pure_hue(a))
+            if channel == "S":
+                return _to_uint8(_shade(pure, ramp[:, None], b))
+            return _to_uint8(_shade(pure, b, ramp[:, None]))
+        strip = np.empty((length, 3), dtype=np.uint8)
+        strip[:] = _rgb_fixed(channel, a, b)
+        strip[:, "RGB".index(channel)] = _to_uint8(ramp)
+        return strip
+
+    ramp = _positions(length, 255.0)
+    if channel == "S":
+        return bytes(c for x in ramp for c in hsv_to_rgb(a, x, b))
+    if channel == "V":
+        return bytes(c for x in ramp for c in hsv_to_rgb(a, b, x))
+    out = bytearray(bytes(_rgb_fixed(channel, a, b)) * length)
+    out["RGB".index(channel) :: 3] = bytes(_clamp_byte(x) for x in ramp)
+    return bytes(out)
+
+
+def _rgb_fixed(channel, a, b):
+    fixed = [a, b]
+    fixed.insert("RGB".index(channel), 0)
+    return fixed
+
+
+def rows_of(strip, height):
+    """Repeat a (width, 3) strip down `height` rows -> (height, width, 3)."""
+    if HAS_NUMPY:
+        # A read-only view; to_rgb888() makes the one copy.
+        return np.broadcast_to(strip, (height,) + strip.shape)
+    return bytes(strip) * height
+
+
+def columns_of(strip, width):
+    """Repeat a (height, 3) strip across `width` columns -> (height, width, 3)."""
+    if HAS_NUMPY:
+        return np.broadcast_to(strip[:, None, :], (strip.shape[0], width, 3))
+    return b"".join(strip[i : i + 3] * width for i in range(0, len(strip), 3))
+
+
+_SCALE_TABLES = {}
+
+
+def _scale_table(v):
+    """bytes.translate table mapping i -> i * v / 255 for an integer v."""
+    table = _SCALE_TABLES.get(v)
+    if table is None:
+        table = bytes(_clamp_byte(i * v / 255.0) for i in range(256))
+        _SCALE_TABLES[v] = table
+    return table
+
+
+def sv_plane(hue, width, height):
+    """Saturation left to right, value top (255) to bottom (0) -> (height, width, 3)."""
+    # HSV->RGB is linear in value, so every row is the fully bright top row
+    # scaled by v / 255: convert that one row, then only scale it per row.
+    # Both paths scale in 8-bit integers, so they agree exactly.
+    if HAS_NUMPY:
+        top = _to_uint8(_shade(np.array(_pure_hue(hue)), _ramp(width)[:, None], 255.0))
+        vals = _to_uint8(_ramp(height)[::-1])
+        # Scale in reused uint16 buffers: allocating ~1 MB of temporaries per
+        # call costs more than the arithmetic (every hue change rebuilds it).
+        shape = (height, 3 * width)
+        plane, carry = _cached_strip(
+            ("sv", shape), lambda: (np.empty(shape, np.uint16), np.empty(shape, np.uint16))
+        )
+        np.multiply(vals.astype(np.uint16)[:, None], top.astype(np.uint16).ravel(), out=plane)
+        # Exact round(x / 255) for x <= 255 * 255, without a division.
+        np.add(plane, 128, out=plane)
+        np.right_shift(plane, 8, out=carry)
+        np.add(plane, carry, out=plane)
+        np.right_shift(plane, 8, out=plane)
+        return plane.astype(np.uint8).reshape(height, width, 3)
+    sats = _positions(width, 255.0)
+    vals = [_clamp_byte(255.0 - y) for y in _positions(height, 255.0)]
+    top = bytes(c for s in sats for c in hsv_to_rgb(hue, s, 255))
+    return b"".join(top.translate(_scale_table(v)) for v in vals)
+
+
+def to_rgb888(image):
+    """Row-major RGB888 bytes for an image built above."""
+    if HAS_NUMPY and isinstance(image, np.ndarray):
+        return image.astype(np.uint8, copy=False).tobytes()
+    return bytes(image)
@@ -0,0 +1,121 @@
+"""Undo/redo for edits to a grid's item list, stored as deltas.
+
+A step keeps only the items an edit changed: for each, the item before and
+after (None where it was added or removed) and where it sat in the list.
+Items are never mutated in place (edits replace them via `copy_with`), so a
+step holds references, not copies. Memory is bounded by both the number of
+steps and the total number of changed items they hold; the oldest steps
+are dropped first.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from .models import PaletteItem
+
+MAX_STEPS = 500
+MAX_CHANGED_ITEMS = 50000
+
+
+@dataclass
+class ItemChange:
+    item_id: str
+    before: Optional[PaletteItem]
+    after: Optional[PaletteItem]
+    before_index: int = -1
+    after_index: int = -1
+
+
+class EditJournal:
+    def __init__(self, max_steps=MAX_STEPS, max_changed_items=MAX_CHANGED_ITEMS):
+        self.max_steps = max(1, int(max_steps))
+        self.max_changed_items = max(1, int(max_changed_items))
+        self._undo: List[List[ItemChange]] = []
+        self._redo: List[List[ItemChange]] = []
+        self._size = 0
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def __len__(self):
+        return len(self._undo)
+
+    def clear(self):
+        self._undo = []
+        self._redo = []
+        self._size = 0
+
+    @staticmethod
+    def diff(
+        before: Sequence[PaletteItem], after: Sequence[PaletteItem]
+    ) -> List[ItemChange]:
+        old = {item.id: (index, item) for index, item in enumerate(before)}
+        changes = []
+        for index, item in enumerate(after):
+            previous = old.pop(item.id, None)
+            if previous is None:
+                changes.append(ItemChange(item.id, None, item, after_index=index))
+            elif previous[1] is not item and previous[1] != item:
+                changes.append(
+                    ItemChange(item.id, previous[1], item, previous[0], index)
+                )
+        for item_id, (index, item) in old.items():
+            changes.append(ItemChange(item_id, item, None, before_index=index))
+        return changes
+
+    def record(
+        self, before: Sequence[PaletteItem], after: Sequence[PaletteItem]
+    ) -> bool:
+        """Record the edit that turned `before` into `after`; clears redo.
+
+        Returns False (and records nothing) if nothing changed.
+        """
+        changes = self.diff(before, after)
+        if not changes:
+            return False
+        self._undo.append(changes)
+        self._size += len(changes)
+        for step in self._redo:
+            self._size -= len(step)
+        self._redo = []
+        while len(self._undo) > 1 and (
+            len(self._undo) > self.max_steps or self._size > self.max_changed_items
+        ):
+            self._size -= len(self._undo.pop(0))
+        return True
+
+    def undo(self, items: Sequence[PaletteItem]) -> Tuple[List[PaletteItem], set]:
+        """`items` with the last step reverted, and the ids it touched."""
+        if not self._undo:
+            return list(items), set()
+        step = self._undo.pop()
+        self._redo.append(step)
+        return self._apply(items, step, forward=False)
+
+    def redo(self, items: Sequence[PaletteItem]) -> Tuple[List[PaletteItem], set]:
+        """`items` with the last undone step re-applied, and the ids it touched."""
+        if not self._redo:
+            return list(items), set()
+        step = self._redo.pop()
+        self._undo.append(step)
+        return self._apply(items, step, forward=True)
+
+    @staticmethod
+    def _apply(items, step, forward):
+        touched = {change.item_id for change in step}
+        result = [item for item in items if item.id not in touched]
+        # Re-insert in list order so each lands where it was.
+        targets = []
+        for change in step:
+            target = change.after if forward else change.before
+            if target is not None:
+                index = change.after_index if forward else change.before_index
+                targets.append((index, target))
+        for index, target in sorted(targets, key=lambda entry: entry[0]):
+            result.insert(min(index, len(result)), target)
+        return result, touched
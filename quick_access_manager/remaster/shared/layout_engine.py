@@ -8,6 +8,7 @@ validation state.
 from dataclasses import dataclass, field
 from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
+from . import metrics
 from .models import PaletteItem
 
 
@@ -40,11 +41,13 @@ class FreeGridLayoutEngine:
     def __init__(self, columns: int):
         self.columns = max(1, int(columns))
 
+    @metrics.timed(metrics.histogram("layout.add_item"))
     def add_item(self, items: Sequence[PaletteItem], new_item: PaletteItem) -> LayoutResult:
         if any(item.id == new_item.id for item in items):
             raise ValueError("Duplicate palette item id: {0}".format(new_item.id))
         return self._place_with_push(list(items), new_item)
 
+    @metrics.timed(metrics.histogram("layout.move_item"))
     def move_item(
         self, items: Sequence[PaletteItem], item_id: str, row: int, col: int
     ) -> LayoutResult:
@@ -52,6 +55,7 @@ class FreeGridLayoutEngine:
         rest = [item for item in items if item.id != item_id]
         return self._place_with_push(rest, moving)
 
+    @metrics.timed(metrics.histogram("layout.resize_item"))
     def resize_item(
         self,
         items: Sequence[PaletteItem],
@@ -69,79 +73,182 @@ class FreeGridLayoutEngine:
         rest = [item for item in items if item.id != item_id]
         return self._place_with_push(rest, resized)
 
+    @metrics.timed(metrics.histogram("layout.move_items"))
+    def move_items(
+        self,
+        items: Sequence[PaletteItem],
+        item_ids: Iterable[str],
+        row_delta: int,
+        col_delta: int,
+    ) -> LayoutResult:
+        """Move a group of items together by the same offset.
+
+        The offset is clamped so the group stays inside the grid; the moved
+        items keep their shape and the rest are pushed out of their way.
+        """
+        item_ids = set(item_ids)
+        active = [item for item in items if item.id in item_ids]
+        if not active:
+            return self.validate(items)
+        # A limit never pushes the group the other way: an item already past
+        # an edge (e.g. after the column count shrank) only stops it moving
+        # further out.
+        row_delta = max(int(row_delta), min(0, -min(item.row for item in active)))
+        col_delta = max(int(col_delta), min(0, -min(item.col for item in active)))
+        fitting = [item for item in active if item.col_span <= self.columns]
+        if fitting:
+            right_room = min(self.columns - item.right for item in fitting)
+            col_delta = min(col_delta, max(0, right_room))
+        if row_delta == 0 and col_delta == 0:
+            return self.validate(items)
+        moved = [
+            item.copy_with(row=item.row + row_delta, col=item.col + col_delta)
+            for item in active
+        ]
+        rest = [item for item in items if item.id not in item_ids]
+        return self._place_group_with_push(rest, moved)
+
+    @metrics.timed(metrics.histogram("layout.resize_items"))
+    def resize_items(
+        self,
+        items: Sequence[PaletteItem],
+        item_ids: Iterable[str],
+        row_delta: int = 0,
+        col_delta: int = 0,
+    ) -> LayoutResult:
+        """Grow or shrink a group of items by the same number of cells.
+
+        Spans stay at least one cell and never reach past the right edge.
+        """
+        item_ids = set(item_ids)
+        resized = []
+        for item in items:
+            if item.id not in item_ids:
+                continue
+            resized.append(
+                item.copy_with(
+                    row_span=max(1, item.row_span + int(row_delta)),
+                    col_span=max(
+                        1,
+                        min(
+                            self.columns - max(0, item.col),
+                            item.col_span + int(col_delta),
+                        ),
+                    ),
+                )
+            )
+        if not resized:
+            return self.validate(items)
+        rest = [item for item in items if item.id not in item_ids]
+        return self._place_group_with_push(rest, resized)
+
+    @metrics.timed(metrics.histogram("layout.validate"))
     def validate(self, items: Sequence[PaletteItem]) -> LayoutResult:
         issues: List[PlacementIssue] = []
         for item in items:
             issues.extend(self._bounds_issues(item))
+        # Index cells to find overlapping pairs without comparing every pair;
+        # report them in the order a pairwise scan of `items` would.
+        owners: Dict[Tuple[int, int], List[int]] = {}
+        pairs: Set[Tuple[int, int]] = set()
         for index, item in enumerate(items):
-            for other in items[index + 1 :]:
-                if self._overlaps(item, other):
-                    issues.append(
-                        PlacementIssue(
-                            item.id,
-                            "overlap",
-                            "Item overlaps with {0}.".format(other.id),
-                        )
-                    )
-                    issues.append(
-                        PlacementIssue(
-                            other.id,
-                            "overlap",
-                            "Item overlaps with {0}.".format(item.id),
-                        )
-                    )
+            for cell in item.cells():
+                earlier = owners.setdefault(cell, [])
+                pairs.update((other, index) for other in earlier)
+                earlier.append(index)
+        for first, second in sorted(pairs):
+            item, other = items[first], items[second]
+            issues.append(
+                PlacementIssue(
+                    item.id,
+                    "overlap",
+                    "Item overlaps with {0}.".format(other.id),
+                )
+            )
+            issues.append(
+                PlacementIssue(
+                    other.id,
+                    "overlap",
+                    "Item overlaps with {0}.".format(item.id),
+                )
+            )
         return LayoutResult(list(items), issues)
 
+    @metrics.timed(metrics.histogram("layout.compact"))
     def compact(self, items: Sequence[PaletteItem]) -> LayoutResult:
         """Pack items left-to-right without holes, preserving visual order."""
         placed: List[PaletteItem] = []
+        occupancy = _Occupancy(self.columns)
         for item in self._stable_order(items):
             candidate = item.copy_with(row=0, col=0)
-            if candidate.col_span > self.columns:
-                placed.append(candidate)
-                continue
-            candidate = self._first_free_position(candidate, placed)
+            if candidate.col_span <= self.columns:
+                candidate = self._first_free_position(candidate, occupancy)
             placed.append(candidate)
+            occupancy.add(candidate)
         return self.validate(placed)
 
     def _place_with_push(
         self, existing_items: List[PaletteItem], active_item: PaletteItem
     ) -> LayoutResult:
-        active_item = active_item.copy_with(row=max(0, active_item.row), col=max(0, active_item.col))
+        return self._place_group_with_push(existing_items, [active_item])
 
-        if active_item.col_span > self.columns:
-            items = [active_item] + list(existing_items)
+    def _place_group_with_push(
+        self, existing_items: List[PaletteItem], active_items: List[PaletteItem]
+    ) -> LayoutResult:
+        """Place `active_items` where requested and push the rest out of the way.
+
+        Active items are placed first, in reading order; one that lands on an
+        earlier active item is pushed like any other. The rest keep their cell
+        unless it is taken, in which case they move to the next free cell in
+        reading order.
+        """
+        active_items = [self._clamped(item) for item in active_items]
+        if any(item.col_span > self.columns for item in active_items):
+            items = active_items + list(existing_items)
             return LayoutResult(items, self.validate(items).issues)
 
-        placed: List[PaletteItem] = [active_item]
+        placed: List[PaletteItem] = []
+        occupancy = _Occupancy(self.columns)
+        for candidate in self._stable_order(active_items):
+            if occupancy.collides(candidate):
+                candidate = self._first_free_position(candidate, occupancy)
+            placed.append(candidate)
+            occupancy.add(candidate)
         for item in self._stable_order(existing_items):
-            candidate = item.copy_with(row=max(0, item.row), col=max(0, item.col))
-            if candidate.col_span > self.columns:
-                placed.append(candidate)
-                continue
-            if self._needs_reposition(candidate, placed):
-                candidate = self._first_free_position(candidate, placed)
+            candidate = self._clamped(item)
+            if candidate.col_span <= self.columns and self._needs_reposition(
+                candidate, occupancy
+            ):
+                candidate = self._first_free_position(candidate, occupancy)
             placed.append(candidate)
+            occupancy.add(candidate)
         return self.validate(placed)
 
+    @staticmethod
+    def _clamped(item: PaletteItem) -> PaletteItem:
+        # Items are never mutated in place, so one already in range is reused.
+        if item.row >= 0 and item.col >= 0:
+            return item
+        return item.copy_with(row=max(0, item.row), col=max(0, item.col))
+
     def _first_free_position(
-        self, item: PaletteItem, placed: Sequence[PaletteItem]
+        self, item: PaletteItem, occupancy: "_Occupancy"
     ) -> PaletteItem:
-        cursor = self._linear_index(item.row, item.col)
+        # Every cell before the first free one is taken, so start there at
+        # the earliest instead of rescanning the packed part of the grid.
+        cursor = max(self._linear_index(item.row, item.col), occupancy.first_free())
         while True:
             row, col = self._row_col(cursor)
-            if col + item.col_span <= self.columns:
-                candidate = item.copy_with(row=row, col=col)
-                if not self._needs_reposition(candidate, placed):
-                    return candidate
+            if col + item.col_span <= self.columns and occupancy.is_free(
+                row, col, item.row_span, item.col_span
+            ):
+                return item.copy_with(row=row, col=col)
             cursor += 1
 
-    def _needs_reposition(
-        self, item: PaletteItem, placed: Sequence[PaletteItem]
-    ) -> bool:
+    def _needs_reposition(self, item: PaletteItem, occupancy: "_Occupancy") -> bool:
         if self._bounds_issues(item):
             return True
-        return any(self._overlaps(item, other) for other in placed)
+        return occupancy.collides(item)
 
     def _bounds_issues(self, item: PaletteItem) -> List[PlacementIssue]:
         issues: List[PlacementIssue] = []
@@ -201,3 +308,33 @@ class FreeGridLayoutEngine:
             if item.id == item_id:
                 return item
         raise ValueError("Palette item not found: {0}".format(item_id))
+
+
+class _Occupancy:
+    """Cells taken so far during a placement pass, for constant-time lookups."""
+
+    def __init__(self, columns: int):
+        self.columns = columns
+        self.cells: Dict[Tuple[int, int], str] = {}
+        self._first_free = 0
+
+    def add(self, item: PaletteItem):
+        for cell in item.cells():
+            self.cells[cell] = item.id
+
+    def collides(self, item: PaletteItem) -> bool:
+        return not self.is_free(item.row, item.col, item.row_span, item.col_span)
+
+    def is_free(self, row: int, col: int, row_span: int, col_span: int) -> bool:
+        cells = self.cells
+        return not any(
+            (cell_row, cell_col) in cells
+            for cell_row in range(row, row + row_span)
+            for cell_col in range(col, col + col_span)
+        )
+
+    def first_free(self) -> int:
+        """Linear index of the first untaken cell (cells are only ever added)."""
+        while divmod(self._first_free, self.columns) in self.cells:
+            self._first_free += 1
+        return self._first_free
@@ -0,0 +1,204 @@
+"""In-process performance metrics, without Qt or Krita.
+
+Hot paths (layout engine calls, the JSON cache, docker rebuilds, gesture
+dispatch, poll ticks, Krita API reads) record into one process-wide
+`MetricsRegistry`. A module fetches its metric objects once, at import:
+
+    _reads = metrics.counter("json_cache.reads")
+    ...
+    _reads.inc()
+
+so recording is an attribute update (`Counter`, `Gauge`) or a bisect into
+fixed buckets (`Histogram`), with no lookup, lock or allocation. Values
+are milliseconds where they are times. `snapshot()` and `to_json()` are for
+the Performance dialog and for comparing runs; `reset()` starts over.
+"""
+
+import functools
+import json
+import time
+from bisect import bisect_left
+
+# Upper bounds, in ms; the last bucket counts everything slower.
+DEFAULT_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class Counter:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def reset(self):
+        self.value = 0
+
+    def as_dict(self):
+        return {"type": "counter", "value": self.value}
+
+
+class Gauge:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name):
+        self.name = name
+        self.value = None
+
+    def set(self, value):
+        self.value = value
+
+    def reset(self):
+        self.value = None
+
+    def as_dict(self):
+        return {"type": "gauge", "value": self.value}
+
+
+class Histogram:
+    """Latency distribution over fixed bucket bounds, plus count/sum/max."""
+
+    __slots__ = ("name", "buckets", "counts", "count", "total", "max")
+
+    def __init__(self, name, buckets=DEFAULT_BUCKETS_MS):
+        self.name = name
+        self.buckets = tuple(sorted(buckets))
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def time(self):
+        """Context manager observing the wall time of its block."""
+        return _Timer(self)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the `fraction` quantile."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def as_dict(self):
+        return {
+            "type": "histogram",
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "max": self.max,
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+        }
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_started")
+
+    def __init__(self, histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc):
+        self._histogram.observe((time.perf_counter() - self._started) * 1000.0)
+        return False
+
+
+class MetricsRegistry:
+    """Named metrics; asking for an existing name returns the same object."""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def _get(self, name, kind, *args):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = kind(name, *args)
+        elif not isinstance(metric, kind):
+            raise TypeError(f"Metric {name!r} is a {type(metric).__name__}")
+        return metric
+
+    def counter(self, name):
+        return self._get(name, Counter)
+
+    def gauge(self, name):
+        return self._get(name, Gauge)
+
+    def histogram(self, name, buckets=DEFAULT_BUCKETS_MS):
+        return self._get(name, Histogram, buckets)
+
+    def names(self):
+        return sorted(self._metrics)
+
+    def snapshot(self):
+        """{name: metric.as_dict()}, sorted by name."""
+        return {name: self._metrics[name].as_dict() for name in self.names()}
+
+    def to_json(self, indent=2):
+        return json.dumps(
+            {"captured_at": time.time(), "metrics": self.snapshot()}, indent=indent
+        )
+
+    def reset(self):
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics():
+    return _registry
+
+
+def counter(name):
+    return _registry.counter(name)
+
+
+def gauge(name):
+    return _registry.gauge(name)
+
+
+def histogram(name, buckets=DEFAULT_BUCKETS_MS):
+    return _registry.histogram(name, buckets)
+
+
+def timed(metric):
+    """Decorator recording each call's wall time into histogram `metric`."""
+
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                metric.observe((time.perf_counter() - started) * 1000.0)
+
+        return wrapper
+
+    return decorate
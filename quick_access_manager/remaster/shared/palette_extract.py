@@ -0,0 +1,259 @@
+"""Dominant colors of a layer or image, without Qt or Krita.
+
+HueSVC's document palette reads a canvas through `Node.pixelData()` /
+`Document.pixelData()`. Reading a whole 8K canvas is hundreds of megabytes,
+so `tile_rects()` spreads a fixed pixel budget over the canvas as a grid of
+small tiles; only those are read. `decode_pixels()` turns the raw tile bytes
+(Krita's BGRA, any of its RGB depths) into opaque sRGB pixels and
+`dominant_colors()` clusters them.
+
+With NumPy the clustering is a bounded k-means in OKLab on a random
+subsample, seeded for repeatable results; without it, a median cut over a
+smaller subsample. Both accept `should_cancel`, checked between passes,
+and return None once it answers True.
+"""
+
+import array
+import math
+import random
+import struct
+import zlib
+
+from . import color_math
+
+try:
+    import numpy as np
+except ImportError:  # Krita builds without NumPy
+    np = None
+
+HAS_NUMPY = np is not None
+
+DEFAULT_TILE_SIZE = 32
+DEFAULT_PIXEL_BUDGET = 65536
+DEFAULT_COLOR_COUNT = 8
+DEFAULT_ITERATIONS = 12
+DEFAULT_MAX_SAMPLES = 20000
+# The pure-Python median cut sorts buckets repeatedly; keep it to a few
+# thousand pixels so it stays well under a second.
+FALLBACK_MAX_SAMPLES = 4000
+
+# Pixels at most this opaque (0-255) are left out.
+MIN_ALPHA = 128
+
+# Bytes per channel and the NumPy / `array` type for Krita's RGB depths.
+DEPTH_FORMATS = {
+    "U8": (1, "u1", "B"),
+    "U16": (2, "<u2", "H"),
+    "F16": (2, "<f2", None),
+    "F32": (4, "<f4", "f"),
+}
+
+
+def tile_rects(x, y, width, height, budget=DEFAULT_PIXEL_BUDGET, tile=DEFAULT_TILE_SIZE):
+    """(x, y, w, h) tiles spread evenly over a rect, at most `budget` pixels.
+
+    A rect that fits the budget is returned whole, as one tile.
+    """
+    if width <= 0 or height <= 0:
+        return []
+    if width * height <= budget:
+        return [(x, y, width, height)]
+    tile_w, tile_h = min(tile, width), min(tile, height)
+    count = max(1, budget // (tile_w * tile_h))
+    # Keep the grid's aspect close to the canvas so both axes are covered.
+    cols = max(1, min(width // tile_w, round(math.sqrt(count * width / height))))
+    rows = max(1, min(height // tile_h, count // cols))
+    rects = []
+    for row in range(rows):
+        top = y + (height - tile_h) * (2 * row + 1) // (2 * rows)
+        for col in range(cols):
+            left = x + (width - tile_w) * (2 * col + 1) // (2 * cols)
+            rects.append((left, top, tile_w, tile_h))
+    return rects
+
+
+def fingerprint(chunks):
+    """Cheap checksum of the sampled bytes; unchanged pixels, same value."""
+    crc = 0
+    for chunk in chunks:
+        crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+# ----------------------------------------------------------------------
+# Decoding
+# ----------------------------------------------------------------------
+def decode_pixels(chunks, depth="U8"):
+    """Opaque sRGB pixels from BGRA tile bytes of the given channel depth.
+
+    Returns an `(n, 3)` uint8 array with NumPy, otherwise a list of
+    (r, g, b) tuples. Float depths are taken as 0-1 and clipped.
+    """
+    size, dtype, code = DEPTH_FORMATS[depth]
+    data = b"".join(chunks)
+    data = data[: len(data) // (4 * size) * (4 * size)]
+    if HAS_NUMPY:
+        values = np.frombuffer(data, dtype=dtype).reshape(-1, 4)
+        if depth == "U8":
+            bgra = values
+        elif depth == "U16":
+            bgra = ((values.astype(np.uint32) + 128) // 257).astype(np.uint8)
+        else:
+            bgra = (np.clip(values.astype(np.float32), 0.0, 1.0) * 255 + 0.5).astype(np.uint8)
+        opaque = bgra[bgra[:, 3] > MIN_ALPHA]
+        return np.ascontiguousarray(opaque[:, 2::-1])
+    return _decode_python(data, depth, code)
+
+
+def _decode_python(data, depth, code):
+    if code is None:
+        values = [v for (v,) in struct.iter_unpack("<e", data)]
+    else:
+        values = array.array(code)
+        values.frombytes(data)
+        if values.itemsize > 1 and struct.pack("=H", 1) != struct.pack("<H", 1):
+            values.byteswap()
+    if depth == "U8":
+        to_byte = int
+    elif depth == "U16":
+        def to_byte(v):
+            return (v + 128) // 257
+    else:
+        def to_byte(v):
+            return int(min(max(v, 0.0), 1.0) * 255 + 0.5)
+    return [
+        (to_byte(values[i + 2]), to_byte(values[i + 1]), to_byte(values[i]))
+        for i in range(0, len(values), 4)
+        if to_byte(values[i + 3]) > MIN_ALPHA
+    ]
+
+
+# ----------------------------------------------------------------------
+# Clustering
+# ----------------------------------------------------------------------
+def dominant_colors(
+    pixels,
+    count=DEFAULT_COLOR_COUNT,
+    iterations=DEFAULT_ITERATIONS,
+    max_samples=DEFAULT_MAX_SAMPLES,
+    seed=0,
+    should_cancel=None,
+):
+    """Up to `count` (rgb, share) pairs, most common first; None if cancelled.
+
+    `share` is the fraction of the sampled pixels the color stands for.
+    """
+    if len(pixels) == 0:
+        return []
+    if HAS_NUMPY:
+        return _kmeans(pixels, count, iterations, max_samples, seed, should_cancel)
+    return _median_cut(pixels, count, min(max_samples, FALLBACK_MAX_SAMPLES), seed, should_cancel)
+
+
+def _cancelled(should_cancel):
+    return should_cancel is not None and should_cancel()
+
+
+def _kmeans(pixels, count, iterations, max_samples, seed, should_cancel):
+    rng = np.random.default_rng(seed)
+    pixels = np.asarray(pixels, dtype=np.uint8).reshape(-1, 3)
+    if len(pixels) > max_samples:
+        pixels = pixels[rng.choice(len(pixels), max_samples, replace=False)]
+    # Identical pixels are common in artwork; cluster each color once,
+    # weighted by how often it occurs. Packing to one integer per pixel makes
+    # np.unique a plain sort instead of a much slower row-wise one.
+    packed = (pixels[:, 0].astype(np.uint32) << 16) | (pixels[:, 1].astype(np.uint32) << 8)
+    packed |= pixels[:, 2]
+    packed, weights = np.unique(packed, return_counts=True)
+    colors = np.stack([packed >> 16, (packed >> 8) & 0xFF, packed & 0xFF], axis=1)
+    weights = weights.astype(np.float64)
+    points = color_math.rgb_to_oklab_array(colors)
+    count = min(count, len(points))
+
+    # k-means++ seeding: each center far from the ones already picked.
+    centers = np.empty((count, 3))
+    centers[0] = points[rng.choice(len(points), p=weights / weights.sum())]
+    nearest = ((points - centers[0]) ** 2).sum(axis=1)
+    for i in range(1, count):
+        spread = nearest * weights
+        if spread.sum() <= 0:
+            centers = centers[:i]
+            break
+        centers[i] = points[rng.choice(len(points), p=spread / spread.sum())]
+        nearest = np.minimum(nearest, ((points - centers[i]) ** 2).sum(axis=1))
+
+    labels = None
+    for _ in range(iterations):
+        if _cancelled(should_cancel):
+            return None
+        # |p - c|^2 less the |p|^2 every center shares: one matrix product.
+        scores = (centers**2).sum(axis=1) - 2.0 * (points @ centers.T)
+        new_labels = scores.argmin(axis=1)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        totals = np.bincount(labels, weights, minlength=len(centers))
+        for axis in range(3):
+            sums = np.bincount(labels, weights * points[:, axis], minlength=len(centers))
+            used = totals > 0
+            centers[used, axis] = sums[used] / totals[used]
+    if _cancelled(should_cancel):
+        return None
+
+    totals = np.bincount(labels, weights, minlength=len(centers))
+    order = np.argsort(-totals, kind="stable")
+    total = weights.sum()
+    return [
+        (color_math.oklab_to_rgb(*centers[i]), float(totals[i] / total))
+        for i in order
+        if totals[i] > 0
+    ]
+
+
+def _split_at_median(bucket, channel):
+    """Split a bucket sorted on `channel` near its middle, between two values.
+
+    Cutting exactly at the median would split a run of one color in two.
+    """
+    middle = len(bucket) // 2
+    cut = middle
+    while cut < len(bucket) and bucket[cut][channel] == bucket[cut - 1][channel]:
+        cut += 1
+    if cut == len(bucket):
+        cut = middle
+        while cut > 1 and bucket[cut][channel] == bucket[cut - 1][channel]:
+            cut -= 1
+    return [bucket[:cut], bucket[cut:]]
+
+
+def _median_cut(pixels, count, max_samples, seed, should_cancel):
+    pixels = list(pixels)
+    if len(pixels) > max_samples:
+        pixels = random.Random(seed).sample(pixels, max_samples)
+    buckets = [pixels]
+    while len(buckets) < count:
+        if _cancelled(should_cancel):
+            return None
+        # Split the bucket with the widest channel range at its median.
+        widest, channel, spread = None, 0, 0
+        for index, bucket in enumerate(buckets):
+            if len(bucket) < 2:
+                continue
+            for c in range(3):
+                values = [p[c] for p in bucket]
+                if max(values) - min(values) > spread:
+                    widest, channel, spread = index, c, max(values) - min(values)
+        if widest is None:
+            break
+        bucket = sorted(buckets.pop(widest), key=lambda p: p[channel])
+        buckets += _split_at_median(bucket, channel)
+    if _cancelled(should_cancel):
+        return None
+
+    total = len(pixels)
+    results = []
+    for bucket in sorted(buckets, key=len, reverse=True):
+        n = len(bucket)
+        mean = tuple(int(round(sum(p[c] for p in bucket) / n)) for c in range(3))
+        results.append((mean, n / total))
+    return results
@@ -0,0 +1,168 @@
+"""Opt-in timing of the plugin's part of Krita's startup.
+
+Launch Krita with `QUICK_ACCESS_MANAGER_PROFILE_STARTUP=1` to time the
+plugin's import, `setup()`, `createActions()`, each docker's
+`createDockWidget()`, gesture initialization and each docker's first paint.
+Once every docker created so far has painted (or `FINISH_TIMEOUT_MS` after
+the first window, whichever comes first) the per-phase report is written to
+`startup_profile.txt` in the remaster config dir. With the value `cprofile`,
+a cProfile dump of the same span goes to `startup_profile.prof` as well.
+
+Without the variable `phase()` returns one shared no-op context manager and
+the other hooks return immediately, so the instrumented code pays one
+function call.
+"""
+
+import contextlib
+import os
+import time
+
+ENV_VAR = "QUICK_ACCESS_MANAGER_PROFILE_STARTUP"
+CPROFILE_MODE = "cprofile"
+REPORT_FILE = "startup_profile.txt"
+CPROFILE_FILE = "startup_profile.prof"
+# Written even if a docker never paints (hidden, or in a collapsed tab).
+FINISH_TIMEOUT_MS = 15000
+
+_NULL_PHASE = contextlib.nullcontext()
+
+
+class StartupProfiler:
+    """Collects nested phases and one-off marks relative to its creation."""
+
+    def __init__(self, use_cprofile=False, clock=time.perf_counter):
+        self._clock = clock
+        self._origin = clock()
+        self._depth = 0
+        self._pending_paints = set()
+        self._finish_scheduled = False
+        self.entries = []  # (name, start ms, duration ms or None, depth)
+        self.finished = False
+        self.cprofile = None
+        if use_cprofile:
+            import cProfile
+
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    def _now_ms(self):
+        return (self._clock() - self._origin) * 1000.0
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        entry = [name, self._now_ms(), None, self._depth]
+        self.entries.append(entry)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            entry[2] = self._now_ms() - entry[1]
+
+    def mark(self, name):
+        self.entries.append([name, self._now_ms(), None, self._depth])
+
+    def expect_paint(self, key):
+        self._pending_paints.add(key)
+
+    def painted(self, key, name):
+        if key not in self._pending_paints:
+            return
+        self._pending_paints.discard(key)
+        self.mark(name)
+        if not self._pending_paints:
+            self.finish()
+
+    def schedule_finish(self, delay_ms=FINISH_TIMEOUT_MS):
+        if self._finish_scheduled:
+            return
+        from .compat import QTimer
+
+        self._finish_scheduled = True
+        QTimer.singleShot(delay_ms, self.finish)
+
+    def report(self):
+        lines = [
+            "Quick Access Manager startup profile",
+            f"{'start ms':>10} {'took ms':>9}  phase",
+        ]
+        for name, start, duration, depth in sorted(self.entries, key=lambda e: e[1]):
+            took = "" if duration is None else f"{duration:.1f}"
+            lines.append(f"{start:10.1f} {took:>9}  {'  ' * depth}{name}")
+        return "\n".join(lines) + "\n"
+
+    def finish(self, directory=None):
+        """Write the report (and cProfile dump); later calls do nothing."""
+        if self.finished:
+            return None
+        self.finished = True
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        try:
+            if directory is None:
+                from .infrastructure.paths import get_remaster_config_dir
+
+                directory = get_remaster_config_dir()
+            path = os.path.join(directory, REPORT_FILE)
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(self.report())
+            if self.cprofile is not None:
+                self.cprofile.dump_stats(os.path.join(directory, CPROFILE_FILE))
+            return path
+        except Exception as e:
+            print(f"Error writing startup profile: {e}")
+            return None
+
+
+def _from_environment():
+    mode = os.environ.get(ENV_VAR, "").strip().lower()
+    if not mode or mode in ("0", "false", "off"):
+        return None
+    return StartupProfiler(use_cprofile=mode == CPROFILE_MODE)
+
+
+_profiler = _from_environment()
+
+
+def get_startup_profiler():
+    """The active profiler, or None when profiling is off."""
+    return _profiler
+
+
+def phase(name):
+    """Context manager timing `name`; a shared no-op when profiling is off."""
+    if _profiler is None or _profiler.finished:
+        return _NULL_PHASE
+    return _profiler.phase(name)
+
+
+def mark(name):
+    if _profiler is not None and not _profiler.finished:
+        _profiler.mark(name)
+
+
+def watch_first_paint(widget, name):
+    """Mark `widget`'s first paint; the report is written once all have painted."""
+    if _profiler is None or _profiler.finished:
+        return
+    from .compat import QEvent, QObject
+
+    profiler = _profiler
+    key = id(widget)
+
+    class _FirstPaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                obj.removeEventFilter(self)
+                profiler.painted(key, f"first paint: {name}")
+                self.deleteLater()
+            return False
+
+    profiler.expect_paint(key)
+    widget.installEventFilter(_FirstPaintFilter(widget))
+
+
+def schedule_finish():
+    """Write the report `FINISH_TIMEOUT_MS` from now if no paint has yet."""
+    if _profiler is not None and not _profiler.finished:
+        _profiler.schedule_finish()
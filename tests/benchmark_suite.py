@@ -0,0 +1,462 @@
+"""Headless performance suite for the remaster package, with a regression check.
+
+Runs without Krita, on the stand-in `krita` module under Qt's offscreen
+platform, and times:
+
+- layout: `FreeGridLayoutEngine` add/move/resize, group move, validate and
+  compact on grids of 10, 100, 1,000 and 10,000 items;
+- repository: `PaletteRepository` load (cold and from the JSON cache) and
+  save of a `TABS` x `ITEMS_PER_TAB` palette (half brushes, half actions);
+- settings: the controller's settings getters and `peek_settings()`;
+- docker: building the Quick Access Palette docker, and `reload_tabs()`;
+- popup: building and showing the palette popup;
+- gesture: the detector's per-event filter cost over the shipped traces.
+
+The Qt groups run against a stand-in Krita holding `PRESETS` presets and
+`ACTIONS` actions, and also record the Krita API calls one run of each
+makes (`krita_calls` in the JSON).
+
+Every metric is a median in microseconds, lower is better. A layout size
+whose quadratic extrapolation from the previous size exceeds `--budget-s`
+is skipped (and listed as skipped) instead of run. The docker, popup and
+gesture groups need PyQt and are skipped without it.
+
+Run `python -m tests.benchmark_suite [--json] [--output FILE]
+[--only GROUP ...] [--sizes N ...]`. With `--compare BASELINE.json`, the
+metrics both runs have are compared, and the exit status is 1 if any is
+more than `--threshold` (default 0.25, i.e. 25%) slower than the baseline.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from unittest import mock
+
+GROUPS = ("layout", "repository", "settings", "docker", "popup", "gesture")
+QT_GROUPS = ("docker", "popup", "gesture")
+LAYOUT_SIZES = (10, 100, 1000, 10000)
+LAYOUT_COLUMNS = 8
+TABS = 6
+ITEMS_PER_TAB = 80
+PRESETS = 5000
+ACTIONS = 2000
+# Per measurement: sample until this much time is spent (at least
+# MIN_SAMPLES, at most MAX_SAMPLES calls).
+MIN_TIME_S = 0.2
+MIN_SAMPLES = 3
+MAX_SAMPLES = 200
+DEFAULT_BUDGET_S = 5.0
+DEFAULT_THRESHOLD = 0.25
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    median_us: float
+    samples: int
+
+
+@dataclass
+class SuiteReport:
+    results: Dict[str, BenchmarkResult] = field(default_factory=dict)
+    skipped: Dict[str, str] = field(default_factory=dict)
+    krita_calls: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def add(self, result):
+        self.results[result.name] = result
+
+    def as_dict(self):
+        return {
+            "captured_at": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": {
+                name: {"median_us": result.median_us, "samples": result.samples}
+                for name, result in sorted(self.results.items())
+            },
+            "skipped": dict(sorted(self.skipped.items())),
+            "krita_calls": self.krita_calls,
+        }
+
+    def summary(self):
+        lines = []
+        for name, result in self.results.items():
+            line = f"{name:<40} {result.median_us:>14,.1f} us  (n={result.samples})"
+            if name in self.krita_calls:
+                line += f", {sum(self.krita_calls[name].values())} Krita calls"
+            lines.append(line)
+        lines.extend(
+            f"{name:<40} {'skipped':>14}     ({reason})"
+            for name, reason in self.skipped.items()
+        )
+        return "\n".join(lines)
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_us: float
+    current_us: float
+
+    @property
+    def ratio(self):
+        return self.current_us / self.baseline_us if self.baseline_us else 1.0
+
+    def regressed(self, threshold):
+        return self.ratio > 1.0 + threshold
+
+    def summary(self, threshold):
+        flag = "REGRESSED" if self.regressed(threshold) else ""
+        return (
+            f"{self.name:<40} {self.baseline_us:>12,.1f} -> {self.current_us:>12,.1f} us"
+            f"  {self.ratio:6.2f}x {flag}"
+        ).rstrip()
+
+
+def compare(baseline, current):
+    """Comparisons for the metrics present in both `as_dict()` outputs."""
+    before = baseline.get("results", {})
+    after = current.get("results", {})
+    return [
+        Comparison(name, before[name]["median_us"], after[name]["median_us"])
+        for name in sorted(set(before) & set(after))
+    ]
+
+
+def measure(name, work, setup=None, teardown=None, max_time_s=None):
+    """Median wall time of `work()` in microseconds.
+
+    `setup()` runs before each call and its result is passed to `work`;
+    `teardown(value)` gets what `work` returned. Neither is timed.
+    """
+    perf = time.perf_counter
+    samples = []
+    spent = 0.0
+    limit = MIN_TIME_S if max_time_s is None else min(MIN_TIME_S, max_time_s)
+    while len(samples) < MAX_SAMPLES:
+        argument = setup() if setup is not None else None
+        started = perf()
+        value = work(argument) if setup is not None else work()
+        elapsed = perf() - started
+        if teardown is not None:
+            teardown(value)
+        samples.append(elapsed)
+        spent += elapsed
+        if spent >= limit and len(samples) >= MIN_SAMPLES:
+            break
+        if max_time_s is not None and spent >= max_time_s:
+            break
+    return BenchmarkResult(name, statistics.median(samples) * 1e6, len(samples))
+
+
+# --- layout ---------------------------------------------------------------
+
+
+def _layout_items(count):
+    from quick_access_manager.remaster.shared import PaletteItem
+
+    return [
+        PaletteItem.create_brush(
+            f"item-{i}", f"brush-{i}", row=i // LAYOUT_COLUMNS, col=i % LAYOUT_COLUMNS
+        )
+        for i in range(count)
+    ]
+
+
+def _layout_operations(engine, items):
+    from quick_access_manager.remaster.shared import PaletteItem
+
+    new_item = PaletteItem.create_brush("new-item", "brush-new", row=0, col=0)
+    middle = items[len(items) // 2].id
+    group = {item.id for item in items[: max(1, len(items) // 10)]}
+    return {
+        "add_item": lambda: engine.add_item(items, new_item),
+        "move_item": lambda: engine.move_item(items, middle, 0, 0),
+        "resize_item": lambda: engine.resize_item(items, items[0].id, col_span=2),
+        "move_items": lambda: engine.move_items(items, group, 1, 0),
+        "validate": lambda: engine.validate(items),
+        "compact": lambda: engine.compact(items),
+    }
+
+
+def run_layout(report, sizes=LAYOUT_SIZES, budget_s=DEFAULT_BUDGET_S):
+    from quick_access_manager.remaster.shared import FreeGridLayoutEngine
+
+    engine = FreeGridLayoutEngine(columns=LAYOUT_COLUMNS)
+    previous = {}  # operation -> (size, median_us)
+    for size in sorted(sizes):
+        items = _layout_items(size)
+        for operation, work in _layout_operations(engine, items).items():
+            name = f"layout.{operation}[{size}]"
+            if operation in previous:
+                last_size, last_us = previous[operation]
+                predicted_s = last_us * (size / last_size) ** 2 / 1e6
+                if predicted_s > budget_s:
+                    report.skipped[name] = f"~{predicted_s:,.0f} s per call predicted"
+                    del previous[operation]
+                    continue
+            elif any(key.startswith(f"layout.{operation}[") for key in report.skipped):
+                report.skipped[name] = "a smaller size was over budget"
+                continue
+            result = measure(name, work, max_time_s=budget_s)
+            report.add(result)
+            previous[operation] = (size, result.median_us)
+
+
+# --- repository and settings -----------------------------------------------
+
+
+def _palette_document(settings=None):
+    from quick_access_manager.remaster.shared import (
+        PaletteDocument,
+        PaletteGrid,
+        PaletteItem,
+        PaletteTab,
+    )
+
+    tabs = []
+    for t in range(TABS):
+        items = []
+        for i in range(ITEMS_PER_TAB):
+            row, col = divmod(i, LAYOUT_COLUMNS)
+            if i % 2:
+                # Named like the stand-in Krita's populated presets.
+                item = PaletteItem.create_brush(
+                    f"item-{t}-{i}", f"Preset {t * ITEMS_PER_TAB + i:05d}", row, col
+                )
+            else:
+                item = PaletteItem.create_action(
+                    f"item-{t}-{i}", f"action_{i}", row, col, col_span=1
+                )
+            items.append(item)
+        grid = PaletteGrid(f"grid-{t}", f"Grid {t}", LAYOUT_COLUMNS, items)
+        tabs.append(PaletteTab(id=f"tab-{t}", name=f"Tab {t}", grids=[grid]))
+    return PaletteDocument(tabs=tabs, active_tab_id=tabs[0].id, settings=settings or {})
+
+
+def _repository(directory):
+    from quick_access_manager.remaster.infrastructure import PaletteRepository
+
+    return PaletteRepository(
+        path=os.path.join(directory, "quick_access_palette.json"),
+        settings_path=os.path.join(directory, "settings.json"),
+    )
+
+
+def run_repository(report):
+    from quick_access_manager.remaster.infrastructure import json_cache
+
+    with tempfile.TemporaryDirectory() as directory:
+        repository = _repository(directory)
+        document = _palette_document()
+        repository.save(document)
+        report.add(
+            measure(
+                "repository.load_cold",
+                lambda _: repository.load(),
+                setup=json_cache.invalidate,
+            )
+        )
+        repository.load()
+        report.add(measure("repository.load_cached", repository.load))
+        report.add(measure("repository.save", lambda: repository.save(document)))
+
+
+def run_settings(report):
+    from quick_access_manager.remaster.infrastructure import AliasRepository
+    from quick_access_manager.remaster.quick_access_palette.controller import (
+        PaletteController,
+        peek_settings,
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        repository = _repository(directory)
+        repository.save(_palette_document({"default": {"docker_icon_size": 36}}))
+        controller = PaletteController(
+            repository=repository,
+            alias_repository=AliasRepository(
+                path=os.path.join(directory, "alias_config.json")
+            ),
+        )
+        getters = {
+            "settings": controller.settings,
+            "docker_icon_size": controller.docker_icon_size,
+            "tab_bar_settings": controller.tab_bar_settings,
+            "huesvc_settings": controller.huesvc_settings,
+            "quick_adjust_settings": controller.quick_adjust_settings,
+            "peek_settings": lambda: peek_settings(repository),
+        }
+        for name, getter in getters.items():
+            report.add(measure(f"settings.{name}", getter))
+
+
+# --- Qt: docker, popup, gesture --------------------------------------------
+
+
+class _QtBench:
+    """Qt, the stand-in Krita and a palette in a throwaway config dir."""
+
+    def __init__(self):
+        from tests import fake_krita
+        from tests.qt_support import start_qt
+
+        self.app = start_qt()
+        self._fake_krita = fake_krita
+        krita = fake_krita.Krita.instance()
+        if krita.activeWindow() is None:
+            krita.openWindow()
+        krita.populate(presets=PRESETS, actions=ACTIONS)
+        from quick_access_manager.remaster.infrastructure import paths
+
+        self._tmp = tempfile.TemporaryDirectory()
+        self._patch = mock.patch.object(
+            paths, "get_krita_data_dir", return_value=self._tmp.name
+        )
+        self._patch.start()
+        from quick_access_manager.remaster.infrastructure import PaletteRepository
+
+        PaletteRepository().save(_palette_document())
+
+    def count_calls(self, report, name, work, teardown=None):
+        """Record the Krita API calls one more `work()` makes."""
+        with self._fake_krita.counting_calls() as made:
+            value = work()
+        if teardown is not None:
+            teardown(value)
+        report.krita_calls[name] = dict(sorted(made.items()))
+
+    def dispose(self, widget):
+        widget.close()
+        widget.deleteLater()
+        self.app.processEvents()
+
+    def close(self):
+        from quick_access_manager.remaster.infrastructure import json_cache
+
+        self._patch.stop()
+        json_cache.invalidate()
+        self._tmp.cleanup()
+
+
+def run_docker(report, bench):
+    from quick_access_manager.remaster.quick_access_palette.docker.widget import (
+        QuickAccessPaletteDockerWidget,
+    )
+
+    def build():
+        docker = QuickAccessPaletteDockerWidget()
+        bench.app.processEvents()
+        return docker
+
+    report.add(measure("docker.build", build, teardown=bench.dispose))
+    bench.count_calls(report, "docker.build", build, teardown=bench.dispose)
+    docker = build()
+    try:
+
+        def reload():
+            docker.reload_tabs()
+            bench.app.processEvents()
+
+        report.add(measure("docker.reload_tabs", reload))
+        bench.count_calls(report, "docker.reload_tabs", reload)
+    finally:
+        bench.dispose(docker)
+
+
+def run_popup(report, bench):
+    from quick_access_manager.remaster.quick_access_palette.popup import (
+        QuickAccessPalettePopup,
+    )
+
+    def show():
+        popup = QuickAccessPalettePopup()
+        popup.show_at_cursor()
+        bench.app.processEvents()
+        return popup
+
+    report.add(measure("popup.show", show, teardown=bench.dispose))
+    bench.count_calls(report, "popup.show", show, teardown=bench.dispose)
+
+
+def run_gesture(report, bench):
+    from tests.gesture_replay import GestureReplayHarness, load_trace, shipped_traces
+
+    harness = GestureReplayHarness()
+    for path in shipped_traces():
+        trace = load_trace(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        # Per-event cost, so the median is over events rather than replays.
+        replay = harness.replay(trace)
+        report.add(BenchmarkResult(f"gesture.filter[{name}]", replay.p50_us, replay.events))
+
+
+def run(groups=GROUPS, sizes=LAYOUT_SIZES, budget_s=DEFAULT_BUDGET_S):
+    from tests.qt_support import HAS_QT
+
+    report = SuiteReport()
+    if "layout" in groups:
+        run_layout(report, sizes=sizes, budget_s=budget_s)
+    if "repository" in groups:
+        run_repository(report)
+    if "settings" in groups:
+        run_settings(report)
+    qt_groups = [group for group in QT_GROUPS if group in groups]
+    if qt_groups and not HAS_QT:
+        for group in qt_groups:
+            report.skipped[group] = "PyQt is not installed"
+    elif qt_groups:
+        bench = _QtBench()
+        try:
+            runners = {"docker": run_docker, "popup": run_popup, "gesture": run_gesture}
+            for group in qt_groups:
+                runners[group](report, bench)
+        finally:
+            bench.close()
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=list(GROUPS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(LAYOUT_SIZES))
+    parser.add_argument("--budget-s", type=float, default=DEFAULT_BUDGET_S)
+    parser.add_argument("--compare", metavar="BASELINE.json")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    report = run(groups=args.only, sizes=args.sizes, budget_s=args.budget_s)
+    data = report.as_dict()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2)
+    if args.json:
+        print(json.dumps(data, indent=2))
+    else:
+        print(report.summary())
+
+    if not args.compare:
+        return 0
+    with open(args.compare, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    comparisons = compare(baseline, data)
+    regressions = [c for c in comparisons if c.regressed(args.threshold)]
+    # Keep stdout parseable with --json.
+    out = sys.stderr if args.json else sys.stdout
+    print(f"\nCompared with {args.compare} (threshold {args.threshold:.0%}):", file=out)
+    for comparison in comparisons:
+        print(comparison.summary(args.threshold), file=out)
+    print(f"{len(regressions)} of {len(comparisons)} metric(s) regressed", file=out)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
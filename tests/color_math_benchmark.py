@@ -0,0 +1,103 @@
+"""Micro-benchmark for the HueSVC gradient images in `shared.color_math`.
+
+Times each image builder at the docker's default widget sizes, with NumPy
+and with the pure-Python fallback. No Qt or Krita needed.
+
+Run `python -m tests.color_math_benchmark [--repeat N] [--json]`.
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+from unittest import mock
+
+from quick_access_manager.remaster.shared import color_math
+
+# Widget sizes from tests.paint_benchmark's docker (DOCK_SIZE = 320x560).
+SV_SIZE = (276, 333)
+HUE_BAR_SIZE = (30, 333)
+CHANNEL_BAR_SIZE = (276, 16)
+
+
+@dataclass
+class BuildReport:
+    name: str
+    backend: str
+    builds: int
+    mean_us: float
+    best_us: float
+
+    def as_dict(self):
+        return asdict(self)
+
+    def summary(self):
+        return (
+            f"{self.name} [{self.backend}]: {self.builds} builds, "
+            f"mean {self.mean_us:.0f} us, best {self.best_us:.0f} us"
+        )
+
+
+def _cases():
+    sv_w, sv_h = SV_SIZE
+    hue_w, hue_h = HUE_BAR_SIZE
+    bar_w, bar_h = CHANNEL_BAR_SIZE
+    return [
+        (f"SV plane {sv_w}x{sv_h}", lambda i: color_math.sv_plane(i % 360, sv_w, sv_h)),
+        (
+            f"hue bar {hue_w}x{hue_h}",
+            lambda i: color_math.columns_of(color_math.hue_strip(hue_h), hue_w),
+        ),
+        (
+            f"S bar {bar_w}x{bar_h}",
+            lambda i: color_math.rows_of(color_math.channel_strip("S", bar_w, i % 360, 200), bar_h),
+        ),
+        (
+            f"R bar {bar_w}x{bar_h}",
+            lambda i: color_math.rows_of(color_math.channel_strip("R", bar_w, i % 256, 40), bar_h),
+        ),
+    ]
+
+
+def _time(build, repeat):
+    costs = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        color_math.to_rgb888(build(i))
+        costs.append((time.perf_counter() - start) * 1e6)
+    return sum(costs) / len(costs), min(costs)
+
+
+def run(repeat=200):
+    backends = [("python", False)]
+    if color_math.HAS_NUMPY:
+        backends.insert(0, ("numpy", True))
+    reports = []
+    for backend, use_numpy in backends:
+        with mock.patch.object(color_math, "HAS_NUMPY", use_numpy):
+            for name, build in _cases():
+                build(0)  # warm-up (size caches)
+                mean_us, best_us = _time(build, repeat)
+                reports.append(BuildReport(name, backend, repeat, mean_us, best_us))
+    return reports
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="print reports as JSON")
+    args = parser.parse_args(argv)
+
+    reports = run(args.repeat)
+    if args.json:
+        print(json.dumps([report.as_dict() for report in reports], indent=2))
+    else:
+        for report in reports:
+            print(report.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
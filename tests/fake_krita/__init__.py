@@ -0,0 +1,627 @@
+"""Stand-in `krita` module for exercising Qt-level plugin code off-Krita.
+
+Models the part of Krita's Python API the plugin uses: `Krita.instance()`
+with its notifier signals, windows, views, documents and actions; resources
+(brush presets as `Resource`, with `Preset` wrapping one for its XML);
+views with the brush/color state; documents whose nodes are U8 RGBA layers
+(transparent BGRA buffers); and `Extension`/`DockWidgetFactory` for
+registration. `install()` registers it as `sys.modules["krita"]` so
+`from krita import Krita` resolves to the classes below; PyQt is required,
+since Krita's own objects are QObjects with real signals.
+
+For realistic sizes, `populate(presets=5000, actions=2000, layers=...)`
+fills the running instance. Every public API method call is counted in
+`calls` ("View.brushSize" -> n); `counting_calls()` gives the calls made
+inside a block, which is how a hot path's Krita round-trips are measured.
+`set_call_cost_us(n)` makes each call busy-wait, since Krita's real API
+costs microseconds per call where the stand-in costs nanoseconds.
+"""
+
+import collections
+import contextlib
+import functools
+import sys
+import time
+import types
+import uuid
+
+try:
+    from PyQt5.QtCore import QObject, QRect, pyqtSignal
+    from PyQt5.QtGui import QColor
+    from PyQt5.QtWidgets import QAction, QDockWidget, QWidget
+except ImportError:
+    from PyQt6.QtCore import QObject, QRect, pyqtSignal
+    from PyQt6.QtGui import QAction, QColor
+    from PyQt6.QtWidgets import QDockWidget, QWidget
+
+
+# "Class.method" -> number of calls since the last reset_calls().
+calls = collections.Counter()
+_call_cost_s = 0.0
+
+
+def reset_calls():
+    calls.clear()
+
+
+@contextlib.contextmanager
+def counting_calls():
+    """Yield a Counter that holds, after the block, the API calls made in it."""
+    before = calls.copy()
+    made = collections.Counter()
+    try:
+        yield made
+    finally:
+        made.update(calls - before)
+
+
+def set_call_cost_us(microseconds):
+    """Busy-wait this long in every counted call (0 turns it off)."""
+    global _call_cost_s
+    _call_cost_s = max(0.0, microseconds) / 1e6
+
+
+def _counted(cls):
+    """Count calls to `cls`'s public methods; helpers opt out via `_uncounted`."""
+    skip = set(getattr(cls, "_uncounted", ()))
+    for name, member in list(vars(cls).items()):
+        if name.startswith("_") or name in skip:
+            continue
+        if not isinstance(member, types.FunctionType):
+            continue  # classmethods, nested classes, Qt signals
+        setattr(cls, name, _count(f"{cls.__name__}.{name}", member))
+    return cls
+
+
+def _count(key, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        calls[key] += 1
+        if _call_cost_s:
+            deadline = time.perf_counter() + _call_cost_s
+            while time.perf_counter() < deadline:
+                pass
+        return method(*args, **kwargs)
+
+    return wrapper
+
+
+class Notifier(QObject):
+    windowCreated = pyqtSignal()
+    viewCreated = pyqtSignal(object)
+    viewClosed = pyqtSignal(object)
+    imageCreated = pyqtSignal(object)
+    imageSaved = pyqtSignal(str)
+    imageClosed = pyqtSignal(str)
+    configurationChanged = pyqtSignal()
+    applicationClosing = pyqtSignal()
+
+
+@_counted
+class Resource:
+    def __init__(self, name, resource_type="preset", filename="", image=None):
+        self._name = name
+        self._type = resource_type
+        self._filename = filename or f"{name}.kpp"
+        self._image = image
+        self._xml = f'<Preset name="{name}" paintopid="paintbrush"/>'
+
+    def name(self):
+        return self._name
+
+    def type(self):
+        return self._type
+
+    def filename(self):
+        return self._filename
+
+    def image(self):
+        return self._image
+
+    def setImage(self, image):
+        self._image = image
+
+
+@_counted
+class Preset(Resource):
+    """A brush preset. Like Krita's, `Preset(resource)` wraps a resource to
+    reach its XML; `Preset("name")` is a shorthand for a new one."""
+
+    def __init__(self, resource):
+        if isinstance(resource, Resource):
+            self.__dict__ = resource.__dict__
+        else:
+            super().__init__(resource)
+
+    def toXML(self):
+        return self._xml
+
+    def fromXML(self, xml):
+        self._xml = xml
+
+
+@_counted
+class ManagedColor:
+    def __init__(self, model="RGBA", depth="U8", profile=""):
+        # Krita's U8 RGBA component order is B, G, R, A.
+        self._components = [0.0, 0.0, 0.0, 1.0]
+
+    def colorModel(self):
+        return "RGBA"
+
+    def colorDepth(self):
+        return "U8"
+
+    def components(self):
+        return list(self._components)
+
+    def setComponents(self, components):
+        self._components = list(components)
+
+    def colorForCanvas(self, canvas):
+        b, g, r = (round(c * 255) for c in self._components[:3])
+        return QColor(r, g, b)
+
+    @classmethod
+    def fromRgb(cls, r, g, b):
+        color = cls()
+        color.setComponents([b / 255.0, g / 255.0, r / 255.0, 1.0])
+        return color
+
+
+@_counted
+class Node:
+    """A U8 RGBA paint layer; its pixels are a BGRA buffer, transparent by default."""
+
+    def __init__(self, name="Layer 1", width=0, height=0, node_type="paintlayer"):
+        self._name = name
+        self._type = node_type
+        self._opacity = 255
+        self._blending_mode = "normal"
+        self._visible = True
+        self._uuid = uuid.uuid4()
+        self._width = width
+        self._height = height
+        self._pixels = bytearray(width * height * 4)
+        self._parent = None
+        self._children = []
+
+    def name(self):
+        return self._name
+
+    def setName(self, name):
+        self._name = name
+
+    def type(self):
+        return self._type
+
+    def uniqueId(self):
+        return self._uuid
+
+    def opacity(self):
+        return self._opacity
+
+    def setOpacity(self, value):
+        self._opacity = int(value)
+
+    def blendingMode(self):
+        return self._blending_mode
+
+    def setBlendingMode(self, mode):
+        self._blending_mode = mode
+
+    def visible(self):
+        return self._visible
+
+    def setVisible(self, visible):
+        self._visible = bool(visible)
+
+    def colorModel(self):
+        return "RGBA"
+
+    def colorDepth(self):
+        return "U8"
+
+    def parentNode(self):
+        return self._parent
+
+    def childNodes(self):
+        return list(self._children)
+
+    def addChildNode(self, child, above=None):
+        self._attach(child, above)
+        return True
+
+    def _attach(self, child, above=None):
+        child._parent = self
+        if above in self._children:
+            self._children.insert(self._children.index(above) + 1, child)
+        else:
+            self._children.append(child)
+
+    def bounds(self):
+        return QRect(0, 0, self._width, self._height)
+
+    def pixelData(self, x, y, w, h):
+        rows = []
+        for row in range(y, y + h):
+            start = (row * self._width + x) * 4
+            rows.append(bytes(self._pixels[start : start + w * 4]))
+        return b"".join(rows)
+
+    def setPixelData(self, data, x, y, w, h):
+        for i, row in enumerate(range(y, y + h)):
+            start = (row * self._width + x) * 4
+            self._pixels[start : start + w * 4] = data[i * w * 4 : (i + 1) * w * 4]
+
+
+@_counted
+class Document:
+    _uncounted = ("addLayers",)
+
+    def __init__(self, width=0, height=0, name="Untitled"):
+        self._width = width
+        self._height = height
+        self._name = name
+        self._file_name = ""
+        self._root = Node("root", node_type="grouplayer")
+        self._node = Node(width=width, height=height)
+        self._root._attach(self._node)
+        self._selection = None
+
+    def addLayers(self, count):
+        """Add `count` paint layers above the first; the active one is kept."""
+        for index in range(count):
+            self._root._attach(Node(f"Layer {index + 2}", self._width, self._height))
+
+    def name(self):
+        return self._name
+
+    def fileName(self):
+        return self._file_name
+
+    def width(self):
+        return self._width
+
+    def height(self):
+        return self._height
+
+    def rootNode(self):
+        return self._root
+
+    def topLevelNodes(self):
+        return self._root.childNodes()
+
+    def nodeByName(self, name):
+        for node in self._root.childNodes():
+            if node.name() == name:
+                return node
+        return None
+
+    def createNode(self, name, node_type):
+        return Node(name, self._width, self._height, node_type)
+
+    def activeNode(self):
+        return self._node
+
+    def setActiveNode(self, node):
+        self._node = node
+
+    def colorModel(self):
+        return "RGBA"
+
+    def colorDepth(self):
+        return "U8"
+
+    def pixelData(self, x, y, w, h):
+        # The projection of a single-layer image is that layer.
+        return self._node.pixelData(x, y, w, h)
+
+    def selection(self):
+        return self._selection
+
+    def setSelection(self, selection):
+        self._selection = selection
+
+    def refreshProjection(self):
+        pass
+
+
+class Canvas:
+    pass
+
+
+@_counted
+class View:
+    def __init__(self, window, document=None):
+        self._window = window
+        self._document = document
+        self._canvas = Canvas()
+        self._preset = None
+        self._brush_size = 10.0
+        self._opacity = 1.0
+        self._flow = 1.0
+        self._rotation = 0.0
+        self._blending_mode = "normal"
+        self._foreground = ManagedColor.fromRgb(0, 0, 0)
+        self._background = ManagedColor.fromRgb(255, 255, 255)
+
+    def window(self):
+        return self._window
+
+    def document(self):
+        return self._document
+
+    def canvas(self):
+        return self._canvas
+
+    def visible(self):
+        return True
+
+    def currentBrushPreset(self):
+        return self._preset
+
+    def setCurrentBrushPreset(self, preset):
+        self._preset = preset
+
+    def brushSize(self):
+        return self._brush_size
+
+    def setBrushSize(self, value):
+        self._brush_size = float(value)
+
+    def paintingOpacity(self):
+        return self._opacity
+
+    def setPaintingOpacity(self, value):
+        self._opacity = float(value)
+
+    def paintingFlow(self):
+        return self._flow
+
+    def setPaintingFlow(self, value):
+        self._flow = float(value)
+
+    def brushRotation(self):
+        return self._rotation
+
+    def setBrushRotation(self, value):
+        self._rotation = float(value)
+
+    def currentBlendingMode(self):
+        return self._blending_mode
+
+    def setCurrentBlendingMode(self, mode):
+        self._blending_mode = mode
+
+    def foregroundColor(self):
+        return self._foreground
+
+    def setForeGroundColor(self, color):
+        self._foreground = color
+
+    def backgroundColor(self):
+        return self._background
+
+    def setBackGroundColor(self, color):
+        self._background = color
+
+
+@_counted
+class Window(QObject):
+    _uncounted = ("addView",)
+    activeViewChanged = pyqtSignal()
+    windowClosed = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self._qwindow = None
+        self._views = [View(self)]
+
+    def qwindow(self):
+        # Built lazily: a QWidget needs a QApplication, which a test creates
+        # only after installing the stand-in.
+        if self._qwindow is None:
+            self._qwindow = QWidget()
+        return self._qwindow
+
+    def views(self):
+        return list(self._views)
+
+    def activeView(self):
+        return self._views[0] if self._views else None
+
+    def addView(self, document=None):
+        """Open a view and make it the active one, as opening a document does."""
+        view = View(self, document)
+        self._views.insert(0, view)
+        Krita.instance().notifier().viewCreated.emit(view)
+        self.activeViewChanged.emit()
+        return view
+
+    def dockers(self):
+        if self._qwindow is None:
+            return []
+        return self._qwindow.findChildren(QDockWidget)
+
+    def createAction(self, action_id, text="", menu_location=""):
+        action = QAction(text, self)
+        action.setObjectName(action_id)
+        # Krita.action() looks through the window's action collection.
+        Krita.instance()._actions[action_id] = action
+        return action
+
+
+@_counted
+class Krita(QObject):
+    _instance = None
+    _uncounted = ("populate", "setActiveDocument")
+
+    def __init__(self):
+        super().__init__()
+        self._notifier = Notifier()
+        self._windows = []
+        self._extensions = []
+        self._dock_factories = []
+        self._presets = {}
+        self._resources = {}
+        self._actions = {}
+        self._documents = []
+        self._document = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def reset(cls):
+        cls._instance = None
+
+    def populate(self, presets=0, actions=0, layers=0, resources=None):
+        """Add `presets` brush presets, `actions` QActions and, on the active
+        document, `layers` more layers; `resources` maps other resource types
+        ("gradient", "pattern", ...) to counts."""
+        for index in range(len(self._presets), presets):
+            name = f"Preset {index:05d}"
+            self._presets[name] = Resource(name)
+        for index in range(len(self._actions), actions):
+            action_id = f"stand_in_action_{index:05d}"
+            action = QAction(f"Action {index}", self)
+            action.setObjectName(action_id)
+            self._actions[action_id] = action
+        for resource_type, count in (resources or {}).items():
+            bucket = self._resources.setdefault(resource_type, {})
+            for index in range(len(bucket), count):
+                name = f"{resource_type} {index:05d}"
+                bucket[name] = Resource(name, resource_type)
+        if layers and self._document is not None:
+            self._document.addLayers(layers)
+        return self
+
+    def notifier(self):
+        return self._notifier
+
+    def version(self):
+        return "5.2.0"
+
+    def windows(self):
+        return list(self._windows)
+
+    def activeWindow(self):
+        return self._windows[0] if self._windows else None
+
+    def openWindow(self):
+        window = Window()
+        self._windows.append(window)
+        self._notifier.windowCreated.emit()
+        return window
+
+    def views(self):
+        return [view for window in self._windows for view in window.views()]
+
+    def documents(self):
+        return list(self._documents)
+
+    def activeDocument(self):
+        return self._document
+
+    def setActiveDocument(self, document):
+        if document is not None and document not in self._documents:
+            self._documents.append(document)
+        self._document = document
+
+    def createDocument(
+        self, width, height, name, color_model, color_depth, profile, resolution
+    ):
+        document = Document(width, height, name)
+        self._documents.append(document)
+        return document
+
+    def resources(self, resource_type):
+        if resource_type == "preset":
+            return dict(self._presets)
+        return dict(self._resources.get(resource_type, {}))
+
+    def action(self, action_id):
+        return self._actions.get(action_id)
+
+    def actions(self):
+        return list(self._actions.values())
+
+    def readSetting(self, group, name, default):
+        return default
+
+    def writeSetting(self, group, name, value):
+        pass
+
+    def addExtension(self, extension):
+        self._extensions.append(extension)
+
+    def addDockWidgetFactory(self, factory):
+        self._dock_factories.append(factory)
+
+
+class Extension(QObject):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+    def setup(self):
+        pass
+
+    def createActions(self, window):
+        pass
+
+
+class DockWidget(QDockWidget):
+    def canvasChanged(self, canvas):
+        pass
+
+
+class DockWidgetFactoryBase:
+    def __init__(self, docker_id, dock_position):
+        self._id = docker_id
+        self._position = dock_position
+
+    def id(self):
+        return self._id
+
+    def createDockWidget(self):
+        raise NotImplementedError
+
+
+class DockWidgetFactory(DockWidgetFactoryBase):
+    DockRight = 2
+
+
+def populate(**sizes):
+    """`Krita.instance().populate(**sizes)`; see there."""
+    return Krita.instance().populate(**sizes)
+
+
+def install():
+    """Register this module as `krita` (idempotent) and return the module."""
+    existing = sys.modules.get("krita")
+    if existing is not None:
+        return existing
+    module = types.ModuleType("krita")
+    for name in (
+        "DockWidget",
+        "DockWidgetFactory",
+        "DockWidgetFactoryBase",
+        "Canvas",
+        "Document",
+        "Extension",
+        "Krita",
+        "ManagedColor",
+        "Node",
+        "Notifier",
+        "Preset",
+        "Resource",
+        "View",
+        "Window",
+    ):
+        setattr(module, name, globals()[name])
+    sys.modules["krita"] = module
+    return module
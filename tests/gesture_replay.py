@@ -0,0 +1,463 @@
+"""Headless replay harness for the gesture detector.
+
+Feeds recorded or generated key/mouse event streams into
+`GestureDetector.eventFilter` under Qt's offscreen platform with the stand-in
+`krita` module, and reports throughput, per-event filter cost, and the
+gestures the detector recognized.
+
+Trace files are JSON:
+
+    {
+      "name": "...",
+      "rate_hz": 1000,                  # mouse sampling rate of the device
+      "settings": {"minimum_pixels_to_move": 20},
+      "gesture_configs": {"G": {"up": {...gesture config...}, ...}},
+      "events": [
+        [t_ms, "press", "G", x, y],     # key press with the cursor at (x, y)
+        [t_ms, "release", "G"],
+        [t_ms, "move", x, y]            # global mouse position
+      ],
+      "expected_actions": [{"gesture_type": ..., "parameters": {...}}, ...]
+    }
+
+Run `python -m tests.gesture_replay [trace.json ...]` for a report (every
+shipped trace when no path is given), `--realtime` to pace the replay at the
+recorded timestamps, or `--generate OUT.json` to write a fresh synthetic trace.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+from unittest import mock
+
+TRACES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gesture_traces")
+
+# The eight compass directions as (dx, dy) in screen space (y grows downwards).
+DIRECTION_VECTORS = {
+    "right": (1, 0),
+    "right_up": (1, -1),
+    "up": (0, -1),
+    "left_up": (-1, -1),
+    "left": (-1, 0),
+    "left_down": (-1, 1),
+    "down": (0, 1),
+    "right_down": (1, 1),
+}
+
+
+def load_trace(path):
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def shipped_traces():
+    if not os.path.isdir(TRACES_DIR):
+        return []
+    return sorted(
+        os.path.join(TRACES_DIR, name)
+        for name in os.listdir(TRACES_DIR)
+        if name.endswith(".json")
+    )
+
+
+# ----------------------------------------------------------------------
+# Trace generation
+# ----------------------------------------------------------------------
+def _action(action_id):
+    return {"gesture_type": "action", "parameters": {"action_id": action_id}}
+
+
+DEFAULT_GESTURE_CONFIGS = {
+    "G": {
+        "up": _action("view_zoom_in"),
+        "down": _action("view_zoom_out"),
+        "left": _action("edit_undo"),
+        "right": _action("edit_redo"),
+        "center": _action("reset_canvas_rotation"),
+    },
+    "F2": {
+        "left_up": {"gesture_type": "brush", "parameters": {"brush_name": "b) Basic-5 Size"}},
+        "right_down": {"gesture_type": "docker_toggle", "parameters": {"docker_name": "Layers"}},
+    },
+}
+
+
+def generate_trace(
+    gestures,
+    rate_hz=1000,
+    gesture_configs=None,
+    threshold=20,
+    seed=0,
+    name="generated",
+    idle_ms=400,
+    stroke_ms=180,
+    distance=120,
+    stray_keys=("A", "S", "1"),
+):
+    """Build a trace that performs `gestures` ((key, direction) pairs) in order.
+
+    Between gestures the cursor wanders as it would during ordinary painting,
+    sampled at `rate_hz`, with an occasional tap of an unbound key, so most of
+    the stream is events the detector has to look at and then ignore.
+    """
+    rng = random.Random(seed)
+    configs = gesture_configs or DEFAULT_GESTURE_CONFIGS
+    step_ms = 1000.0 / rate_hz
+    events = []
+    expected = []
+    t = 0.0
+    x, y = 800.0, 500.0
+
+    def wander(duration_ms):
+        nonlocal t, x, y
+        heading = rng.uniform(0, 2 * math.pi)
+        for _ in range(int(duration_ms / step_ms)):
+            heading += rng.uniform(-0.3, 0.3)
+            x += math.cos(heading) * 1.5
+            y += math.sin(heading) * 1.5
+            t += step_ms
+            events.append([round(t, 3), "move", int(x), int(y)])
+
+    for key, direction in gestures:
+        wander(idle_ms)
+        if stray_keys and rng.random() < 0.5:
+            stray = rng.choice(stray_keys)
+            events.append([round(t, 3), "press", stray, int(x), int(y)])
+            t += 60
+            events.append([round(t, 3), "release", stray])
+
+        t += step_ms
+        events.append([round(t, 3), "press", key, int(x), int(y)])
+        if direction == "center":
+            dx, dy = 0.0, 0.0
+            travel = threshold / 3.0
+        else:
+            dx, dy = DIRECTION_VECTORS[direction]
+            norm = math.hypot(dx, dy)
+            dx, dy = dx / norm, dy / norm
+            travel = float(distance)
+        samples = max(1, int(stroke_ms / step_ms))
+        start_x, start_y = x, y
+        for index in range(1, samples + 1):
+            progress = index / samples
+            jitter = rng.uniform(-1.5, 1.5)
+            x = start_x + dx * travel * progress + (jitter if dx == 0 else 0)
+            y = start_y + dy * travel * progress + (jitter if dy == 0 else 0)
+            if direction == "center":
+                x = start_x + rng.uniform(-travel, travel)
+                y = start_y + rng.uniform(-travel, travel)
+            t += step_ms
+            events.append([round(t, 3), "move", int(x), int(y)])
+        t += step_ms
+        events.append([round(t, 3), "release", key])
+
+        config = configs.get(key, {}).get(direction)
+        if config:
+            expected.append(config)
+
+    wander(idle_ms)
+    return {
+        "name": name,
+        "rate_hz": rate_hz,
+        "settings": {"minimum_pixels_to_move": threshold, "show_preview": False},
+        "gesture_configs": configs,
+        "events": events,
+        "expected_actions": expected,
+    }
+
+
+# ----------------------------------------------------------------------
+# Replay
+# ----------------------------------------------------------------------
+@dataclass
+class ReplayReport:
+    name: str
+    events: int
+    wall_seconds: float
+    filter_seconds: float
+    events_per_second: float
+    mean_us: float
+    p50_us: float
+    p95_us: float
+    max_us: float
+    cost_by_kind_us: Dict[str, float] = field(default_factory=dict)
+    actions: List[dict] = field(default_factory=list)
+
+    def as_dict(self):
+        return asdict(self)
+
+    def summary(self):
+        kinds = ", ".join(
+            f"{kind} {cost:.1f}" for kind, cost in sorted(self.cost_by_kind_us.items())
+        )
+        return (
+            f"{self.name}: {self.events} events, "
+            f"{self.events_per_second:,.0f} events/s through the filter, "
+            f"mean {self.mean_us:.1f} us, p50 {self.p50_us:.1f} us, "
+            f"p95 {self.p95_us:.1f} us, max {self.max_us:.1f} us "
+            f"(mean by kind: {kinds}); {len(self.actions)} gesture(s) recognized"
+        )
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class GestureReplayHarness:
+    """Drives a real GestureDetector with synthetic Qt events.
+
+    The detector is built against a throwaway gesture data dir, so replaying
+    never reads or writes the user's Krita config, and `execute_gesture` is
+    swapped for a recorder, so recognized gestures are reported instead of
+    being run against the stand-in Krita.
+    """
+
+    def __init__(self):
+        from tests import fake_krita
+        from tests.qt_support import start_qt
+
+        self.app = start_qt()
+        krita = fake_krita.Krita.instance()
+        if krita.activeWindow() is None:
+            krita.openWindow()
+
+        from quick_access_manager.remaster.compat import (
+            QEvent,
+            QKeyEvent,
+            QMouseEvent,
+            QObject,
+            QPointF,
+            Qt,
+        )
+        from quick_access_manager.remaster.gesture import gesture_main
+
+        self._QEvent = QEvent
+        self._QKeyEvent = QKeyEvent
+        self._QMouseEvent = QMouseEvent
+        self._QPointF = QPointF
+        self._Qt = Qt
+        self._gesture_main = gesture_main
+        self._target = QObject()
+
+    def _key_code(self, key_text):
+        Qt = self._Qt
+        if key_text.startswith("F") and key_text[1:].isdigit():
+            return getattr(Qt, f"Key_{key_text}")
+        return getattr(Qt, f"Key_{key_text.upper()}", 0)
+
+    def build_events(self, trace):
+        """Turn trace rows into (t_ms, kind, QEvent, cursor_pos) tuples up front,
+        so event construction is not billed to the filter."""
+        Qt = self._Qt
+        QEvent = self._QEvent
+        built = []
+        for row in trace["events"]:
+            t_ms, kind = row[0], row[1]
+            if kind == "move":
+                pos = self._QPointF(row[2], row[3])
+                event = self._QMouseEvent(
+                    QEvent.MouseMove, pos, pos, Qt.NoButton, Qt.NoButton, Qt.NoModifier
+                )
+                built.append((t_ms, kind, event, None))
+            elif kind in ("press", "release"):
+                key_text = row[2]
+                text = "" if key_text.startswith("F") and len(key_text) > 1 else key_text.lower()
+                event_type = QEvent.KeyPress if kind == "press" else QEvent.KeyRelease
+                event = self._QKeyEvent(
+                    event_type, self._key_code(key_text), Qt.NoModifier, text
+                )
+                cursor = (row[3], row[4]) if kind == "press" and len(row) >= 5 else None
+                built.append((t_ms, kind, event, cursor))
+            else:
+                raise ValueError(f"Unknown trace event kind: {kind!r}")
+        return built
+
+    def make_detector(self, trace):
+        with tempfile.TemporaryDirectory() as data_dir:
+            with open(os.path.join(data_dir, "gesture.json"), "w", encoding="utf-8") as handle:
+                json.dump(trace.get("settings", {}), handle)
+            with mock.patch.object(
+                self._gesture_main, "get_gesture_data_dir", return_value=data_dir
+            ):
+                detector = self._gesture_main.GestureDetector()
+        detector.gesture_configs = {
+            key.upper(): dict(mapping) for key, mapping in trace["gesture_configs"].items()
+        }
+        return detector
+
+    def replay(self, trace, realtime=False, detector=None):
+        """Replay `trace` and return a ReplayReport.
+
+        With `realtime`, events are delivered at their recorded timestamps and
+        Qt gets to process its own queue in between, like it would in Krita;
+        otherwise they are pushed back-to-back for a pure throughput number.
+        """
+        from quick_access_manager.remaster.compat import QCursor, QPoint
+
+        built = self.build_events(trace)
+        detector = detector or self.make_detector(trace)
+        actions = []
+        costs = []
+        cost_by_kind = {}
+        filter_event = detector.eventFilter
+        target = self._target
+        perf = time.perf_counter
+
+        with mock.patch.object(
+            self._gesture_main, "execute_gesture", side_effect=actions.append
+        ):
+            wall_start = perf()
+            for t_ms, kind, event, cursor in built:
+                if realtime:
+                    due = wall_start + t_ms / 1000.0
+                    while True:
+                        remaining = due - perf()
+                        if remaining <= 0:
+                            break
+                        self.app.processEvents()
+                        if remaining > 0.002:
+                            time.sleep(remaining / 2)
+                if cursor is not None:
+                    QCursor.setPos(QPoint(int(cursor[0]), int(cursor[1])))
+                started = perf()
+                filter_event(target, event)
+                cost = perf() - started
+                costs.append(cost)
+                cost_by_kind.setdefault(kind, []).append(cost)
+            wall = perf() - wall_start
+
+        total = sum(costs)
+        ordered = sorted(costs)
+        return ReplayReport(
+            name=trace.get("name", "trace"),
+            events=len(costs),
+            wall_seconds=wall,
+            filter_seconds=total,
+            events_per_second=(len(costs) / total) if total else 0.0,
+            mean_us=(statistics.fmean(costs) * 1e6) if costs else 0.0,
+            p50_us=_percentile(ordered, 0.50) * 1e6,
+            p95_us=_percentile(ordered, 0.95) * 1e6,
+            max_us=(ordered[-1] * 1e6) if ordered else 0.0,
+            cost_by_kind_us={
+                kind: statistics.fmean(values) * 1e6 for kind, values in cost_by_kind.items()
+            },
+            actions=actions,
+        )
+
+
+class TraceRecorder:
+    """Record a live key/mouse stream into the trace format above.
+
+    For capturing real device traces: from Krita's Scripter, put this
+    repository on sys.path, then
+
+        recorder = TraceRecorder(); recorder.start()
+        ... perform gestures ...
+        recorder.stop(); recorder.save("my_trace.json", gesture_configs)
+    """
+
+    def __init__(self, name="recorded"):
+        from quick_access_manager.remaster.compat import QCursor, QEvent, QObject, Qt
+
+        self.name = name
+        self.events = []
+        self._started = None
+        recorder = self
+
+        class _Filter(QObject):
+            def eventFilter(self, _obj, event):
+                t = event.type()
+                if t not in (QEvent.KeyPress, QEvent.KeyRelease, QEvent.MouseMove):
+                    return False
+                stamp = round((time.perf_counter() - recorder._started) * 1000.0, 3)
+                if t == QEvent.MouseMove:
+                    pos = event.globalPos()
+                    recorder.events.append([stamp, "move", pos.x(), pos.y()])
+                elif not event.isAutoRepeat():
+                    key = event.text().upper()
+                    if not key and Qt.Key_F1 <= event.key() <= Qt.Key_F12:
+                        key = f"F{event.key() - Qt.Key_F1 + 1}"
+                    if not key:
+                        return False
+                    if t == QEvent.KeyPress:
+                        pos = QCursor.pos()
+                        recorder.events.append([stamp, "press", key, pos.x(), pos.y()])
+                    else:
+                        recorder.events.append([stamp, "release", key])
+                return False
+
+        self._filter = _Filter()
+
+    def start(self):
+        from quick_access_manager.remaster.compat import QApplication
+
+        self.events = []
+        self._started = time.perf_counter()
+        QApplication.instance().installEventFilter(self._filter)
+
+    def stop(self):
+        from quick_access_manager.remaster.compat import QApplication
+
+        QApplication.instance().removeEventFilter(self._filter)
+
+    def save(self, path, gesture_configs, settings=None, expected_actions=None):
+        trace = {
+            "name": self.name,
+            "rate_hz": None,
+            "settings": settings or {"minimum_pixels_to_move": 20, "show_preview": False},
+            "gesture_configs": gesture_configs,
+            "events": self.events,
+            "expected_actions": expected_actions or [],
+        }
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(trace, handle, separators=(",", ":"))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("traces", nargs="*", help="trace files (default: shipped traces)")
+    parser.add_argument("--realtime", action="store_true", help="pace at recorded timestamps")
+    parser.add_argument("--json", action="store_true", help="print reports as JSON")
+    parser.add_argument("--generate", metavar="OUT", help="write a synthetic trace and exit")
+    parser.add_argument("--rate", type=int, default=1000, help="generated sampling rate (Hz)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        gestures = [("G", d) for d in ("up", "down", "left", "right", "center")]
+        gestures += [("F2", "left_up"), ("F2", "right_down"), ("G", "left_down")]
+        trace = generate_trace(
+            gestures, rate_hz=args.rate, seed=args.seed,
+            name=os.path.splitext(os.path.basename(args.generate))[0],
+        )
+        with open(args.generate, "w", encoding="utf-8") as handle:
+            json.dump(trace, handle, separators=(",", ":"))
+        print(f"Wrote {len(trace['events'])} events to {args.generate}")
+        return 0
+
+    harness = GestureReplayHarness()
+    reports = [
+        harness.replay(load_trace(path), realtime=args.realtime)
+        for path in (args.traces or shipped_traces())
+    ]
+    if args.json:
+        print(json.dumps([report.as_dict() for report in reports], indent=2))
+    else:
+        for report in reports:
+            print(report.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
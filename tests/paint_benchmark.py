@@ -0,0 +1,187 @@
+"""Headless paint benchmark for the HueSVC color picker.
+
+Builds the real HueSVC docker against the stand-in `krita` module under Qt's
+offscreen platform, then drags across the SV box (and the hue bar) with
+synthetic mouse events, flushing the resulting repaints after every step. Each
+step's cost - event handling, the docker's color sync, and every repaint it
+caused - is one frame.
+
+Run `python -m tests.paint_benchmark [--steps N] [--json]`.
+"""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+from unittest import mock
+
+DOCK_SIZE = (320, 560)
+
+
+@dataclass
+class PaintReport:
+    name: str
+    frames: int
+    paints: int
+    mean_us: float
+    p50_us: float
+    p95_us: float
+    max_us: float
+
+    def as_dict(self):
+        return asdict(self)
+
+    def summary(self):
+        return (
+            f"{self.name}: {self.frames} frames, {self.paints} widget paints, "
+            f"mean {self.mean_us:.0f} us/frame, p50 {self.p50_us:.0f} us, "
+            f"p95 {self.p95_us:.0f} us, max {self.max_us:.0f} us"
+        )
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class PaintBenchmark:
+    """Drives a shown ColorSelectorDock with synthetic drags."""
+
+    def __init__(self):
+        from tests import fake_krita
+        from tests.qt_support import start_qt
+
+        self.app = start_qt()
+        krita = fake_krita.Krita.instance()
+        if krita.activeWindow() is None:
+            krita.openWindow()
+
+        from quick_access_manager.remaster.color_selector import docker
+        from quick_access_manager.remaster.compat import (
+            QEvent,
+            QMouseEvent,
+            QObject,
+            QPointF,
+            Qt,
+        )
+
+        self._QEvent = QEvent
+        self._QMouseEvent = QMouseEvent
+        self._QPointF = QPointF
+        self._Qt = Qt
+        self._paints = _PaintCounter(QObject, QEvent)
+
+        # Defaults instead of the user's palette config.
+        with mock.patch.object(
+            docker,
+            "_load_huesvc_settings",
+            return_value=dict(docker.DEFAULT_HUESVC_SETTINGS),
+        ):
+            self.dock = docker.ColorSelectorDock()
+        self.dock.resize(*DOCK_SIZE)
+        self.dock.show()
+        self.app.processEvents()
+        for child in [self.dock.sv_box, self.dock.hue_bar, *self.dock.channel_bars.values()]:
+            child.installEventFilter(self._paints.filter)
+
+    def _mouse(self, event_type, widget, x, y, buttons):
+        Qt = self._Qt
+        pos = self._QPointF(x, y)
+        button = Qt.LeftButton if event_type != self._QEvent.MouseMove else Qt.NoButton
+        event = self._QMouseEvent(
+            event_type, pos, widget.mapToGlobal(pos.toPoint()), button, buttons, Qt.NoModifier
+        )
+        self.app.sendEvent(widget, event)
+
+    def drag(self, widget, path, name):
+        """Press, move along `path` ((x, y) points), release; time each step."""
+        Qt = self._Qt
+        QEvent = self._QEvent
+        x0, y0 = path[0]
+        self._mouse(QEvent.MouseButtonPress, widget, x0, y0, Qt.LeftButton)
+        self.app.processEvents()
+        self._paints.count = 0
+        costs = []
+        for x, y in path[1:]:
+            start = time.perf_counter()
+            self._mouse(QEvent.MouseMove, widget, x, y, Qt.LeftButton)
+            self.app.processEvents()
+            costs.append((time.perf_counter() - start) * 1e6)
+        self._mouse(QEvent.MouseButtonRelease, widget, *path[-1], Qt.NoButton)
+        self.app.processEvents()
+        ordered = sorted(costs)
+        return PaintReport(
+            name=name,
+            frames=len(costs),
+            paints=self._paints.count,
+            mean_us=statistics.fmean(costs) if costs else 0.0,
+            p50_us=_percentile(ordered, 0.5),
+            p95_us=_percentile(ordered, 0.95),
+            max_us=ordered[-1] if ordered else 0.0,
+        )
+
+    def sv_drag(self, steps=300):
+        """Spiral across the SV box, as a user hunting for a shade would."""
+        box = self.dock.sv_box
+        w, h = box.width(), box.height()
+        path = []
+        for i in range(steps + 1):
+            t = i / steps
+            radius = 0.45 * t
+            angle = t * 6 * math.pi
+            path.append(
+                (
+                    int(w * (0.5 + radius * math.cos(angle))),
+                    int(h * (0.5 + radius * math.sin(angle))),
+                )
+            )
+        return self.drag(box, path, f"SV drag ({w}x{h})")
+
+    def hue_drag(self, steps=300):
+        bar = self.dock.hue_bar
+        h = bar.height()
+        path = [(bar.width() // 2, int((h - 1) * i / steps)) for i in range(steps + 1)]
+        return self.drag(bar, path, f"hue drag ({bar.width()}x{h})")
+
+
+class _PaintCounter:
+    """Counts Paint events delivered to the watched widgets."""
+
+    def __init__(self, QObject, QEvent):
+        counter = self
+        self.count = 0
+
+        class _Filter(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Paint:
+                    counter.count += 1
+                return False
+
+        self.filter = _Filter()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--json", action="store_true", help="print reports as JSON")
+    args = parser.parse_args(argv)
+
+    bench = PaintBenchmark()
+    bench.sv_drag(steps=30)  # warm-up
+    reports = [bench.sv_drag(args.steps), bench.hue_drag(args.steps)]
+    if args.json:
+        print(json.dumps([report.as_dict() for report in reports], indent=2))
+    else:
+        for report in reports:
+            print(report.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Benchmark for HueSVC's document palette extraction in `shared.palette_extract`.
+
+Samples a synthetic canvas (soft color regions with noise) the way the
+docker does - tile rects within the pixel budget, decode, cluster - and
+times decoding and clustering with NumPy and with the pure-Python fallback.
+Tile bytes are generated per tile, so an 8K canvas costs no 8K buffer. No
+Qt or Krita needed; reading tiles from Krita itself is not timed here.
+
+Run `python -m tests.palette_benchmark [--repeat N] [--json]`.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+from unittest import mock
+
+from quick_access_manager.remaster.shared import palette_extract
+
+CANVASES = {"4K": (3840, 2160), "8K": (7680, 4320)}
+REGION_COLORS = 12
+
+
+@dataclass
+class ExtractReport:
+    canvas: str
+    backend: str
+    tiles: int
+    sampled_pixels: int
+    canvas_pixels: int
+    decode_ms: float
+    cluster_ms: float
+
+    def as_dict(self):
+        return asdict(self)
+
+    def summary(self):
+        share = 100.0 * self.sampled_pixels / self.canvas_pixels
+        return (
+            f"{self.canvas} [{self.backend}]: {self.tiles} tiles, "
+            f"{self.sampled_pixels} px ({share:.2f}% of the canvas), "
+            f"decode {self.decode_ms:.1f} ms, cluster {self.cluster_ms:.1f} ms"
+        )
+
+
+def _tile_bytes(rects, width, height, seed=1):
+    """BGRA bytes per tile: one color per canvas region, a little noise."""
+    rng = random.Random(seed)
+    colors = [tuple(rng.randrange(256) for _ in range(3)) for _ in range(REGION_COLORS)]
+    chunks = []
+    for x, y, w, h in rects:
+        r, g, b = colors[(x * 4 // width + 4 * (y * 3 // height)) % REGION_COLORS]
+        noise = [rng.randrange(-6, 7) for _ in range(16)]
+        chunks.append(
+            b"".join(
+                bytes((min(255, max(0, b + noise[i % 16])), g, r, 255)) for i in range(w * h)
+            )
+        )
+    return chunks
+
+
+def _best_ms(work, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        work()
+        cost = (time.perf_counter() - start) * 1000
+        best = cost if best is None else min(best, cost)
+    return best
+
+
+def run(repeat=5):
+    backends = [("python", False)]
+    if palette_extract.HAS_NUMPY:
+        backends.insert(0, ("numpy", True))
+    reports = []
+    for canvas, (width, height) in CANVASES.items():
+        rects = palette_extract.tile_rects(0, 0, width, height)
+        chunks = _tile_bytes(rects, width, height)
+        for backend, use_numpy in backends:
+            with mock.patch.object(palette_extract, "HAS_NUMPY", use_numpy):
+                pixels = palette_extract.decode_pixels(chunks)
+                decode_ms = _best_ms(lambda: palette_extract.decode_pixels(chunks), repeat)
+                cluster_ms = _best_ms(lambda: palette_extract.dominant_colors(pixels), repeat)
+            reports.append(
+                ExtractReport(
+                    canvas=canvas,
+                    backend=backend,
+                    tiles=len(rects),
+                    sampled_pixels=sum(w * h for _, _, w, h in rects),
+                    canvas_pixels=width * height,
+                    decode_ms=decode_ms,
+                    cluster_ms=cluster_ms,
+                )
+            )
+    return reports
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print reports as JSON")
+    args = parser.parse_args(argv)
+
+    reports = run(args.repeat)
+    if args.json:
+        print(json.dumps([report.as_dict() for report in reports], indent=2))
+    else:
+        for report in reports:
+            print(report.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
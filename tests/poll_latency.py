@@ -0,0 +1,188 @@
+"""Idle cost and change-to-UI latency of the Quick Adjust poll loop.
+
+Runs a real `PollScheduler` against the stand-in `krita` module under Qt's
+offscreen platform, with one brush consumer standing in for the Quick Adjust
+docker, and measures:
+
+- idle: consumer calls per second and process CPU while nothing changes,
+  once the scheduler has backed off;
+- latency: time from an `increase_brush_size` action firing to the consumer
+  seeing the new size, starting from that backed-off state.
+
+Both are reported with Krita's signals connected ("events") and without
+("polling", the scheduler's timer alone). Run
+`python -m tests.poll_latency [--json] [--idle-seconds N] [--samples N]`.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+BRUSH_ACTION_ID = "increase_brush_size"
+
+
+@dataclass
+class LatencyReport:
+    mode: str
+    idle_seconds: float
+    idle_calls_per_second: float
+    idle_cpu_percent: float
+    latencies_ms: List[float] = field(default_factory=list)
+
+    @property
+    def mean_ms(self):
+        return statistics.fmean(self.latencies_ms) if self.latencies_ms else 0.0
+
+    @property
+    def max_ms(self):
+        return max(self.latencies_ms) if self.latencies_ms else 0.0
+
+    def as_dict(self):
+        data = asdict(self)
+        data["mean_ms"] = self.mean_ms
+        data["max_ms"] = self.max_ms
+        return data
+
+    def summary(self):
+        return (
+            f"{self.mode}: idle {self.idle_calls_per_second:.2f} polls/s, "
+            f"{self.idle_cpu_percent:.2f}% CPU; change-to-UI latency "
+            f"mean {self.mean_ms:.1f} ms, max {self.max_ms:.1f} ms "
+            f"over {len(self.latencies_ms)} change(s)"
+        )
+
+
+class PollLatencyHarness:
+    """Drives a PollScheduler with a brush consumer on the stand-in Krita."""
+
+    def __init__(self):
+        from tests import fake_krita
+        from tests.qt_support import start_qt
+
+        self.app = start_qt()
+        krita = fake_krita.Krita.instance()
+        window = krita.activeWindow() or krita.openWindow()
+        view = window.activeView()
+        if view.currentBrushPreset() is None:
+            view.setCurrentBrushPreset(fake_krita.Preset("b) Basic-5 Size"))
+        if krita.action(BRUSH_ACTION_ID) is None:
+            action = window.createAction(BRUSH_ACTION_ID, "Increase Brush Size")
+            # Krita's own handler: grow the active view's brush.
+            action.triggered.connect(
+                lambda *_args: krita.activeWindow()
+                .activeView()
+                .setBrushSize(krita.activeWindow().activeView().brushSize() + 1)
+            )
+        self.krita = krita
+
+        from quick_access_manager.remaster.compat import QEventLoop, QObject, QTimer
+        from quick_access_manager.remaster.quick_adjust import krita_state, poll_scheduler
+
+        self._QEventLoop = QEventLoop
+        self._QObject = QObject
+        self._QTimer = QTimer
+        self._krita_state = krita_state
+        self._poll_scheduler = poll_scheduler
+
+    def _spin(self, ms, until=None):
+        """Run the Qt event loop for `ms`, or until `until` quits it early."""
+        loop = self._QEventLoop()
+        self._QTimer.singleShot(int(ms), loop.quit)
+        if until is not None:
+            until.append(loop)
+        loop.exec() if hasattr(loop, "exec") else loop.exec_()
+        if until is not None and loop in until:
+            until.remove(loop)
+
+    def run(self, use_events=True, idle_seconds=3.0, samples=5, settle_seconds=None, seed=0):
+        """Measure one mode and return a LatencyReport."""
+        module = self._poll_scheduler
+        if settle_seconds is None:
+            # Long enough to back off from the fast interval to the slowest.
+            settle_seconds = (
+                module.ACTIVITY_WINDOW_MS + 2 * module.MAX_INTERVAL_MS
+            ) / 1000.0
+        rng = random.Random(seed)
+        scheduler = module.PollScheduler(use_events=use_events)
+        owner = self._QObject()
+        state = {"size": None, "calls": 0, "seen_at": None}
+        waiting = []
+
+        def consumer(snapshot):
+            state["calls"] += 1
+            if snapshot.brush_size == state["size"]:
+                return False
+            state["size"] = snapshot.brush_size
+            state["seen_at"] = time.perf_counter()
+            for loop in list(waiting):
+                loop.quit()
+            return True
+
+        scheduler.register(owner, consumer, groups=(self._krita_state.BRUSH,))
+        scheduler.set_active(owner, True)
+        try:
+            self._spin(settle_seconds * 1000)
+            calls_before = state["calls"]
+            cpu_before = time.process_time()
+            wall_before = time.perf_counter()
+            self._spin(idle_seconds * 1000)
+            wall = time.perf_counter() - wall_before
+            cpu = time.process_time() - cpu_before
+            idle_calls = state["calls"] - calls_before
+
+            action = self.krita.action(BRUSH_ACTION_ID)
+            latencies = []
+            for _ in range(samples):
+                # Land the change anywhere in the current poll interval.
+                self._spin(rng.uniform(0, scheduler.interval()))
+                expected = self.krita.activeWindow().activeView().brushSize() + 1
+                triggered_at = time.perf_counter()
+                action.trigger()
+                deadline = triggered_at + (module.MAX_INTERVAL_MS * 2) / 1000.0
+                while state["size"] != expected and time.perf_counter() < deadline:
+                    self._spin((deadline - time.perf_counter()) * 1000, until=waiting)
+                if state["size"] == expected:
+                    latencies.append((state["seen_at"] - triggered_at) * 1000.0)
+                self._spin(settle_seconds * 1000)
+        finally:
+            scheduler.unregister(owner)
+            scheduler.deleteLater()
+
+        return LatencyReport(
+            mode="events" if use_events else "polling",
+            idle_seconds=wall,
+            idle_calls_per_second=idle_calls / wall if wall else 0.0,
+            idle_cpu_percent=100.0 * cpu / wall if wall else 0.0,
+            latencies_ms=latencies,
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print reports as JSON")
+    parser.add_argument("--idle-seconds", type=float, default=5.0)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    harness = PollLatencyHarness()
+    reports = [
+        harness.run(use_events=use_events, idle_seconds=args.idle_seconds,
+                    samples=args.samples, seed=args.seed)
+        for use_events in (False, True)
+    ]
+    if args.json:
+        print(json.dumps([report.as_dict() for report in reports], indent=2))
+    else:
+        for report in reports:
+            print(report.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""Time a canvas mouse press spends in the brush history's press hook.
+
+Sends `MouseButtonPress` events to a stand-in canvas widget under Qt's
+offscreen platform, with a real `BrushHistoryWidget` on the stand-in `krita`
+module, and measures how long each press takes to be delivered:
+
+- baseline: no application-wide filter at all;
+- synchronous: the old filter, calling `check_brush_change` inside the press;
+- deferred: the shared press hook, which only starts a zero-interval timer.
+
+Krita's Python API is far slower than the stand-in, so `--api-cost-us`
+adds a busy-wait to every `currentBrushPreset()` call. Run
+`python -m tests.press_latency [--json] [--presses N] [--api-cost-us N]`.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+MODES = ("baseline", "synchronous", "deferred")
+
+
+@dataclass
+class PressReport:
+    mode: str
+    api_cost_us: float
+    press_us: List[float] = field(default_factory=list)
+    checks: int = 0
+
+    @property
+    def median_us(self):
+        return statistics.median(self.press_us) if self.press_us else 0.0
+
+    @property
+    def p95_us(self):
+        if not self.press_us:
+            return 0.0
+        ordered = sorted(self.press_us)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def as_dict(self):
+        data = asdict(self)
+        data["median_us"] = self.median_us
+        data["p95_us"] = self.p95_us
+        return data
+
+    def summary(self):
+        return (
+            f"{self.mode}: press delivery median {self.median_us:.1f} us, "
+            f"p95 {self.p95_us:.1f} us over {len(self.press_us)} press(es); "
+            f"{self.checks} brush check(s)"
+        )
+
+
+class PressLatencyHarness:
+    """Presses a stand-in canvas with the brush history watching."""
+
+    def __init__(self):
+        from tests import fake_krita
+        from tests.qt_support import start_qt
+
+        self.app = start_qt()
+        krita = fake_krita.Krita.instance()
+        window = krita.activeWindow() or krita.openWindow()
+        view = window.activeView()
+        if view.currentBrushPreset() is None:
+            view.setCurrentBrushPreset(fake_krita.Preset("b) Basic-5 Size"))
+        self.view = view
+
+        from quick_access_manager.remaster.compat import (
+            QEvent,
+            QMouseEvent,
+            QObject,
+            QPointF,
+            Qt,
+            QWidget,
+        )
+        from quick_access_manager.remaster.infrastructure import HistoryRepository
+        from quick_access_manager.remaster.quick_adjust.widgets import (
+            brush_history_widget,
+        )
+
+        self._QEvent = QEvent
+        self._QMouseEvent = QMouseEvent
+        self._QObject = QObject
+        self._QPointF = QPointF
+        self._Qt = Qt
+        self._module = brush_history_widget
+        self._HistoryRepository = HistoryRepository
+        self.canvas = QWidget()
+        self.canvas.resize(400, 300)
+
+    def _press(self):
+        point = self._QPointF(200, 150)
+        event = self._QMouseEvent(
+            self._QEvent.MouseButtonPress,
+            point,
+            point,
+            self._Qt.LeftButton,
+            self._Qt.LeftButton,
+            self._Qt.NoModifier,
+        )
+        started = time.perf_counter()
+        self.app.sendEvent(self.canvas, event)
+        return (time.perf_counter() - started) * 1e6
+
+    def _legacy_filter(self, widget):
+        """The pre-hook filter: checks Krita inside every unmodified press."""
+        QEvent, Qt = self._QEvent, self._Qt
+
+        class SynchronousFilter(self._QObject):
+            def eventFilter(self, obj, event):
+                if (
+                    event.type() == QEvent.MouseButtonPress
+                    and event.modifiers() == Qt.NoModifier
+                ):
+                    widget.check_brush_change()
+                return False
+
+        return SynchronousFilter()
+
+    def run(self, mode, presses=500, api_cost_us=0.0):
+        """Measure one mode and return a PressReport."""
+        from tests.qt_support import spin
+
+        view = self.view
+        current = type(view).currentBrushPreset
+        counter = {"checks": 0}
+
+        def costly_preset(self_view):
+            counter["checks"] += 1
+            deadline = time.perf_counter() + api_cost_us / 1e6
+            while time.perf_counter() < deadline:
+                pass
+            return current(self_view)
+
+        tmp = tempfile.TemporaryDirectory()
+        repository = self._HistoryRepository(f"{tmp.name}/history.json")
+        widget = self._module.BrushHistoryWidget(None, 10, 30, repository=repository)
+        widget.set_filter_active(False)
+        legacy = None
+        if mode == "synchronous":
+            legacy = self._legacy_filter(widget)
+            self.app.installEventFilter(legacy)
+        elif mode == "deferred":
+            widget.set_filter_active(True)
+
+        type(view).currentBrushPreset = costly_preset
+        timings = []
+        try:
+            for _ in range(presses):
+                timings.append(self._press())
+                # Let the deferred check run between presses, as Krita would.
+                spin(0)
+        finally:
+            type(view).currentBrushPreset = current
+            if legacy is not None:
+                self.app.removeEventFilter(legacy)
+            widget.set_filter_active(False)
+            widget.deleteLater()
+            spin(0)
+            tmp.cleanup()
+
+        return PressReport(
+            mode=mode, api_cost_us=api_cost_us, press_us=timings,
+            checks=counter["checks"],
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print reports as JSON")
+    parser.add_argument("--presses", type=int, default=500)
+    parser.add_argument(
+        "--api-cost-us", type=float, default=200.0,
+        help="simulated cost of one Krita API call, in microseconds",
+    )
+    args = parser.parse_args(argv)
+
+    harness = PressLatencyHarness()
+    reports = [
+        harness.run(mode, presses=args.presses, api_cost_us=args.api_cost_us)
+        for mode in MODES
+    ]
+    if args.json:
+        print(json.dumps([report.as_dict() for report in reports], indent=2))
+    else:
+        for report in reports:
+            print(report.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""Shared setup for the tests that need Qt but not Krita.
+
+`HAS_QT` gates those tests (they are skipped without PyQt); `start_qt()`
+installs the stand-in `krita` module and returns an offscreen QApplication.
+"""
+
+import importlib.util
+import os
+
+HAS_QT = any(
+    importlib.util.find_spec(name) is not None for name in ("PyQt5", "PyQt6")
+)
+
+
+def start_qt():
+    """Install the stand-in krita module and return the offscreen QApplication."""
+    from tests import fake_krita
+
+    fake_krita.install()
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from quick_access_manager.remaster.compat import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+def spin(ms):
+    """Run the Qt event loop for `ms` milliseconds so timers can fire."""
+    from quick_access_manager.remaster.compat import QEventLoop, QTimer
+
+    loop = QEventLoop()
+    QTimer.singleShot(int(ms), loop.quit)
+    loop.exec() if hasattr(loop, "exec") else loop.exec_()
@@ -0,0 +1,181 @@
+"""Import and setup time of the remastered plugin on the stand-in `krita`.
+
+Each sample runs in a fresh interpreter, as Krita's first import does, under
+Qt's offscreen platform:
+
+- import: `import quick_access_manager` (which imports `remaster.plugin` and
+  registers its extensions);
+- setup: the Quick Access Palette extension's `setup()`, with the plugin's
+  config directory redirected to a temporary one holding a palette of
+  `TABS` x `ITEMS_PER_TAB` action items;
+- window: opening the first main window, which runs `createActions()` and
+  anything deferred to `windowCreated`.
+
+Reported with every subsystem enabled ("all") and with HueSVC and Quick
+Adjust disabled in settings.json ("minimal"). Run
+`python -m tests.startup_benchmark [--json] [--samples N]`.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+TABS = 6
+ITEMS_PER_TAB = 80
+COLUMNS = 8
+PROFILES = {
+    "all": {},
+    "minimal": {"default": {"huesvc_enabled": False, "quick_adjust_enabled": False}},
+}
+
+
+@dataclass
+class StartupReport:
+    profile: str
+    import_ms: List[float] = field(default_factory=list)
+    setup_ms: List[float] = field(default_factory=list)
+    window_ms: List[float] = field(default_factory=list)
+
+    @staticmethod
+    def _median(values):
+        return statistics.median(values) if values else 0.0
+
+    def as_dict(self):
+        data = asdict(self)
+        for name in ("import_ms", "setup_ms", "window_ms"):
+            data[f"median_{name}"] = self._median(getattr(self, name))
+        return data
+
+    def summary(self):
+        return (
+            f"{self.profile}: import {self._median(self.import_ms):.1f} ms, "
+            f"setup {self._median(self.setup_ms):.1f} ms, "
+            f"first window {self._median(self.window_ms):.1f} ms "
+            f"(median of {len(self.import_ms)})"
+        )
+
+
+def _start_qt():
+    # Not tests.qt_support.start_qt(): importing the compat shim through the
+    # package would import the plugin before the clock starts.
+    from tests import fake_krita
+
+    fake_krita.install()
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+    except ImportError:
+        from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([]), fake_krita.Krita.instance()
+
+
+def _write_palette(settings):
+    from quick_access_manager.remaster.infrastructure import PaletteRepository
+    from quick_access_manager.remaster.shared import (
+        PaletteDocument,
+        PaletteGrid,
+        PaletteItem,
+        PaletteTab,
+    )
+
+    tabs = []
+    for t in range(TABS):
+        items = [
+            PaletteItem.create_action(
+                f"item-{t}-{i}", f"action_{i}", i // COLUMNS, i % COLUMNS, col_span=1
+            )
+            for i in range(ITEMS_PER_TAB)
+        ]
+        grid = PaletteGrid(f"grid-{t}", f"Grid {t}", COLUMNS, items)
+        tabs.append(PaletteTab(id=f"tab-{t}", name=f"Tab {t}", grids=[grid]))
+    document = PaletteDocument(tabs=tabs, active_tab_id=tabs[0].id, settings=settings)
+    PaletteRepository().save(document)
+
+
+def measure_once(settings):
+    """One cold start in this interpreter; returns (import, setup, window) ms."""
+    app, krita = _start_qt()
+
+    started = time.perf_counter()
+    import quick_access_manager  # noqa: F401
+
+    imported = time.perf_counter()
+
+    from quick_access_manager.remaster import plugin
+    from quick_access_manager.remaster.infrastructure import paths
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        paths.get_krita_data_dir = lambda: data_dir
+        _write_palette(settings)
+        extensions = [
+            extension
+            for extension in krita._extensions
+            if isinstance(extension, plugin.QuickAccessPaletteExtension)
+        ]
+
+        setup_started = time.perf_counter()
+        for extension in extensions:
+            extension.setup()
+        setup_done = time.perf_counter()
+
+        window = krita.openWindow()
+        for extension in krita._extensions:
+            extension.createActions(window)
+        app.processEvents()
+        window_done = time.perf_counter()
+
+    return (
+        (imported - started) * 1000.0,
+        (setup_done - setup_started) * 1000.0,
+        (window_done - setup_done) * 1000.0,
+    )
+
+
+def run(profile, samples=5):
+    """Measure `profile` in `samples` fresh interpreters."""
+    report = StartupReport(profile=profile)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for _ in range(samples):
+        output = subprocess.run(
+            [sys.executable, "-m", "tests.startup_benchmark", "--child", profile],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        import_ms, setup_ms, window_ms = json.loads(output.strip().splitlines()[-1])
+        report.import_ms.append(import_ms)
+        report.setup_ms.append(setup_ms)
+        report.window_ms.append(window_ms)
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print reports as JSON")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--child", choices=sorted(PROFILES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure_once(PROFILES[args.child])))
+        return 0
+
+    reports = [run(profile, samples=args.samples) for profile in PROFILES]
+    if args.json:
+        print(json.dumps([report.as_dict() for report in reports], indent=2))
+    else:
+        for report in reports:
+            print(report.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
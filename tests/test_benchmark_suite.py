@@ -0,0 +1,56 @@
+"""Benchmark suite tests: the regression check and the layout size budget.
+
+Timings themselves are not asserted; only the suite's bookkeeping is.
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from tests import benchmark_suite
+from tests.benchmark_suite import SuiteReport
+
+
+class CompareTests(unittest.TestCase):
+    def test_only_shared_metrics_are_compared(self):
+        baseline = {"results": {"a": {"median_us": 10.0}, "gone": {"median_us": 1.0}}}
+        current = {"results": {"a": {"median_us": 14.0}, "new": {"median_us": 1.0}}}
+        comparisons = benchmark_suite.compare(baseline, current)
+        self.assertEqual([c.name for c in comparisons], ["a"])
+        self.assertAlmostEqual(comparisons[0].ratio, 1.4)
+        self.assertTrue(comparisons[0].regressed(0.25))
+        self.assertFalse(comparisons[0].regressed(0.5))
+
+    def test_main_exits_nonzero_when_a_metric_regresses(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline_path = os.path.join(directory, "baseline.json")
+            with open(baseline_path, "w", encoding="utf-8") as handle:
+                json.dump({"results": {"settings.settings": {"median_us": 1e-6}}}, handle)
+            output_path = os.path.join(directory, "current.json")
+            args = ["--only", "settings", "--output", output_path]
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(benchmark_suite.main(args), 0)
+                regressed = benchmark_suite.main(args + ["--compare", baseline_path])
+                unchanged = benchmark_suite.main(
+                    args + ["--compare", output_path, "--threshold", "100"]
+                )
+        self.assertEqual(regressed, 1)
+        self.assertEqual(unchanged, 0)
+
+
+class LayoutBudgetTests(unittest.TestCase):
+    def test_sizes_predicted_over_budget_are_skipped_not_run(self):
+        report = SuiteReport()
+        benchmark_suite.run_layout(report, sizes=(4, 40, 400), budget_s=0.001)
+        self.assertIn("layout.validate[4]", report.results)
+        skipped = [name for name in report.skipped if name.startswith("layout.compact")]
+        self.assertIn("layout.compact[400]", skipped)
+        for name in report.skipped:
+            self.assertNotIn(name, report.results)
+
+
+if __name__ == "__main__":
+    unittest.main()
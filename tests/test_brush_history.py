@@ -0,0 +1,97 @@
+"""Brush history widget tests - needs PyQt (offscreen) for the stand-in krita."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from tests.qt_support import HAS_QT
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class BrushHistoryWidgetTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests import fake_krita
+        from tests.qt_support import start_qt
+
+        cls.app = start_qt()
+        cls.fake = fake_krita
+        from quick_access_manager.remaster.infrastructure import HistoryRepository
+        from quick_access_manager.remaster.quick_adjust.widgets import (
+            brush_history_widget,
+        )
+
+        cls.module = brush_history_widget
+        cls.HistoryRepository = HistoryRepository
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.repository = self.HistoryRepository(
+            os.path.join(self._tmp.name, "quick_adjust_history.json")
+        )
+        self.krita = self.fake.Krita.instance()
+        window = self.krita.activeWindow() or self.krita.openWindow()
+        self.view = window.activeView()
+        self.presets = {name: self.fake.Preset(name) for name in "ABCDE"}
+        self.addCleanup(setattr, self.krita, "_presets", self.krita._presets)
+        self.krita._presets = dict(self.presets)
+        self.view.setCurrentBrushPreset(self.presets["A"])
+        self.widget = self._widget()
+
+    def _widget(self):
+        widget = self.module.BrushHistoryWidget(None, 4, 30, repository=self.repository)
+        self.addCleanup(widget.set_filter_active, False)
+        return widget
+
+    def _use(self, name):
+        self.widget.add_brush_to_history(name, self.presets[name])
+
+    def _names(self):
+        return list(self.widget.brush_history)
+
+    def test_lru_order_and_capacity(self):
+        for name in "BCDE":
+            self._use(name)
+        self.assertEqual(self._names(), ["E", "D", "C", "B"])
+        self._use("C")
+        self.assertEqual(self._names(), ["C", "E", "D", "B"])
+        tips = [btn.toolTip() for btn in self.widget.brush_buttons]
+        self.assertEqual(tips, ["Brush: C", "Brush: E", "Brush: D", "Brush: B"])
+
+    def test_only_a_new_preset_gets_a_thumbnail(self):
+        for name in "BC":
+            self._use(name)
+        with mock.patch.object(
+            self.widget, "generate_brush_thumbnail", wraps=self.widget.generate_brush_thumbnail
+        ) as thumbnail:
+            self._use("A")
+            self._use("B")
+            self.assertEqual(thumbnail.call_count, 0)
+            self._use("D")
+            self.assertEqual(thumbnail.call_count, 1)
+
+    def test_moving_a_brush_forward_leaves_later_buttons_alone(self):
+        for name in "BCD":
+            self._use(name)
+        last = self.widget.brush_buttons[3]
+        with mock.patch.object(type(last), "setIcon") as set_icon:
+            self._use("C")
+        self.assertEqual(set_icon.call_count, 2)
+
+    def test_history_is_restored_next_session(self):
+        for name in "BC":
+            self._use(name)
+        self.widget.set_filter_active(False)
+        self.assertEqual(self.repository.load("brushes"), ["C", "B", "A"])
+        # A preset deleted since then is dropped.
+        del self.krita._presets["B"]
+        self.view.setCurrentBrushPreset(self.presets["C"])
+        restored = self._widget()
+        self.assertEqual(list(restored.brush_history), ["C", "A"])
+        self.assertFalse(restored.brush_buttons[1].icon().isNull())
+
+
+if __name__ == "__main__":
+    unittest.main()
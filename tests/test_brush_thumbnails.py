@@ -0,0 +1,112 @@
+"""Resources dialog Brushes tab: lazy thumbnails, filtering and Add.
+
+These need PyQt (offscreen) and the stand-in `krita` module, and are
+skipped without PyQt.
+"""
+
+import tempfile
+import unittest
+from unittest import mock
+
+from tests.qt_support import HAS_QT
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class BrushThumbnailTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests import fake_krita
+        from tests.qt_support import start_qt
+
+        cls.app = start_qt()
+        cls.fake = fake_krita
+
+    def setUp(self):
+        from quick_access_manager.remaster.compat import QColor, QImage, QPixmapCache
+        from quick_access_manager.remaster.infrastructure import paths
+
+        QPixmapCache.clear()
+        self.addCleanup(setattr, self.fake.Krita, "_instance", self.fake.Krita._instance)
+        self.fake.Krita._instance = None
+        self.krita = self.fake.Krita.instance()
+        self.fake.populate(presets=500)
+        image = QImage(120, 80, QImage.Format_ARGB32)
+        image.fill(QColor("#884422"))
+        for preset in self.krita.resources("preset").values():
+            preset.setImage(image)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patch = mock.patch.object(paths, "get_krita_data_dir", return_value=tmp.name)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def entries(self):
+        return sorted(self.krita.resources("preset").items())
+
+    def test_thumbnails_are_made_in_batches_only_for_requested_rows(self):
+        from quick_access_manager.remaster.compat import Qt
+        from quick_access_manager.remaster.quick_access_palette import brush_thumbnails
+        from tests.qt_support import spin
+
+        entries = self.entries()
+        with self.fake.counting_calls() as made:
+            model = brush_thumbnails.BrushListModel(entries, 56)
+        self.assertEqual(made, {})
+
+        changed = []
+        model.dataChanged.connect(lambda top, bottom, roles: changed.append(top.row()))
+        for row in range(40):
+            self.assertIsNone(model.data(model.index(row), Qt.DecorationRole))
+        with self.fake.counting_calls() as made:
+            spin(50)
+        self.assertEqual(made["Resource.image"], 40)
+        self.assertEqual(sorted(changed), list(range(40)))
+
+        pixmap = model.data(model.index(3), Qt.DecorationRole)
+        self.assertEqual((pixmap.width(), pixmap.height()), (56, 37))
+        again = brush_thumbnails.BrushListModel(self.entries(), 56)
+        self.assertIsNotNone(again.data(again.index(3), Qt.DecorationRole))
+
+    def test_cleared_rows_are_not_loaded(self):
+        from quick_access_manager.remaster.compat import Qt
+        from quick_access_manager.remaster.quick_access_palette import brush_thumbnails
+        from tests.qt_support import spin
+
+        model = brush_thumbnails.BrushListModel(self.entries(), 56)
+        for row in range(100):
+            model.data(model.index(row), Qt.DecorationRole)
+        model.clear_pending()
+        with self.fake.counting_calls() as made:
+            spin(50)
+        self.assertEqual(made, {})
+
+    def test_dialog_opens_without_loading_thumbnails_and_filters_and_adds(self):
+        from quick_access_manager.remaster.quick_access_palette.alias_config_dialog import (
+            AliasConfigDialog,
+        )
+
+        controller = mock.Mock()
+        with self.fake.counting_calls() as made:
+            dialog = AliasConfigDialog(controller=controller)
+        self.addCleanup(dialog.deleteLater)
+        self.assertNotIn("Resource.image", made)
+        self.assertEqual(dialog.brush_proxy.rowCount(), 500)
+
+        dialog.brush_filter_edit.setText("preset 0004")
+        self.assertEqual(dialog.brush_proxy.rowCount(), 10)
+
+        selection = dialog.brush_list.selectionModel()
+        for row in (7, 2):
+            selection.select(
+                dialog.brush_proxy.index(row, 0), selection.SelectionFlag.Select
+            )
+        dialog._add_selected_brushes()
+        self.assertEqual(
+            [call.args[0] for call in controller.add_brush.call_args_list],
+            ["Preset 00042", "Preset 00047"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
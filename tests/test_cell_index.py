@@ -0,0 +1,65 @@
+"""Pure cell index tests - no krita, no Qt."""
+
+import unittest
+
+from quick_access_manager.remaster.shared import (
+    CellIndex,
+    FreeGridLayoutEngine,
+    PaletteItem,
+)
+
+
+def brush(item_id, row=0, col=0):
+    return PaletteItem.create_brush(item_id, f"brush-{item_id}", row=row, col=col)
+
+
+def label(item_id, row=0, col=0, col_span=2):
+    return PaletteItem.create_label(
+        item_id, item_id, row=row, col=col, col_span=col_span
+    )
+
+
+def cell(row, col):
+    return range(row, row + 1), range(col, col + 1)
+
+
+class CellIndexTests(unittest.TestCase):
+    def test_cells_match_occupied_cells(self):
+        items = [brush("a"), label("b", row=1, col=1), brush("c", row=3, col=3)]
+        index = CellIndex(4, items)
+        occupied = FreeGridLayoutEngine(4).occupied_cells(items)
+        for row in range(5):
+            for col in range(4):
+                expected = {occupied[(row, col)]} if (row, col) in occupied else set()
+                self.assertEqual(index.items_in(*cell(row, col)), expected)
+
+    def test_items_in_returns_every_item_touching_the_block(self):
+        index = CellIndex(4, [brush("a"), label("b", row=1, col=1), brush("c", 3, 3)])
+        self.assertEqual(index.items_in(range(1, 2), range(2, 4)), {"b"})
+        self.assertEqual(index.items_in(range(-2, 2), range(-1, 9)), {"a", "b"})
+        self.assertEqual(index.items_in(range(2, 3), range(0, 4)), set())
+
+    def test_an_item_under_another_is_still_found(self):
+        index = CellIndex(4, [brush("under", 1, 1), label("over", row=1, col=0)])
+        self.assertEqual(index.items_in(*cell(1, 1)), {"under", "over"})
+        index.remove("over")
+        self.assertEqual(index.items_in(*cell(1, 1)), {"under"})
+        self.assertEqual(index.items_in(*cell(1, 0)), set())
+
+    def test_out_of_bounds_items_can_still_be_hit(self):
+        index = CellIndex(4, [label("wide", row=0, col=3, col_span=3)])
+        self.assertEqual(index.items_in(*cell(0, 5)), {"wide"})
+        self.assertEqual(index.items_in(range(0, 1), range(4, 6)), {"wide"})
+
+    def test_updates_follow_moves_and_removals(self):
+        index = CellIndex(4, [label("b", row=0, col=0)])
+        index.add(label("b", row=2, col=2))
+        self.assertEqual(index.items_in(*cell(0, 1)), set())
+        self.assertEqual(index.items_in(*cell(2, 3)), {"b"})
+        index.remove("b")
+        self.assertEqual(index.items_in(*cell(2, 3)), set())
+        self.assertEqual(len(index), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+"""Recent-colors history tests.
+
+The ring buffer and repository need neither krita nor Qt; the widget tests
+need PyQt (offscreen) for the stand-in krita and are skipped without it.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from quick_access_manager.remaster.infrastructure import HistoryRepository
+from quick_access_manager.remaster.shared.color_history import ColorHistory
+from tests.qt_support import HAS_QT
+
+RED, TEAL, CREAM, BLACK = (200, 30, 40), (20, 140, 150), (240, 230, 200), (0, 0, 0)
+
+
+class ColorHistoryTests(unittest.TestCase):
+    def test_newest_first_and_capacity(self):
+        history = ColorHistory(3)
+        for color in (RED, TEAL, CREAM, BLACK):
+            history.add(color)
+        self.assertEqual(history.colors(), [BLACK, CREAM, TEAL])
+        self.assertEqual(len(history), 3)
+
+    def test_new_color_shifts_every_cell(self):
+        history = ColorHistory(4, colors=[TEAL, RED])
+        self.assertEqual(list(history.add(CREAM)), [0, 1, 2])
+
+    def test_near_duplicate_moves_to_the_front(self):
+        history = ColorHistory(4, colors=[CREAM, TEAL, RED])
+        changed = history.add((201, 30, 41))
+        self.assertEqual(list(changed), [0, 1, 2])
+        self.assertEqual(history.colors(), [(201, 30, 41), CREAM, TEAL])
+
+    def test_near_duplicate_of_the_newest_changes_nothing(self):
+        history = ColorHistory(4, colors=[RED, TEAL])
+        self.assertEqual(list(history.add((200, 31, 40))), [])
+        self.assertEqual(history.colors(), [RED, TEAL])
+
+    def test_distinct_but_close_colors_are_kept(self):
+        history = ColorHistory(4, colors=[RED])
+        history.add((215, 30, 40))
+        self.assertEqual(len(history), 2)
+
+    def test_dedupe_only_touches_the_cells_up_to_the_match(self):
+        history = ColorHistory(5, colors=[BLACK, CREAM, TEAL, RED])
+        self.assertEqual(list(history.add(CREAM)), [0, 1])
+        self.assertEqual(history.colors(), [CREAM, BLACK, TEAL, RED])
+
+
+class HistoryRepositoryTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "quick_adjust_history.json")
+
+    def test_round_trip_keeps_other_keys(self):
+        repository = HistoryRepository(self.path)
+        self.assertEqual(repository.load("colors"), [])
+        repository.save("colors", [[1, 2, 3]])
+        repository.save("brushes", ["b) Basic-5 Size"])
+        reloaded = HistoryRepository(self.path)
+        self.assertEqual(reloaded.load("colors"), [[1, 2, 3]])
+        self.assertEqual(reloaded.load("brushes"), ["b) Basic-5 Size"])
+
+    def test_broken_file_loads_empty(self):
+        with open(self.path, "w", encoding="utf-8") as handle:
+            handle.write("{not json")
+        self.assertEqual(HistoryRepository(self.path).load("colors"), [])
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class ColorHistoryWidgetTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests import fake_krita
+        from tests.qt_support import start_qt
+
+        cls.app = start_qt()
+        cls.fake = fake_krita
+        from quick_access_manager.remaster.quick_adjust.widgets import (
+            color_history_widget,
+        )
+
+        cls.module = color_history_widget
+        cls.krita = fake_krita.Krita.instance()
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.repository = HistoryRepository(
+            os.path.join(self._tmp.name, "quick_adjust_history.json")
+        )
+        self.widget = self._widget()
+
+    def _widget(self):
+        widget = self.module.ColorHistoryWidget(None, 6, 20, repository=self.repository)
+        self.addCleanup(widget.set_monitoring_active, False)
+        return widget
+
+    def _pick(self, rgb):
+        # Like Krita's own selector or the eyedropper: no signal is sent.
+        window = self.krita.activeWindow() or self.krita.openWindow()
+        window.activeView().setForeGroundColor(self.fake.ManagedColor.fromRgb(*rgb))
+
+    def test_only_the_color_held_at_a_press_is_recorded(self):
+        from quick_access_manager.remaster.quick_adjust.press_hook import (
+            get_press_hook,
+        )
+
+        for value in range(0, 250, 10):
+            self._pick((value, 100, 100))
+        self.assertEqual(self.widget._history.colors(), [])
+        get_press_hook()._run()
+        self.assertEqual(self.widget._history.colors(), [(240, 100, 100)])
+
+    def test_history_is_persisted_and_restored(self):
+        for color in (RED, TEAL):
+            self.widget.add_color_to_history(color)
+        self.assertTrue(self.widget._save_timer.isActive())
+        self.widget.set_monitoring_active(False)
+        self.assertEqual(self.repository.load("colors"), [list(TEAL), list(RED)])
+        restored = self._widget()
+        self.assertEqual(restored._history.colors(), [TEAL, RED])
+        self.assertEqual(restored.color_buttons[0].toolTip(), "RGB(20, 140, 150)")
+
+    def test_only_changed_cells_are_restyled(self):
+        for color in (RED, TEAL, CREAM, BLACK):
+            self.widget.add_color_to_history(color)
+        buttons = self.widget.color_buttons
+        with mock.patch.object(type(buttons[0]), "setStyleSheet") as restyle:
+            self.widget.add_color_to_history(TEAL)
+        # TEAL was third: it and the two newer colors move; RED stays put.
+        self.assertEqual(restyle.call_count, 3)
+        self.assertEqual(self.widget._history.colors(), [TEAL, BLACK, CREAM, RED])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""Pure color math tests - no krita, no Qt."""
+
+import colorsys
+import unittest
+from unittest import mock
+
+from quick_access_manager.remaster.shared import color_math
+
+
+def _pixels(image):
+    """Flat list of channel values, whichever backend built `image`."""
+    return list(color_math.to_rgb888(image))
+
+
+class ScalarConversionTests(unittest.TestCase):
+    def test_hsv_primaries(self):
+        self.assertEqual(color_math.hsv_to_rgb(0, 255, 255), (255, 0, 0))
+        self.assertEqual(color_math.hsv_to_rgb(120, 255, 255), (0, 255, 0))
+        self.assertEqual(color_math.hsv_to_rgb(240, 255, 255), (0, 0, 255))
+        self.assertEqual(color_math.hsv_to_rgb(360, 255, 255), (255, 0, 0))
+
+    def test_achromatic_hue_is_minus_one(self):
+        self.assertEqual(color_math.rgb_to_hsv(128, 128, 128), (-1, 0, 128))
+        self.assertEqual(color_math.hsv_to_rgb(-1, 0, 77), (77, 77, 77))
+        self.assertEqual(color_math.rgb_to_hsl(0, 0, 0), (-1, 0, 0))
+
+    def test_hsv_matches_colorsys(self):
+        for r, g, b in [(200, 100, 180), (10, 240, 30), (90, 90, 250), (255, 128, 0)]:
+            h, s, v = colorsys.rgb_to_hsv(r / 255, g / 255, b / 255)
+            ours = color_math.rgb_to_hsv(r, g, b)
+            self.assertAlmostEqual(ours[0], h * 360, delta=1)
+            self.assertAlmostEqual(ours[1], s * 255, delta=1)
+            self.assertEqual(ours[2], max(r, g, b))
+
+    def test_hsv_round_trip(self):
+        for rgb in [(200, 100, 180), (10, 240, 30), (1, 2, 3), (255, 255, 0)]:
+            back = color_math.hsv_to_rgb(*color_math.rgb_to_hsv(*rgb))
+            for got, want in zip(back, rgb):
+                self.assertAlmostEqual(got, want, delta=1)
+
+    def test_hsl_round_trip(self):
+        for rgb in [(200, 100, 180), (10, 240, 30), (128, 128, 128), (255, 0, 0)]:
+            back = color_math.hsl_to_rgb(*color_math.rgb_to_hsl(*rgb))
+            for got, want in zip(back, rgb):
+                self.assertAlmostEqual(got, want, delta=1)
+
+    def test_oklab_reference_points(self):
+        L, a, b = color_math.rgb_to_oklab(255, 255, 255)
+        self.assertAlmostEqual(L, 1.0, places=3)
+        self.assertAlmostEqual(a, 0.0, places=3)
+        self.assertAlmostEqual(b, 0.0, places=3)
+        self.assertAlmostEqual(color_math.rgb_to_oklab(0, 0, 0)[0], 0.0, places=6)
+        # Ottosson's published value for sRGB red.
+        L, a, b = color_math.rgb_to_oklab(255, 0, 0)
+        self.assertAlmostEqual(L, 0.628, places=3)
+        self.assertAlmostEqual(a, 0.225, places=3)
+        self.assertAlmostEqual(b, 0.126, places=3)
+
+    def test_oklab_round_trip(self):
+        for rgb in [(200, 100, 180), (10, 240, 30), (0, 0, 0), (255, 255, 255)]:
+            self.assertEqual(color_math.oklab_to_rgb(*color_math.rgb_to_oklab(*rgb)), rgb)
+
+    def test_delta_e(self):
+        white = color_math.rgb_to_oklab(255, 255, 255)
+        black = color_math.rgb_to_oklab(0, 0, 0)
+        self.assertAlmostEqual(color_math.delta_e_ok(white, black), 1.0, places=3)
+        self.assertEqual(color_math.delta_e_ok(white, white), 0.0)
+
+
+class GradientImageTests(unittest.TestCase):
+    def test_shapes_and_byte_lengths(self):
+        self.assertEqual(len(color_math.to_rgb888(color_math.sv_plane(30, 40, 20))), 40 * 20 * 3)
+        strip = color_math.hue_strip(50)
+        self.assertEqual(len(color_math.to_rgb888(color_math.columns_of(strip, 7))), 50 * 7 * 3)
+        strip = color_math.channel_strip("G", 60, 10, 20)
+        self.assertEqual(len(color_math.to_rgb888(color_math.rows_of(strip, 4))), 60 * 4 * 3)
+
+    def test_sv_plane_corners(self):
+        width, height = 16, 9
+        data = _pixels(color_math.sv_plane(120, width, height))
+
+        def pixel(x, y):
+            i = 3 * (y * width + x)
+            return tuple(data[i : i + 3])
+
+        self.assertEqual(pixel(0, 0), (255, 255, 255))
+        self.assertEqual(pixel(width - 1, 0), (0, 255, 0))
+        self.assertEqual(pixel(0, height - 1), (0, 0, 0))
+        self.assertEqual(pixel(width - 1, height - 1), (0, 0, 0))
+
+    def test_rgb_channel_strip_ramps_only_its_channel(self):
+        data = _pixels(color_math.channel_strip("B", 3, 10, 20))
+        self.assertEqual(data, [10, 20, 0, 10, 20, 128, 10, 20, 255])
+
+    def test_rows_and_columns_repeat_the_strip(self):
+        strip = color_math.hue_strip(6)
+        self.assertEqual(_pixels(color_math.rows_of(strip, 2)), _pixels(strip) * 2)
+        columns = _pixels(color_math.columns_of(strip, 2))
+        self.assertEqual(columns[:6], _pixels(strip)[:3] * 2)
+
+
+@unittest.skipUnless(color_math.HAS_NUMPY, "NumPy is not installed")
+class FallbackAgreementTests(unittest.TestCase):
+    """The NumPy and pure-Python paths build the same images."""
+
+    def assertClose(self, build):
+        vectorized = _pixels(build())
+        with mock.patch.object(color_math, "HAS_NUMPY", False):
+            fallback = build()
+        self.assertIsInstance(fallback, bytes)
+        fallback = list(fallback)
+        self.assertEqual(len(vectorized), len(fallback))
+        self.assertLessEqual(max(abs(a - b) for a, b in zip(vectorized, fallback)), 1)
+
+    def test_sv_plane(self):
+        self.assertClose(lambda: color_math.sv_plane(200, 64, 48))
+
+    def test_hue_columns(self):
+        self.assertClose(lambda: color_math.columns_of(color_math.hue_strip(90), 5))
+
+    def test_channel_rows(self):
+        for channel, a, b in [("H", 180, 200), ("S", 45, 220), ("V", 300, 90), ("R", 5, 250)]:
+            self.assertClose(
+                lambda: color_math.rows_of(color_math.channel_strip(channel, 80, a, b), 3)
+            )
+
+    def test_hsv_array_matches_scalar(self):
+        hues = [0, 59.5, 120, 200, 359]
+        rgb = color_math.hsv_to_rgb_array(hues, 180, 220)
+        for hue, got in zip(hues, rgb.tolist()):
+            self.assertEqual(tuple(got), color_math.hsv_to_rgb(hue, 180, 220))
+
+    def test_oklab_array_matches_scalar(self):
+        colors = [(200, 100, 180), (10, 240, 30), (0, 0, 0), (255, 255, 255)]
+        labs = color_math.rgb_to_oklab_array(colors)
+        for rgb, lab in zip(colors, labs):
+            for got, want in zip(lab, color_math.rgb_to_oklab(*rgb)):
+                self.assertAlmostEqual(got, want, places=9)
+
+
+if __name__ == "__main__":
+    unittest.main()
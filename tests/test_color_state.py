@@ -0,0 +1,115 @@
+"""Shared color state tests - needs PyQt (offscreen) for the stand-in krita."""
+
+import unittest
+from unittest import mock
+
+from tests.qt_support import HAS_QT
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class ColorStateServiceTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests import fake_krita
+        from tests.qt_support import start_qt
+
+        cls.app = start_qt()
+        cls.fake = fake_krita
+        from quick_access_manager.remaster.compat import QObject
+        from quick_access_manager.remaster.quick_adjust import color_state, krita_state
+        from quick_access_manager.remaster.quick_adjust.poll_scheduler import (
+            PollScheduler,
+        )
+
+        cls.QObject = QObject
+        cls.module = color_state
+        cls.krita_state = krita_state
+        cls.PollScheduler = PollScheduler
+
+    def setUp(self):
+        self.krita = self.fake.Krita.instance()
+        window = self.krita.activeWindow() or self.krita.openWindow()
+        self.view = self.fake.View(window)
+        window._views = [self.view]
+        self.scheduler = self.PollScheduler(use_events=False)
+        self.service = self.module.ColorStateService(self.scheduler)
+        self.seen = []
+        self.service.changed.connect(self.seen.append)
+
+    def _set_foreground(self, r, g, b):
+        self.view.setForeGroundColor(self.fake.ManagedColor.fromRgb(r, g, b))
+
+    def test_changed_fires_only_on_a_real_change(self):
+        self._set_foreground(10, 20, 30)
+        self.service.refresh()
+        self.service.refresh()
+        self.assertEqual(len(self.seen), 1)
+        state = self.seen[0]
+        self.assertEqual(state.foreground, (10, 20, 30))
+        self.assertEqual(state.background, (255, 255, 255))
+        self.assertEqual(state.foreground_hsv, (210, 170, 30))
+        self.assertIs(state.foreground_color, self.view.foregroundColor())
+
+        self._set_foreground(10, 20, 31)
+        self.service.refresh()
+        self.assertEqual(len(self.seen), 2)
+
+    def test_foreground_hsv_matches_qcolor(self):
+        from quick_access_manager.remaster.compat import QColor
+
+        state = self.module.ColorState.create((125, 165, 233), None)
+        self.assertEqual(state.foreground_hsv, (217, 118, 233))
+        for rgb in [(128, 128, 128), (0, 0, 0)] + [
+            (r, g, b) for r in range(0, 256, 17) for g in (3, 120, 250) for b in (9, 201)
+        ]:
+            color = QColor(*rgb)
+            self.assertEqual(
+                self.module.ColorState.create(rgb, None).foreground_hsv,
+                (color.hsvHue(), color.hsvSaturation(), color.value()),
+                rgb,
+            )
+
+    def test_one_capture_feeds_every_subscriber(self):
+        first, second = self.QObject(), self.QObject()
+        received = []
+        self.service.changed.connect(lambda state: received.append(state))
+        self.service.set_active(first, True)
+        self.service.set_active(second, True)
+        self._set_foreground(200, 100, 0)
+        with mock.patch.object(
+            self.krita_state.KritaStateSnapshot,
+            "capture",
+            wraps=self.krita_state.KritaStateSnapshot.capture,
+        ) as capture:
+            self.scheduler.tick()
+        self.assertEqual(capture.call_count, 1)
+        self.assertEqual(self.seen, received)
+        self.assertEqual(self.service.state.foreground, (200, 100, 0))
+
+    def test_polls_only_while_a_subscriber_is_active(self):
+        first, second = self.QObject(), self.QObject()
+        self.service.set_active(first, True)
+        self.service.set_active(second, True)
+        self.service.set_active(first, False)
+        self.assertTrue(self.scheduler.is_active(self.service))
+        self.service.set_active(second, False)
+        self.assertFalse(self.scheduler.is_active(self.service))
+
+    def test_poll_interval_change_keeps_activity(self):
+        owner = self.QObject()
+        self.service.set_active(owner, True)
+        self.service.set_poll_interval(100)
+        self.assertTrue(self.scheduler.is_active(self.service))
+
+    def test_note_foreground_updates_without_reading_krita(self):
+        self._set_foreground(0, 0, 0)
+        self.service.refresh()
+        with mock.patch.object(self.view, "foregroundColor") as read:
+            self.service.note_foreground((1, 2, 3))
+        read.assert_not_called()
+        self.assertEqual(self.seen[-1].foreground, (1, 2, 3))
+        self.assertEqual(self.seen[-1].background, (255, 255, 255))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""HueSVC picker widget tests - needs PyQt (offscreen), not Krita."""
+
+import unittest
+from unittest import mock
+
+from tests.qt_support import HAS_QT
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class GradientCacheTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests.paint_benchmark import PaintBenchmark
+
+        cls.bench = PaintBenchmark()
+        cls.dock = cls.bench.dock
+
+    def test_sv_drag_reuses_every_background(self):
+        self.bench.sv_drag(steps=5)
+        widgets = [self.dock.sv_box, self.dock.hue_bar]
+        builds = [widget._background.builds for widget in widgets]
+        report = self.bench.sv_drag(steps=40)
+        self.assertEqual(report.frames, 40)
+        self.assertEqual([widget._background.builds for widget in widgets], builds)
+
+    def test_hue_change_rebuilds_the_sv_background_once(self):
+        box = self.dock.sv_box
+        self.bench.app.processEvents()
+        before = box._background.builds
+        box.setHue((box._hue + 90) % 360)
+        self.bench.app.processEvents()
+        box.setSatVal(10, 20)
+        self.bench.app.processEvents()
+        self.assertEqual(box._background.builds, before + 1)
+
+    def test_channel_bar_keeps_its_gradient_when_only_its_value_moves(self):
+        bar = self.dock.channel_bars["R"]
+        bar.setColor(0, 100, 100, 10, 20, 30)
+        self.bench.app.processEvents()
+        before = bar._background.builds
+        bar.setColor(0, 100, 100, 80, 20, 30)
+        self.bench.app.processEvents()
+        self.assertEqual(bar._background.builds, before)
+        bar.setColor(0, 100, 100, 80, 50, 30)
+        self.bench.app.processEvents()
+        self.assertEqual(bar._background.builds, before + 1)
+
+    def test_resize_rebuilds_the_background(self):
+        box = self.dock.sv_box
+        pixmap = box._background.pixmap(box, box._hue)
+        box.resize(box.width() + 10, box.height())
+        resized = box._background.pixmap(box, box._hue)
+        self.assertIsNot(resized, pixmap)
+        self.assertEqual(resized.width(), round((box.width()) * box.devicePixelRatioF()))
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class ForegroundThrottleTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests import fake_krita
+        from tests.paint_benchmark import PaintBenchmark
+
+        cls.bench = PaintBenchmark()
+        from quick_access_manager.remaster.compat import QColor
+        from quick_access_manager.remaster.quick_adjust.color_state import (
+            get_color_state,
+        )
+
+        cls.QColor = QColor
+        cls.color_state = get_color_state()
+        cls.dock = cls.bench.dock
+        cls.krita = fake_krita.Krita.instance()
+        cls.fake = fake_krita
+
+    def setUp(self):
+        from tests.qt_support import spin
+
+        if self.krita.activeDocument() is None:
+            self.krita.setActiveDocument(self.fake.Document())
+        self.view = self.krita.activeWindow().activeView()
+        # Let a write left over from another test's drag land first.
+        spin(50)
+
+    def _picked_rgb(self):
+        return (self.dock._r, self.dock._g, self.dock._b)
+
+    def _krita_rgb(self):
+        color = self.view.foregroundColor().colorForCanvas(None)
+        return (color.red(), color.green(), color.blue())
+
+    def test_fast_drag_writes_about_once_per_frame(self):
+        with mock.patch.object(
+            self.view, "setForeGroundColor", wraps=self.view.setForeGroundColor
+        ) as write:
+            report = self.bench.sv_drag(steps=120)
+        # Offscreen, a drag step takes ~1 ms: 120 picks span a handful of
+        # display frames, and Krita should see about one write per frame.
+        self.assertEqual(report.frames, 120)
+        self.assertGreaterEqual(write.call_count, 2)
+        self.assertLess(write.call_count, report.frames // 2)
+
+    def test_release_applies_the_last_pick(self):
+        self.bench.hue_drag(steps=60)
+        self.assertFalse(self.dock._fg_writer.has_pending)
+        self.assertEqual(self._krita_rgb(), self._picked_rgb())
+
+    def test_poll_does_not_undo_a_coalesced_pick(self):
+        box = self.dock.sv_box
+        self.bench.app.processEvents()
+        self.dock._onSVChanged(self.QColor.fromHsv(0, 255, 255))
+        self.dock._onSVChanged(self.QColor.fromHsv(0, 128, 255))
+        self.assertTrue(self.dock._fg_writer.has_pending)
+        self.dock._onColorState(self.color_state.refresh())
+        self.assertEqual(box._sat, 128)
+        self.dock._fg_writer.flush()
+        self.assertEqual(self._krita_rgb(), self._picked_rgb())
+
+    def test_a_change_held_back_after_a_pick_is_applied_when_the_hold_ends(self):
+        from tests.qt_support import spin
+
+        self.dock._applyHSV(0, 255, 255)
+        self.dock._fg_writer.flush()
+        self.view.setForeGroundColor(self.fake.ManagedColor.fromRgb(10, 200, 30))
+        self.dock._onColorState(self.color_state.refresh())
+        self.assertEqual(self._picked_rgb(), (255, 0, 0))
+        spin(self.dock._settings["poll_interval"] + 100)
+        self.assertEqual(self._picked_rgb(), (10, 200, 30))
+
+    def test_swap_is_reported_to_the_shared_color_state(self):
+        self.view.setForeGroundColor(self.fake.ManagedColor.fromRgb(1, 2, 3))
+        self.view.setBackGroundColor(self.fake.ManagedColor.fromRgb(40, 50, 60))
+        self.color_state.refresh()
+        self.dock._swapColors()
+        state = self.color_state.state
+        self.assertEqual((state.foreground, state.background), ((40, 50, 60), (1, 2, 3)))
+        self.assertEqual(self._picked_rgb(), (40, 50, 60))
+
+    def test_a_pick_krita_never_received_is_not_reported(self):
+        document = self.krita.activeDocument()
+        self.krita.setActiveDocument(None)
+        self.addCleanup(self.krita.setActiveDocument, document)
+        before = self.color_state.state
+        self.dock._applyHSV(120, 255, 255)
+        self.dock._fg_writer.flush()
+        self.assertEqual(self.color_state.state, before)
+
+    def test_palette_swatch_click_sets_the_foreground(self):
+        swatches = self.dock.palette_swatches
+        swatches.setColors([((12, 34, 56), 0.7), ((200, 100, 0), 0.3)])
+        swatches.colorClicked.emit(200, 100, 0)
+        self.assertFalse(self.dock._fg_writer.has_pending)
+        self.assertEqual(self._krita_rgb(), (200, 100, 0))
+        self.assertEqual(self._picked_rgb(), (200, 100, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
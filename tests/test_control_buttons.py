@@ -0,0 +1,99 @@
+"""Quick Adjust status column tests - needs PyQt (offscreen) for the stand-in krita."""
+
+import unittest
+from unittest import mock
+
+from tests.qt_support import HAS_QT
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class ControlButtonWidgetTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests import fake_krita
+        from tests.qt_support import start_qt
+
+        cls.app = start_qt()
+        cls.krita = fake_krita.Krita.instance()
+        cls.window = cls.krita.activeWindow() or cls.krita.openWindow()
+        from quick_access_manager.remaster.quick_adjust.krita_state import (
+            KritaStateSnapshot,
+        )
+        from quick_access_manager.remaster.quick_adjust.widgets import (
+            control_buttons_widgets,
+        )
+
+        cls.module = control_buttons_widgets
+        cls.Snapshot = KritaStateSnapshot
+
+    def setUp(self):
+        self.preserve_alpha = self._checkable("preserve_alpha")
+        self.erase = self._checkable("erase_action")
+
+    def _checkable(self, action_id):
+        action = self.krita.action(action_id)
+        if action is None:
+            action = self.window.createAction(action_id)
+            action.setCheckable(True)
+        action.setChecked(False)
+        return action
+
+    def _widget(self):
+        widget = self.module.ControlButtonWidget(None)
+        self.addCleanup(widget.deleteLater)
+        self.addCleanup(widget.cleanup)
+        return widget
+
+    def test_indicators_follow_their_actions(self):
+        widget = self._widget()
+        self.preserve_alpha.setChecked(True)
+        self.assertEqual(widget.preserve_alpha_label.toolTip(), "Preserve Alpha: On")
+        self.erase.trigger()
+        self.assertEqual(widget.erase_mode_label.toolTip(), "Erase Mode: On")
+        self.erase.trigger()
+        self.assertEqual(widget.erase_mode_label.toolTip(), "Erase Mode: Off")
+
+    def test_icons_are_loaded_once_and_shared(self):
+        first = self._widget()
+        with mock.patch.object(
+            self.module, "QPixmap", wraps=self.module.QPixmap
+        ) as load:
+            second = self._widget()
+            self.preserve_alpha.setChecked(True)
+            self.preserve_alpha.setChecked(False)
+        self.assertEqual(load.call_count, 0)
+        pixmap = second.preserve_alpha_label.pixmap()
+        self.assertEqual(pixmap.width(), self.module.STATUS_ICON_SIZE)
+        self.assertEqual(
+            pixmap.cacheKey(), first.preserve_alpha_label.pixmap().cacheKey()
+        )
+
+    def test_poll_only_updates_the_selection(self):
+        widget = self._widget()
+        snapshot = self.Snapshot(has_selection=True, preserve_alpha=True)
+        self.assertTrue(widget._poll_status(snapshot))
+        self.assertEqual(widget.selection_info_label.toolTip(), "Selection: On")
+        self.assertEqual(widget.preserve_alpha_label.toolTip(), "Preserve Alpha: Off")
+        self.assertFalse(widget._poll_status(snapshot))
+
+    def test_status_poll_reads_only_the_selection(self):
+        from quick_access_manager.remaster.quick_adjust.poll_scheduler import (
+            PollScheduler,
+        )
+
+        scheduler = PollScheduler(use_events=False)
+        with mock.patch.object(self.module, "get_poll_scheduler", return_value=scheduler):
+            self._widget()
+        with mock.patch.object(self.krita, "action", wraps=self.krita.action) as action:
+            scheduler.tick()
+        action.assert_not_called()
+
+    def test_cleanup_disconnects_the_actions(self):
+        widget = self._widget()
+        widget.cleanup()
+        self.preserve_alpha.setChecked(True)
+        self.assertFalse(widget.is_preserve_alpha)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,6 +17,7 @@ from quick_access_manager.remaster.infrastructure import (
 )
 from quick_access_manager.remaster.quick_access_palette.controller import (
     PaletteController,
+    peek_settings,
 )
 
 
@@ -417,6 +418,27 @@ class TabBarStyleSettingsTests(ControllerTestCase):
         self.assertEqual(style["active_font_color"], "#111111")
 
 
+class PeekSettingsTests(ControllerTestCase):
+    def test_peek_matches_the_controller_without_loading_the_palette(self):
+        self.make_controller().update_settings(huesvc_enabled=False)
+        with mock.patch.object(PaletteRepository, "load") as load:
+            settings = peek_settings(self.repository)
+        load.assert_not_called()
+        self.assertEqual(settings, self.make_controller().settings())
+        self.assertFalse(settings["default"]["huesvc_enabled"])
+        self.assertTrue(settings["default"]["quick_adjust_enabled"])
+
+    def test_peek_reads_settings_not_yet_split_out_of_the_palette_file(self):
+        with open(self.repository.path, "w", encoding="utf-8") as handle:
+            json.dump(
+                {"tabs": [], "settings": {"default": {"quick_adjust_enabled": False}}},
+                handle,
+            )
+        settings = peek_settings(self.repository)
+        self.assertFalse(settings["default"]["quick_adjust_enabled"])
+        self.assertFalse(os.path.exists(self.repository.settings_path))
+
+
 class TabManagementTests(ControllerTestCase):
     def test_add_tab_becomes_active(self):
         controller = self.make_controller()
@@ -0,0 +1,126 @@
+"""HueSVC document palette tests - needs PyQt (offscreen) for the stand-in krita."""
+
+import time
+import unittest
+from unittest import mock
+
+from tests.qt_support import HAS_QT
+
+RED, TEAL = (200, 30, 40), (20, 140, 150)
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class DocumentPaletteExtractorTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests import fake_krita
+        from tests.qt_support import start_qt
+
+        cls.app = start_qt()
+        cls.fake = fake_krita
+        from quick_access_manager.remaster.color_selector import document_palette
+        from quick_access_manager.remaster.quick_adjust.poll_scheduler import (
+            PollScheduler,
+        )
+
+        cls.module = document_palette
+        cls.PollScheduler = PollScheduler
+
+    def setUp(self):
+        self.krita = self.fake.Krita.instance()
+        if self.krita.activeWindow() is None:
+            self.krita.openWindow()
+        self.document = self._document(RED, TEAL)
+        self.krita.setActiveDocument(self.document)
+        self.addCleanup(self.krita.setActiveDocument, None)
+        self.scheduler = self.PollScheduler(use_events=False)
+        self.extractor = self.module.DocumentPaletteExtractor(
+            count=2, pixel_budget=4096, scheduler=self.scheduler
+        )
+        self.addCleanup(self._drop_extractor)
+        self.results, self.failures = [], []
+        self.extractor.paletteReady.connect(self.results.append)
+        self.extractor.extractionFailed.connect(self.failures.append)
+
+    def _drop_extractor(self):
+        # Let it be destroyed now, not at interpreter exit.
+        self.extractor.cancel()
+        self.scheduler.unregister(self.extractor)
+        del self.extractor
+
+    def _document(self, left, right, width=256, height=128):
+        document = self.fake.Document(width, height)
+        self._paint(document.activeNode(), left, right, width, height)
+        return document
+
+    def _paint(self, node, left, right, width=256, height=128):
+        """Left three quarters `left`, the rest `right`."""
+        split = width * 3 // 4
+        row = bytes((left[2], left[1], left[0], 255)) * split + bytes(
+            (right[2], right[1], right[0], 255)
+        ) * (width - split)
+        node.setPixelData(row * height, 0, 0, width, height)
+
+    def _wait(self, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.extractor.busy and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.001)
+        self.app.processEvents()
+
+    def test_extracts_the_dominant_colors(self):
+        self.extractor.extract()
+        self.assertTrue(self.extractor.busy)
+        self._wait()
+        self.assertEqual(self.failures, [])
+        (first, share), (second, _) = self.results[-1]
+        self.assertEqual(first, RED)
+        self.assertEqual(second, TEAL)
+        self.assertAlmostEqual(share, 0.75, delta=0.05)
+
+    def test_reads_only_the_sampled_tiles(self):
+        node = self.document.activeNode()
+        with mock.patch.object(node, "pixelData", wraps=node.pixelData) as read:
+            self.extractor.extract()
+            self._wait()
+        pixels = sum(call.args[2] * call.args[3] for call in read.call_args_list)
+        self.assertLessEqual(pixels, 4096)
+
+    def test_unchanged_layer_is_served_from_the_cache(self):
+        threading = self.module.threading
+        self.extractor.extract()
+        self._wait()
+        with mock.patch.object(threading, "Thread", wraps=threading.Thread) as thread:
+            self.extractor.extract()
+            self._wait()
+        thread.assert_not_called()
+        self.assertEqual(self.results[0], self.results[1])
+
+        # New pixels, new checksum: clustered again.
+        self._paint(self.document.activeNode(), RED, (0, 0, 0))
+        with mock.patch.object(threading, "Thread", wraps=threading.Thread) as thread:
+            self.extractor.extract()
+            self._wait()
+        thread.assert_called_once()
+        self.assertEqual(self.results[-1][1][0], (0, 0, 0))
+
+    def test_document_switch_cancels_the_job(self):
+        self.extractor.extract()
+        self.assertTrue(self.scheduler.is_active(self.extractor))
+        self.krita.setActiveDocument(self._document(TEAL, RED))
+        self.scheduler.tick()
+        self.assertFalse(self.extractor.busy)
+        self.assertFalse(self.scheduler.is_active(self.extractor))
+        self._wait(0.2)
+        self.assertEqual(self.results, [])
+
+    def test_non_rgb_layer_is_refused(self):
+        node = self.document.activeNode()
+        with mock.patch.object(node, "colorModel", return_value="CMYKA"):
+            self.extractor.extract()
+        self.assertFalse(self.extractor.busy)
+        self.assertEqual(len(self.failures), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""Grid Edit undo/redo journal tests.
+
+The journal is pure; the dialog test needs PyQt (offscreen) and the
+stand-in `krita` module, and is skipped without PyQt.
+"""
+
+import tempfile
+import unittest
+from unittest import mock
+
+from quick_access_manager.remaster.shared import EditJournal, PaletteItem
+from tests.qt_support import HAS_QT
+
+
+def brush(item_id, row=0, col=0):
+    return PaletteItem.create_brush(item_id, f"brush-{item_id}", row=row, col=col)
+
+
+def positions(items):
+    return [(item.id, item.row, item.col) for item in items]
+
+
+class EditJournalTests(unittest.TestCase):
+    def test_a_step_keeps_only_the_changed_items(self):
+        journal = EditJournal()
+        before = [brush("a"), brush("b", col=1), brush("c", col=2)]
+        after = [item.copy_with() for item in before]
+        after[1] = after[1].copy_with(row=3)
+        self.assertTrue(journal.record(before, after))
+        self.assertEqual([change.item_id for change in journal._undo[0]], ["b"])
+        self.assertFalse(journal.record(after, [item.copy_with() for item in after]))
+        self.assertEqual(len(journal), 1)
+
+    def test_undo_and_redo_restore_moves_adds_and_removals_in_place(self):
+        journal = EditJournal()
+        first = [brush("a"), brush("b", col=1), brush("c", col=2)]
+        second = [first[0].copy_with(row=1), first[2], brush("d", col=5)]
+        journal.record(first, second)
+
+        undone, touched = journal.undo(second)
+        self.assertEqual(positions(undone), positions(first))
+        self.assertEqual(touched, {"a", "b", "d"})
+        self.assertTrue(journal.can_redo)
+
+        redone, _ = journal.redo(undone)
+        self.assertEqual(positions(redone), positions(second))
+        self.assertFalse(journal.can_redo)
+
+    def test_a_new_edit_clears_redo(self):
+        journal = EditJournal()
+        items = [brush("a")]
+        moved = [items[0].copy_with(col=1)]
+        journal.record(items, moved)
+        items_back, _ = journal.undo(moved)
+        journal.record(items_back, [items_back[0].copy_with(col=2)])
+        self.assertFalse(journal.can_redo)
+
+    def test_oldest_steps_are_dropped_past_either_bound(self):
+        journal = EditJournal(max_steps=3)
+        items = [brush("a")]
+        for col in range(1, 6):
+            moved = [items[0].copy_with(col=col)]
+            journal.record(items, moved)
+            items = moved
+        self.assertEqual(len(journal), 3)
+
+        journal = EditJournal(max_changed_items=5)
+        items = [brush(str(i), col=i) for i in range(3)]
+        for row in range(1, 4):
+            moved = [item.copy_with(row=row) for item in items]
+            journal.record(items, moved)
+            items = moved
+        self.assertEqual(len(journal), 1)
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class GridEditUndoTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests.qt_support import start_qt
+
+        cls.app = start_qt()
+
+    def setUp(self):
+        from quick_access_manager.remaster.infrastructure import paths
+        from quick_access_manager.remaster.quick_access_palette.dialogs.grid_edit import (
+            GridEditDialog,
+        )
+        from quick_access_manager.remaster.shared import PaletteGrid, PaletteTab
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patch = mock.patch.object(paths, "get_krita_data_dir", return_value=tmp.name)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        items = [brush(f"b{i}", row=0, col=i) for i in range(4)]
+        tabs = [PaletteTab(id="t", name="T", grids=[PaletteGrid("g", "G", 4, items)])]
+        self.dialog = GridEditDialog(tabs)
+        self.addCleanup(self.dialog.deleteLater)
+
+    def test_undo_moves_the_existing_widgets_back_and_redo_reapplies(self):
+        dialog = self.dialog
+        dialog.selected_ids = {"b0"}
+        dialog.move_selected(2, 0)
+        widgets = dict(dialog.item_widgets)
+        self.assertTrue(dialog.undo_btn.isEnabled())
+
+        dialog.undo()
+        self.assertEqual(
+            {item.id: (item.row, item.col) for item in dialog.items}["b0"], (0, 0)
+        )
+        self.assertIs(dialog.item_widgets["b0"], widgets["b0"])
+        self.assertEqual(
+            dialog.item_widgets["b0"].geometry().topLeft().y(),
+            dialog.item_geometry(dialog.items[0], dialog.spacing)[1],
+        )
+        self.assertFalse(dialog.undo_btn.isEnabled())
+        self.assertTrue(dialog.redo_btn.isEnabled())
+
+        dialog.redo()
+        self.assertEqual({item.id: item.row for item in dialog.items}["b0"], 2)
+        self.assertFalse(dialog.redo_btn.isEnabled())
+
+    def test_undo_of_a_removal_restores_the_item_and_its_widget(self):
+        dialog = self.dialog
+        dialog.selected_ids = {"b2"}
+        dialog.remove_selected_items()
+        self.assertNotIn("b2", dialog.item_widgets)
+        dialog.undo()
+        self.assertEqual([item.id for item in dialog.items], ["b0", "b1", "b2", "b3"])
+        self.assertIn("b2", dialog.item_widgets)
+
+
+if __name__ == "__main__":
+    unittest.main()
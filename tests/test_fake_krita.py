@@ -0,0 +1,74 @@
+"""Stand-in `krita` module tests: sizes, call counting, resources.
+
+The stand-in is built on PyQt, so these are skipped without it.
+"""
+
+import time
+import unittest
+
+from tests.qt_support import HAS_QT
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class FakeKritaTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests import fake_krita
+        from tests.qt_support import start_qt
+
+        cls.app = start_qt()
+        cls.fake = fake_krita
+
+    def setUp(self):
+        # A private instance, so populating it leaves other tests' alone.
+        self.addCleanup(setattr, self.fake.Krita, "_instance", self.fake.Krita._instance)
+        self.fake.Krita._instance = None
+        self.krita = self.fake.Krita.instance()
+        self.window = self.krita.openWindow()
+
+    def test_populate_adds_presets_actions_resources_and_layers(self):
+        self.krita.setActiveDocument(self.fake.Document(16, 16))
+        self.fake.populate(presets=50, actions=20, layers=3, resources={"gradient": 4})
+        self.fake.populate(presets=50)
+        self.assertEqual(len(self.krita.resources("preset")), 50)
+        self.assertEqual(len(self.krita.actions()), 20)
+        self.assertEqual(len(self.krita.resources("gradient")), 4)
+        document = self.krita.activeDocument()
+        self.assertEqual(len(document.topLevelNodes()), 4)
+        self.assertIs(document.activeNode(), document.topLevelNodes()[0])
+        action = self.krita.actions()[0]
+        self.assertIs(self.krita.action(action.objectName()), action)
+
+    def test_counting_calls_reports_only_the_calls_inside_the_block(self):
+        view = self.window.activeView()
+        view.brushSize()
+        with self.fake.counting_calls() as made:
+            view.brushSize()
+            view.setBrushSize(12)
+            self.krita.resources("preset")
+            self.fake.populate(presets=10)
+        self.assertEqual(
+            made, {"View.brushSize": 1, "View.setBrushSize": 1, "Krita.resources": 1}
+        )
+
+    def test_preset_wraps_a_resource_and_shares_its_xml(self):
+        self.fake.populate(presets=1)
+        resource = next(iter(self.krita.resources("preset").values()))
+        self.window.activeView().setCurrentBrushPreset(resource)
+        preset = self.fake.Preset(self.window.activeView().currentBrushPreset())
+        preset.fromXML("<Preset changed='1'/>")
+        self.assertEqual(preset.name(), resource.name())
+        self.assertEqual(self.fake.Preset(resource).toXML(), "<Preset changed='1'/>")
+
+    def test_call_cost_makes_each_call_wait(self):
+        self.fake.set_call_cost_us(2000)
+        self.addCleanup(self.fake.set_call_cost_us, 0)
+        view = self.window.activeView()
+        started = time.perf_counter()
+        for _ in range(5):
+            view.brushSize()
+        self.assertGreaterEqual(time.perf_counter() - started, 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""Gesture detector replay tests - needs PyQt (offscreen), not Krita.
+
+Replays the shipped traces in tests/data/gesture_traces through a real
+GestureDetector (see tests/gesture_replay.py) and checks both what it
+recognized and what it cost per event. Skipped when PyQt is not installed.
+"""
+
+import unittest
+
+from tests.qt_support import HAS_QT
+
+# Generous on purpose: the filter costs a few microseconds per event on a
+# desktop, so only a real regression (disk access or a widget rebuild on a
+# hot path) trips these on a slow CI box.
+MAX_MEAN_US = 150.0
+MAX_MOVE_MEAN_US = 100.0
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class GestureReplayTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests import gesture_replay
+
+        cls.replay = gesture_replay
+        cls.harness = gesture_replay.GestureReplayHarness()
+
+    def test_shipped_traces_exist(self):
+        self.assertTrue(self.replay.shipped_traces())
+
+    def test_shipped_traces_recognize_the_recorded_gestures(self):
+        for path in self.replay.shipped_traces():
+            trace = self.replay.load_trace(path)
+            with self.subTest(trace=trace["name"]):
+                report = self.harness.replay(trace)
+                self.assertEqual(report.events, len(trace["events"]))
+                self.assertEqual(report.actions, trace["expected_actions"])
+
+    def test_filter_cost_stays_within_budget(self):
+        for path in self.replay.shipped_traces():
+            trace = self.replay.load_trace(path)
+            with self.subTest(trace=trace["name"]):
+                # Best of three, so one scheduler hiccup cannot fail the run.
+                reports = [self.harness.replay(trace) for _ in range(3)]
+                best = min(reports, key=lambda report: report.mean_us)
+                self.assertLess(best.mean_us, MAX_MEAN_US, best.summary())
+                self.assertLess(
+                    best.cost_by_kind_us.get("move", 0.0), MAX_MOVE_MEAN_US, best.summary()
+                )
+
+    def test_short_movement_runs_the_center_gesture(self):
+        trace = self.replay.generate_trace([("G", "center")], rate_hz=250, seed=3)
+        report = self.harness.replay(trace)
+        self.assertEqual(report.actions, [self.replay.DEFAULT_GESTURE_CONFIGS["G"]["center"]])
+
+    def test_unbound_direction_runs_nothing(self):
+        trace = self.replay.generate_trace([("F2", "up")], rate_hz=250, seed=4)
+        report = self.harness.replay(trace)
+        self.assertEqual(report.actions, [])
+
+    def test_every_direction_is_recognized(self):
+        configs = {
+            "G": {
+                direction: {"gesture_type": "action", "parameters": {"action_id": direction}}
+                for direction in self.replay.DIRECTION_VECTORS
+            }
+        }
+        gestures = [("G", direction) for direction in self.replay.DIRECTION_VECTORS]
+        trace = self.replay.generate_trace(gestures, gesture_configs=configs, seed=5)
+        report = self.harness.replay(trace)
+        recognized = [action["parameters"]["action_id"] for action in report.actions]
+        self.assertEqual(recognized, list(self.replay.DIRECTION_VECTORS))
+
+
+if __name__ == "__main__":
+    unittest.main()
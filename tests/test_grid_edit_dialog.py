@@ -0,0 +1,143 @@
+"""Grid Edit dialog tests: persistent widgets, restyling and marquee hits.
+
+These need PyQt (offscreen) and the stand-in `krita` module, and are
+skipped without PyQt.
+"""
+
+import tempfile
+import unittest
+from unittest import mock
+
+from quick_access_manager.remaster.shared import PaletteItem
+from tests.qt_support import HAS_QT
+
+COLUMNS = 20
+
+
+def brush(item_id, row=0, col=0):
+    return PaletteItem.create_brush(item_id, f"brush-{item_id}", row=row, col=col)
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class GridEditDialogTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests.qt_support import start_qt
+
+        cls.app = start_qt()
+
+    def setUp(self):
+        from quick_access_manager.remaster.infrastructure import paths
+        from quick_access_manager.remaster.quick_access_palette.dialogs.grid_edit import (
+            GridEditDialog,
+        )
+        from quick_access_manager.remaster.shared import PaletteGrid, PaletteTab
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patch = mock.patch.object(paths, "get_krita_data_dir", return_value=tmp.name)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        items = [brush(f"b{i}", row=i // COLUMNS, col=i % COLUMNS) for i in range(300)]
+        tabs = [
+            PaletteTab("t1", "One", grids=[PaletteGrid("g1", "G", COLUMNS, items)]),
+            PaletteTab("t2", "Two", grids=[PaletteGrid("g2", "G", 4, [brush("x")])]),
+        ]
+        self.dialog = GridEditDialog(tabs)
+        self.addCleanup(self.dialog.deleteLater)
+
+    def count_restyles(self):
+        styled = []
+        original = self.dialog.item_style
+
+        def item_style(item, selected):
+            styled.append(item.id)
+            return original(item, selected)
+
+        self.dialog.item_style = item_style
+        return styled
+
+    def test_nudging_a_selection_reuses_every_widget(self):
+        dialog = self.dialog
+        dialog.selected_ids = {f"b{i}" for i in range(200)}
+        dialog.update_selection_styles()
+        widgets = dict(dialog.item_widgets)
+        styled = self.count_restyles()
+
+        for _ in range(5):
+            dialog.move_selected(1, 0)
+
+        self.assertEqual(styled, [])
+        self.assertEqual(dialog.item_widgets, widgets)
+        by_id = {item.id: item for item in dialog.items}
+        for item_id in ("b0", "b250"):
+            widget = dialog.item_widgets[item_id]
+            self.assertIs(widget.item, by_id[item_id])
+            self.assertEqual(
+                widget.geometry().getRect(),
+                dialog.item_geometry(by_id[item_id], dialog.spacing),
+            )
+
+    def test_only_items_whose_selection_changed_are_restyled(self):
+        dialog = self.dialog
+        dialog.selected_ids = {"b0", "b1"}
+        dialog.update_selection_styles()
+        styled = self.count_restyles()
+        dialog.selected_ids = {"b1", "b2"}
+        dialog.update_selection_styles()
+        self.assertEqual(sorted(styled), ["b0", "b2"])
+
+    def test_switching_tabs_keeps_each_tabs_widgets(self):
+        dialog = self.dialog
+        widgets = dict(dialog.item_widgets)
+        styled = self.count_restyles()
+        dialog.tab_widget.setCurrentIndex(1)
+        self.assertEqual(list(dialog.item_widgets), ["x"])
+        dialog.tab_widget.setCurrentIndex(0)
+        self.assertEqual(dialog.item_widgets, widgets)
+        self.assertEqual(styled, [])
+
+    def test_marquee_selects_the_items_under_it_after_edits(self):
+        from quick_access_manager.remaster.compat import QRect
+
+        dialog = self.dialog
+        dialog.selected_ids = {"b0"}
+        dialog.move_selected(20, 0)
+        pitch = dialog.cell_size + dialog.spacing
+        # Rows 1-2, columns 0-1, starting inside the gap before row 1.
+        rect = QRect(4, 4 + pitch - 2, pitch + 10, pitch + 10)
+        dialog.select_items_in_rect(rect)
+        expected = {
+            item.id
+            for item in dialog.items
+            if rect.intersects(QRect(*dialog.item_geometry(item, dialog.spacing)))
+        }
+        self.assertEqual(dialog.selected_ids, expected)
+        self.assertEqual(len(expected), 4)
+
+        dialog.select_items_in_rect(QRect(4, 4 + 20 * pitch, 5, 5))
+        self.assertEqual(dialog.selected_ids, {"b0"})
+
+    def test_arrow_keys_nudge_the_selection(self):
+        from quick_access_manager.remaster.compat import QShortcut
+
+        from quick_access_manager.remaster.compat import Qt
+
+        dialog = self.dialog
+        dialog.selected_ids = {"b0"}
+        shortcuts = {
+            shortcut.key().toString(): shortcut
+            for shortcut in dialog.grid_host.findChildren(QShortcut)
+        }
+        self.assertEqual(sorted(shortcuts), ["Down", "Left", "Right", "Up"])
+        for shortcut in shortcuts.values():
+            self.assertEqual(shortcut.context(), Qt.WidgetWithChildrenShortcut)
+        shortcuts["Right"].activated.emit()
+        shortcuts["Down"].activated.emit()
+        moved = next(item for item in dialog.items if item.id == "b0")
+        self.assertEqual((moved.row, moved.col), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""KritaStateSnapshot tests - needs PyQt (offscreen) for the stand-in krita."""
+
+import dataclasses
+import unittest
+from unittest import mock
+
+from tests.qt_support import HAS_QT
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class KritaStateSnapshotTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests import fake_krita
+        from tests.qt_support import start_qt
+
+        cls.app = start_qt()
+        cls.fake = fake_krita
+        from quick_access_manager.remaster.quick_adjust import krita_state
+
+        cls.state = krita_state
+
+    def setUp(self):
+        self.krita = self.fake.Krita.instance()
+        window = self.krita.activeWindow() or self.krita.openWindow()
+        self.view = self.fake.View(window)
+        window._views = [self.view]
+        self.view.setCurrentBrushPreset(self.fake.Preset("b) Basic-5 Size"))
+        self.document = self.fake.Document()
+        self.krita.setActiveDocument(self.document)
+        self.addCleanup(self.krita.setActiveDocument, None)
+
+    def test_capture_reads_every_group(self):
+        self.view.setBrushSize(42)
+        self.view.setForeGroundColor(self.fake.ManagedColor.fromRgb(255, 128, 0))
+        self.document.activeNode().setOpacity(128)
+        snapshot = self.state.KritaStateSnapshot.capture()
+
+        self.assertEqual(snapshot.brush_name, "b) Basic-5 Size")
+        self.assertEqual(snapshot.brush_size, 42.0)
+        self.assertEqual(snapshot.layer_opacity, 128)
+        self.assertEqual(snapshot.layer_blend_mode, "normal")
+        self.assertEqual(snapshot.foreground, (255, 128, 0))
+        self.assertEqual(snapshot.background, (255, 255, 255))
+        self.assertFalse(snapshot.has_selection)
+        self.assertIs(snapshot.view, self.view)
+
+    def test_capture_reads_each_value_once(self):
+        with mock.patch.object(
+            self.view, "brushSize", wraps=self.view.brushSize
+        ) as brush_size, mock.patch.object(
+            self.document, "activeNode", wraps=self.document.activeNode
+        ) as active_node:
+            self.state.KritaStateSnapshot.capture()
+        self.assertEqual(brush_size.call_count, 1)
+        self.assertEqual(active_node.call_count, 1)
+
+    def test_capture_skips_groups_not_asked_for(self):
+        with mock.patch.object(self.view, "brushSize") as brush_size:
+            snapshot = self.state.KritaStateSnapshot.capture((self.state.LAYER,))
+        brush_size.assert_not_called()
+        self.assertIsNone(snapshot.brush_size)
+        self.assertEqual(snapshot.layer_opacity, 255)
+
+    def test_snapshot_is_immutable(self):
+        snapshot = self.state.KritaStateSnapshot.capture()
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            snapshot.brush_size = 1.0
+
+    def test_changed_fields_reports_only_what_changed(self):
+        before = self.state.KritaStateSnapshot.capture()
+        self.view.setPaintingOpacity(0.5)
+        self.document.activeNode().setBlendingMode("multiply")
+        after = self.state.KritaStateSnapshot.capture()
+        self.assertEqual(
+            after.changed_fields(before), {"brush_opacity", "layer_blend_mode"}
+        )
+        self.assertEqual(
+            after.changed_fields(before, self.state.BRUSH_FIELDS), {"brush_opacity"}
+        )
+
+    def test_switching_to_a_look_alike_layer_is_a_change(self):
+        before = self.state.KritaStateSnapshot.capture((self.state.LAYER,))
+        self.document.setActiveNode(self.document.createNode("Twin", "paintlayer"))
+        after = self.state.KritaStateSnapshot.capture((self.state.LAYER,))
+        self.assertEqual(after.changed_fields(before), {"layer_id"})
+
+    def test_switching_layers_drops_a_queued_opacity(self):
+        from quick_access_manager.remaster.compat import QObject
+        from quick_access_manager.remaster.quick_adjust.layer_monitor import (
+            LayerMonitorMixin,
+        )
+        from tests.qt_support import spin
+
+        class Controls(LayerMonitorMixin, QObject):
+            layer_opacity_slider = None
+            layer_blend_combo = None
+
+        controls = Controls()
+        controls.setup_layer_monitoring()
+        first = self.document.activeNode()
+        controls.check_layer_change()
+        controls.layer_opacity_writer.submit(50)
+        controls.layer_opacity_writer.submit(20)
+        second = self.document.createNode("Layer 2", "paintlayer")
+        self.document.setActiveNode(second)
+        self.assertTrue(controls.check_layer_change())
+        spin(150)
+        self.assertEqual((first.opacity(), second.opacity()), (127, 255))
+
+    def test_changed_fields_ignores_rounding_noise(self):
+        before = self.state.KritaStateSnapshot.capture()
+        self.view.setPaintingOpacity(0.999)
+        self.view.setBrushSize(10.004)
+        after = self.state.KritaStateSnapshot.capture()
+        self.assertEqual(after.changed_fields(before), frozenset())
+
+    def test_changed_fields_compares_shared_groups_only(self):
+        brush_only = self.state.KritaStateSnapshot.capture((self.state.BRUSH,))
+        full = self.state.KritaStateSnapshot.capture()
+        self.assertEqual(full.changed_fields(brush_only), frozenset())
+        self.assertEqual(
+            brush_only.changed_fields(None), set(self.state.BRUSH_FIELDS)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
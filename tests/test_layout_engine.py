@@ -90,6 +90,55 @@ class ResizeItemTests(unittest.TestCase):
         self.assertTrue(engine.validate(result.items).valid)
 
 
+class GroupTests(unittest.TestCase):
+    def test_move_items_keeps_the_group_shape_and_pushes_the_rest(self):
+        engine = FreeGridLayoutEngine(columns=4)
+        items = [brush("a", 0, 0), brush("b", 0, 1), brush("c", 1, 0), brush("d", 1, 1)]
+        result = engine.move_items(items, {"a", "b"}, 1, 0)
+        self.assertTrue(result.valid)
+        by_id = {item.id: item for item in result.items}
+        self.assertEqual((by_id["a"].row, by_id["a"].col), (1, 0))
+        self.assertEqual((by_id["b"].row, by_id["b"].col), (1, 1))
+        self.assertNotIn((by_id["c"].row, by_id["c"].col), [(1, 0), (1, 1)])
+
+    def test_move_items_clamps_the_offset_to_the_grid(self):
+        engine = FreeGridLayoutEngine(columns=4)
+        items = [brush("a", 0, 1), brush("b", 1, 2)]
+        result = engine.move_items(items, {"a", "b"}, -3, 5)
+        by_id = {item.id: item for item in result.items}
+        self.assertEqual((by_id["a"].row, by_id["a"].col), (0, 2))
+        self.assertEqual((by_id["b"].row, by_id["b"].col), (1, 3))
+        unchanged = engine.move_items(items, {"a", "b"}, -1, 0)
+        self.assertEqual(unchanged.items, items)
+
+    def test_moving_an_item_past_the_right_edge_keeps_its_column(self):
+        engine = FreeGridLayoutEngine(columns=4)
+        items = [PaletteItem.create_label("wide", "W", row=0, col=3), brush("b", 2, 0)]
+
+        def moved(row_delta, col_delta):
+            result = engine.move_items(items, {"wide"}, row_delta, col_delta)
+            wide = next(item for item in result.items if item.id == "wide")
+            return wide.row, wide.col
+
+        self.assertEqual(moved(1, 0), (1, 3))
+        self.assertEqual(moved(0, 1), (0, 3))
+        self.assertEqual(moved(0, -1), (0, 2))
+
+    def test_resize_items_stops_at_the_right_edge_and_separates_the_group(self):
+        engine = FreeGridLayoutEngine(columns=4)
+        items = [
+            PaletteItem.create_label("a", "A", row=0, col=0),
+            PaletteItem.create_label("b", "B", row=0, col=2),
+            brush("c", 0, 1),
+        ]
+        result = engine.resize_items(items, {"a", "b"}, col_delta=3)
+        self.assertTrue(result.valid)
+        by_id = {item.id: item for item in result.items}
+        self.assertEqual(by_id["b"].col_span, 2)
+        self.assertEqual((by_id["a"].row, by_id["a"].col_span), (0, 4))
+        self.assertEqual(by_id["b"].row, 1)
+
+
 class ValidateTests(unittest.TestCase):
     def test_overlap_is_reported_on_both_items(self):
         engine = FreeGridLayoutEngine(columns=4)
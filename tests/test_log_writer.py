@@ -0,0 +1,96 @@
+"""Buffered log writer tests - need neither krita nor Qt."""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from quick_access_manager import log_writer
+from quick_access_manager.log_writer import LogWriter
+
+
+class LogWriterTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.path = os.path.join(self._tmp.name, "logs", "log.txt")
+
+    def _read(self, path=None):
+        with open(path or self.path, encoding="utf-8") as handle:
+            return handle.read()
+
+    def test_messages_wait_in_memory_until_flushed(self):
+        writer = LogWriter(self.path, flush_interval=60)
+        self.addCleanup(writer.close)
+        writer.enqueue("debug", "gesture", "first")
+        writer.enqueue("error", "gesture", "second")
+        self.assertFalse(os.path.exists(self.path))
+        writer.flush()
+        lines = self._read().splitlines()
+        self.assertRegex(lines[0], r"DEBUG   \[gesture\] first$")
+        self.assertRegex(lines[1], r"ERROR   \[gesture\] second$")
+
+    def test_background_thread_writes_within_the_interval(self):
+        writer = LogWriter(self.path, flush_interval=0.01)
+        self.addCleanup(writer.close)
+        writer.enqueue("info", "gesture", "hello")
+        deadline = time.monotonic() + 2.0
+        while not os.path.exists(self.path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIn("hello", self._read())
+
+    def test_close_writes_what_is_still_queued(self):
+        writer = LogWriter(lambda: self.path, flush_interval=60)
+        writer.enqueue("info", "gesture", "last words")
+        writer.close()
+        self.assertIn("last words", self._read())
+        writer.enqueue("info", "gesture", "after shutdown")
+        self.assertIn("after shutdown", self._read())
+
+    def test_files_rotate_at_the_size_limit(self):
+        writer = LogWriter(self.path, max_bytes=200, backup_count=2, flush_interval=60)
+        self.addCleanup(writer.close)
+        for index in range(4):
+            writer.enqueue("info", "gesture", f"batch {index} " + "x" * 100)
+            writer.flush()
+        self.assertIn("batch 3", self._read())
+        self.assertIn("batch 2", self._read(self.path + ".1"))
+        self.assertIn("batch 1", self._read(self.path + ".2"))
+        self.assertFalse(os.path.exists(self.path + ".3"))
+
+
+class LogLevelTests(unittest.TestCase):
+    def setUp(self):
+        patch = mock.patch.object(log_writer, "_levels", {})
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_levels_default_to_off_and_are_per_subsystem(self):
+        self.assertFalse(log_writer.is_enabled("gesture", "error"))
+        log_writer.set_level("gesture", "warning")
+        self.assertTrue(log_writer.is_enabled("gesture", "error"))
+        self.assertFalse(log_writer.is_enabled("gesture", "debug"))
+        self.assertFalse(log_writer.is_enabled("legacy", "error"))
+        log_writer.set_level("*", "info")
+        self.assertTrue(log_writer.is_enabled("legacy", "info"))
+
+    def test_environment_sets_a_default_and_per_subsystem_levels(self):
+        value = "info, gesture=debug, legacy=off, bogus=loud"
+        with mock.patch.dict(os.environ, {log_writer.ENV_VAR: value}):
+            levels = log_writer._levels_from_environment()
+        self.assertEqual(levels, {"*": 20, "gesture": 10, "legacy": 100})
+
+    def test_disabled_messages_are_not_queued_unless_forced(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "log.txt")
+            writer = log_writer.get_log_writer(path)
+            with mock.patch.object(writer, "enqueue") as enqueue:
+                log_writer.log("gesture", "dropped", path)
+                enqueue.assert_not_called()
+                log_writer.log("gesture", "kept", path, force=True)
+            enqueue.assert_called_once_with("debug", "gesture", "kept")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""Metrics registry tests.
+
+The registry needs neither krita nor Qt; the Performance dialog test needs
+PyQt (offscreen) and is skipped without it.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from quick_access_manager.remaster.infrastructure import json_cache
+from quick_access_manager.remaster.shared import metrics
+from quick_access_manager.remaster.shared.metrics import MetricsRegistry
+from tests.qt_support import HAS_QT
+
+
+class HistogramTests(unittest.TestCase):
+    def test_observations_land_in_the_first_bucket_not_below_them(self):
+        histogram = metrics.Histogram("h", buckets=(1, 10))
+        for value in (0.5, 1, 5, 50):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.max, 50)
+        self.assertAlmostEqual(histogram.mean, 56.5 / 4)
+
+    def test_percentiles_report_bucket_bounds_and_the_max_beyond_them(self):
+        histogram = metrics.Histogram("h", buckets=(1, 10))
+        for _ in range(90):
+            histogram.observe(0.5)
+        for _ in range(10):
+            histogram.observe(42)
+        self.assertEqual(histogram.percentile(0.5), 1)
+        self.assertEqual(histogram.percentile(0.95), 42)
+        self.assertEqual(metrics.Histogram("empty").percentile(0.5), 0.0)
+
+    def test_timed_records_calls_that_raise(self):
+        histogram = metrics.Histogram("h")
+
+        @metrics.timed(histogram)
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            fail()
+        with histogram.time():
+            pass
+        self.assertEqual(histogram.count, 2)
+
+
+class MetricsRegistryTests(unittest.TestCase):
+    def test_names_are_get_or_create_and_keep_their_kind(self):
+        registry = MetricsRegistry()
+        self.assertIs(registry.counter("a"), registry.counter("a"))
+        with self.assertRaises(TypeError):
+            registry.histogram("a")
+
+    def test_snapshot_json_and_reset(self):
+        registry = MetricsRegistry()
+        registry.counter("b.count").inc(3)
+        registry.gauge("a.gauge").set(12)
+        registry.histogram("c.time").observe(2.0)
+        snapshot = registry.snapshot()
+        self.assertEqual(list(snapshot), ["a.gauge", "b.count", "c.time"])
+        self.assertEqual(snapshot["b.count"], {"type": "counter", "value": 3})
+        self.assertEqual(snapshot["c.time"]["count"], 1)
+        self.assertEqual(json.loads(registry.to_json())["metrics"], snapshot)
+
+        registry.reset()
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot["b.count"]["value"], 0)
+        self.assertIsNone(snapshot["a.gauge"]["value"])
+        self.assertEqual(snapshot["c.time"]["count"], 0)
+
+    def test_json_cache_counts_hits_misses_and_writes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "data.json")
+            hits = metrics.counter("json_cache.hits").value
+            misses = metrics.counter("json_cache.misses").value
+            writes = metrics.counter("json_cache.writes").value
+            json_cache.write_json(path, {"a": 1})
+            json_cache.invalidate(path)
+            json_cache.read_json(path)
+            json_cache.read_json(path)
+            json_cache.invalidate(path)
+        self.assertEqual(metrics.counter("json_cache.writes").value, writes + 1)
+        self.assertEqual(metrics.counter("json_cache.misses").value, misses + 1)
+        self.assertEqual(metrics.counter("json_cache.hits").value, hits + 1)
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class PerformanceDialogTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests.qt_support import start_qt
+
+        cls.app = start_qt()
+
+    def test_table_lists_the_registry_and_export_writes_it(self):
+        from quick_access_manager.remaster.performance_dialog import PerformanceDialog
+
+        registry = MetricsRegistry()
+        registry.counter("json_cache.hits").inc(7)
+        registry.histogram("layout.add_item").observe(0.2)
+        dialog = PerformanceDialog(registry=registry)
+        self.addCleanup(dialog.deleteLater)
+
+        self.assertEqual(dialog.table.rowCount(), 2)
+        self.assertEqual(dialog.table.item(0, 0).text(), "json_cache.hits")
+        self.assertEqual(dialog.table.item(0, 1).text(), "7")
+        self.assertEqual(dialog.table.item(1, 4).text(), "0.250")
+
+        registry.gauge("poll.interval_ms").set(100)
+        dialog.refresh()
+        self.assertEqual(dialog.table.rowCount(), 3)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = dialog.export_json(os.path.join(directory, "metrics.json"))
+            with open(path, encoding="utf-8") as handle:
+                exported = json.load(handle)["metrics"]
+        self.assertEqual(exported["json_cache.hits"]["value"], 7)
+
+        dialog.reset_metrics()
+        self.assertEqual(dialog.table.item(0, 1).text(), "0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Document palette extraction tests - no krita, no Qt."""
+
+import struct
+import unittest
+from unittest import mock
+
+from quick_access_manager.remaster.shared import palette_extract
+
+RED, TEAL, CREAM = (200, 30, 40), (20, 140, 150), (240, 230, 200)
+
+
+def _bgra(colors, alpha=255):
+    return b"".join(bytes((b, g, r, alpha)) for r, g, b in colors)
+
+
+def _pixels(weights):
+    """Flat pixel list with each color repeated `weights[color]` times."""
+    return [color for color, n in weights.items() for _ in range(n)]
+
+
+class TileRectTests(unittest.TestCase):
+    def test_small_canvas_is_read_whole(self):
+        self.assertEqual(palette_extract.tile_rects(5, 6, 100, 80, budget=10000), [(5, 6, 100, 80)])
+
+    def test_8k_canvas_stays_within_the_budget(self):
+        budget = palette_extract.DEFAULT_PIXEL_BUDGET
+        rects = palette_extract.tile_rects(0, 0, 7680, 4320, budget=budget)
+        self.assertLessEqual(sum(w * h for _, _, w, h in rects), budget)
+        self.assertGreater(sum(w * h for _, _, w, h in rects), budget // 2)
+        for x, y, w, h in rects:
+            self.assertTrue(0 <= x and x + w <= 7680 and 0 <= y and y + h <= 4320)
+        # Spread over the whole canvas, not bunched in a corner.
+        xs = [x for x, _, _, _ in rects]
+        ys = [y for _, y, _, _ in rects]
+        self.assertLess(min(xs), 7680 // 8)
+        self.assertGreater(max(xs), 7680 * 7 // 8 - 32)
+        self.assertLess(min(ys), 4320 // 8)
+        self.assertGreater(max(ys), 4320 * 7 // 8 - 32)
+
+    def test_empty_bounds(self):
+        self.assertEqual(palette_extract.tile_rects(0, 0, 0, 100), [])
+
+
+class DecodeTests(unittest.TestCase):
+    def test_bgra_u8_is_reordered_and_transparent_pixels_dropped(self):
+        data = _bgra([RED, TEAL]) + _bgra([CREAM], alpha=0)
+        pixels = palette_extract.decode_pixels([data])
+        self.assertEqual([tuple(p) for p in pixels], [RED, TEAL])
+
+    def test_u16_and_f32(self):
+        u16 = struct.pack("<4H", 40 * 257, 30 * 257, 200 * 257, 65535)
+        self.assertEqual([tuple(p) for p in palette_extract.decode_pixels([u16], "U16")], [RED])
+        f32 = struct.pack("<4f", 40 / 255, 30 / 255, 200 / 255, 1.0)
+        self.assertEqual([tuple(p) for p in palette_extract.decode_pixels([f32], "F32")], [RED])
+
+    def test_fallback_decodes_the_same(self):
+        data = _bgra([RED, TEAL, CREAM]) + _bgra([RED], alpha=10)
+        f16 = struct.pack("<4e", 0.0, 0.5, 1.0, 1.0)
+        with mock.patch.object(palette_extract, "HAS_NUMPY", False):
+            self.assertEqual(palette_extract.decode_pixels([data]), [RED, TEAL, CREAM])
+            self.assertEqual(palette_extract.decode_pixels([f16], "F16"), [(255, 128, 0)])
+
+    def test_fingerprint_follows_content(self):
+        a = palette_extract.fingerprint([_bgra([RED]), _bgra([TEAL])])
+        self.assertEqual(a, palette_extract.fingerprint([_bgra([RED]), _bgra([TEAL])]))
+        self.assertNotEqual(a, palette_extract.fingerprint([_bgra([RED]), _bgra([CREAM])]))
+
+
+class DominantColorTests(unittest.TestCase):
+    def assertFindsColors(self, result, expected):
+        self.assertEqual(len(result), len(expected))
+        for (rgb, _share), want in zip(result, expected):
+            for got, channel in zip(rgb, want):
+                self.assertAlmostEqual(got, channel, delta=3)
+
+    def test_most_common_color_comes_first(self):
+        pixels = _pixels({RED: 600, TEAL: 300, CREAM: 100})
+        result = palette_extract.dominant_colors(pixels, count=3)
+        self.assertFindsColors(result, [RED, TEAL, CREAM])
+        self.assertAlmostEqual(result[0][1], 0.6, places=2)
+        self.assertAlmostEqual(sum(share for _, share in result), 1.0)
+
+    def test_fewer_distinct_colors_than_asked(self):
+        result = palette_extract.dominant_colors([RED] * 50, count=8)
+        self.assertFindsColors(result, [RED])
+        self.assertEqual(palette_extract.dominant_colors([], count=8), [])
+
+    def test_cancel_returns_none(self):
+        pixels = _pixels({RED: 100, TEAL: 100})
+        self.assertIsNone(palette_extract.dominant_colors(pixels, count=2, should_cancel=lambda: True))
+        with mock.patch.object(palette_extract, "HAS_NUMPY", False):
+            self.assertIsNone(
+                palette_extract.dominant_colors(pixels, count=2, should_cancel=lambda: True)
+            )
+
+    def test_fallback_median_cut_finds_the_same_colors(self):
+        pixels = _pixels({RED: 600, TEAL: 300, CREAM: 100})
+        with mock.patch.object(palette_extract, "HAS_NUMPY", False):
+            result = palette_extract.dominant_colors(pixels, count=3)
+        self.assertFindsColors(result, [RED, TEAL, CREAM])
+
+    def test_samples_are_bounded(self):
+        pixels = _pixels({RED: 30000, TEAL: 20000})
+        result = palette_extract.dominant_colors(pixels, count=2, max_samples=500)
+        self.assertFindsColors(result, [RED, TEAL])
+        self.assertAlmostEqual(result[0][1], 0.6, delta=0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
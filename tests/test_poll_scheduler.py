@@ -0,0 +1,181 @@
+"""Poll scheduler tests - needs PyQt (offscreen), not Krita."""
+
+import unittest
+from unittest import mock
+
+from tests.qt_support import HAS_QT
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class PollSchedulerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests.qt_support import start_qt
+
+        cls.app = start_qt()
+        from quick_access_manager.remaster.compat import QObject
+        from quick_access_manager.remaster.quick_adjust import poll_scheduler
+
+        cls.QObject = QObject
+        cls.module = poll_scheduler
+
+    def setUp(self):
+        self.scheduler = self.module.PollScheduler(use_events=False)
+        self.clock = [0.0]
+        patcher = mock.patch.object(self.module, "_now_ms", side_effect=lambda: self.clock[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_inactive_owner_is_not_polled(self):
+        owner = self.QObject()
+        calls = []
+        self.scheduler.register(owner, calls.append)
+        self.scheduler.tick()
+        self.assertEqual(calls, [])
+        self.assertFalse(self.scheduler._timer.isActive())
+
+    def test_context_is_shared_by_every_consumer(self):
+        first, second = self.QObject(), self.QObject()
+        seen = []
+        self.scheduler.register(first, seen.append)
+        self.scheduler.register(second, seen.append)
+        self.scheduler.set_active(first, True)
+        self.scheduler.set_active(second, True)
+        self.scheduler.tick()
+        self.assertEqual(len(seen), 2)
+        self.assertIs(seen[0], seen[1])
+
+    def test_interval_backs_off_when_nothing_changes(self):
+        owner = self.QObject()
+        self.scheduler.register(owner, lambda context: False)
+        self.scheduler.set_active(owner, True)
+        intervals = []
+        for _ in range(6):
+            self.clock[0] += 5000
+            self.scheduler.tick()
+            intervals.append(self.scheduler.interval())
+        self.assertEqual(intervals, [200, 400, 800, 1600, 2000, 2000])
+
+    def test_change_or_activity_returns_to_fast_interval(self):
+        changed = [False]
+        owner = self.QObject()
+        self.scheduler.register(owner, lambda context: changed[0])
+        self.scheduler.set_active(owner, True)
+        for _ in range(4):
+            self.clock[0] += 5000
+            self.scheduler.tick()
+        changed[0] = True
+        self.scheduler.tick()
+        self.assertEqual(self.scheduler.interval(), self.module.FAST_INTERVAL_MS)
+
+        changed[0] = False
+        self.clock[0] += 5000
+        self.scheduler.tick()
+        self.scheduler.notify_activity()
+        self.assertEqual(self.scheduler.interval(), self.module.FAST_INTERVAL_MS)
+
+    def test_min_interval_skips_fast_ticks(self):
+        owner = self.QObject()
+        calls = []
+        self.scheduler.register(owner, calls.append, min_interval_ms=1000)
+        self.scheduler.set_active(owner, True)
+        for _ in range(5):
+            self.scheduler.tick()
+            self.clock[0] += 300
+        self.assertEqual(len(calls), 2)
+
+    def test_deactivating_last_owner_stops_the_timer(self):
+        owner = self.QObject()
+        self.scheduler.register(owner, lambda context: False)
+        self.scheduler.set_active(owner, True)
+        self.assertTrue(self.scheduler._timer.isActive())
+        self.scheduler.set_active(owner, False)
+        self.assertFalse(self.scheduler._timer.isActive())
+
+    def test_deleted_owner_is_dropped(self):
+        owner = self.QObject()
+
+        def consumer(context):
+            raise RuntimeError("wrapped C/C++ object has been deleted")
+
+        self.scheduler.register(owner, consumer)
+        self.scheduler.set_active(owner, True)
+        self.scheduler.tick()
+        self.assertFalse(self.scheduler.is_active(owner))
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class PollSchedulerEventTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests import fake_krita
+        from tests.poll_latency import BRUSH_ACTION_ID, PollLatencyHarness
+
+        cls.harness = PollLatencyHarness()
+        cls.fake = fake_krita
+        cls.action_id = BRUSH_ACTION_ID
+        from quick_access_manager.remaster.compat import QObject
+        from quick_access_manager.remaster.quick_adjust import krita_state, poll_scheduler
+
+        cls.QObject = QObject
+        cls.state = krita_state
+        cls.module = poll_scheduler
+
+    def setUp(self):
+        self.scheduler = self.module.PollScheduler()
+        self.addCleanup(self.scheduler.deleteLater)
+        self.calls = {}
+        self.owner = self.QObject()
+        for group in (self.state.BRUSH, self.state.LAYER):
+            self.calls[group] = 0
+            self.scheduler.register(
+                self.owner, self._consumer(group), min_interval_ms=60000, groups=(group,)
+            )
+        self.scheduler.set_active(self.owner, True)
+        self.addCleanup(self.scheduler.unregister, self.owner)
+        self.scheduler.tick()
+
+    def _consumer(self, group):
+        def consumer(snapshot):
+            self.calls[group] += 1
+            return False
+
+        return consumer
+
+    def test_request_tick_runs_only_matching_consumers(self):
+        self.scheduler.request_tick((self.state.BRUSH,))
+        self.harness._spin(50)
+        self.assertEqual(self.calls, {self.state.BRUSH: 2, self.state.LAYER: 1})
+
+    def test_requests_coalesce_into_one_tick(self):
+        for _ in range(5):
+            self.scheduler.request_tick((self.state.BRUSH,))
+        self.harness._spin(50)
+        self.assertEqual(self.calls[self.state.BRUSH], 2)
+
+    def test_brush_action_triggers_a_brush_tick(self):
+        self.fake.Krita.instance().action(self.action_id).trigger()
+        self.harness._spin(50)
+        self.assertEqual(self.calls, {self.state.BRUSH: 2, self.state.LAYER: 1})
+
+    def test_view_switch_triggers_every_group(self):
+        self.fake.Krita.instance().activeWindow().addView()
+        self.harness._spin(50)
+        self.assertEqual(self.calls, {self.state.BRUSH: 2, self.state.LAYER: 2})
+
+    def test_inactive_scheduler_ignores_events(self):
+        self.scheduler.set_active(self.owner, False)
+        self.fake.Krita.instance().action(self.action_id).trigger()
+        self.harness._spin(50)
+        self.assertEqual(self.calls, {self.state.BRUSH: 1, self.state.LAYER: 1})
+
+    def test_event_latency_is_well_under_the_poll_interval(self):
+        report = self.harness.run(
+            use_events=True, idle_seconds=0.1, samples=3, settle_seconds=0.2
+        )
+        self.assertEqual(len(report.latencies_ms), 3, report.summary())
+        self.assertLess(report.max_ms, self.module.FAST_INTERVAL_MS, report.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
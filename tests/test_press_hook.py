@@ -0,0 +1,104 @@
+"""Deferred mouse-press hook tests - needs PyQt (offscreen)."""
+
+import unittest
+
+from tests.qt_support import HAS_QT
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class PressHookTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests.qt_support import start_qt
+
+        cls.app = start_qt()
+        from quick_access_manager.remaster.compat import (
+            QEvent,
+            QMouseEvent,
+            QObject,
+            QPointF,
+            Qt,
+            QWidget,
+        )
+        from quick_access_manager.remaster.quick_adjust.press_hook import PressHook
+
+        cls.QEvent, cls.QMouseEvent, cls.QObject = QEvent, QMouseEvent, QObject
+        cls.QPointF, cls.Qt = QPointF, Qt
+        cls.PressHook = PressHook
+        cls.target = QWidget()
+
+    def setUp(self):
+        self.hook = self.PressHook()
+        self.calls = []
+        self.owner = self._owner("first")
+
+    def _owner(self, name):
+        owner = self.QObject()
+        self.hook.register(owner, lambda: self.calls.append(name))
+        self.addCleanup(self.hook.set_active, owner, False)
+        return owner
+
+    def _press(self, modifiers=None):
+        point = self.QPointF(5, 5)
+        event = self.QMouseEvent(
+            self.QEvent.MouseButtonPress,
+            point,
+            point,
+            self.Qt.LeftButton,
+            self.Qt.LeftButton,
+            self.Qt.NoModifier if modifiers is None else modifiers,
+        )
+        self.app.sendEvent(self.target, event)
+
+    def _spin(self):
+        from tests.qt_support import spin
+
+        spin(0)
+
+    def test_repeated_presses_run_one_deferred_check(self):
+        self.hook.set_active(self.owner, True)
+        for _ in range(5):
+            self._press()
+        # Nothing runs inside the press itself.
+        self.assertEqual(self.calls, [])
+        self.assertTrue(self.hook.is_pending())
+        self._spin()
+        self.assertEqual(self.calls, ["first"])
+
+    def test_each_active_owner_is_checked_once(self):
+        second = self._owner("second")
+        self._owner("inactive")
+        self.hook.set_active(self.owner, True)
+        self.hook.set_active(second, True)
+        self._press()
+        self._press()
+        self._spin()
+        self.assertEqual(sorted(self.calls), ["first", "second"])
+
+    def test_modified_presses_are_ignored(self):
+        self.hook.set_active(self.owner, True)
+        self._press(self.Qt.AltModifier)
+        self._spin()
+        self.assertEqual(self.calls, [])
+
+    def test_filter_is_removed_once_no_owner_is_active(self):
+        self.hook.set_active(self.owner, True)
+        self.hook.set_active(self.owner, False)
+        self._press()
+        self.assertFalse(self.hook.is_pending())
+        self._spin()
+        self.assertEqual(self.calls, [])
+
+    def test_deleted_owner_is_forgotten(self):
+        self.hook.set_active(self.owner, True)
+        self.owner.deleteLater()
+        from quick_access_manager.remaster.compat import QEvent
+
+        self.app.sendPostedEvents(None, QEvent.DeferredDelete)
+        self._press()
+        self._spin()
+        self.assertEqual(self.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""Opt-in startup profiler tests.
+
+The profiler itself needs neither krita nor Qt; the first-paint test needs
+PyQt (offscreen) and is skipped without it.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from quick_access_manager.remaster import startup_profiler
+from quick_access_manager.remaster.startup_profiler import StartupProfiler
+from tests.qt_support import HAS_QT
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class StartupProfilerTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.clock = _Clock()
+
+    def test_phases_nest_and_are_reported_in_order(self):
+        profiler = StartupProfiler(clock=self.clock)
+        self.clock.now = 0.010
+        profiler.mark("plugin module imported")
+        with profiler.phase("setup"):
+            self.clock.now = 0.012
+            with profiler.phase("import HueSVC"):
+                self.clock.now = 0.020
+        lines = profiler.report().splitlines()[2:]
+        self.assertRegex(lines[0], r"10\.0\s+plugin module imported$")
+        self.assertRegex(lines[1], r"10\.0\s+10\.0  setup$")
+        self.assertRegex(lines[2], r"12\.0\s+8\.0    import HueSVC$")
+
+    def test_finish_writes_once_with_an_optional_cprofile_dump(self):
+        profiler = StartupProfiler(use_cprofile=True)
+        with profiler.phase("setup"):
+            pass
+        path = profiler.finish(self._tmp.name)
+        with open(path, encoding="utf-8") as handle:
+            self.assertIn("setup", handle.read())
+        self.assertTrue(
+            os.path.exists(os.path.join(self._tmp.name, startup_profiler.CPROFILE_FILE))
+        )
+        self.assertIsNone(profiler.finish(self._tmp.name))
+
+    def test_hooks_are_no_ops_when_profiling_is_off(self):
+        with mock.patch.object(startup_profiler, "_profiler", None):
+            self.assertIs(startup_profiler.phase("setup"), startup_profiler._NULL_PHASE)
+            startup_profiler.mark("ignored")
+            startup_profiler.watch_first_paint(object(), "ignored")
+            startup_profiler.schedule_finish()
+
+    def test_only_an_explicit_value_turns_profiling_on(self):
+        cases = (("", None), ("0", None), ("1", False), ("cprofile", True))
+        for value, expected in cases:
+            with mock.patch.dict(os.environ, {startup_profiler.ENV_VAR: value}):
+                profiler = startup_profiler._from_environment()
+            if expected is None:
+                self.assertIsNone(profiler)
+            else:
+                self.assertEqual(profiler.cprofile is not None, expected)
+                if profiler.cprofile is not None:
+                    profiler.cprofile.disable()
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class FirstPaintTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests.qt_support import start_qt
+
+        cls.app = start_qt()
+
+    def test_report_is_written_once_every_watched_docker_painted(self):
+        from quick_access_manager.remaster.compat import QWidget
+        from tests.qt_support import spin
+
+        profiler = StartupProfiler()
+        patch = mock.patch.object(startup_profiler, "_profiler", profiler)
+        patch.start()
+        self.addCleanup(patch.stop)
+        widgets = [QWidget(), QWidget()]
+        for index, widget in enumerate(widgets):
+            self.addCleanup(widget.deleteLater)
+            startup_profiler.watch_first_paint(widget, f"docker {index}")
+        with mock.patch.object(profiler, "finish") as finish:
+            widgets[0].show()
+            spin(20)
+            finish.assert_not_called()
+            widgets[1].show()
+            spin(20)
+            widgets[0].update()
+            spin(20)
+        finish.assert_called_once_with()
+        marks = [entry[0] for entry in profiler.entries]
+        self.assertEqual(marks, ["first paint: docker 0", "first paint: docker 1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""ThrottledWriter tests - needs PyQt (offscreen), not Krita."""
+
+import math
+import time
+import unittest
+
+from tests.qt_support import HAS_QT
+
+
+@unittest.skipUnless(HAS_QT, "PyQt is not installed")
+class ThrottledWriterTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from tests.qt_support import spin, start_qt
+
+        cls.app = start_qt()
+        cls.spin = staticmethod(spin)
+        from quick_access_manager.remaster.quick_adjust.write_throttle import (
+            ThrottledWriter,
+        )
+
+        cls.ThrottledWriter = ThrottledWriter
+
+    def setUp(self):
+        self.applied = []
+        self.writer = self.ThrottledWriter(self.applied.append, 40)
+
+    def test_first_value_is_applied_immediately(self):
+        self.writer.submit(1)
+        self.assertEqual(self.applied, [1])
+
+    def test_values_within_the_interval_coalesce_to_the_latest(self):
+        for value in range(1, 6):
+            self.writer.submit(value)
+        self.assertEqual(self.applied, [1])
+        self.assertTrue(self.writer.has_pending)
+        self.spin(80)
+        self.assertEqual(self.applied, [1, 5])
+        self.assertFalse(self.writer.has_pending)
+
+    def test_drag_writes_live_at_a_bounded_rate(self):
+        start = time.perf_counter()
+        value = 0
+        while time.perf_counter() - start < 0.3:
+            value += 1
+            self.writer.submit(value)
+            self.spin(2)
+        self.spin(80)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.assertEqual(self.applied[-1], value)
+        self.assertGreater(len(self.applied), 3)
+        self.assertLessEqual(len(self.applied), elapsed_ms / 40 + 2)
+
+    def test_flush_applies_the_pending_value_now(self):
+        self.writer.submit(1)
+        self.writer.submit(2)
+        self.writer.flush()
+        self.assertEqual(self.applied, [1, 2])
+
+    def test_cancel_drops_the_pending_value(self):
+        self.writer.submit(1)
+        self.writer.submit(2)
+        self.writer.cancel()
+        self.spin(80)
+        self.assertEqual(self.applied, [1])
+
+    def test_frame_interval_follows_the_screen_refresh_rate(self):
+        from quick_access_manager.remaster.quick_adjust import write_throttle
+
+        rate = self.app.primaryScreen().refreshRate()
+        interval = write_throttle.frame_interval_ms()
+        if rate > 1:
+            self.assertEqual(interval, math.ceil(1000 / rate))
+        else:
+            self.assertEqual(interval, write_throttle.DEFAULT_FRAME_INTERVAL_MS)
+
+
+if __name__ == "__main__":
+    unittest.main()